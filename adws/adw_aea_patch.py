@@ -44,6 +44,7 @@ import aiosqlite
 # Add parent directory to path for imports
 sys.path.append(str(Path(__file__).parent))
 from adw_modules.aea_data_types import AEAAgent, AEAMessage
+from adw_modules.agent import check_claude_installed as check_claude_cli
 
 # Load environment variables
 load_dotenv()
@@ -56,16 +57,12 @@ DB_PATH = Path(__file__).parent / "adw_data" / "aea_agents.db"
 
 
 def check_claude_installed() -> Optional[str]:
-    """Check if Claude Code CLI is installed. Return error message if not."""
-    try:
-        result = subprocess.run(
-            [CLAUDE_PATH, "--version"], capture_output=True, text=True
-        )
-        if result.returncode != 0:
-            return f"Error: Claude Code CLI is not installed or not working. Expected at: {CLAUDE_PATH}"
-    except FileNotFoundError:
-        return f"Error: Claude Code CLI is not installed. Expected at: {CLAUDE_PATH}"
-    return None
+    """Check if Claude Code CLI is installed. Return error message if not.
+
+    Uses the process-wide probe cache from adw_modules/agent.py so repeated
+    prompts do not fork `claude --version` each time.
+    """
+    return check_claude_cli(CLAUDE_PATH)
 
 
 def parse_jsonl_output(output_file: Path) -> Tuple[str, str, Optional[str]]:
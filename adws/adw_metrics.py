@@ -0,0 +1,69 @@
+#!/usr/bin/env -S uv run
+# /// script
+# dependencies = ["python-dotenv", "pydantic"]
+# ///
+
+"""
+ADW Metrics - Latency and cost report for Claude Code agent calls
+
+Usage: uv run adw_metrics.py [--agents-dir DIR] [--adw-id ID] [--json]
+
+Reads every agents/<adw_id>/metrics.jsonl written by the agent module and
+prints, per slash command: call count, failures, retries, p50/p95 wall time,
+total and average cost, and token totals.
+"""
+
+import argparse
+import json
+import os
+import sys
+
+# Add the parent directory to Python path to import modules
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from adw_modules.agent_metrics import AGENTS_DIR, iter_metrics, summarize_metrics
+
+
+def format_report(summary: dict) -> str:
+    """Render a metrics summary as a fixed-width table."""
+    header = (
+        f"{'slash_command':<26} {'calls':>6} {'fail':>5} {'retry':>6} "
+        f"{'p50_s':>8} {'p95_s':>8} {'cost_usd':>10} {'avg_usd':>8} "
+        f"{'in_tok':>10} {'out_tok':>10}"
+    )
+    lines = [header, "-" * len(header)]
+    for command, stats in summary.items():
+        lines.append(
+            f"{command:<26} {stats['calls']:>6} {stats['failures']:>5} "
+            f"{stats['retries']:>6} {stats['p50_seconds']:>8.1f} "
+            f"{stats['p95_seconds']:>8.1f} {stats['total_cost_usd']:>10.4f} "
+            f"{stats['avg_cost_usd']:>8.4f} {stats['input_tokens']:>10} "
+            f"{stats['output_tokens']:>10}"
+        )
+    return "\n".join(lines)
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Report agent latency and cost")
+    parser.add_argument(
+        "--agents-dir", default=AGENTS_DIR, help="Directory containing ADW runs"
+    )
+    parser.add_argument("--adw-id", help="Only include this ADW run")
+    parser.add_argument("--json", action="store_true", help="Print JSON instead of a table")
+    args = parser.parse_args()
+
+    records = iter_metrics(args.agents_dir)
+    if args.adw_id:
+        records = (r for r in records if r.get("adw_id") == args.adw_id)
+    summary = summarize_metrics(records)
+
+    if args.json:
+        print(json.dumps(summary, indent=2))
+    elif not summary:
+        print(f"No agent metrics found in {args.agents_dir}")
+    else:
+        print(format_report(summary))
+
+
+if __name__ == "__main__":
+    main()
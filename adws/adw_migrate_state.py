@@ -0,0 +1,51 @@
+#!/usr/bin/env -S uv run
+# /// script
+# dependencies = ["python-dotenv", "pydantic"]
+# ///
+
+"""
+ADW Migrate State - Import JSON state files into the SQLite state store
+
+Usage: uv run adw_migrate_state.py [--agents-dir DIR] [--db PATH]
+
+Copies every agents/<adw_id>/adw_state.json into agents/adw_state.db.
+Runs already present in the database are skipped, so it is safe to re-run.
+Set ADW_STATE_BACKEND=sqlite afterwards to use the database.
+"""
+
+import argparse
+import os
+import sys
+
+# Add the parent directory to Python path to import modules
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from adw_modules.state_store import (
+    PROJECT_ROOT,
+    STATE_DB_PATH,
+    StateStore,
+    migrate_json_states,
+)
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Migrate ADW state to SQLite")
+    parser.add_argument(
+        "--agents-dir",
+        default=os.path.join(PROJECT_ROOT, "agents"),
+        help="Directory containing ADW runs",
+    )
+    parser.add_argument("--db", default=STATE_DB_PATH, help="SQLite database path")
+    args = parser.parse_args()
+
+    counts = migrate_json_states(args.agents_dir, StateStore(args.db))
+    print(
+        f"Migrated {counts['migrated']} runs to {args.db} "
+        f"({counts['skipped']} already present, {counts['invalid']} invalid)"
+    )
+    if counts["migrated"]:
+        print("Set ADW_STATE_BACKEND=sqlite to use the database")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,14 +1,45 @@
 """Claude Code agent module for executing prompts programmatically."""
 
+import asyncio
 import subprocess
 import sys
 import os
 import json
 import re
 import logging
+import shutil
+import signal
+import textwrap
+import threading
 import time
-from typing import Optional, List, Dict, Any, Tuple, Final
+from collections import deque
+from typing import (
+    Optional,
+    List,
+    Dict,
+    Any,
+    Tuple,
+    Final,
+    Deque,
+    Iterable,
+    Iterator,
+    TextIO,
+)
 from dotenv import load_dotenv
+from .agent_limiter import agent_slot, agent_slot_async
+from .agent_metrics import (
+    add_usage,
+    extract_usage,
+    get_slash_command,
+    record_agent_call,
+)
+from .response_cache import (
+    ResponseCache,
+    get_response_cache,
+    hash_template,
+    make_cache_key,
+)
+from .retry_policy import RetryPolicy, detect_rate_limit, get_circuit_breaker
 from .data_types import (
     AgentPromptRequest,
     AgentPromptResponse,
@@ -25,6 +56,30 @@ load_dotenv()
 # Get Claude Code CLI path from environment
 CLAUDE_PATH = os.getenv("CLAUDE_CODE_PATH", "claude")
 
+# Prompts and raw output are saved under agents/ at the project root.
+# __file__ is in adws/adw_modules/, so we need to go up 3 levels to get to project root
+PROJECT_ROOT = os.path.dirname(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+)
+AGENTS_DIR = os.path.join(PROJECT_ROOT, "agents")
+
+# Whether to also export raw_output.jsonl as a pretty-printed raw_output.json array.
+# Off by default: the JSONL file is the source of truth and the export can be
+# produced later with convert_jsonl_to_json().
+EXPORT_JSON_OUTPUT = os.getenv("ADW_EXPORT_JSON_OUTPUT", "false").lower() == "true"
+
+# How long a successful or failed `claude --version` probe is trusted (seconds)
+CLAUDE_PROBE_TTL_SECONDS = float(os.getenv("ADW_CLAUDE_PROBE_TTL", "300"))
+
+# Process-wide probe cache: claude_path -> (resolved_path, mtime, checked_at, error)
+_claude_probe_cache: Dict[
+    str, Tuple[Optional[str], Optional[float], float, Optional[str]]
+] = {}
+_claude_probe_lock = threading.Lock()
+
+# Bytes read per chunk when streaming async subprocess output
+ASYNC_READ_CHUNK_SIZE = 64 * 1024
+
 # Model selection mapping for slash commands
 # Maps each command to its model configuration for base and heavy model sets
 SLASH_COMMAND_MODEL_MAP: Final[Dict[SlashCommand, Dict[ModelSet, str]]] = {
@@ -48,6 +103,39 @@ SLASH_COMMAND_MODEL_MAP: Final[Dict[SlashCommand, Dict[ModelSet, str]]] = {
     "/track_agentic_kpis": {"base": "sonnet", "heavy": "sonnet"},
 }
 
+# Hard wall-clock budget (seconds) for each slash command
+# The agent's process group is killed once its budget is spent
+SLASH_COMMAND_TIMEOUT_MAP: Final[Dict[SlashCommand, int]] = {
+    "/classify_issue": 300,
+    "/classify_adw": 300,
+    "/generate_branch_name": 300,
+    "/implement": 3600,
+    "/test": 1800,
+    "/resolve_failed_test": 1800,
+    "/test_e2e": 1800,
+    "/resolve_failed_e2e_test": 1800,
+    "/review": 1800,
+    "/document": 1800,
+    "/commit": 300,
+    "/pull_request": 600,
+    "/chore": 1800,
+    "/bug": 1800,
+    "/feature": 1800,
+    "/patch": 1800,
+    "/install_worktree": 900,
+    "/track_agentic_kpis": 600,
+}
+
+# Budget for prompts that are not a known slash command (seconds)
+DEFAULT_AGENT_TIMEOUT_SECONDS = int(os.getenv("ADW_AGENT_TIMEOUT", "3600"))
+
+# Kill an agent whose raw_output.jsonl has not grown for this long (seconds, 0 disables)
+AGENT_IDLE_TIMEOUT_SECONDS = int(os.getenv("ADW_AGENT_IDLE_TIMEOUT", "600"))
+
+# Seconds between watchdog checks, and grace period between SIGTERM and SIGKILL
+WATCHDOG_POLL_SECONDS = 5.0
+WATCHDOG_KILL_GRACE_SECONDS = 5.0
+
 
 def get_model_for_slash_command(
     request: AgentTemplateRequest, default: str = "sonnet"
@@ -83,6 +171,19 @@ def get_model_for_slash_command(
     return default
 
 
+def get_timeout_for_prompt(request: AgentPromptRequest) -> int:
+    """Get the wall-clock budget for a prompt in seconds.
+
+    Uses request.timeout_seconds if set, otherwise the budget of the prompt's
+    slash command, falling back to DEFAULT_AGENT_TIMEOUT_SECONDS.
+    """
+    if request.timeout_seconds:
+        return request.timeout_seconds
+    return SLASH_COMMAND_TIMEOUT_MAP.get(
+        get_slash_command(request.prompt), DEFAULT_AGENT_TIMEOUT_SECONDS
+    )
+
+
 def truncate_output(
     output: str, max_length: int = 500, suffix: str = "... (truncated)"
 ) -> str:
@@ -144,42 +245,178 @@ def truncate_output(
     return output[:truncate_at] + suffix
 
 
-def check_claude_installed() -> Optional[str]:
-    """Check if Claude Code CLI is installed. Return error message if not."""
+def _resolve_claude_binary(claude_path: str) -> Tuple[Optional[str], Optional[float]]:
+    """Resolve the Claude CLI to a real path and its mtime (None if not found)."""
+    resolved = shutil.which(claude_path)
+    if not resolved:
+        return None, None
+    resolved = os.path.realpath(resolved)
+    try:
+        return resolved, os.stat(resolved).st_mtime
+    except OSError:
+        return resolved, None
+
+
+def _probe_claude_cli(claude_path: str) -> Optional[str]:
+    """Run `claude --version`. Return error message if the CLI is unusable."""
     try:
         result = subprocess.run(
-            [CLAUDE_PATH, "--version"], capture_output=True, text=True
+            [claude_path, "--version"], capture_output=True, text=True
         )
         if result.returncode != 0:
             return (
-                f"Error: Claude Code CLI is not installed. Expected at: {CLAUDE_PATH}"
+                f"Error: Claude Code CLI is not installed. Expected at: {claude_path}"
             )
     except FileNotFoundError:
-        return f"Error: Claude Code CLI is not installed. Expected at: {CLAUDE_PATH}"
+        return f"Error: Claude Code CLI is not installed. Expected at: {claude_path}"
     return None
 
 
+def check_claude_installed(
+    claude_path: Optional[str] = None, use_cache: bool = True
+) -> Optional[str]:
+    """Check if Claude Code CLI is installed. Return error message if not.
+
+    Probe results are cached per process, keyed on the configured CLI path.
+    A cached result is reused while the resolved binary and its mtime are
+    unchanged and the entry is younger than CLAUDE_PROBE_TTL_SECONDS.
+
+    Args:
+        claude_path: CLI path to check (default: CLAUDE_PATH)
+        use_cache: Set to False to force a fresh `claude --version` probe
+    """
+    claude_path = claude_path or CLAUDE_PATH
+    resolved, mtime = _resolve_claude_binary(claude_path)
+    now = time.monotonic()
+
+    if use_cache:
+        with _claude_probe_lock:
+            cached = _claude_probe_cache.get(claude_path)
+        if cached:
+            cached_resolved, cached_mtime, checked_at, cached_error = cached
+            if (
+                cached_resolved == resolved
+                and cached_mtime == mtime
+                and now - checked_at < CLAUDE_PROBE_TTL_SECONDS
+            ):
+                return cached_error
+
+    error = _probe_claude_cli(claude_path)
+    with _claude_probe_lock:
+        _claude_probe_cache[claude_path] = (resolved, mtime, now, error)
+    return error
+
+
+def clear_claude_probe_cache() -> None:
+    """Forget all cached Claude CLI probe results."""
+    with _claude_probe_lock:
+        _claude_probe_cache.clear()
+
+
+class StreamJsonConsumer:
+    """Incrementally consume Claude Code stream-json output.
+
+    Each line is parsed exactly once as it arrives and optionally teed to a
+    sink file. Only the messages needed to build an AgentPromptResponse are
+    kept in memory: the result message, the session ID and a short tail of
+    recent messages for error context.
+    """
+
+    TAIL_SIZE = 5
+
+    def __init__(self, sink: Optional[TextIO] = None):
+        self.sink = sink
+        self.result_message: Optional[Dict[str, Any]] = None
+        self.session_id: Optional[str] = None
+        self.message_count = 0
+        self.tail: Deque[Dict[str, Any]] = deque(maxlen=self.TAIL_SIZE)
+        self.last_line = ""
+
+    def feed(self, line: str) -> Optional[Dict[str, Any]]:
+        """Consume one line of output. Returns the parsed message, if any."""
+        if self.sink:
+            self.sink.write(line)
+            self.sink.flush()
+
+        stripped = line.strip()
+        if not stripped:
+            return None
+        self.last_line = stripped
+
+        try:
+            message = json.loads(stripped)
+        except json.JSONDecodeError:
+            return None
+        if not isinstance(message, dict):
+            return None
+
+        self.message_count += 1
+        self.tail.append(message)
+
+        if message.get("type") == "result":
+            self.result_message = message
+        if self.session_id is None and message.get("session_id"):
+            self.session_id = message.get("session_id")
+
+        return message
+
+    def consume(self, lines: Iterable[str]) -> "StreamJsonConsumer":
+        """Consume every line from an iterable (file, pipe, list)."""
+        for line in lines:
+            self.feed(line)
+        return self
+
+    def last_assistant_text(self, keywords: Optional[List[str]] = None) -> Optional[str]:
+        """Return text of the most recent assistant message in the tail.
+
+        Args:
+            keywords: If given, only return text containing one of these
+                (case-insensitive) keywords
+        """
+        for message in reversed(self.tail):
+            if message.get("type") != "assistant" or not message.get("message"):
+                continue
+            content = message["message"].get("content", [])
+            if isinstance(content, list) and content:
+                text = content[0].get("text", "")
+                if not text:
+                    continue
+                if keywords and not any(k in text.lower() for k in keywords):
+                    continue
+                return text
+        return None
+
+
+def iter_jsonl_messages(jsonl_file: str) -> Iterator[Dict[str, Any]]:
+    """Yield parsed messages from a JSONL file one line at a time."""
+    with open(jsonl_file, "r") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
 def parse_jsonl_output(
     output_file: str,
 ) -> Tuple[List[Dict[str, Any]], Optional[Dict[str, Any]]]:
     """Parse JSONL output file and return all messages and the result message.
 
+    Loads every message into memory; prefer StreamJsonConsumer when only the
+    result is needed.
+
     Returns:
         Tuple of (all_messages, result_message) where result_message is None if not found
     """
     try:
-        with open(output_file, "r") as f:
-            # Read all lines and parse each as JSON
-            messages = [json.loads(line) for line in f if line.strip()]
-
-            # Find the result message (should be the last one)
-            result_message = None
-            for message in reversed(messages):
-                if message.get("type") == "result":
-                    result_message = message
-                    break
+        messages = list(iter_jsonl_messages(output_file))
+
+        # Find the result message (should be the last one)
+        result_message = None
+        for message in reversed(messages):
+            if message.get("type") == "result":
+                result_message = message
+                break
 
-            return messages, result_message
+        return messages, result_message
     except Exception as e:
         return [], None
 
@@ -188,7 +425,8 @@ def convert_jsonl_to_json(jsonl_file: str) -> str:
     """Convert JSONL file to JSON array file.
 
     Creates a .json file with the same name as the .jsonl file,
-    containing all messages as a JSON array.
+    containing all messages as a JSON array. Messages are streamed from
+    the JSONL file so the full array is never held in memory.
 
     Returns:
         Path to the created JSON file
@@ -196,16 +434,112 @@ def convert_jsonl_to_json(jsonl_file: str) -> str:
     # Create JSON filename by replacing .jsonl with .json
     json_file = jsonl_file.replace(".jsonl", ".json")
 
-    # Parse the JSONL file
-    messages, _ = parse_jsonl_output(jsonl_file)
-
-    # Write as JSON array
+    # Write as JSON array, one message at a time
     with open(json_file, "w") as f:
-        json.dump(messages, f, indent=2)
+        first = True
+        try:
+            for message in iter_jsonl_messages(jsonl_file):
+                f.write("[\n" if first else ",\n")
+                f.write(textwrap.indent(json.dumps(message, indent=2), "  "))
+                first = False
+        except (OSError, json.JSONDecodeError):
+            pass
+        f.write("[]" if first else "\n]")
 
     return json_file
 
 
+class AgentWatchdog:
+    """Enforce the wall-clock and idle-output budgets of one agent process.
+
+    Idle time is measured by growth of the agent's raw_output.jsonl file.
+    """
+
+    def __init__(
+        self, output_file: str, timeout_seconds: int, idle_timeout_seconds: int
+    ):
+        self.output_file = output_file
+        self.timeout_seconds = timeout_seconds
+        self.idle_timeout_seconds = idle_timeout_seconds
+        self.started_at = time.monotonic()
+        self.last_growth_at = self.started_at
+        self.last_size = -1
+        self.reason: Optional[str] = None
+
+    def check(self) -> Optional[str]:
+        """Return why the process should be killed, or None if it may continue."""
+        now = time.monotonic()
+        try:
+            size = os.path.getsize(self.output_file)
+        except OSError:
+            size = 0
+        if size != self.last_size:
+            self.last_size = size
+            self.last_growth_at = now
+
+        if self.timeout_seconds and now - self.started_at > self.timeout_seconds:
+            self.reason = f"timed out after {self.timeout_seconds} seconds"
+        elif (
+            self.idle_timeout_seconds
+            and now - self.last_growth_at > self.idle_timeout_seconds
+        ):
+            self.reason = f"produced no output for {self.idle_timeout_seconds} seconds"
+        return self.reason
+
+
+def _signal_process_group(pid: int, sig: int) -> None:
+    """Send a signal to a process group, ignoring groups that already exited."""
+    try:
+        os.killpg(pid, sig)
+    except (ProcessLookupError, PermissionError):
+        pass
+
+
+def _watch_process(
+    process: subprocess.Popen, watchdog: AgentWatchdog, done: threading.Event
+) -> None:
+    """Kill the process group once the watchdog trips (runs in a thread)."""
+    while not done.wait(WATCHDOG_POLL_SECONDS):
+        if watchdog.check():
+            _signal_process_group(process.pid, signal.SIGTERM)
+            try:
+                process.wait(timeout=WATCHDOG_KILL_GRACE_SECONDS)
+            except subprocess.TimeoutExpired:
+                _signal_process_group(process.pid, signal.SIGKILL)
+            return
+
+
+async def _watch_process_async(
+    process: asyncio.subprocess.Process, watchdog: AgentWatchdog
+) -> None:
+    """Async variant of _watch_process; cancel the task when the process exits."""
+    while True:
+        await asyncio.sleep(WATCHDOG_POLL_SECONDS)
+        if watchdog.check():
+            _signal_process_group(process.pid, signal.SIGTERM)
+            try:
+                await asyncio.wait_for(process.wait(), WATCHDOG_KILL_GRACE_SECONDS)
+            except asyncio.TimeoutError:
+                _signal_process_group(process.pid, signal.SIGKILL)
+            return
+
+
+def _build_timeout_response(
+    consumer: StreamJsonConsumer, reason: str
+) -> AgentPromptResponse:
+    """Build a TIMEOUT_ERROR response from the partial output of a killed agent."""
+    error_msg = f"Error: Claude Code command {reason}"
+    text = consumer.last_assistant_text()
+    if text:
+        error_msg += f"\nLast output: {text[:500]}"
+    return AgentPromptResponse(
+        output=truncate_output(error_msg, max_length=800),
+        success=False,
+        session_id=consumer.session_id,
+        retry_code=RetryCode.TIMEOUT_ERROR,
+    )
+
+
 def get_claude_env() -> Dict[str, str]:
     """Get only the required environment variables for Claude Code execution.
 
@@ -234,11 +568,7 @@ def save_prompt(prompt: str, adw_id: str, agent_name: str = "ops") -> None:
     command_name = slash_command[1:]
 
     # Create directory structure at project root (parent of adws)
-    # __file__ is in adws/adw_modules/, so we need to go up 3 levels to get to project root
-    project_root = os.path.dirname(
-        os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-    )
-    prompt_dir = os.path.join(project_root, "agents", adw_id, agent_name, "prompts")
+    prompt_dir = os.path.join(AGENTS_DIR, adw_id, agent_name, "prompts")
     os.makedirs(prompt_dir, exist_ok=True)
 
     # Save prompt to file
@@ -247,63 +577,135 @@ def save_prompt(prompt: str, adw_id: str, agent_name: str = "ops") -> None:
         f.write(prompt)
 
 
+def _should_retry(
+    response: AgentPromptResponse,
+    policy: RetryPolicy,
+    retries_by_code: Dict[RetryCode, int],
+) -> bool:
+    """Check whether a response is a retryable failure with budget left."""
+    if response.success or response.retry_code == RetryCode.NONE:
+        # Success or non-retryable error
+        return False
+    return policy.allows_retry(response.retry_code, retries_by_code)
+
+
+def _next_retry_delay(
+    response: AgentPromptResponse,
+    policy: RetryPolicy,
+    retries_by_code: Dict[RetryCode, int],
+    retry_delays: Optional[List[int]],
+) -> float:
+    """Record a retry for response and return how long to wait before it."""
+    retries_by_code[response.retry_code] = retries_by_code.get(response.retry_code, 0) + 1
+    retry_number = sum(retries_by_code.values())
+
+    if retry_delays:
+        # Fixed schedule requested by the caller; repeat the last delay if short
+        delay = retry_delays[min(retry_number, len(retry_delays)) - 1]
+        if response.retry_after is not None:
+            delay = max(delay, response.retry_after)
+        return delay
+    return policy.get_delay(retry_number, response.retry_after)
+
+
+def _resolve_retry_policy(
+    max_retries: Optional[int], policy: Optional[RetryPolicy]
+) -> RetryPolicy:
+    """Return the retry policy to use, applying a max_retries override."""
+    policy = policy or RetryPolicy()
+    if max_retries is not None:
+        policy = policy.model_copy(update={"max_retries": max_retries})
+    return policy
+
+
 def prompt_claude_code_with_retry(
     request: AgentPromptRequest,
-    max_retries: int = 3,
-    retry_delays: List[int] = None,
+    max_retries: Optional[int] = None,
+    retry_delays: Optional[List[int]] = None,
+    policy: Optional[RetryPolicy] = None,
 ) -> AgentPromptResponse:
     """Execute Claude Code with retry logic for certain error types.
 
+    Retries use exponential backoff with full jitter and a per-RetryCode
+    budget, and honour any retry-after hint reported by the API. Once the
+    call finishes, its tokens, cost, latency and retries are appended to
+    the run's metrics file.
+
     Args:
         request: The prompt request configuration
-        max_retries: Maximum number of retry attempts (default: 3)
-        retry_delays: List of delays in seconds between retries (default: [1, 3, 5])
+        max_retries: Maximum number of retry attempts (default: policy.max_retries)
+        retry_delays: Optional fixed delays in seconds between retries, used
+            instead of jittered backoff. The list is not modified.
+        policy: Retry policy (default: RetryPolicy())
 
     Returns:
         AgentPromptResponse with output and retry code
     """
-    if retry_delays is None:
-        retry_delays = [1, 3, 5]
-
-    # Ensure we have enough delays for max_retries
-    while len(retry_delays) < max_retries:
-        retry_delays.append(retry_delays[-1] + 2)  # Add incrementing delays
-
-    last_response = None
-
-    for attempt in range(max_retries + 1):  # +1 for initial attempt
-        if attempt > 0:
-            # This is a retry
-            delay = retry_delays[attempt - 1]
-            time.sleep(delay)
+    policy = _resolve_retry_policy(max_retries, policy)
+    retries_by_code: Dict[RetryCode, int] = {}
+    started = time.monotonic()
+    usage = None
 
+    while True:
         response = prompt_claude_code(request)
-        last_response = response
+        usage = add_usage(usage, response.usage)
+        if not _should_retry(response, policy, retries_by_code):
+            record_agent_call(
+                request,
+                response,
+                usage,
+                retries=sum(retries_by_code.values()),
+                wall_time_seconds=time.monotonic() - started,
+            )
+            return response
+        time.sleep(_next_retry_delay(response, policy, retries_by_code, retry_delays))
+
 
-        # Check if we should retry based on the retry code
-        if response.success or response.retry_code == RetryCode.NONE:
-            # Success or non-retryable error
+async def prompt_claude_code_with_retry_async(
+    request: AgentPromptRequest,
+    max_retries: Optional[int] = None,
+    retry_delays: Optional[List[int]] = None,
+    policy: Optional[RetryPolicy] = None,
+) -> AgentPromptResponse:
+    """Async variant of prompt_claude_code_with_retry."""
+    policy = _resolve_retry_policy(max_retries, policy)
+    retries_by_code: Dict[RetryCode, int] = {}
+    started = time.monotonic()
+    usage = None
+
+    while True:
+        response = await prompt_claude_code_async(request)
+        usage = add_usage(usage, response.usage)
+        if not _should_retry(response, policy, retries_by_code):
+            record_agent_call(
+                request,
+                response,
+                usage,
+                retries=sum(retries_by_code.values()),
+                wall_time_seconds=time.monotonic() - started,
+            )
             return response
+        await asyncio.sleep(
+            _next_retry_delay(response, policy, retries_by_code, retry_delays)
+        )
 
-        # Check if this is a retryable error
-        if response.retry_code in [
-            RetryCode.CLAUDE_CODE_ERROR,
-            RetryCode.TIMEOUT_ERROR,
-            RetryCode.EXECUTION_ERROR,
-            RetryCode.ERROR_DURING_EXECUTION,
-        ]:
-            if attempt < max_retries:
-                continue
-            else:
-                return response
 
-    # Should not reach here, but return last response just in case
-    return last_response
+def _record_api_health(response: AgentPromptResponse) -> None:
+    """Feed the outcome of an agent call into the shared circuit breaker."""
+    breaker = get_circuit_breaker()
+    if not breaker:
+        return
+    if response.retry_code == RetryCode.RATE_LIMIT_ERROR:
+        breaker.record_failure(response.retry_after)
+    elif response.success:
+        breaker.record_success()
 
 
-def prompt_claude_code(request: AgentPromptRequest) -> AgentPromptResponse:
-    """Execute Claude Code with the given prompt configuration."""
+def _prepare_prompt(request: AgentPromptRequest) -> Optional[AgentPromptResponse]:
+    """Run pre-flight checks and setup for a prompt.
 
+    Returns an error response if Claude Code cannot be run, None otherwise.
+    """
     # Check if Claude Code CLI is installed
     error_msg = check_claude_installed()
     if error_msg:
@@ -322,12 +724,17 @@ def prompt_claude_code(request: AgentPromptRequest) -> AgentPromptResponse:
     if output_dir:
         os.makedirs(output_dir, exist_ok=True)
 
-    # Build command - always use stream-json format and verbose
+    return None
+
+
+def _build_claude_command(request: AgentPromptRequest) -> List[str]:
+    """Build the Claude Code CLI command for a prompt request."""
+    # Always use stream-json format and verbose
     cmd = [CLAUDE_PATH, "-p", request.prompt]
     cmd.extend(["--model", request.model])
     cmd.extend(["--output-format", "stream-json"])
     cmd.append("--verbose")
-    
+
     # Check for MCP config in working directory
     if request.working_dir:
         mcp_config_path = os.path.join(request.working_dir, ".mcp.json")
@@ -338,166 +745,202 @@ def prompt_claude_code(request: AgentPromptRequest) -> AgentPromptResponse:
     if request.dangerously_skip_permissions:
         cmd.append("--dangerously-skip-permissions")
 
-    # Set up environment with only required variables
-    env = get_claude_env()
-
-    try:
-        # Open output file for streaming
-        with open(request.output_file, "w") as output_f:
-            # Execute Claude Code and stream output to file
-            result = subprocess.run(
-                cmd,
-                stdout=output_f,  # Stream directly to file
-                stderr=subprocess.PIPE,
-                text=True,
-                env=env,
-                cwd=request.working_dir,  # Use working_dir if provided
-            )
-
-        if result.returncode == 0:
+    return cmd
 
-            # Parse the JSONL file
-            messages, result_message = parse_jsonl_output(request.output_file)
 
-            # Convert JSONL to JSON array file
-            json_file = convert_jsonl_to_json(request.output_file)
+def _create_watchdog(request: AgentPromptRequest) -> AgentWatchdog:
+    """Create the watchdog enforcing a prompt's timeout budgets."""
+    idle_timeout = request.idle_timeout_seconds
+    if idle_timeout is None:
+        idle_timeout = AGENT_IDLE_TIMEOUT_SECONDS
+    return AgentWatchdog(
+        request.output_file, get_timeout_for_prompt(request), idle_timeout
+    )
 
-            if result_message:
-                # Extract session_id from result message
-                session_id = result_message.get("session_id")
 
-                # Check if there was an error in the result
-                is_error = result_message.get("is_error", False)
-                subtype = result_message.get("subtype", "")
+def _build_prompt_response(
+    consumer: StreamJsonConsumer, returncode: int, stderr_output: str
+) -> AgentPromptResponse:
+    """Turn a consumed stream-json run into an AgentPromptResponse."""
+    result_message = consumer.result_message
 
-                # Handle error_during_execution case where there's no result field
-                if subtype == "error_during_execution":
-                    error_msg = "Error during execution: Agent encountered an error and did not return a result"
-                    return AgentPromptResponse(
-                        output=error_msg,
-                        success=False,
-                        session_id=session_id,
-                        retry_code=RetryCode.ERROR_DURING_EXECUTION,
-                    )
+    if returncode == 0:
 
-                result_text = result_message.get("result", "")
+        if result_message:
+            # Extract session_id from result message
+            session_id = result_message.get("session_id")
 
-                # For error cases, truncate the output to prevent JSONL blobs
-                if is_error and len(result_text) > 1000:
-                    result_text = truncate_output(result_text, max_length=800)
+            # Check if there was an error in the result
+            is_error = result_message.get("is_error", False)
+            subtype = result_message.get("subtype", "")
 
+            # Handle error_during_execution case where there's no result field
+            if subtype == "error_during_execution":
+                error_msg = "Error during execution: Agent encountered an error and did not return a result"
                 return AgentPromptResponse(
-                    output=result_text,
-                    success=not is_error,
+                    output=error_msg,
+                    success=False,
                     session_id=session_id,
-                    retry_code=RetryCode.NONE,  # No retry needed for successful or non-retryable errors
+                    retry_code=RetryCode.ERROR_DURING_EXECUTION,
                 )
-            else:
-                # No result message found, try to extract meaningful error
-                error_msg = "No result message found in Claude Code output"
-
-                # Try to get the last few lines of output for context
-                try:
-                    with open(request.output_file, "r") as f:
-                        lines = f.readlines()
-                        if lines:
-                            # Get last 5 lines or less
-                            last_lines = lines[-5:] if len(lines) > 5 else lines
-                            # Try to parse each as JSON to find any error messages
-                            for line in reversed(last_lines):
-                                try:
-                                    data = json.loads(line.strip())
-                                    if data.get("type") == "assistant" and data.get(
-                                        "message"
-                                    ):
-                                        # Extract text from assistant message
-                                        content = data["message"].get("content", [])
-                                        if isinstance(content, list) and content:
-                                            text = content[0].get("text", "")
-                                            if text:
-                                                error_msg = f"Claude Code output: {text[:500]}"  # Truncate
-                                                break
-                                except:
-                                    pass
-                except:
-                    pass
 
-                return AgentPromptResponse(
-                    output=truncate_output(error_msg, max_length=800),
-                    success=False,
-                    session_id=None,
-                    retry_code=RetryCode.NONE,
-                )
+            result_text = result_message.get("result", "")
+
+            # Rate limits and overload are retryable, with the API's retry-after hint
+            retry_code = RetryCode.NONE
+            retry_after = None
+            if is_error:
+                rate_limited, retry_after = detect_rate_limit(result_message, stderr_output)
+                if rate_limited:
+                    retry_code = RetryCode.RATE_LIMIT_ERROR
+
+            # For error cases, truncate the output to prevent JSONL blobs
+            if is_error and len(result_text) > 1000:
+                result_text = truncate_output(result_text, max_length=800)
+
+            return AgentPromptResponse(
+                output=result_text,
+                success=not is_error,
+                session_id=session_id,
+                retry_code=retry_code,
+                retry_after=retry_after,
+            )
         else:
-            # Error occurred - stderr is captured, stdout went to file
-            stderr_msg = result.stderr.strip() if result.stderr else ""
+            # No result message found, try to extract meaningful error
+            error_msg = "No result message found in Claude Code output"
 
-            # Try to read the output file to check for errors in stdout
-            stdout_msg = ""
-            error_from_jsonl = None
-            try:
-                if os.path.exists(request.output_file):
-                    # Parse JSONL to find error message
-                    messages, result_message = parse_jsonl_output(request.output_file)
-
-                    if result_message and result_message.get("is_error"):
-                        # Found error in result message
-                        error_from_jsonl = result_message.get("result", "Unknown error")
-                    elif messages:
-                        # Look for error in last few messages
-                        for msg in reversed(messages[-5:]):
-                            if msg.get("type") == "assistant" and msg.get(
-                                "message", {}
-                            ).get("content"):
-                                content = msg["message"]["content"]
-                                if isinstance(content, list) and content:
-                                    text = content[0].get("text", "")
-                                    if text and (
-                                        "error" in text.lower()
-                                        or "failed" in text.lower()
-                                    ):
-                                        error_from_jsonl = text[:500]  # Truncate
-                                        break
-
-                    # If no structured error found, get last line only
-                    if not error_from_jsonl:
-                        with open(request.output_file, "r") as f:
-                            lines = f.readlines()
-                            if lines:
-                                # Just get the last line instead of entire file
-                                stdout_msg = lines[-1].strip()[
-                                    :200
-                                ]  # Truncate to 200 chars
-            except:
-                pass
+            # Use the last few messages for context
+            text = consumer.last_assistant_text()
+            if text:
+                error_msg = f"Claude Code output: {text[:500]}"  # Truncate
 
-            if error_from_jsonl:
-                error_msg = f"Claude Code error: {error_from_jsonl}"
-            elif stdout_msg and not stderr_msg:
-                error_msg = f"Claude Code error: {stdout_msg}"
-            elif stderr_msg and not stdout_msg:
-                error_msg = f"Claude Code error: {stderr_msg}"
-            elif stdout_msg and stderr_msg:
-                error_msg = f"Claude Code error: {stderr_msg}\nStdout: {stdout_msg}"
-            else:
-                error_msg = f"Claude Code error: Command failed with exit code {result.returncode}"
-
-            # Always truncate error messages to prevent huge outputs
             return AgentPromptResponse(
                 output=truncate_output(error_msg, max_length=800),
                 success=False,
                 session_id=None,
-                retry_code=RetryCode.CLAUDE_CODE_ERROR,
+                retry_code=RetryCode.NONE,
             )
+    else:
+        # Error occurred - stderr is captured, stdout went to file
+        stderr_msg = stderr_output.strip()
+
+        # Check the parsed stream for errors in stdout
+        stdout_msg = ""
+        error_from_jsonl = None
+        if result_message and result_message.get("is_error"):
+            # Found error in result message
+            error_from_jsonl = result_message.get("result", "Unknown error")
+        else:
+            # Look for error in last few messages
+            text = consumer.last_assistant_text(keywords=["error", "failed"])
+            if text:
+                error_from_jsonl = text[:500]  # Truncate
+
+        # If no structured error found, use the last line only
+        if not error_from_jsonl:
+            stdout_msg = consumer.last_line[:200]  # Truncate to 200 chars
+
+        if error_from_jsonl:
+            error_msg = f"Claude Code error: {error_from_jsonl}"
+        elif stdout_msg and not stderr_msg:
+            error_msg = f"Claude Code error: {stdout_msg}"
+        elif stderr_msg and not stdout_msg:
+            error_msg = f"Claude Code error: {stderr_msg}"
+        elif stdout_msg and stderr_msg:
+            error_msg = f"Claude Code error: {stderr_msg}\nStdout: {stdout_msg}"
+        else:
+            error_msg = f"Claude Code error: Command failed with exit code {returncode}"
+
+        # Not error_msg: it may quote the assistant's own text
+        rate_limited, retry_after = detect_rate_limit(result_message, stderr_msg)
 
-    except subprocess.TimeoutExpired:
-        error_msg = "Error: Claude Code command timed out after 5 minutes"
+        # Always truncate error messages to prevent huge outputs
         return AgentPromptResponse(
-            output=error_msg,
+            output=truncate_output(error_msg, max_length=800),
             success=False,
             session_id=None,
-            retry_code=RetryCode.TIMEOUT_ERROR,
+            retry_code=(
+                RetryCode.RATE_LIMIT_ERROR
+                if rate_limited
+                else RetryCode.CLAUDE_CODE_ERROR
+            ),
+            retry_after=retry_after,
         )
+
+
+def prompt_claude_code(request: AgentPromptRequest) -> AgentPromptResponse:
+    """Execute Claude Code with the given prompt configuration."""
+
+    error_response = _prepare_prompt(request)
+    if error_response:
+        return error_response
+
+    cmd = _build_claude_command(request)
+
+    # Set up environment with only required variables
+    env = get_claude_env()
+
+    # Pause new launches while the API is overloaded
+    breaker = get_circuit_breaker()
+    if breaker:
+        breaker.wait_until_closed()
+
+    started = time.monotonic()
+    try:
+        # Wait for a host-wide agent slot, then tee each line into the output file
+        with agent_slot(request.model, request.adw_id, request.agent_name), open(
+            request.output_file, "w"
+        ) as output_f:
+            process = subprocess.Popen(
+                cmd,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                text=True,
+                env=env,
+                cwd=request.working_dir,  # Use working_dir if provided
+                start_new_session=True,  # Own process group so the watchdog can kill it
+            )
+
+            # Drain stderr in the background so a chatty CLI cannot block on a full pipe
+            stderr_chunks: List[str] = []
+            stderr_thread = threading.Thread(
+                target=lambda: stderr_chunks.append(process.stderr.read()),
+                daemon=True,
+            )
+            stderr_thread.start()
+
+            # Kill the agent if it exceeds its budget or stops producing output
+            watchdog = _create_watchdog(request)
+            watchdog_done = threading.Event()
+            watchdog_thread = threading.Thread(
+                target=_watch_process,
+                args=(process, watchdog, watchdog_done),
+                daemon=True,
+            )
+            watchdog_thread.start()
+
+            try:
+                consumer = StreamJsonConsumer(sink=output_f).consume(process.stdout)
+                returncode = process.wait()
+            finally:
+                watchdog_done.set()
+                watchdog_thread.join()
+            stderr_thread.join()
+
+        if EXPORT_JSON_OUTPUT:
+            convert_jsonl_to_json(request.output_file)
+
+        if watchdog.reason:
+            response = _build_timeout_response(consumer, watchdog.reason)
+        else:
+            response = _build_prompt_response(
+                consumer, returncode, "".join(stderr_chunks)
+            )
+            _record_api_health(response)
+        response.usage = extract_usage(consumer.result_message)
+        response.wall_time_seconds = time.monotonic() - started
+        return response
+
     except Exception as e:
         error_msg = f"Error executing Claude Code: {e}"
         return AgentPromptResponse(
@@ -508,24 +951,97 @@ def prompt_claude_code(request: AgentPromptRequest) -> AgentPromptResponse:
         )
 
 
-def execute_template(request: AgentTemplateRequest) -> AgentPromptResponse:
-    """Execute a Claude Code template with slash command and arguments.
+async def prompt_claude_code_async(request: AgentPromptRequest) -> AgentPromptResponse:
+    """Execute Claude Code without blocking the event loop.
 
-    This function automatically selects the appropriate model based on:
-    1. The slash command being executed
-    2. The model_set stored in the ADW state (base or heavy)
+    Behaves like prompt_claude_code but runs the CLI with asyncio subprocesses,
+    so many prompts can be awaited concurrently from one thread.
+    """
+    error_response = _prepare_prompt(request)
+    if error_response:
+        return error_response
 
-    Example:
-        request = AgentTemplateRequest(
-            agent_name="planner",
-            slash_command="/implement",
-            args=["plan.md"],
-            adw_id="abc12345"
+    cmd = _build_claude_command(request)
+
+    # Set up environment with only required variables
+    env = get_claude_env()
+
+    # Pause new launches while the API is overloaded
+    breaker = get_circuit_breaker()
+    if breaker:
+        await breaker.wait_until_closed_async()
+
+    started = time.monotonic()
+    try:
+        async with agent_slot_async(
+            request.model, request.adw_id, request.agent_name
+        ):
+            response = await _run_claude_async(request, cmd, env)
+        _record_api_health(response)
+        response.wall_time_seconds = time.monotonic() - started
+        return response
+    except Exception as e:
+        error_msg = f"Error executing Claude Code: {e}"
+        return AgentPromptResponse(
+            output=error_msg,
+            success=False,
+            session_id=None,
+            retry_code=RetryCode.EXECUTION_ERROR,
         )
-        # If state has model_set="heavy", this will use "opus"
-        # If state has model_set="base" or missing, this will use "sonnet"
-        response = execute_template(request)
-    """
+
+
+async def _run_claude_async(
+    request: AgentPromptRequest, cmd: List[str], env: Dict[str, str]
+) -> AgentPromptResponse:
+    """Spawn Claude Code with asyncio and stream its output into a response."""
+    with open(request.output_file, "w") as output_f:
+        process = await asyncio.create_subprocess_exec(
+            *cmd,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            env=env,
+            cwd=request.working_dir,  # Use working_dir if provided
+            start_new_session=True,  # Own process group so the watchdog can kill it
+        )
+        stderr_task = asyncio.create_task(process.stderr.read())
+
+        # Kill the agent if it exceeds its budget or stops producing output
+        watchdog = _create_watchdog(request)
+        watchdog_task = asyncio.create_task(_watch_process_async(process, watchdog))
+
+        try:
+            # Split lines ourselves: stream-json lines can exceed StreamReader's line limit
+            consumer = StreamJsonConsumer(sink=output_f)
+            buffer = b""
+            while True:
+                chunk = await process.stdout.read(ASYNC_READ_CHUNK_SIZE)
+                if not chunk:
+                    break
+                buffer += chunk
+                *lines, buffer = buffer.split(b"\n")
+                for line in lines:
+                    consumer.feed(line.decode("utf-8", errors="replace") + "\n")
+            if buffer:
+                consumer.feed(buffer.decode("utf-8", errors="replace"))
+
+            returncode = await process.wait()
+        finally:
+            watchdog_task.cancel()
+        stderr_output = (await stderr_task).decode("utf-8", errors="replace")
+
+    if EXPORT_JSON_OUTPUT:
+        convert_jsonl_to_json(request.output_file)
+
+    if watchdog.reason:
+        response = _build_timeout_response(consumer, watchdog.reason)
+    else:
+        response = _build_prompt_response(consumer, returncode, stderr_output)
+    response.usage = extract_usage(consumer.result_message)
+    return response
+
+
+def _build_template_prompt_request(request: AgentTemplateRequest) -> AgentPromptRequest:
+    """Resolve model and output location for a template request."""
     # Get the appropriate model for this request
     mapped_model = get_model_for_slash_command(request)
     request = request.model_copy(update={"model": mapped_model})
@@ -534,20 +1050,14 @@ def execute_template(request: AgentTemplateRequest) -> AgentPromptResponse:
     prompt = f"{request.slash_command} {' '.join(request.args)}"
 
     # Create output directory with adw_id at project root
-    # __file__ is in adws/adw_modules/, so we need to go up 3 levels to get to project root
-    project_root = os.path.dirname(
-        os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-    )
-    output_dir = os.path.join(
-        project_root, "agents", request.adw_id, request.agent_name
-    )
+    output_dir = os.path.join(AGENTS_DIR, request.adw_id, request.agent_name)
     os.makedirs(output_dir, exist_ok=True)
 
     # Build output file path
     output_file = os.path.join(output_dir, "raw_output.jsonl")
 
     # Create prompt request with specific parameters
-    prompt_request = AgentPromptRequest(
+    return AgentPromptRequest(
         prompt=prompt,
         adw_id=request.adw_id,
         agent_name=request.agent_name,
@@ -555,7 +1065,103 @@ def execute_template(request: AgentTemplateRequest) -> AgentPromptResponse:
         dangerously_skip_permissions=True,
         output_file=output_file,
         working_dir=request.working_dir,  # Pass through working_dir
+        timeout_seconds=SLASH_COMMAND_TIMEOUT_MAP.get(
+            request.slash_command, DEFAULT_AGENT_TIMEOUT_SECONDS
+        ),
     )
 
+
+def _get_response_cache_entry(
+    request: AgentTemplateRequest, model: str
+) -> Tuple[Optional[ResponseCache], str]:
+    """Return the response cache and key for a template request, if cacheable."""
+    cache = get_response_cache(request.slash_command)
+    if not cache:
+        return None, ""
+    template_hash = hash_template(request.slash_command, request.working_dir)
+    return cache, make_cache_key(request.slash_command, request.args, model, template_hash)
+
+
+def execute_template(request: AgentTemplateRequest) -> AgentPromptResponse:
+    """Execute a Claude Code template with slash command and arguments.
+
+    This function automatically selects the appropriate model based on:
+    1. The slash command being executed
+    2. The model_set stored in the ADW state (base or heavy)
+
+    Example:
+        request = AgentTemplateRequest(
+            agent_name="planner",
+            slash_command="/implement",
+            args=["plan.md"],
+            adw_id="abc12345"
+        )
+        # If state has model_set="heavy", this will use "opus"
+        # If state has model_set="base" or missing, this will use "sonnet"
+        response = execute_template(request)
+
+    Classifier commands are served from the response cache when it is enabled
+    (see adw_modules.response_cache).
+    """
+    prompt_request = _build_template_prompt_request(request)
+
+    cache, cache_key = _get_response_cache_entry(request, prompt_request.model)
+    if cache:
+        cached = cache.get(cache_key)
+        if cached:
+            return cached
+
     # Execute with retry logic and return response (prompt_claude_code now handles all parsing)
-    return prompt_claude_code_with_retry(prompt_request)
+    response = prompt_claude_code_with_retry(prompt_request)
+    if cache and response.success:
+        cache.put(cache_key, request.slash_command, response)
+    return response
+
+
+async def execute_template_async(request: AgentTemplateRequest) -> AgentPromptResponse:
+    """Async variant of execute_template.
+
+    Model selection, output locations and response caching are identical
+    to execute_template.
+    """
+    prompt_request = _build_template_prompt_request(request)
+
+    cache, cache_key = _get_response_cache_entry(request, prompt_request.model)
+    if cache:
+        cached = cache.get(cache_key)
+        if cached:
+            return cached
+
+    response = await prompt_claude_code_with_retry_async(prompt_request)
+    if cache and response.success:
+        cache.put(cache_key, request.slash_command, response)
+    return response
+
+
+async def gather_templates(
+    requests: List[AgentTemplateRequest], max_concurrency: int = 4
+) -> List[AgentPromptResponse]:
+    """Execute independent template requests concurrently.
+
+    At most max_concurrency agents run at once. Each request must use a distinct
+    agent_name so their raw_output.jsonl files do not collide.
+
+    Returns:
+        Responses in the same order as requests. Unexpected exceptions are
+        returned as failed responses with RetryCode.EXECUTION_ERROR.
+    """
+    semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+    async def run_one(request: AgentTemplateRequest) -> AgentPromptResponse:
+        async with semaphore:
+            try:
+                return await execute_template_async(request)
+            except Exception as e:
+                return AgentPromptResponse(
+                    output=f"Error executing {request.slash_command}: {e}",
+                    success=False,
+                    session_id=None,
+                    retry_code=RetryCode.EXECUTION_ERROR,
+                )
+
+    return list(await asyncio.gather(*(run_one(r) for r in requests)))
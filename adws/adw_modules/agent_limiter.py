@@ -0,0 +1,303 @@
+"""Cross-process concurrency limiter for Claude Code agents.
+
+Every ADW process on a host (workflow scripts, cron and webhook triggers)
+shares a single SQLite database at agents/agent_limiter.db. Before spawning
+`claude`, an agent takes a ticket and waits until a slot is free for its
+model. Tickets are granted in FIFO order, per-model limits and a global
+limit are enforced, and slots held by dead processes are reclaimed.
+
+Limits are configured via environment variables:
+- ADW_MAX_AGENTS: total concurrent agents on this host (default: 8)
+- ADW_MAX_AGENTS_OPUS / ADW_MAX_AGENTS_SONNET / ADW_MAX_AGENTS_HAIKU:
+  per-model limits (defaults: 2 / 4 / 8)
+- ADW_AGENT_LIMITER: set to "false" to disable the limiter
+"""
+
+import asyncio
+import os
+import sqlite3
+import time
+from contextlib import asynccontextmanager, contextmanager
+from typing import AsyncIterator, Dict, Iterator, Optional
+
+# __file__ is in adws/adw_modules/, so we need to go up 3 levels to get to project root
+PROJECT_ROOT = os.path.dirname(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+)
+LIMITER_DB_PATH = os.path.join(PROJECT_ROOT, "agents", "agent_limiter.db")
+
+LIMITER_ENABLED = os.getenv("ADW_AGENT_LIMITER", "true").lower() != "false"
+
+# Seconds between slot checks while waiting
+POLL_INTERVAL_SECONDS = 0.5
+
+# Number of recent acquisitions used for queue-wait statistics
+STATS_WINDOW = 200
+
+# Number of acquisitions kept in slot_history
+HISTORY_LIMIT = 1000
+
+
+def get_model_limits() -> Dict[str, int]:
+    """Read per-model concurrency limits from the environment."""
+    return {
+        "opus": int(os.getenv("ADW_MAX_AGENTS_OPUS", "2")),
+        "sonnet": int(os.getenv("ADW_MAX_AGENTS_SONNET", "4")),
+        "haiku": int(os.getenv("ADW_MAX_AGENTS_HAIKU", "8")),
+    }
+
+
+def get_global_limit() -> int:
+    """Read the host-wide concurrency limit from the environment."""
+    return int(os.getenv("ADW_MAX_AGENTS", "8"))
+
+
+def _pid_alive(pid: int) -> bool:
+    """Check whether a process with the given pid is still running."""
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True  # Exists but owned by another user
+    return True
+
+
+class AgentLimiter:
+    """FIFO counting semaphore shared by all processes using the same database."""
+
+    def __init__(
+        self,
+        db_path: str = LIMITER_DB_PATH,
+        model_limits: Optional[Dict[str, int]] = None,
+        global_limit: Optional[int] = None,
+    ):
+        self.db_path = db_path
+        self.model_limits = model_limits or get_model_limits()
+        self.global_limit = global_limit or get_global_limit()
+        os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS tickets (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    model TEXT NOT NULL,
+                    pid INTEGER NOT NULL,
+                    adw_id TEXT,
+                    agent_name TEXT,
+                    enqueued_at REAL NOT NULL,
+                    acquired_at REAL
+                );
+                CREATE TABLE IF NOT EXISTS slot_history (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    model TEXT NOT NULL,
+                    adw_id TEXT,
+                    agent_name TEXT,
+                    wait_seconds REAL NOT NULL,
+                    acquired_at REAL NOT NULL
+                );
+                """
+            )
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Open a connection in autocommit mode; transactions are explicit."""
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    def _limit_for(self, model: str) -> int:
+        return self.model_limits.get(model, self.global_limit)
+
+    def enqueue(self, model: str, adw_id: str = "", agent_name: str = "") -> int:
+        """Take a ticket in the wait queue. Returns the ticket id."""
+        with self._connect() as conn:
+            cursor = conn.execute(
+                "INSERT INTO tickets (model, pid, adw_id, agent_name, enqueued_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (model, os.getpid(), adw_id, agent_name, time.time()),
+            )
+            return cursor.lastrowid
+
+    def try_acquire(self, ticket: int) -> bool:
+        """Try to turn a waiting ticket into a running slot.
+
+        A ticket is granted when its model and the host have spare capacity,
+        it is the oldest waiting ticket for its model, and no older ticket of
+        another model that could run right now is waiting for a global slot.
+        """
+        with self._connect() as conn:
+            return self._try_acquire(conn, ticket)
+
+    def _try_acquire(self, conn: sqlite3.Connection, ticket: int) -> bool:
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            self._reap_dead(conn)
+
+            row = conn.execute(
+                "SELECT model, acquired_at FROM tickets WHERE id = ?", (ticket,)
+            ).fetchone()
+            if row is None:
+                conn.execute("COMMIT")
+                raise RuntimeError(f"Agent limiter ticket {ticket} no longer exists")
+            model, acquired_at = row
+            if acquired_at is not None:
+                conn.execute("COMMIT")
+                return True
+
+            running = dict(
+                conn.execute(
+                    "SELECT model, COUNT(*) FROM tickets "
+                    "WHERE acquired_at IS NOT NULL GROUP BY model"
+                ).fetchall()
+            )
+            total_running = sum(running.values())
+
+            granted = (
+                total_running < self.global_limit
+                and running.get(model, 0) < self._limit_for(model)
+                and self._is_next_in_line(conn, ticket, model, running)
+            )
+            if granted:
+                now = time.time()
+                conn.execute(
+                    "UPDATE tickets SET acquired_at = ? WHERE id = ?", (now, ticket)
+                )
+                conn.execute(
+                    "INSERT INTO slot_history (model, adw_id, agent_name, wait_seconds, acquired_at) "
+                    "SELECT model, adw_id, agent_name, ? - enqueued_at, ? FROM tickets WHERE id = ?",
+                    (now, now, ticket),
+                )
+            conn.execute("COMMIT")
+            return granted
+        except Exception:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
+
+    def _is_next_in_line(
+        self, conn: sqlite3.Connection, ticket: int, model: str, running: Dict[str, int]
+    ) -> bool:
+        """Check FIFO order against older waiting tickets."""
+        older = conn.execute(
+            "SELECT model FROM tickets WHERE acquired_at IS NULL AND id < ? ORDER BY id",
+            (ticket,),
+        ).fetchall()
+        for (other_model,) in older:
+            if other_model == model:
+                return False
+            # An older ticket of another model that has model capacity gets
+            # the global slot first
+            if running.get(other_model, 0) < self._limit_for(other_model):
+                return False
+        return True
+
+    def _reap_dead(self, conn: sqlite3.Connection) -> None:
+        """Delete tickets held by processes that no longer exist."""
+        pids = [row[0] for row in conn.execute("SELECT DISTINCT pid FROM tickets")]
+        for pid in pids:
+            if not _pid_alive(pid):
+                conn.execute("DELETE FROM tickets WHERE pid = ?", (pid,))
+
+    def release(self, ticket: int) -> None:
+        """Release a slot or abandon a waiting ticket."""
+        with self._connect() as conn:
+            conn.execute("DELETE FROM tickets WHERE id = ?", (ticket,))
+            conn.execute(
+                "DELETE FROM slot_history WHERE id <= (SELECT MAX(id) FROM slot_history) - ?",
+                (HISTORY_LIMIT,),
+            )
+
+    def get_queue_stats(self) -> Dict[str, Dict[str, float]]:
+        """Return per-model running/waiting counts and recent queue-wait times.
+
+        Returns:
+            Mapping of model -> {"running", "waiting", "limit", "avg_wait_seconds",
+            "max_wait_seconds", "samples"}
+        """
+        with self._connect() as conn:
+            counts = conn.execute(
+                "SELECT model, SUM(acquired_at IS NOT NULL), SUM(acquired_at IS NULL) "
+                "FROM tickets GROUP BY model"
+            ).fetchall()
+            waits = conn.execute(
+                "SELECT model, AVG(wait_seconds), MAX(wait_seconds), COUNT(*) FROM "
+                "(SELECT model, wait_seconds FROM slot_history ORDER BY id DESC LIMIT ?) "
+                "GROUP BY model",
+                (STATS_WINDOW,),
+            ).fetchall()
+
+        stats: Dict[str, Dict[str, float]] = {}
+        for model in set(self.model_limits) | {row[0] for row in counts + waits}:
+            stats[model] = {
+                "running": 0,
+                "waiting": 0,
+                "limit": self._limit_for(model),
+                "avg_wait_seconds": 0.0,
+                "max_wait_seconds": 0.0,
+                "samples": 0,
+            }
+        for model, running, waiting in counts:
+            stats[model]["running"] = running
+            stats[model]["waiting"] = waiting
+        for model, avg_wait, max_wait, samples in waits:
+            stats[model]["avg_wait_seconds"] = avg_wait
+            stats[model]["max_wait_seconds"] = max_wait
+            stats[model]["samples"] = samples
+        return stats
+
+
+_limiter: Optional[AgentLimiter] = None
+
+
+def get_agent_limiter() -> AgentLimiter:
+    """Return the process-wide limiter for LIMITER_DB_PATH."""
+    global _limiter
+    if _limiter is None or _limiter.db_path != LIMITER_DB_PATH:
+        _limiter = AgentLimiter(LIMITER_DB_PATH)
+    return _limiter
+
+
+@contextmanager
+def agent_slot(model: str, adw_id: str = "", agent_name: str = "") -> Iterator[float]:
+    """Block until an agent slot is available for model, then hold it.
+
+    Yields:
+        Seconds spent waiting in the queue
+    """
+    if not LIMITER_ENABLED:
+        yield 0.0
+        return
+
+    limiter = get_agent_limiter()
+    start = time.monotonic()
+    ticket = limiter.enqueue(model, adw_id, agent_name)
+    try:
+        while not limiter.try_acquire(ticket):
+            time.sleep(POLL_INTERVAL_SECONDS)
+        yield time.monotonic() - start
+    finally:
+        limiter.release(ticket)
+
+
+@asynccontextmanager
+async def agent_slot_async(
+    model: str, adw_id: str = "", agent_name: str = ""
+) -> AsyncIterator[float]:
+    """Async variant of agent_slot that waits without blocking the event loop."""
+    if not LIMITER_ENABLED:
+        yield 0.0
+        return
+
+    limiter = get_agent_limiter()
+    start = time.monotonic()
+    ticket = limiter.enqueue(model, adw_id, agent_name)
+    try:
+        while not limiter.try_acquire(ticket):
+            await asyncio.sleep(POLL_INTERVAL_SECONDS)
+        yield time.monotonic() - start
+    finally:
+        limiter.release(ticket)
@@ -0,0 +1,167 @@
+"""Token, cost and latency accounting for Claude Code agent calls.
+
+Every agent call appends one compact JSON line to agents/<adw_id>/metrics.jsonl.
+The same format is read back by summarize_metrics to report latency
+percentiles and cost per slash command (see adw_metrics.py).
+
+Set ADW_AGENT_METRICS=false to disable recording.
+"""
+
+import glob
+import json
+import logging
+import os
+import re
+import time
+from typing import Any, Dict, Iterator, List, Optional
+
+from .data_types import AgentPromptRequest, AgentPromptResponse, AgentUsage
+
+# __file__ is in adws/adw_modules/, so we need to go up 3 levels to get to project root
+PROJECT_ROOT = os.path.dirname(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+)
+AGENTS_DIR = os.path.join(PROJECT_ROOT, "agents")
+METRICS_FILENAME = "metrics.jsonl"
+
+METRICS_ENABLED = os.getenv("ADW_AGENT_METRICS", "true").lower() != "false"
+
+TOKEN_FIELDS = (
+    "input_tokens",
+    "output_tokens",
+    "cache_creation_input_tokens",
+    "cache_read_input_tokens",
+)
+
+logger = logging.getLogger(__name__)
+
+
+def extract_usage(result_message: Optional[Dict[str, Any]]) -> Optional[AgentUsage]:
+    """Build AgentUsage from a stream-json result message, if there is one."""
+    if not result_message:
+        return None
+    usage = result_message.get("usage") or {}
+    return AgentUsage(
+        **{field: usage.get(field) or 0 for field in TOKEN_FIELDS},
+        total_cost_usd=result_message.get("total_cost_usd") or 0.0,
+        duration_ms=result_message.get("duration_ms") or 0,
+        duration_api_ms=result_message.get("duration_api_ms") or 0,
+        num_turns=result_message.get("num_turns") or 0,
+    )
+
+
+def add_usage(total: Optional[AgentUsage], usage: Optional[AgentUsage]) -> Optional[AgentUsage]:
+    """Sum the usage of two attempts of the same call."""
+    if total is None or usage is None:
+        return total or usage
+    return AgentUsage(
+        **{
+            field: getattr(total, field) + getattr(usage, field)
+            for field in AgentUsage.model_fields
+        }
+    )
+
+
+def get_slash_command(prompt: str) -> str:
+    """Return the prompt's leading slash command, or "(prompt)" for free text."""
+    match = re.match(r"^(/\w+)", prompt)
+    return match.group(1) if match else "(prompt)"
+
+
+def get_metrics_path(adw_id: str) -> str:
+    """Get the metrics file for an ADW run."""
+    return os.path.join(AGENTS_DIR, adw_id, METRICS_FILENAME)
+
+
+def record_agent_call(
+    request: AgentPromptRequest,
+    response: AgentPromptResponse,
+    usage: Optional[AgentUsage],
+    retries: int,
+    wall_time_seconds: float,
+) -> None:
+    """Append a metrics record for a finished agent call (all attempts).
+
+    Recording never raises: metrics must not break a workflow.
+    """
+    if not METRICS_ENABLED:
+        return
+
+    usage = usage or AgentUsage()
+    record = {
+        "ts": round(time.time(), 3),
+        "adw_id": request.adw_id,
+        "agent_name": request.agent_name,
+        "slash_command": get_slash_command(request.prompt),
+        "model": request.model,
+        "success": response.success,
+        "retry_code": response.retry_code.value,
+        "retries": retries,
+        "wall_time_seconds": round(wall_time_seconds, 3),
+        "api_duration_ms": usage.duration_api_ms,
+        "num_turns": usage.num_turns,
+        "cost_usd": usage.total_cost_usd,
+        **{field: getattr(usage, field) for field in TOKEN_FIELDS},
+    }
+
+    try:
+        path = get_metrics_path(request.adw_id)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # A single short append is atomic, so concurrent agents can share the file
+        with open(path, "a") as f:
+            f.write(json.dumps(record, separators=(",", ":")) + "\n")
+    except OSError as e:
+        logger.warning(f"Failed to record agent metrics: {e}")
+
+
+def iter_metrics(agents_dir: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+    """Yield every metrics record under agents_dir, skipping malformed lines."""
+    pattern = os.path.join(agents_dir or AGENTS_DIR, "*", METRICS_FILENAME)
+    for path in sorted(glob.glob(pattern)):
+        with open(path, "r") as f:
+            for line in f:
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Return the pct-th percentile of values (linear interpolation)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * pct / 100
+    lower = int(rank)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (rank - lower)
+
+
+def summarize_metrics(records: Iterator[Dict[str, Any]]) -> Dict[str, Dict[str, float]]:
+    """Aggregate metrics records per slash command.
+
+    Returns:
+        Mapping of slash_command -> {"calls", "failures", "retries",
+        "p50_seconds", "p95_seconds", "total_cost_usd", "avg_cost_usd",
+        "input_tokens", "output_tokens"}
+    """
+    grouped: Dict[str, List[Dict[str, Any]]] = {}
+    for record in records:
+        grouped.setdefault(record.get("slash_command", "(prompt)"), []).append(record)
+
+    summary: Dict[str, Dict[str, float]] = {}
+    for command, items in sorted(grouped.items()):
+        latencies = [r.get("wall_time_seconds", 0.0) for r in items]
+        total_cost = sum(r.get("cost_usd", 0.0) for r in items)
+        summary[command] = {
+            "calls": len(items),
+            "failures": sum(1 for r in items if not r.get("success")),
+            "retries": sum(r.get("retries", 0) for r in items),
+            "p50_seconds": percentile(latencies, 50),
+            "p95_seconds": percentile(latencies, 95),
+            "total_cost_usd": total_cost,
+            "avg_cost_usd": total_cost / len(items),
+            "input_tokens": sum(r.get("input_tokens", 0) for r in items),
+            "output_tokens": sum(r.get("output_tokens", 0) for r in items),
+        }
+    return summary
@@ -0,0 +1,377 @@
+"""Durable background outbox for issue comments.
+
+With ADW_COMMENT_OUTBOX=true, make_issue_comment appends the comment to
+agents/comment_outbox.db and returns at once; a background thread posts
+queued comments so workflows no longer wait on GitHub round-trips.
+
+- Comments of one issue are posted in the order they were queued.
+- A burst of comments from the same "<adw_id>_<agent>" tag is coalesced:
+  messages queued together are posted as one comment, and messages that
+  follow the issue's last ADW comment within the coalescing window are
+  appended to it by editing it instead of adding a new one.
+- Writes are spaced host-wide (GitHub's secondary rate limits ask for at
+  least a second between content-creating requests) and all writers pause
+  when GitHub reports a rate limit.
+- Comments still queued when a process exits are flushed for up to
+  ADW_COMMENT_DRAIN_TIMEOUT seconds; anything left stays in the database
+  and is posted by the next process that runs the outbox.
+
+Configure via:
+- ADW_COMMENT_OUTBOX: set to "true" to enable (default: disabled)
+- ADW_COMMENT_COALESCE_WINDOW: seconds a comment keeps absorbing follow-ups (default: 30)
+- ADW_COMMENT_MIN_INTERVAL: minimum seconds between comment writes (default: 1)
+- ADW_COMMENT_DRAIN_TIMEOUT: seconds to keep flushing at exit (default: 30)
+"""
+
+import atexit
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterator, List, Optional, Set
+
+from .github import ADW_BOT_IDENTIFIER, edit_issue_comment, post_issue_comment
+from .github_api import is_rate_limited
+
+# __file__ is in adws/adw_modules/, so we need to go up 3 levels to get to project root
+PROJECT_ROOT = os.path.dirname(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+)
+OUTBOX_DB_PATH = os.path.join(PROJECT_ROOT, "agents", "comment_outbox.db")
+
+COALESCE_WINDOW_SECONDS = float(os.getenv("ADW_COMMENT_COALESCE_WINDOW", "30"))
+MIN_WRITE_INTERVAL_SECONDS = float(os.getenv("ADW_COMMENT_MIN_INTERVAL", "1"))
+DRAIN_TIMEOUT_SECONDS = float(os.getenv("ADW_COMMENT_DRAIN_TIMEOUT", "30"))
+RATE_LIMIT_BACKOFF_SECONDS = 60.0  # Used when GitHub sends no Retry-After
+MAX_ATTEMPTS = 8
+CLAIM_LEASE_SECONDS = 120.0
+WORKER_POLL_SECONDS = 1.0
+MAX_COMMENT_LENGTH = 60000  # GitHub rejects bodies over 65536 characters
+
+# "[ADW-AGENTS] <adw_id>_<agent_name>[_<session_id>]: message"
+_TAG_PATTERN = re.compile(rf"^{re.escape(ADW_BOT_IDENTIFIER)} (\S+?): ")
+
+logger = logging.getLogger(__name__)
+
+
+def get_coalesce_key(comment: str) -> Optional[str]:
+    """Return the comment's ADW tag, or None if it should never be coalesced."""
+    match = _TAG_PATTERN.match(comment)
+    return match.group(1) if match else None
+
+
+class CommentOutbox:
+    """Queue of issue comments in SQLite, flushed by a background thread."""
+
+    def __init__(
+        self,
+        db_path: str = OUTBOX_DB_PATH,
+        coalesce_window: float = COALESCE_WINDOW_SECONDS,
+        min_interval: float = MIN_WRITE_INTERVAL_SECONDS,
+        rate_limit_backoff: float = RATE_LIMIT_BACKOFF_SECONDS,
+        background: bool = True,
+    ):
+        self.db_path = db_path
+        self.coalesce_window = coalesce_window
+        self.min_interval = min_interval
+        self.rate_limit_backoff = rate_limit_backoff
+        self.background = background
+        self._enqueued: Set[int] = set()
+        self._wake = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._thread_lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS outbox (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    repo_path TEXT NOT NULL,
+                    issue_id TEXT NOT NULL,
+                    coalesce_key TEXT,
+                    body TEXT NOT NULL,
+                    status TEXT NOT NULL DEFAULT 'pending',
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    next_attempt_at REAL NOT NULL,
+                    claimed_until REAL NOT NULL DEFAULT 0,
+                    comment_id TEXT,
+                    created_at REAL NOT NULL,
+                    sent_at REAL
+                );
+                CREATE INDEX IF NOT EXISTS idx_outbox_status
+                    ON outbox (status, id);
+                CREATE TABLE IF NOT EXISTS last_comment (
+                    repo_path TEXT NOT NULL,
+                    issue_id TEXT NOT NULL,
+                    coalesce_key TEXT,
+                    comment_id TEXT,
+                    body TEXT NOT NULL,
+                    updated_at REAL NOT NULL,
+                    PRIMARY KEY (repo_path, issue_id)
+                );
+                CREATE TABLE IF NOT EXISTS throttle (
+                    id INTEGER PRIMARY KEY CHECK (id = 1),
+                    next_write_at REAL NOT NULL
+                );
+                INSERT OR IGNORE INTO throttle VALUES (1, 0);
+                """
+            )
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Open a connection in autocommit mode; transactions are explicit."""
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    def enqueue(self, repo_path: str, issue_id: str, comment: str) -> int:
+        """Queue a comment for posting and return its outbox ID."""
+        now = time.time()
+        with self._connect() as conn:
+            entry_id = conn.execute(
+                "INSERT INTO outbox (repo_path, issue_id, coalesce_key, body, "
+                "next_attempt_at, created_at) VALUES (?, ?, ?, ?, ?, ?)",
+                (repo_path, str(issue_id), get_coalesce_key(comment), comment, now, now),
+            ).lastrowid
+        self._enqueued.add(entry_id)
+        print(f"Queued comment for issue #{issue_id}")
+        if self.background:
+            self.start()
+            self._wake.set()
+        return entry_id
+
+    def _claim(self) -> List[sqlite3.Row]:
+        """Claim the pending comments of the issue whose oldest one is due.
+
+        Issues with comments claimed by another worker are skipped, so each
+        issue's comments are posted by one worker, in order.
+        """
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                rows = conn.execute(
+                    "SELECT * FROM outbox WHERE status = 'pending' ORDER BY id"
+                ).fetchall()
+                busy = set()
+                claimed: List[sqlite3.Row] = []
+                for row in rows:
+                    issue = (row["repo_path"], row["issue_id"])
+                    if claimed:
+                        if issue == (claimed[0]["repo_path"], claimed[0]["issue_id"]):
+                            claimed.append(row)
+                        continue
+                    if issue in busy:
+                        continue
+                    if row["claimed_until"] > now or row["next_attempt_at"] > now:
+                        busy.add(issue)
+                        continue
+                    claimed.append(row)
+
+                if claimed:
+                    conn.executemany(
+                        "UPDATE outbox SET claimed_until = ? WHERE id = ?",
+                        [(now + CLAIM_LEASE_SECONDS, row["id"]) for row in claimed],
+                    )
+                conn.execute("COMMIT")
+                return claimed
+            except Exception:
+                if conn.in_transaction:
+                    conn.execute("ROLLBACK")
+                raise
+
+    def _wait_for_write_slot(self) -> None:
+        """Block until this process may write, reserving the next slot."""
+        while True:
+            with self._connect() as conn:
+                conn.execute("BEGIN IMMEDIATE")
+                now = time.time()
+                next_write_at = conn.execute(
+                    "SELECT next_write_at FROM throttle WHERE id = 1"
+                ).fetchone()[0]
+                if now >= next_write_at:
+                    conn.execute(
+                        "UPDATE throttle SET next_write_at = ? WHERE id = 1",
+                        (now + self.min_interval,),
+                    )
+                conn.execute("COMMIT")
+            if now >= next_write_at:
+                return
+            time.sleep(min(next_write_at - now, WORKER_POLL_SECONDS))
+
+    def _pause_writes(self, seconds: float) -> None:
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE throttle SET next_write_at = MAX(next_write_at, ?) WHERE id = 1",
+                (time.time() + seconds,),
+            )
+
+    def _write(self, group: List[sqlite3.Row]) -> None:
+        """Post one group of same-tag comments, editing the last comment if possible."""
+        first = group[0]
+        repo_path, issue_id, key = first["repo_path"], first["issue_id"], first["coalesce_key"]
+        text = "\n\n".join(row["body"] for row in group)
+
+        with self._connect() as conn:
+            last = conn.execute(
+                "SELECT * FROM last_comment WHERE repo_path = ? AND issue_id = ?",
+                (repo_path, issue_id),
+            ).fetchone()
+
+        self._wait_for_write_slot()
+        if (
+            key is not None
+            and last is not None
+            and last["coalesce_key"] == key
+            and last["comment_id"]
+            and time.time() - last["updated_at"] <= self.coalesce_window
+            and len(last["body"]) + len(text) + 2 <= MAX_COMMENT_LENGTH
+        ):
+            comment_id = last["comment_id"]
+            body = f"{last['body']}\n\n{text}"
+            edit_issue_comment(repo_path, comment_id, body)
+        else:
+            body = text
+            comment_id = post_issue_comment(repo_path, issue_id, body)
+
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.executemany(
+                "UPDATE outbox SET status = 'sent', comment_id = ?, sent_at = ?, "
+                "claimed_until = 0 WHERE id = ?",
+                [(comment_id, now, row["id"]) for row in group],
+            )
+            conn.execute(
+                "INSERT OR REPLACE INTO last_comment VALUES (?, ?, ?, ?, ?, ?)",
+                (repo_path, issue_id, key, comment_id, body, now),
+            )
+            conn.execute(
+                "DELETE FROM outbox WHERE status = 'sent' AND sent_at < ?",
+                (now - 86400,),
+            )
+            conn.execute("COMMIT")
+
+    def _release(self, rows: List[sqlite3.Row]) -> None:
+        with self._connect() as conn:
+            conn.executemany(
+                "UPDATE outbox SET claimed_until = 0 WHERE id = ?",
+                [(row["id"],) for row in rows],
+            )
+
+    def _record_failure(self, group: List[sqlite3.Row], error: Exception) -> None:
+        attempts = group[0]["attempts"] + 1
+        status = "failed" if attempts >= MAX_ATTEMPTS else "pending"
+        logger.warning(
+            f"Failed to post comment to issue #{group[0]['issue_id']} "
+            f"(attempt {attempts}/{MAX_ATTEMPTS}): {error}"
+        )
+        with self._connect() as conn:
+            conn.executemany(
+                "UPDATE outbox SET attempts = ?, status = ?, next_attempt_at = ?, "
+                "claimed_until = 0 WHERE id = ?",
+                [
+                    (attempts, status, time.time() + min(2**attempts, 300), row["id"])
+                    for row in group
+                ],
+            )
+
+    def flush_once(self) -> int:
+        """Post the pending comments of one issue.
+
+        Returns:
+            The number of outbox entries claimed (0 if nothing was due)
+        """
+        rows = self._claim()
+        remaining = list(rows)
+        while remaining:
+            # Consecutive comments with the same tag are written together
+            group = [remaining[0]]
+            size = len(group[0]["body"])
+            for row in remaining[1:]:
+                size += len(row["body"]) + 2
+                if (
+                    group[0]["coalesce_key"] is None
+                    or row["coalesce_key"] != group[0]["coalesce_key"]
+                    or row["attempts"] != group[0]["attempts"]
+                    or size > MAX_COMMENT_LENGTH
+                ):
+                    break
+                group.append(row)
+
+            try:
+                self._write(group)
+            except Exception as e:
+                if is_rate_limited(e):
+                    self._pause_writes(
+                        getattr(e, "retry_after", None) or self.rate_limit_backoff
+                    )
+                    self._release(remaining)
+                else:
+                    self._record_failure(group, e)
+                    self._release(remaining[len(group) :])
+                break
+            remaining = remaining[len(group) :]
+        return len(rows)
+
+    def pending_ids(self) -> Set[int]:
+        """Return the IDs of every comment not yet posted or abandoned."""
+        with self._connect() as conn:
+            rows = conn.execute("SELECT id FROM outbox WHERE status = 'pending'")
+            return {row["id"] for row in rows}
+
+    def drain(self, timeout: float = DRAIN_TIMEOUT_SECONDS) -> bool:
+        """Flush until this process's comments are posted or timeout expires.
+
+        Returns:
+            True if nothing queued by this process is still pending
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            if not self._enqueued & self.pending_ids():
+                return True
+            if time.monotonic() >= deadline:
+                logger.warning("Comment outbox not drained; pending comments stay queued")
+                return False
+            if not self.flush_once():
+                time.sleep(0.1)
+
+    def _run(self) -> None:
+        while True:
+            try:
+                flushed = self.flush_once()
+            except Exception as e:
+                logger.warning(f"Comment outbox worker error: {e}")
+                flushed = 0
+            if not flushed:
+                self._wake.wait(WORKER_POLL_SECONDS)
+                self._wake.clear()
+
+    def start(self) -> None:
+        """Start the background worker and flush on exit (idempotent)."""
+        with self._thread_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="comment-outbox", daemon=True
+                )
+                self._thread.start()
+                atexit.register(self.drain)
+
+
+_outbox: Optional[CommentOutbox] = None
+
+
+def get_comment_outbox() -> CommentOutbox:
+    """Return the process-wide outbox for OUTBOX_DB_PATH."""
+    global _outbox
+    if _outbox is None or _outbox.db_path != OUTBOX_DB_PATH:
+        _outbox = CommentOutbox(OUTBOX_DB_PATH)
+    return _outbox
@@ -1,7 +1,7 @@
 """Data types for GitHub API responses and Claude Code agent."""
 
 from datetime import datetime
-from typing import Optional, List, Literal
+from typing import Any, Dict, Optional, List, Literal
 from pydantic import BaseModel, Field
 from enum import Enum
 
@@ -14,6 +14,7 @@ class RetryCode(str, Enum):
     TIMEOUT_ERROR = "timeout_error"  # Command timed out
     EXECUTION_ERROR = "execution_error"  # Error during execution
     ERROR_DURING_EXECUTION = "error_during_execution"  # Agent encountered an error
+    RATE_LIMIT_ERROR = "rate_limit_error"  # API rate limited or overloaded
     NONE = "none"  # No retry needed
 
 
@@ -123,6 +124,13 @@ class GitHubIssueListItem(BaseModel):
         populate_by_name = True
 
 
+class GitHubIssueSummary(GitHubIssueListItem):
+    """Open issue with only its latest comment, as returned by the batched poll."""
+
+    comment_count: int = Field(0, alias="commentCount")
+    last_comment: Optional[GitHubComment] = Field(None, alias="lastComment")
+
+
 class GitHubIssue(BaseModel):
     """GitHub issue model."""
 
@@ -154,6 +162,21 @@ class AgentPromptRequest(BaseModel):
     dangerously_skip_permissions: bool = False
     output_file: str
     working_dir: Optional[str] = None
+    timeout_seconds: Optional[int] = None  # Wall-clock budget; defaults per slash command
+    idle_timeout_seconds: Optional[int] = None  # Max seconds without new output
+
+
+class AgentUsage(BaseModel):
+    """Token usage and cost reported in a Claude Code result message."""
+
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cache_creation_input_tokens: int = 0
+    cache_read_input_tokens: int = 0
+    total_cost_usd: float = 0.0
+    duration_ms: int = 0
+    duration_api_ms: int = 0
+    num_turns: int = 0
 
 
 class AgentPromptResponse(BaseModel):
@@ -163,6 +186,9 @@ class AgentPromptResponse(BaseModel):
     success: bool
     session_id: Optional[str] = None
     retry_code: RetryCode = RetryCode.NONE
+    retry_after: Optional[float] = None  # Seconds the API asked us to wait, if any
+    usage: Optional[AgentUsage] = None  # None when the agent produced no result message
+    wall_time_seconds: Optional[float] = None  # Latency of the attempt, including queueing
 
 
 class AgentTemplateRequest(BaseModel):
@@ -232,6 +258,7 @@ class ADWStateData(BaseModel):
     frontend_port: Optional[int] = None
     model_set: Optional[ModelSet] = "base"  # Default to "base" model set
     all_adws: List[str] = Field(default_factory=list)
+    version: int = 0  # Incremented on every save, used for compare-and-swap updates
 
 
 class ReviewIssue(BaseModel):
@@ -283,3 +310,43 @@ class ADWExtractionResult(BaseModel):
     def has_workflow(self) -> bool:
         """Check if a workflow command was extracted."""
         return self.workflow_command is not None
+
+
+class WorkflowJob(BaseModel):
+    """A workflow run launched in the background by a trigger's worker pool."""
+
+    job_id: str
+    issue_number: int
+    cmd: List[str]
+    adw_id: Optional[str] = None
+    workflow: Optional[str] = None  # e.g. "adw_plan_build_iso"
+    repo_path: Optional[str] = None  # owner/repo the issue belongs to
+    delivery_queue_id: Optional[int] = None  # Webhook delivery that launched it
+    priority: int  # Lower runs first
+    status: Literal["queued", "running", "succeeded", "failed", "cancelled"] = "queued"
+    submitted_at: float
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    returncode: Optional[int] = None
+    pid: Optional[int] = None
+    log_file: Optional[str] = None
+
+
+class CheckResult(BaseModel):
+    """Individual check result."""
+
+    success: bool
+    error: Optional[str] = None
+    warning: Optional[str] = None
+    details: Dict[str, Any] = {}
+
+
+class HealthCheckResult(BaseModel):
+    """Structure for health check results."""
+
+    success: bool
+    timestamp: str
+    checks: Dict[str, CheckResult]
+    warnings: List[str] = []
+    errors: List[str] = []
+    duration_seconds: Optional[float] = None  # How long the checks took
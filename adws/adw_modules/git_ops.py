@@ -9,7 +9,18 @@ import logging
 from typing import Optional, Tuple
 
 # Import GitHub functions from existing module
-from adw_modules.github import get_repo_url, extract_repo_path, make_issue_comment
+from adw_modules.github import (
+    get_repo_url,
+    extract_repo_path,
+    make_issue_comment,
+    warn_api_fallback,
+)
+from adw_modules.github_api import (
+    GitHubAPIError,
+    get_github_client,
+    use_http_backend,
+    write_not_applied,
+)
 
 
 def get_current_branch(cwd: Optional[str] = None) -> str:
@@ -23,6 +34,19 @@ def get_current_branch(cwd: Optional[str] = None) -> str:
     return result.stdout.strip()
 
 
+def get_head_commit(cwd: Optional[str] = None) -> Optional[str]:
+    """Get the commit SHA of HEAD, or None if cwd is not a git checkout."""
+    result = subprocess.run(
+        ["git", "rev-parse", "HEAD"],
+        capture_output=True,
+        text=True,
+        cwd=cwd,
+    )
+    if result.returncode != 0:
+        return None
+    return result.stdout.strip()
+
+
 def push_branch(
     branch_name: str, cwd: Optional[str] = None
 ) -> Tuple[bool, Optional[str]]:
@@ -47,6 +71,13 @@ def check_pr_exists(branch_name: str) -> Optional[str]:
     except Exception as e:
         return None
 
+    if use_http_backend():
+        try:
+            prs = get_github_client().find_pull_requests(repo_path, branch_name)
+            return prs[0]["url"] if prs else None
+        except GitHubAPIError as e:
+            warn_api_fallback(e)
+
     result = subprocess.run(
         [
             "gh",
@@ -130,6 +161,13 @@ def get_pr_number(branch_name: str) -> Optional[str]:
     except Exception as e:
         return None
 
+    if use_http_backend():
+        try:
+            prs = get_github_client().find_pull_requests(repo_path, branch_name)
+            return str(prs[0]["number"]) if prs else None
+        except GitHubAPIError as e:
+            warn_api_fallback(e)
+
     result = subprocess.run(
         [
             "gh",
@@ -162,23 +200,36 @@ def approve_pr(pr_number: str, logger: logging.Logger) -> Tuple[bool, Optional[s
     except Exception as e:
         return False, f"Failed to get repo info: {e}"
 
-    result = subprocess.run(
-        [
-            "gh",
-            "pr",
-            "review",
-            pr_number,
-            "--repo",
-            repo_path,
-            "--approve",
-            "--body",
-            "ADW Ship workflow approved this PR after validating all state fields.",
-        ],
-        capture_output=True,
-        text=True,
-    )
-    if result.returncode != 0:
-        return False, result.stderr
+    body = "ADW Ship workflow approved this PR after validating all state fields."
+    approved = False
+    if use_http_backend():
+        try:
+            get_github_client().approve_pull_request(repo_path, pr_number, body)
+            approved = True
+        except GitHubAPIError as e:
+            # Approving again through gh could submit a second review
+            if not write_not_applied(e):
+                return False, str(e)
+            warn_api_fallback(e)
+
+    if not approved:
+        result = subprocess.run(
+            [
+                "gh",
+                "pr",
+                "review",
+                pr_number,
+                "--repo",
+                repo_path,
+                "--approve",
+                "--body",
+                body,
+            ],
+            capture_output=True,
+            text=True,
+        )
+        if result.returncode != 0:
+            return False, result.stderr
 
     logger.info(f"Approved PR #{pr_number}")
     return True, None
@@ -200,6 +251,28 @@ def merge_pr(
     except Exception as e:
         return False, f"Failed to get repo info: {e}"
 
+    merge_body = "Merged by ADW Ship workflow after successful validation."
+    if use_http_backend():
+        merging = False
+        try:
+            client = get_github_client()
+            pr_status = client.get_merge_status(repo_path, pr_number)
+            if pr_status["mergeable"] != "MERGEABLE":
+                return (
+                    False,
+                    f"PR is not mergeable. Status: {pr_status['mergeStateStatus']}",
+                )
+            merging = True
+            client.merge_pull_request(repo_path, pr_number, merge_method, merge_body)
+            logger.info(f"Merged PR #{pr_number} using {merge_method} method")
+            return True, None
+        except GitHubAPIError as e:
+            # The merge may have gone through; only a failed status check
+            # or a merge that never reached GitHub is redone with gh
+            if merging and not write_not_applied(e):
+                return False, str(e)
+            warn_api_fallback(e)
+
     # First check if PR is mergeable
     result = subprocess.run(
         [
@@ -237,9 +310,7 @@ def merge_pr(
     ]
 
     # Add auto-merge body
-    merge_cmd.extend(
-        ["--body", "Merged by ADW Ship workflow after successful validation."]
-    )
+    merge_cmd.extend(["--body", merge_body])
 
     result = subprocess.run(merge_cmd, capture_output=True, text=True)
     if result.returncode != 0:
@@ -17,12 +17,24 @@ import subprocess
 import sys
 import os
 import json
-from typing import Dict, List, Optional
-from .data_types import GitHubIssue, GitHubIssueListItem, GitHubComment
+import re
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+from .data_types import GitHubIssue, GitHubIssueListItem, GitHubIssueSummary, GitHubComment
+from .github_api import (
+    GitHubAPIError,
+    get_github_client,
+    paginate_open_issues,
+    use_http_backend,
+    write_not_applied,
+)
 
 # Bot identifier to prevent webhook loops and filter bot comments
 ADW_BOT_IDENTIFIER = "[ADW-AGENTS]"
 
+# Queue issue comments and post them from a background worker
+COMMENT_OUTBOX_ENABLED = os.getenv("ADW_COMMENT_OUTBOX", "false").lower() == "true"
+
 
 def get_github_env() -> Optional[dict]:
     """Get environment with GitHub token set up. Returns None if no GITHUB_PAT or GH_TOKEN.
@@ -51,8 +63,68 @@ def get_github_env() -> Optional[dict]:
     return env
 
 
+# Origin URL per (git common dir, config signature); see get_repo_url
+_repo_url_cache: Dict[Tuple[str, Tuple[int, int]], str] = {}
+
+# https://host/owner/repo, git@host:owner/repo and ssh://git@host[:port]/owner/repo
+_REPO_PATH_PATTERN = re.compile(
+    r"^(?:[a-z+]+://)?(?:[^@/]+@)?[^/:]+(?::\d+)?[:/]"
+    r"(?P<path>[^/:]+/[^/]+?)(?:\.git)?/?$"
+)
+
+
+def find_git_config(start_dir: Optional[str] = None) -> Optional[str]:
+    """Return the config file of the repository containing start_dir.
+
+    Follows `.git` files of linked worktrees to the main repository's
+    config, where the remotes live. Returns None outside a repository.
+    """
+    directory = os.path.abspath(start_dir or os.getcwd())
+    while True:
+        dot_git = os.path.join(directory, ".git")
+        if os.path.isdir(dot_git):
+            return os.path.join(dot_git, "config")
+        if os.path.isfile(dot_git):
+            try:
+                with open(dot_git, "r") as f:
+                    git_dir = f.read().strip().split("gitdir:", 1)[1].strip()
+                git_dir = os.path.join(directory, git_dir)
+                commondir_file = os.path.join(git_dir, "commondir")
+                if os.path.isfile(commondir_file):
+                    with open(commondir_file, "r") as f:
+                        git_dir = os.path.join(git_dir, f.read().strip())
+                return os.path.join(os.path.realpath(git_dir), "config")
+            except (OSError, IndexError):
+                return None
+        parent = os.path.dirname(directory)
+        if parent == directory:
+            return None
+        directory = parent
+
+
+def clear_repo_cache() -> None:
+    """Forget cached repository URLs and paths."""
+    _repo_url_cache.clear()
+    extract_repo_path.cache_clear()
+
+
 def get_repo_url() -> str:
-    """Get GitHub repository URL from git remote."""
+    """Get GitHub repository URL from git remote.
+
+    The URL is resolved once per repository and cached until the
+    repository's config file changes (e.g. `git remote set-url`).
+    """
+    cache_key = None
+    config_path = find_git_config()
+    if config_path:
+        try:
+            stat = os.stat(config_path)
+            cache_key = (config_path, (stat.st_mtime_ns, stat.st_size))
+        except OSError:
+            pass
+        if cache_key in _repo_url_cache:
+            return _repo_url_cache[cache_key]
+
     try:
         result = subprocess.run(
             ["git", "remote", "get-url", "origin"],
@@ -60,7 +132,6 @@ def get_repo_url() -> str:
             text=True,
             check=True,
         )
-        return result.stdout.strip()
     except subprocess.CalledProcessError:
         raise ValueError(
             "No git remote 'origin' found. Please ensure you're in a git repository with a remote."
@@ -68,15 +139,36 @@ def get_repo_url() -> str:
     except FileNotFoundError:
         raise ValueError("git command not found. Please ensure git is installed.")
 
+    repo_url = result.stdout.strip()
+    if cache_key:
+        _repo_url_cache[cache_key] = repo_url
+    return repo_url
+
 
+@lru_cache(maxsize=32)
 def extract_repo_path(github_url: str) -> str:
-    """Extract owner/repo from GitHub URL."""
-    # Handle both https://github.com/owner/repo and https://github.com/owner/repo.git
+    """Extract owner/repo from a GitHub HTTPS or SSH URL."""
+    # Handles https://github.com/owner/repo(.git), git@github.com:owner/repo(.git)
+    # and ssh://git@github.com/owner/repo(.git)
+    match = _REPO_PATH_PATTERN.match(github_url.strip())
+    if match:
+        return match.group("path")
     return github_url.replace("https://github.com/", "").replace(".git", "")
 
 
+def warn_api_fallback(error: GitHubAPIError) -> None:
+    """Report a failed HTTP backend call that is being retried with gh."""
+    print(f"GitHub API request failed, falling back to gh: {error}", file=sys.stderr)
+
+
 def fetch_issue(issue_number: str, repo_path: str) -> GitHubIssue:
     """Fetch GitHub issue using gh CLI and return typed model."""
+    if use_http_backend():
+        try:
+            return GitHubIssue(**get_github_client().get_issue(repo_path, issue_number))
+        except GitHubAPIError as e:
+            warn_api_fallback(e)
+
     # Use JSON output for structured data
     cmd = [
         "gh",
@@ -122,15 +214,20 @@ def fetch_issue(issue_number: str, repo_path: str) -> GitHubIssue:
         sys.exit(1)
 
 
-def make_issue_comment(issue_id: str, comment: str) -> None:
-    """Post a comment to a GitHub issue using gh CLI."""
-    # Get repo information from git remote
-    github_repo_url = get_repo_url()
-    repo_path = extract_repo_path(github_repo_url)
+def post_issue_comment(repo_path: str, issue_id: str, comment: str) -> Optional[str]:
+    """Post a comment to a GitHub issue and return the new comment's ID.
 
-    # Ensure comment has ADW_BOT_IDENTIFIER to prevent webhook loops
-    if not comment.startswith(ADW_BOT_IDENTIFIER):
-        comment = f"{ADW_BOT_IDENTIFIER} {comment}"
+    The ID is None when gh does not report the comment URL.
+    """
+    if use_http_backend():
+        try:
+            created = get_github_client().create_comment(repo_path, issue_id, comment)
+            return str(created["id"])
+        except GitHubAPIError as e:
+            # Posting again through gh could duplicate the comment
+            if not write_not_applied(e):
+                raise
+            warn_api_fallback(e)
 
     # Build command
     cmd = [
@@ -147,14 +244,64 @@ def make_issue_comment(issue_id: str, comment: str) -> None:
     # Set up environment with GitHub token if available
     env = get_github_env()
 
-    try:
-        result = subprocess.run(cmd, capture_output=True, text=True, env=env)
+    result = subprocess.run(cmd, capture_output=True, text=True, env=env)
+    if result.returncode != 0:
+        raise RuntimeError(f"Failed to post comment: {result.stderr}")
 
-        if result.returncode == 0:
-            print(f"Successfully posted comment to issue #{issue_id}")
-        else:
-            print(f"Error posting comment: {result.stderr}", file=sys.stderr)
-            raise RuntimeError(f"Failed to post comment: {result.stderr}")
+    # gh prints the new comment's URL: .../issues/<n>#issuecomment-<id>
+    match = re.search(r"#issuecomment-(\d+)", result.stdout)
+    return match.group(1) if match else None
+
+
+def edit_issue_comment(repo_path: str, comment_id: str, comment: str) -> None:
+    """Replace the body of an existing issue comment."""
+    if use_http_backend():
+        try:
+            get_github_client().update_comment(repo_path, comment_id, comment)
+            return
+        except GitHubAPIError as e:
+            if not write_not_applied(e):
+                raise
+            warn_api_fallback(e)
+
+    cmd = [
+        "gh",
+        "api",
+        "--method",
+        "PATCH",
+        f"repos/{repo_path}/issues/comments/{comment_id}",
+        "-f",
+        f"body={comment}",
+    ]
+    result = subprocess.run(cmd, capture_output=True, text=True, env=get_github_env())
+    if result.returncode != 0:
+        raise RuntimeError(f"Failed to edit comment {comment_id}: {result.stderr}")
+
+
+def make_issue_comment(issue_id: str, comment: str) -> None:
+    """Post a comment to a GitHub issue.
+
+    With ADW_COMMENT_OUTBOX=true the comment is queued and posted in the
+    background (see comment_outbox.py) instead of blocking the caller.
+    """
+    # Get repo information from git remote
+    github_repo_url = get_repo_url()
+    repo_path = extract_repo_path(github_repo_url)
+
+    # Ensure comment has ADW_BOT_IDENTIFIER to prevent webhook loops
+    if not comment.startswith(ADW_BOT_IDENTIFIER):
+        comment = f"{ADW_BOT_IDENTIFIER} {comment}"
+
+    if COMMENT_OUTBOX_ENABLED:
+        # Imported here: comment_outbox posts through this module
+        from .comment_outbox import get_comment_outbox
+
+        get_comment_outbox().enqueue(repo_path, issue_id, comment)
+        return
+
+    try:
+        post_issue_comment(repo_path, issue_id, comment)
+        print(f"Successfully posted comment to issue #{issue_id}")
     except Exception as e:
         print(f"Error posting comment: {e}", file=sys.stderr)
         raise
@@ -166,6 +313,25 @@ def mark_issue_in_progress(issue_id: str) -> None:
     github_repo_url = get_repo_url()
     repo_path = extract_repo_path(github_repo_url)
 
+    if use_http_backend():
+        try:
+            client = get_github_client()
+            try:
+                client.add_labels(repo_path, issue_id, ["in_progress"])
+            except GitHubAPIError as e:
+                if e.status is None:
+                    raise
+                print(f"Note: Could not add 'in_progress' label: {e}")
+            client.add_assignees(repo_path, issue_id, ["@me"])
+            print(f"Assigned issue #{issue_id} to self")
+            return
+        except GitHubAPIError as e:
+            if not write_not_applied(e):
+                # Like gh's failures here, not fatal to the workflow
+                print(f"Note: Could not mark issue #{issue_id} in progress: {e}")
+                return
+            warn_api_fallback(e)
+
     # Add "in_progress" label
     cmd = [
         "gh",
@@ -207,6 +373,15 @@ def mark_issue_in_progress(issue_id: str) -> None:
 
 def fetch_open_issues(repo_path: str) -> List[GitHubIssueListItem]:
     """Fetch all open issues from the GitHub repository."""
+    if use_http_backend():
+        try:
+            issues_data = get_github_client().list_open_issues(repo_path)
+            issues = [GitHubIssueListItem(**issue_data) for issue_data in issues_data]
+            print(f"Fetched {len(issues)} open issues")
+            return issues
+        except GitHubAPIError as e:
+            warn_api_fallback(e)
+
     try:
         cmd = [
             "gh",
@@ -243,8 +418,63 @@ def fetch_open_issues(repo_path: str) -> List[GitHubIssueListItem]:
         return []
 
 
+def run_graphql_query(query: str, variables: Dict) -> Dict:
+    """Run a GraphQL query with `gh api graphql` and return its data."""
+    cmd = ["gh", "api", "graphql", "-f", f"query={query}"]
+    for name, value in variables.items():
+        if value is not None:
+            cmd.extend(["-f", f"{name}={value}"])
+    result = subprocess.run(
+        cmd, capture_output=True, text=True, check=True, env=get_github_env()
+    )
+    response = json.loads(result.stdout)
+    if response.get("errors"):
+        raise RuntimeError(f"GraphQL query failed: {response['errors']}")
+    return response["data"]
+
+
+def fetch_open_issue_summaries(repo_path: str) -> List[GitHubIssueSummary]:
+    """Fetch all open issues, each with only its latest comment.
+
+    One GraphQL request returns 100 issues, so polling a repository costs a
+    few requests instead of one comment fetch per issue.
+    """
+    issues_data = None
+    if use_http_backend():
+        try:
+            issues_data = get_github_client().list_open_issue_summaries(repo_path)
+        except GitHubAPIError as e:
+            warn_api_fallback(e)
+
+    if issues_data is None:
+        try:
+            issues_data = paginate_open_issues(repo_path, run_graphql_query)
+        except subprocess.CalledProcessError as e:
+            print(f"ERROR: Failed to fetch issues: {e.stderr}", file=sys.stderr)
+            return []
+        except (RuntimeError, json.JSONDecodeError) as e:
+            print(f"ERROR: Failed to parse issues: {e}", file=sys.stderr)
+            return []
+
+    issues = [GitHubIssueSummary(**issue_data) for issue_data in issues_data]
+    print(f"Fetched {len(issues)} open issues")
+    return issues
+
+
 def fetch_issue_comments(repo_path: str, issue_number: int) -> List[Dict]:
     """Fetch all comments for a specific issue."""
+    if use_http_backend():
+        try:
+            # Through get_issue, so the issue's comment count is checked and
+            # deleted comments are not served from the incremental cache
+            comments = get_github_client().get_issue(repo_path, str(issue_number))[
+                "comments"
+            ]
+            comments.sort(key=lambda c: c.get("createdAt", ""))
+            return comments
+        except GitHubAPIError as e:
+            warn_api_fallback(e)
+
     try:
         cmd = [
             "gh",
@@ -0,0 +1,479 @@
+"""HTTP backend for GitHub operations.
+
+Every gh invocation is a fresh process with its own TLS handshake. With
+ADW_GITHUB_BACKEND=http, the issue and pull request helpers in github.py
+and git_ops.py call the REST API directly through one pooled keep-alive
+requests session per process instead. Responses are converted to the same
+JSON shape `gh ... --json` prints, so callers and the data_types models
+do not change. A failed read falls back to gh. A failed write falls back
+only when it certainly did not take effect (see write_not_applied), so
+a timed-out comment, approval or merge is never sent twice.
+
+Configure via:
+- ADW_GITHUB_BACKEND: "gh" (default) or "http"
+- ADW_GITHUB_API_URL: REST API base URL (default: https://api.github.com)
+- GITHUB_PAT / GH_TOKEN: token sent as a bearer token
+
+GET responses and issue comments are cached on disk and revalidated with
+conditional requests (see github_cache.py).
+"""
+
+import json
+import os
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+try:
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.exceptions import NewConnectionError
+    from urllib3.util.retry import Retry
+except ImportError:  # requests is optional; gh is used without it
+    requests = None
+
+from .github_cache import get_github_cache
+
+GITHUB_BACKEND = os.getenv("ADW_GITHUB_BACKEND", "gh").lower()
+GITHUB_API_URL = os.getenv("ADW_GITHUB_API_URL", "https://api.github.com")
+GITHUB_API_TIMEOUT_SECONDS = float(os.getenv("ADW_GITHUB_API_TIMEOUT", "30"))
+GITHUB_API_POOL_SIZE = 10
+
+
+# One page of open issues, each with only its latest comment
+OPEN_ISSUES_QUERY = """
+query($owner: String!, $name: String!, $cursor: String) {
+  repository(owner: $owner, name: $name) {
+    issues(states: OPEN, first: 100, after: $cursor,
+           orderBy: {field: CREATED_AT, direction: DESC}) {
+      pageInfo { hasNextPage endCursor }
+      nodes {
+        number
+        title
+        body
+        createdAt
+        updatedAt
+        labels(first: 20) { nodes { id name color description } }
+        comments(last: 1) {
+          totalCount
+          nodes { id body createdAt author { login } }
+        }
+      }
+    }
+  }
+}
+"""
+
+
+class GitHubAPIError(RuntimeError):
+    """A GitHub REST call failed; status is None for transport errors."""
+
+    def __init__(
+        self,
+        message: str,
+        status: Optional[int] = None,
+        retry_after: Optional[float] = None,
+        sent: bool = True,
+    ):
+        super().__init__(message)
+        self.status = status
+        self.retry_after = retry_after  # Seconds GitHub asked us to wait, if any
+        self.sent = sent  # False if the request never reached GitHub
+
+
+def is_rate_limited(error: Exception) -> bool:
+    """Whether a failed call hit a GitHub primary or secondary rate limit."""
+    if isinstance(error, GitHubAPIError) and error.status == 429:
+        return True
+    return "rate limit" in str(error).lower()
+
+
+def write_not_applied(error: Exception) -> bool:
+    """Whether a failed write certainly had no effect, so gh may redo it.
+
+    True when the request never reached GitHub (no connection could be
+    made, or no HTTP client) or GitHub rejected its credentials. Timeouts
+    and server errors may have been applied, and rate limits must be
+    waited out rather than retried through gh.
+    """
+    if not isinstance(error, GitHubAPIError) or is_rate_limited(error):
+        return False
+    return not error.sent or error.status in (401, 403)
+
+
+def use_http_backend() -> bool:
+    """Whether GitHub operations should go through the HTTP client."""
+    return GITHUB_BACKEND == "http"
+
+
+def _user(user: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    user = user or {"login": "ghost"}
+    return {
+        "id": user.get("node_id"),
+        "login": user["login"],
+        "name": user.get("name"),
+        "is_bot": user.get("type") == "Bot",
+    }
+
+
+def _label(label: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "id": label.get("node_id", str(label.get("id", ""))),
+        "name": label["name"],
+        "color": label.get("color", ""),
+        "description": label.get("description"),
+    }
+
+
+def _comment(comment: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "id": comment.get("node_id", str(comment.get("id", ""))),
+        "author": _user(comment.get("user")),
+        "body": comment.get("body") or "",
+        "createdAt": comment["created_at"],
+        "updatedAt": comment.get("updated_at"),
+    }
+
+
+def _milestone(milestone: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    if not milestone:
+        return None
+    return {
+        "id": milestone.get("node_id", str(milestone.get("id", ""))),
+        "number": milestone["number"],
+        "title": milestone["title"],
+        "description": milestone.get("description"),
+        "state": milestone["state"].upper(),
+    }
+
+
+def _issue_list_item(issue: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "number": issue["number"],
+        "title": issue["title"],
+        "body": issue.get("body") or "",
+        "labels": [_label(label) for label in issue.get("labels", [])],
+        "createdAt": issue["created_at"],
+        "updatedAt": issue["updated_at"],
+    }
+
+
+def _issue_summary(node: Dict[str, Any]) -> Dict[str, Any]:
+    comments = node["comments"]
+    last = comments["nodes"][0] if comments["nodes"] else None
+    return {
+        "number": node["number"],
+        "title": node["title"],
+        "body": node.get("body") or "",
+        "labels": node["labels"]["nodes"],
+        "createdAt": node["createdAt"],
+        "updatedAt": node["updatedAt"],
+        "commentCount": comments["totalCount"],
+        "lastComment": last
+        and {
+            "id": last["id"],
+            "author": last.get("author") or {"login": "ghost"},
+            "body": last.get("body") or "",
+            "createdAt": last["createdAt"],
+        },
+    }
+
+
+def paginate_open_issues(
+    repo_path: str, run_query: Callable[[str, Dict[str, Any]], Dict[str, Any]]
+) -> List[Dict[str, Any]]:
+    """Page through OPEN_ISSUES_QUERY with run_query(query, variables) -> data.
+
+    Returns:
+        Open issues with "commentCount" and "lastComment" (or None), in
+        the shape of data_types.GitHubIssueSummary
+    """
+    owner, name = repo_path.split("/", 1)
+    variables: Dict[str, Any] = {"owner": owner, "name": name, "cursor": None}
+    issues: List[Dict[str, Any]] = []
+    while True:
+        page = run_query(OPEN_ISSUES_QUERY, variables)["repository"]["issues"]
+        issues.extend(_issue_summary(node) for node in page["nodes"])
+        if not page["pageInfo"]["hasNextPage"]:
+            return issues
+        variables["cursor"] = page["pageInfo"]["endCursor"]
+
+
+class GitHubClient:
+    """GitHub REST client sharing one keep-alive connection pool."""
+
+    def __init__(
+        self,
+        base_url: str = GITHUB_API_URL,
+        token: Optional[str] = None,
+        timeout: float = GITHUB_API_TIMEOUT_SECONDS,
+        pool_size: int = GITHUB_API_POOL_SIZE,
+    ):
+        if requests is None:
+            raise GitHubAPIError("The requests package is not installed", sent=False)
+        self.base_url = base_url.rstrip("/")
+        self.token = token
+        self.timeout = timeout
+
+        self.session = requests.Session()
+        self.session.headers.update(
+            {
+                "Accept": "application/vnd.github+json",
+                "X-GitHub-Api-Version": "2022-11-28",
+                "User-Agent": "adw-github-client",
+            }
+        )
+        if token:
+            self.session.headers["Authorization"] = f"Bearer {token}"
+
+        # Only idempotent reads are retried; writes surface their first failure
+        retry = Retry(
+            total=3,
+            backoff_factor=0.5,
+            status_forcelist=(502, 503, 504),
+            allowed_methods=frozenset({"GET"}),
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(
+            pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry
+        )
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self._login: Optional[str] = None
+
+    def close(self) -> None:
+        """Close every pooled connection."""
+        self.session.close()
+
+    def _request(self, method: str, path: str, **kwargs: Any) -> "requests.Response":
+        url = path if path.startswith("http") else f"{self.base_url}{path}"
+        try:
+            response = self.session.request(method, url, timeout=self.timeout, **kwargs)
+        except requests.RequestException as e:
+            # Connecting failed, so nothing was sent; a read timeout or a
+            # dropped connection may have happened after GitHub acted on it
+            reason = getattr(e.args[0], "reason", None) if e.args else None
+            sent = not (
+                isinstance(e, requests.ConnectTimeout)
+                or isinstance(reason, NewConnectionError)
+            )
+            raise GitHubAPIError(f"{method} {url} failed: {e}", sent=sent) from e
+        if response.status_code >= 400:
+            try:
+                message = response.json().get("message", response.text)
+            except ValueError:
+                message = response.text
+            retry_after = response.headers.get("Retry-After")
+            raise GitHubAPIError(
+                f"{method} {url} returned {response.status_code}: {message}",
+                status=response.status_code,
+                retry_after=float(retry_after) if (retry_after or "").isdigit() else None,
+            )
+        return response
+
+    def _json(self, method: str, path: str, **kwargs: Any) -> Any:
+        response = self._request(method, path, **kwargs)
+        return response.json() if response.content else None
+
+    def _get(
+        self, path: str, params: Optional[Dict[str, Any]] = None
+    ) -> Tuple[Any, Optional[str]]:
+        """Conditional GET, revalidating any cached copy of the response.
+
+        Returns:
+            (parsed JSON, URL of the next page or None)
+        """
+        url = path if path.startswith("http") else f"{self.base_url}{path}"
+        url = requests.Request("GET", url, params=params).prepare().url
+        cache = get_github_cache()
+        cached = cache.get_response(url) if cache else None
+
+        headers = {}
+        if cached and cached["etag"]:
+            headers["If-None-Match"] = cached["etag"]
+        if cached and cached["last_modified"]:
+            headers["If-Modified-Since"] = cached["last_modified"]
+
+        response = self._request("GET", url, headers=headers)
+        if response.status_code == 304 and cached:
+            cache.touch_response(url)
+            return json.loads(cached["body"]), cached["next_url"]
+
+        next_url = response.links.get("next", {}).get("url")
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if cache and (etag or last_modified):
+            cache.put_response(url, etag, last_modified, response.text, next_url)
+        return response.json(), next_url
+
+    def _paginate(self, path: str, params: Optional[Dict[str, Any]] = None) -> List[Any]:
+        """GET every page of a list endpoint by following Link: rel="next"."""
+        items: List[Any] = []
+        params = {"per_page": 100, **(params or {})}
+        url: Optional[str] = path
+        while url:
+            page, url = self._get(url, params)
+            items.extend(page)
+            params = None  # The next link already carries the query
+        return items
+
+    def graphql(self, query: str, variables: Dict[str, Any]) -> Dict[str, Any]:
+        """Run a GraphQL query and return its data."""
+        if self.base_url.endswith("/api/v3"):  # GitHub Enterprise Server
+            url = self.base_url[: -len("/v3")] + "/graphql"
+        else:
+            url = f"{self.base_url}/graphql"
+        result = self._json("POST", url, json={"query": query, "variables": variables})
+        if result.get("errors"):
+            messages = "; ".join(e.get("message", str(e)) for e in result["errors"])
+            raise GitHubAPIError(f"GraphQL query failed: {messages}")
+        return result["data"]
+
+    def list_open_issue_summaries(self, repo_path: str) -> List[Dict[str, Any]]:
+        """Return every open issue with its latest comment, 100 per request."""
+        return paginate_open_issues(repo_path, self.graphql)
+
+    def get_login(self) -> str:
+        """Return the login of the authenticated user."""
+        if self._login is None:
+            self._login = self._json("GET", "/user")["login"]
+        return self._login
+
+    def list_issue_comments(
+        self, repo_path: str, issue_number: str, expected_count: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """Return an issue's comments, oldest first, in gh's JSON shape.
+
+        With the cache enabled only comments updated since the last fetch
+        are requested. expected_count (the issue's current comment count)
+        lets deletions be detected, which triggers a full refetch.
+        """
+        path = f"/repos/{repo_path}/issues/{issue_number}/comments"
+        cache = get_github_cache()
+        if cache is None:
+            return [_comment(comment) for comment in self._paginate(path)]
+
+        cursor = cache.get_comment_cursor(repo_path, issue_number)
+        cache.merge_comments(
+            repo_path,
+            issue_number,
+            self._paginate(path, {"since": cursor} if cursor else None),
+        )
+        comments = cache.get_comments(repo_path, issue_number)
+        if cursor and expected_count is not None and len(comments) != expected_count:
+            cache.reset_comments(repo_path, issue_number)
+            cache.merge_comments(repo_path, issue_number, self._paginate(path))
+            comments = cache.get_comments(repo_path, issue_number)
+        return [_comment(comment) for comment in comments]
+
+    def get_issue(self, repo_path: str, issue_number: str) -> Dict[str, Any]:
+        """Return an issue with its comments in `gh issue view --json` shape."""
+        issue, _ = self._get(f"/repos/{repo_path}/issues/{issue_number}")
+        return {
+            **_issue_list_item(issue),
+            "state": issue["state"].upper(),
+            "author": _user(issue.get("user")),
+            "assignees": [_user(user) for user in issue.get("assignees") or []],
+            "milestone": _milestone(issue.get("milestone")),
+            "comments": (
+                self.list_issue_comments(repo_path, issue_number, issue["comments"])
+                if issue.get("comments")
+                else []
+            ),
+            "closedAt": issue.get("closed_at"),
+            "url": issue["html_url"],
+        }
+
+    def list_open_issues(self, repo_path: str) -> List[Dict[str, Any]]:
+        """Return open issues (not pull requests) in `gh issue list` shape."""
+        issues = self._paginate(f"/repos/{repo_path}/issues", {"state": "open"})
+        return [_issue_list_item(i) for i in issues if "pull_request" not in i]
+
+    def create_comment(self, repo_path: str, issue_number: str, body: str) -> Dict[str, Any]:
+        """Post a comment on an issue or pull request."""
+        return self._json(
+            "POST",
+            f"/repos/{repo_path}/issues/{issue_number}/comments",
+            json={"body": body},
+        )
+
+    def update_comment(self, repo_path: str, comment_id: str, body: str) -> Dict[str, Any]:
+        """Replace the body of an existing issue comment."""
+        return self._json(
+            "PATCH",
+            f"/repos/{repo_path}/issues/comments/{comment_id}",
+            json={"body": body},
+        )
+
+    def add_labels(self, repo_path: str, issue_number: str, labels: List[str]) -> None:
+        """Add labels to an issue."""
+        self._json(
+            "POST",
+            f"/repos/{repo_path}/issues/{issue_number}/labels",
+            json={"labels": labels},
+        )
+
+    def add_assignees(self, repo_path: str, issue_number: str, assignees: List[str]) -> None:
+        """Assign users to an issue; "@me" is the authenticated user."""
+        logins = [self.get_login() if a == "@me" else a for a in assignees]
+        self._json(
+            "POST",
+            f"/repos/{repo_path}/issues/{issue_number}/assignees",
+            json={"assignees": logins},
+        )
+
+    def find_pull_requests(self, repo_path: str, branch_name: str) -> List[Dict[str, Any]]:
+        """Return open PRs whose head is branch_name, as {"number", "url"}."""
+        owner = repo_path.split("/")[0]
+        pulls, _ = self._get(
+            f"/repos/{repo_path}/pulls",
+            {"head": f"{owner}:{branch_name}", "state": "open"},
+        )
+        return [{"number": pr["number"], "url": pr["html_url"]} for pr in pulls]
+
+    def get_merge_status(self, repo_path: str, pr_number: str) -> Dict[str, str]:
+        """Return {"mergeable", "mergeStateStatus"} as `gh pr view` reports them."""
+        pr = self._json("GET", f"/repos/{repo_path}/pulls/{pr_number}")
+        mergeable = {True: "MERGEABLE", False: "CONFLICTING"}.get(
+            pr.get("mergeable"), "UNKNOWN"
+        )
+        return {
+            "mergeable": mergeable,
+            "mergeStateStatus": (pr.get("mergeable_state") or "unknown").upper(),
+        }
+
+    def approve_pull_request(self, repo_path: str, pr_number: str, body: str) -> None:
+        """Submit an approving review."""
+        self._json(
+            "POST",
+            f"/repos/{repo_path}/pulls/{pr_number}/reviews",
+            json={"event": "APPROVE", "body": body},
+        )
+
+    def merge_pull_request(
+        self, repo_path: str, pr_number: str, merge_method: str, body: str
+    ) -> None:
+        """Merge a PR with merge_method ('merge', 'squash' or 'rebase')."""
+        self._json(
+            "PUT",
+            f"/repos/{repo_path}/pulls/{pr_number}/merge",
+            json={"merge_method": merge_method, "commit_message": body},
+        )
+
+
+_client: Optional[GitHubClient] = None
+_client_lock = threading.Lock()
+
+
+def get_github_client() -> GitHubClient:
+    """Return the process-wide client for GITHUB_API_URL and the current token."""
+    global _client
+    token = os.getenv("GITHUB_PAT") or os.getenv("GH_TOKEN")
+    with _client_lock:
+        if _client is None or (_client.base_url, _client.token) != (
+            GITHUB_API_URL.rstrip("/"),
+            token,
+        ):
+            if _client is not None:
+                _client.close()
+            _client = GitHubClient(GITHUB_API_URL, token)
+        return _client
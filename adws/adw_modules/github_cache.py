@@ -0,0 +1,185 @@
+"""On-disk cache for the HTTP GitHub backend.
+
+GitHubClient revalidates cached GET responses with If-None-Match /
+If-Modified-Since. GitHub answers 304 Not Modified for unchanged issues
+and issue lists, and 304s do not count against the REST rate limit, so
+polling costs quota only when something changed.
+
+Issue comments are also cached per issue. Refreshes ask only for comments
+updated since the newest one already seen (`?since=`), and fall back to a
+full refetch when the issue's comment count shows that some were deleted.
+
+Entries live in agents/github_cache.db. Set ADW_GITHUB_HTTP_CACHE=false to
+disable.
+"""
+
+import json
+import os
+import sqlite3
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterator, List, Optional
+
+# __file__ is in adws/adw_modules/, so we need to go up 3 levels to get to project root
+PROJECT_ROOT = os.path.dirname(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+)
+GITHUB_CACHE_DB_PATH = os.path.join(PROJECT_ROOT, "agents", "github_cache.db")
+
+HTTP_CACHE_ENABLED = os.getenv("ADW_GITHUB_HTTP_CACHE", "true").lower() != "false"
+RESPONSE_MAX_AGE_SECONDS = 7 * 86400  # Drop responses not revalidated for a week
+
+
+def since_cursor(updated_at: str) -> str:
+    """Return the `since=` value that re-reads everything updated at updated_at.
+
+    GitHub timestamps have one-second resolution, so step back one second
+    to include comments updated in the same second as the newest one seen.
+    """
+    moment = datetime.strptime(updated_at, "%Y-%m-%dT%H:%M:%SZ") - timedelta(seconds=1)
+    return moment.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+class GitHubCache:
+    """Validators and bodies of GET responses plus per-issue comments."""
+
+    def __init__(self, db_path: str = GITHUB_CACHE_DB_PATH):
+        self.db_path = db_path
+        os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS responses (
+                    url TEXT PRIMARY KEY,
+                    etag TEXT,
+                    last_modified TEXT,
+                    body TEXT NOT NULL,
+                    next_url TEXT,
+                    validated_at REAL NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS comments (
+                    repo_path TEXT NOT NULL,
+                    issue_number TEXT NOT NULL,
+                    comment_id INTEGER NOT NULL,
+                    created_at TEXT NOT NULL,
+                    updated_at TEXT NOT NULL,
+                    data TEXT NOT NULL,
+                    PRIMARY KEY (repo_path, issue_number, comment_id)
+                );
+                """
+            )
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Open a connection in autocommit mode."""
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    def get_response(self, url: str) -> Optional[Dict[str, Any]]:
+        """Return {"etag", "last_modified", "body", "next_url"} for url, or None."""
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT etag, last_modified, body, next_url FROM responses WHERE url = ?",
+                (url,),
+            ).fetchone()
+        return dict(row) if row else None
+
+    def touch_response(self, url: str) -> None:
+        """Record that a cached response was revalidated (304)."""
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE responses SET validated_at = ? WHERE url = ?", (time.time(), url)
+            )
+
+    def put_response(
+        self,
+        url: str,
+        etag: Optional[str],
+        last_modified: Optional[str],
+        body: str,
+        next_url: Optional[str],
+    ) -> None:
+        """Store a response and drop responses nobody has revalidated lately."""
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?)",
+                (url, etag, last_modified, body, next_url, now),
+            )
+            conn.execute(
+                "DELETE FROM responses WHERE validated_at < ?",
+                (now - RESPONSE_MAX_AGE_SECONDS,),
+            )
+
+    def get_comments(self, repo_path: str, issue_number: str) -> List[Dict[str, Any]]:
+        """Return cached REST comments of an issue, oldest first."""
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT data FROM comments WHERE repo_path = ? AND issue_number = ? "
+                "ORDER BY created_at, comment_id",
+                (repo_path, str(issue_number)),
+            ).fetchall()
+        return [json.loads(row["data"]) for row in rows]
+
+    def get_comment_cursor(self, repo_path: str, issue_number: str) -> Optional[str]:
+        """Return the `since=` value for the next incremental comment fetch."""
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT MAX(updated_at) FROM comments "
+                "WHERE repo_path = ? AND issue_number = ?",
+                (repo_path, str(issue_number)),
+            ).fetchone()
+        return since_cursor(row[0]) if row[0] else None
+
+    def merge_comments(
+        self, repo_path: str, issue_number: str, comments: List[Dict[str, Any]]
+    ) -> None:
+        """Insert or update REST comments of an issue."""
+        with self._connect() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO comments VALUES (?, ?, ?, ?, ?, ?)",
+                [
+                    (
+                        repo_path,
+                        str(issue_number),
+                        comment["id"],
+                        comment["created_at"],
+                        comment.get("updated_at") or comment["created_at"],
+                        json.dumps(comment),
+                    )
+                    for comment in comments
+                ],
+            )
+
+    def reset_comments(self, repo_path: str, issue_number: str) -> None:
+        """Forget an issue's cached comments so the next fetch is a full one."""
+        with self._connect() as conn:
+            conn.execute(
+                "DELETE FROM comments WHERE repo_path = ? AND issue_number = ?",
+                (repo_path, str(issue_number)),
+            )
+
+    def clear(self) -> None:
+        """Remove every cached response and comment."""
+        with self._connect() as conn:
+            conn.execute("DELETE FROM responses")
+            conn.execute("DELETE FROM comments")
+
+
+_cache: Optional[GitHubCache] = None
+
+
+def get_github_cache() -> Optional[GitHubCache]:
+    """Return the process-wide cache for GITHUB_CACHE_DB_PATH, if enabled."""
+    global _cache
+    if not HTTP_CACHE_ENABLED:
+        return None
+    if _cache is None or _cache.db_path != GITHUB_CACHE_DB_PATH:
+        _cache = GitHubCache(GITHUB_CACHE_DB_PATH)
+    return _cache
@@ -0,0 +1,135 @@
+"""Append-only phase event log for ADW runs.
+
+Composite workflows record a "start" and a "finish" event (with outcome
+and the worktree's HEAD commit) for every phase in
+agents/<adw_id>/phase_events.jsonl, and ADWState records each save. The
+log is never rewritten, so it shows exactly which phases of a run finished
+even when the workflow died midway.
+
+With --resume, composite workflows use the log to skip the leading phases
+that already succeeded, as long as the worktree is still at the commit the
+last of them finished on.
+"""
+
+import json
+import os
+import subprocess
+import time
+from typing import Any, Dict, List, Optional
+
+from adw_modules.git_ops import get_head_commit
+from adw_modules.state import ADWState
+from adw_modules.worktree_ops import get_worktree_path
+
+# __file__ is in adws/adw_modules/, so we need to go up 3 levels to get to project root
+PROJECT_ROOT = os.path.dirname(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+)
+AGENTS_DIR = os.path.join(PROJECT_ROOT, "agents")
+EVENTS_FILENAME = "phase_events.jsonl"
+
+
+def get_events_path(adw_id: str) -> str:
+    """Get the event log for an ADW run."""
+    return os.path.join(AGENTS_DIR, adw_id, EVENTS_FILENAME)
+
+
+def append_event(adw_id: str, event: str, **fields: Any) -> Dict[str, Any]:
+    """Append one event to the run's log and return it."""
+    record = {"ts": round(time.time(), 3), "event": event, **fields}
+    path = get_events_path(adw_id)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    # A single short append is atomic, so concurrent phases can share the file
+    with open(path, "a") as f:
+        f.write(json.dumps(record, separators=(",", ":")) + "\n")
+    return record
+
+
+def read_events(adw_id: str) -> List[Dict[str, Any]]:
+    """Return the run's events in order, skipping malformed lines."""
+    events = []
+    try:
+        with open(get_events_path(adw_id), "r") as f:
+            for line in f:
+                try:
+                    events.append(json.loads(line))
+                except json.JSONDecodeError:
+                    continue
+    except FileNotFoundError:
+        pass
+    return events
+
+
+def get_run_commit(adw_id: str) -> Optional[str]:
+    """Return HEAD of the run's worktree, or None if it has no worktree yet."""
+    state = ADWState.load(adw_id)
+    worktree_path = (state and state.get("worktree_path")) or get_worktree_path(adw_id)
+    if not os.path.isdir(worktree_path):
+        return None
+    return get_head_commit(cwd=worktree_path)
+
+
+def get_completed_phases(
+    adw_id: str, phases: List[str], commit: Optional[str] = None
+) -> List[str]:
+    """Return the leading phases that can be skipped when resuming.
+
+    A prefix of phases is skippable when each phase's latest finish event
+    succeeded, each finished after the previous one, and the last of them
+    finished on the current worktree commit. The longest such prefix wins.
+
+    Args:
+        adw_id: The ADW ID
+        phases: Phase names in execution order
+        commit: Current worktree HEAD (default: read from the worktree)
+    """
+    commit = commit or get_run_commit(adw_id)
+    if not commit:
+        return []
+
+    latest_finish: Dict[str, Dict[str, Any]] = {}
+    for event in read_events(adw_id):
+        if event.get("event") == "phase_finish":
+            latest_finish[event.get("phase")] = event
+
+    completed: List[str] = []
+    previous_ts = 0.0
+    for index, phase in enumerate(phases):
+        finish = latest_finish.get(phase)
+        if not finish or finish.get("outcome") != "success" or finish["ts"] < previous_ts:
+            break
+        previous_ts = finish["ts"]
+        if finish.get("commit") == commit:
+            completed = phases[: index + 1]
+    return completed
+
+
+def run_phase(
+    adw_id: str, phase: str, cmd: List[str], completed: Optional[List[str]] = None
+) -> int:
+    """Run one phase of a composite workflow, recording start and finish events.
+
+    Phases listed in completed are skipped and reported as successful.
+
+    Returns:
+        The phase's exit code (0 when skipped)
+    """
+    if completed and phase in completed:
+        print(f"Skipping {phase} phase: already completed at the current commit")
+        append_event(adw_id, "phase_skip", phase=phase, commit=get_run_commit(adw_id))
+        return 0
+
+    print(f"Running: {' '.join(cmd)}")
+    append_event(adw_id, "phase_start", phase=phase, commit=get_run_commit(adw_id))
+    started = time.monotonic()
+    returncode = subprocess.run(cmd).returncode
+    append_event(
+        adw_id,
+        "phase_finish",
+        phase=phase,
+        outcome="success" if returncode == 0 else "failure",
+        returncode=returncode,
+        duration_seconds=round(time.monotonic() - started, 3),
+        commit=get_run_commit(adw_id),
+    )
+    return returncode
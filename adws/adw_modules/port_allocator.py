@@ -0,0 +1,255 @@
+"""Lease-based port allocation for isolated ADW worktrees.
+
+Each isolated run leases one slot, which is a backend port plus a
+frontend port at the same offset:
+
+    backend  = ADW_BACKEND_PORT_START  + slot
+    frontend = ADW_FRONTEND_PORT_START + slot
+
+Leases live in agents/port_leases.db and are keyed by adw_id, so every
+phase of a run gets the same ports back. Reservation happens inside a
+single SQLite write transaction, and the slot is unique, so two processes
+can never lease the same ports. The old approach (probe with bind(), then
+let the app bind later) had a race between those two steps.
+
+A lease is reclaimed when:
+- it was not renewed for ADW_PORT_LEASE_TTL seconds, or
+- its run is dead: the trees/<adw_id> worktree is gone and the lease is
+  older than a short grace period (ports are leased just before the
+  worktree is created).
+
+Configure via:
+- ADW_BACKEND_PORT_START: first backend port (default: 9100)
+- ADW_FRONTEND_PORT_START: first frontend port (default: 9200)
+- ADW_PORT_SLOTS: number of slots, i.e. concurrent isolated runs (default: 100)
+- ADW_PORT_LEASE_TTL: seconds a lease lives without renewal (default: 7 days)
+"""
+
+import os
+import socket
+import sqlite3
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+# __file__ is in adws/adw_modules/, so we need to go up 3 levels to get to project root
+PROJECT_ROOT = os.path.dirname(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+)
+PORT_LEASES_DB_PATH = os.path.join(PROJECT_ROOT, "agents", "port_leases.db")
+TREES_DIR = os.path.join(PROJECT_ROOT, "trees")
+
+BACKEND_PORT_START = int(os.getenv("ADW_BACKEND_PORT_START", "9100"))
+FRONTEND_PORT_START = int(os.getenv("ADW_FRONTEND_PORT_START", "9200"))
+PORT_SLOTS = int(os.getenv("ADW_PORT_SLOTS", "100"))
+PORT_LEASE_TTL_SECONDS = float(os.getenv("ADW_PORT_LEASE_TTL", str(7 * 86400)))
+DEAD_RUN_GRACE_SECONDS = 3600.0  # A lease may precede its worktree this long
+
+
+def is_port_available(port: int) -> bool:
+    """Check if a port is available for binding.
+
+    Args:
+        port: Port number to check
+
+    Returns:
+        True if port is available, False otherwise
+    """
+    try:
+        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+            s.settimeout(1)
+            s.bind(("localhost", port))
+            return True
+    except (socket.error, OSError):
+        return False
+
+
+def preferred_slot(adw_id: str, slots: int) -> int:
+    """Map an ADW ID onto a slot deterministically, to start the search from."""
+    try:
+        # Take first 8 alphanumeric chars and convert from base 36
+        id_chars = "".join(c for c in adw_id[:8] if c.isalnum())
+        return int(id_chars, 36) % slots
+    except ValueError:
+        return sum(adw_id.encode()) % slots
+
+
+class PortAllocator:
+    """Per-run port leases in a WAL-mode SQLite database."""
+
+    def __init__(
+        self,
+        db_path: str = PORT_LEASES_DB_PATH,
+        backend_start: int = BACKEND_PORT_START,
+        frontend_start: int = FRONTEND_PORT_START,
+        slots: int = PORT_SLOTS,
+        ttl_seconds: float = PORT_LEASE_TTL_SECONDS,
+        trees_dir: str = TREES_DIR,
+        port_available: Callable[[int], bool] = is_port_available,
+    ):
+        if slots < 1:
+            raise ValueError("ADW_PORT_SLOTS must be at least 1")
+        if max(backend_start, frontend_start) < min(backend_start, frontend_start) + slots:
+            raise ValueError(
+                f"Backend ports {backend_start}-{backend_start + slots - 1} overlap "
+                f"frontend ports {frontend_start}-{frontend_start + slots - 1}"
+            )
+        if max(backend_start, frontend_start) + slots - 1 > 65535:
+            raise ValueError("Port range exceeds 65535")
+
+        self.db_path = db_path
+        self.backend_start = backend_start
+        self.frontend_start = frontend_start
+        self.slots = slots
+        self.ttl_seconds = ttl_seconds
+        self.trees_dir = trees_dir
+        self.port_available = port_available
+        os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS leases (
+                    adw_id TEXT PRIMARY KEY,
+                    slot INTEGER NOT NULL UNIQUE,
+                    backend_port INTEGER NOT NULL,
+                    frontend_port INTEGER NOT NULL,
+                    leased_at REAL NOT NULL,
+                    expires_at REAL NOT NULL
+                )
+                """
+            )
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Open a connection in autocommit mode; transactions are explicit."""
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    def ports_for_slot(self, slot: int) -> Tuple[int, int]:
+        """Return (backend_port, frontend_port) of a slot."""
+        return self.backend_start + slot, self.frontend_start + slot
+
+    def _is_dead(self, lease: sqlite3.Row, now: float) -> bool:
+        if lease["expires_at"] <= now:
+            return True
+        return now - lease["leased_at"] > DEAD_RUN_GRACE_SECONDS and not os.path.isdir(
+            os.path.join(self.trees_dir, lease["adw_id"])
+        )
+
+    def allocate(self, adw_id: str) -> Tuple[int, int]:
+        """Lease ports for a run, or renew and return its existing lease.
+
+        Slots are tried from the ADW ID's preferred slot onwards. Slots
+        whose ports are held by some other program are skipped.
+
+        Returns:
+            Tuple of (backend_port, frontend_port)
+
+        Raises:
+            RuntimeError: If every slot is leased or in use
+        """
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                leases = conn.execute("SELECT * FROM leases").fetchall()
+                own = next((lease for lease in leases if lease["adw_id"] == adw_id), None)
+                if own is not None and own["slot"] < self.slots and (
+                    own["backend_port"],
+                    own["frontend_port"],
+                ) == self.ports_for_slot(own["slot"]):
+                    conn.execute(
+                        "UPDATE leases SET expires_at = ? WHERE adw_id = ?",
+                        (now + self.ttl_seconds, adw_id),
+                    )
+                    conn.execute("COMMIT")
+                    return own["backend_port"], own["frontend_port"]
+
+                # Reclaim leases of dead runs
+                dead = [lease["adw_id"] for lease in leases if self._is_dead(lease, now)]
+                if own is not None:
+                    # Leased under a different port range configuration
+                    dead.append(adw_id)
+                conn.executemany(
+                    "DELETE FROM leases WHERE adw_id = ?", [(d,) for d in dead]
+                )
+                taken = {lease["slot"] for lease in leases if lease["adw_id"] not in dead}
+
+                start = preferred_slot(adw_id, self.slots)
+                for offset in range(self.slots):
+                    slot = (start + offset) % self.slots
+                    if slot in taken:
+                        continue
+                    backend_port, frontend_port = self.ports_for_slot(slot)
+                    if not (
+                        self.port_available(backend_port)
+                        and self.port_available(frontend_port)
+                    ):
+                        continue
+                    conn.execute(
+                        "INSERT INTO leases VALUES (?, ?, ?, ?, ?, ?)",
+                        (
+                            adw_id,
+                            slot,
+                            backend_port,
+                            frontend_port,
+                            now,
+                            now + self.ttl_seconds,
+                        ),
+                    )
+                    conn.execute("COMMIT")
+                    return backend_port, frontend_port
+
+                conn.execute("COMMIT")
+            except Exception:
+                if conn.in_transaction:
+                    conn.execute("ROLLBACK")
+                raise
+        raise RuntimeError(
+            f"No available ports: all {self.slots} slots are leased or in use "
+            "(raise ADW_PORT_SLOTS or remove finished worktrees)"
+        )
+
+    def renew(self, adw_id: str) -> bool:
+        """Extend a run's lease; returns False if it holds none."""
+        with self._connect() as conn:
+            cursor = conn.execute(
+                "UPDATE leases SET expires_at = ? WHERE adw_id = ?",
+                (time.time() + self.ttl_seconds, adw_id),
+            )
+        return cursor.rowcount > 0
+
+    def release(self, adw_id: str) -> None:
+        """Give a run's ports back."""
+        with self._connect() as conn:
+            conn.execute("DELETE FROM leases WHERE adw_id = ?", (adw_id,))
+
+    def get(self, adw_id: str) -> Optional[Dict[str, Any]]:
+        """Return a run's lease, or None."""
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT * FROM leases WHERE adw_id = ?", (adw_id,)
+            ).fetchone()
+        return dict(row) if row else None
+
+    def list_leases(self) -> List[Dict[str, Any]]:
+        """Return all leases, by slot."""
+        with self._connect() as conn:
+            rows = conn.execute("SELECT * FROM leases ORDER BY slot").fetchall()
+        return [dict(row) for row in rows]
+
+
+_allocator: Optional[PortAllocator] = None
+
+
+def get_port_allocator() -> PortAllocator:
+    """Return the process-wide allocator for PORT_LEASES_DB_PATH."""
+    global _allocator
+    if _allocator is None or _allocator.db_path != PORT_LEASES_DB_PATH:
+        _allocator = PortAllocator(PORT_LEASES_DB_PATH)
+    return _allocator
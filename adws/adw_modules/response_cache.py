@@ -0,0 +1,150 @@
+"""Content-addressed response cache for deterministic template commands.
+
+Classification-style commands (/classify_adw, /classify_issue,
+/generate_branch_name) are re-run with identical inputs whenever a webhook
+fires or a workflow is retriggered. When enabled, execute_template returns
+a cached successful response for the same (slash_command, args, model,
+template-file hash) instead of spawning the CLI.
+
+Entries live in agents/response_cache.db, are evicted least-recently-used
+beyond a size bound and expire after a TTL. Configure via:
+- ADW_RESPONSE_CACHE: set to "true" to enable (default: disabled)
+- ADW_RESPONSE_CACHE_TTL: seconds an entry stays valid (default: 86400)
+- ADW_RESPONSE_CACHE_MAX_ENTRIES: entries kept on disk (default: 500)
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from contextlib import contextmanager
+from typing import Iterator, List, Optional
+
+from .data_types import AgentPromptResponse
+
+# __file__ is in adws/adw_modules/, so we need to go up 3 levels to get to project root
+PROJECT_ROOT = os.path.dirname(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+)
+CACHE_DB_PATH = os.path.join(PROJECT_ROOT, "agents", "response_cache.db")
+
+CACHE_ENABLED = os.getenv("ADW_RESPONSE_CACHE", "false").lower() == "true"
+CACHE_TTL_SECONDS = float(os.getenv("ADW_RESPONSE_CACHE_TTL", "86400"))
+CACHE_MAX_ENTRIES = int(os.getenv("ADW_RESPONSE_CACHE_MAX_ENTRIES", "500"))
+
+# Commands whose output depends only on their inputs and template
+CACHEABLE_SLASH_COMMANDS = {"/classify_adw", "/classify_issue", "/generate_branch_name"}
+
+
+def hash_template(slash_command: str, working_dir: Optional[str] = None) -> str:
+    """Hash the command template file so template edits invalidate the cache."""
+    command_name = slash_command.lstrip("/")
+    template_path = os.path.join(
+        working_dir or PROJECT_ROOT, ".claude", "commands", f"{command_name}.md"
+    )
+    try:
+        with open(template_path, "rb") as f:
+            return hashlib.sha256(f.read()).hexdigest()
+    except OSError:
+        return "missing"
+
+
+def make_cache_key(
+    slash_command: str, args: List[str], model: str, template_hash: str
+) -> str:
+    """Return the content address of a template invocation."""
+    payload = json.dumps([slash_command, args, model, template_hash])
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """Size-bounded LRU of agent responses with TTL expiry, shared via SQLite."""
+
+    def __init__(
+        self,
+        db_path: str = CACHE_DB_PATH,
+        ttl_seconds: float = CACHE_TTL_SECONDS,
+        max_entries: int = CACHE_MAX_ENTRIES,
+    ):
+        self.db_path = db_path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS responses (
+                    key TEXT PRIMARY KEY,
+                    slash_command TEXT NOT NULL,
+                    response TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    last_used_at REAL NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS idx_responses_last_used
+                    ON responses (last_used_at);
+                """
+            )
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Open a connection in autocommit mode."""
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    def get(self, key: str) -> Optional[AgentPromptResponse]:
+        """Return the cached response for key, or None if missing or expired."""
+        now = time.time()
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT response, created_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            response, created_at = row
+            if now - created_at > self.ttl_seconds:
+                conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                return None
+            conn.execute(
+                "UPDATE responses SET last_used_at = ? WHERE key = ?", (now, key)
+            )
+        return AgentPromptResponse.model_validate_json(response)
+
+    def put(self, key: str, slash_command: str, response: AgentPromptResponse) -> None:
+        """Store a response, evicting expired and least-recently-used entries."""
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?)",
+                (key, slash_command, response.model_dump_json(), now, now),
+            )
+            conn.execute(
+                "DELETE FROM responses WHERE created_at < ?", (now - self.ttl_seconds,)
+            )
+            conn.execute(
+                "DELETE FROM responses WHERE key NOT IN "
+                "(SELECT key FROM responses ORDER BY last_used_at DESC LIMIT ?)",
+                (self.max_entries,),
+            )
+
+    def clear(self) -> None:
+        """Remove every cached response."""
+        with self._connect() as conn:
+            conn.execute("DELETE FROM responses")
+
+
+_cache: Optional[ResponseCache] = None
+
+
+def get_response_cache(slash_command: str) -> Optional[ResponseCache]:
+    """Return the process-wide cache if caching applies to slash_command."""
+    global _cache
+    if not CACHE_ENABLED or slash_command not in CACHEABLE_SLASH_COMMANDS:
+        return None
+    if _cache is None or _cache.db_path != CACHE_DB_PATH:
+        _cache = ResponseCache(CACHE_DB_PATH)
+    return _cache
@@ -0,0 +1,254 @@
+"""Retry policy and circuit breaker for Claude Code agent execution.
+
+RetryPolicy decides whether and when a failed agent call is retried:
+exponential backoff with full jitter, a retry budget per RetryCode and
+respect for retry-after hints reported by the API.
+
+CircuitBreaker is shared by every ADW process on the host through the agent
+limiter database. When rate-limit failures pile up it opens and new agent
+launches pause until the cooldown (or the API's retry-after) has elapsed,
+so concurrent workflows back off together instead of failing together.
+"""
+
+import asyncio
+import os
+import random
+import re
+import sqlite3
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+from pydantic import BaseModel, Field
+
+from . import agent_limiter
+from .data_types import RetryCode
+
+CIRCUIT_BREAKER_ENABLED = os.getenv("ADW_CIRCUIT_BREAKER", "true").lower() != "false"
+
+# Retries allowed per error type before giving up
+DEFAULT_RETRY_BUDGETS: Dict[RetryCode, int] = {
+    RetryCode.CLAUDE_CODE_ERROR: 3,
+    RetryCode.TIMEOUT_ERROR: 1,
+    RetryCode.EXECUTION_ERROR: 2,
+    RetryCode.ERROR_DURING_EXECUTION: 2,
+    RetryCode.RATE_LIMIT_ERROR: 5,
+}
+
+# Patterns that identify API rate limiting / overload in the CLI's stderr
+RATE_LIMIT_PATTERN = re.compile(
+    r"rate[ _-]?limit|too many requests|overloaded|\b429\b|\b529\b", re.IGNORECASE
+)
+# A failed API call ends the run with is_error and "API Error: <status> <body>"
+API_ERROR_PATTERN = re.compile(r"API Error:\s*(\d{3})?")
+RATE_LIMIT_STATUSES = (429, 529)
+RATE_LIMIT_ERROR_TYPES = ("rate_limit_error", "overloaded_error")
+RETRY_AFTER_PATTERN = re.compile(
+    r"retry[ _-]?after[\"']?\s*[:=]?\s*(\d+(?:\.\d+)?)", re.IGNORECASE
+)
+RETRY_AFTER_KEYS = ("retry_after", "retry_after_seconds", "retryAfter")
+
+
+class RetryPolicy(BaseModel):
+    """Backoff and budget configuration for agent retries."""
+
+    max_retries: int = 5  # Total retries across all error types
+    base_delay: float = 1.0  # Seconds; doubled on every retry
+    max_delay: float = 60.0  # Upper bound of the backoff window
+    budgets: Dict[RetryCode, int] = Field(
+        default_factory=lambda: dict(DEFAULT_RETRY_BUDGETS)
+    )
+
+    def allows_retry(
+        self, retry_code: RetryCode, retries_by_code: Dict[RetryCode, int]
+    ) -> bool:
+        """Check whether another retry is allowed for retry_code.
+
+        Args:
+            retry_code: Error type of the failed attempt
+            retries_by_code: Retries already spent, keyed by error type
+        """
+        if sum(retries_by_code.values()) >= self.max_retries:
+            return False
+        return retries_by_code.get(retry_code, 0) < self.budgets.get(retry_code, 0)
+
+    def get_delay(self, retry_number: int, retry_after: Optional[float] = None) -> float:
+        """Return seconds to wait before the given retry (1-based).
+
+        Uses full jitter: a uniform draw from [0, min(max_delay, base * 2^(n-1))].
+        A retry-after hint from the API is honoured as a lower bound.
+        """
+        ceiling = min(self.max_delay, self.base_delay * 2 ** (retry_number - 1))
+        delay = random.uniform(0, ceiling)
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        return delay
+
+
+def detect_rate_limit(
+    result_message: Optional[Dict[str, Any]] = None, stderr: str = ""
+) -> Tuple[bool, Optional[float]]:
+    """Check a failed agent call for rate limiting and a retry-after hint.
+
+    Only the result message's error fields and the CLI's stderr are used,
+    never assistant text, so a model writing about rate limits (or issue
+    #429) cannot trip the circuit breaker.
+
+    Args:
+        result_message: The stream-json result message, if any
+        stderr: The CLI's stderr output
+
+    Returns:
+        Tuple of (is_rate_limited, retry_after_seconds)
+    """
+    rate_limited = False
+    retry_after = None
+    api_error = ""
+    if result_message and result_message.get("is_error"):
+        for key in RETRY_AFTER_KEYS:
+            value = result_message.get(key)
+            if value is not None:
+                try:
+                    retry_after = float(value)
+                except (TypeError, ValueError):
+                    pass
+                break
+
+        match = API_ERROR_PATTERN.match(str(result_message.get("result") or ""))
+        if match:
+            api_error = match.string
+            rate_limited = (
+                match.group(1) is not None
+                and int(match.group(1)) in RATE_LIMIT_STATUSES
+            ) or any(error_type in api_error for error_type in RATE_LIMIT_ERROR_TYPES)
+
+    if stderr and RATE_LIMIT_PATTERN.search(stderr):
+        rate_limited = True
+
+    for text in (api_error, stderr):
+        if retry_after is None and text:
+            match = RETRY_AFTER_PATTERN.search(text)
+            if match:
+                retry_after = float(match.group(1))
+
+    return rate_limited or retry_after is not None, retry_after
+
+
+class CircuitBreaker:
+    """Host-wide breaker that pauses agent launches while the API is overloaded.
+
+    State lives in the agent limiter database so all ADW processes share it.
+    """
+
+    def __init__(
+        self,
+        db_path: Optional[str] = None,
+        failure_threshold: int = 3,
+        window_seconds: float = 60.0,
+        cooldown_seconds: float = 30.0,
+        max_pause_seconds: float = 300.0,
+    ):
+        self.db_path = db_path or agent_limiter.LIMITER_DB_PATH
+        self.failure_threshold = failure_threshold
+        self.window_seconds = window_seconds
+        self.cooldown_seconds = cooldown_seconds
+        self.max_pause_seconds = max_pause_seconds
+        os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS circuit_breaker (
+                    id INTEGER PRIMARY KEY CHECK (id = 1),
+                    failures INTEGER NOT NULL,
+                    window_start REAL NOT NULL,
+                    open_until REAL NOT NULL
+                )
+                """
+            )
+            conn.execute(
+                "INSERT OR IGNORE INTO circuit_breaker VALUES (1, 0, 0, 0)"
+            )
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    def record_failure(self, retry_after: Optional[float] = None) -> None:
+        """Record a rate-limit failure, opening the breaker if needed.
+
+        The breaker opens immediately when the API sent a retry-after hint,
+        or once failure_threshold failures occur within window_seconds.
+        """
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            failures, window_start, open_until = conn.execute(
+                "SELECT failures, window_start, open_until FROM circuit_breaker"
+            ).fetchone()
+            if now - window_start > self.window_seconds:
+                failures, window_start = 0, now
+            failures += 1
+
+            pause = None
+            if retry_after is not None:
+                pause = retry_after
+            elif failures >= self.failure_threshold:
+                pause = self.cooldown_seconds
+            if pause is not None:
+                open_until = max(open_until, now + min(pause, self.max_pause_seconds))
+
+            conn.execute(
+                "UPDATE circuit_breaker SET failures = ?, window_start = ?, open_until = ?",
+                (failures, window_start, open_until),
+            )
+            conn.execute("COMMIT")
+
+    def record_success(self) -> None:
+        """Record a successful call, resetting the failure count."""
+        with self._connect() as conn:
+            conn.execute("UPDATE circuit_breaker SET failures = 0")
+
+    def remaining_pause(self) -> float:
+        """Seconds until the breaker closes (0 when closed)."""
+        with self._connect() as conn:
+            (open_until,) = conn.execute(
+                "SELECT open_until FROM circuit_breaker"
+            ).fetchone()
+        return max(0.0, open_until - time.time())
+
+    def wait_until_closed(self) -> float:
+        """Block while the breaker is open. Returns seconds paused."""
+        paused = 0.0
+        while True:
+            remaining = self.remaining_pause()
+            if remaining <= 0:
+                return paused
+            time.sleep(remaining)
+            paused += remaining
+
+    async def wait_until_closed_async(self) -> float:
+        """Async variant of wait_until_closed."""
+        paused = 0.0
+        while True:
+            remaining = self.remaining_pause()
+            if remaining <= 0:
+                return paused
+            await asyncio.sleep(remaining)
+            paused += remaining
+
+
+_breaker: Optional[CircuitBreaker] = None
+
+
+def get_circuit_breaker() -> Optional[CircuitBreaker]:
+    """Return the process-wide circuit breaker, or None when disabled."""
+    global _breaker
+    if not CIRCUIT_BREAKER_ENABLED:
+        return None
+    if _breaker is None or _breaker.db_path != agent_limiter.LIMITER_DB_PATH:
+        _breaker = CircuitBreaker()
+    return _breaker
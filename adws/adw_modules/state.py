@@ -1,15 +1,86 @@
 """State management for ADW composable architecture.
 
-Provides persistent state management via file storage and
-transient state passing between scripts via stdin/stdout.
+Provides persistent state management via file storage (or a SQLite
+store, see state_store) and transient state passing between scripts
+via stdin/stdout.
 """
 
+import copy
+import glob
 import json
 import os
+import random
 import sys
 import logging
-from typing import Dict, Any, Optional
+import tempfile
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Any, Iterator, List, Optional, Tuple
 from adw_modules.data_types import ADWStateData
+from adw_modules.state_store import get_state_store
+
+try:
+    import fcntl
+except ImportError:  # Windows: writes stay atomic, but are not serialized
+    fcntl = None
+
+# __file__ is in adws/adw_modules/, so we need to go up 3 levels to get to project root
+PROJECT_ROOT = os.path.dirname(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+)
+AGENTS_DIR = os.path.join(PROJECT_ROOT, "agents")
+
+# "json" (one agents/{adw_id}/adw_state.json per run) or "sqlite" (see state_store)
+STATE_BACKEND = os.getenv("ADW_STATE_BACKEND", "json").lower()
+
+# Validated state per adw_id, keyed by the state file's stat signature
+# so repeated loads of an unchanged file only cost a stat call
+_state_cache: Dict[str, Tuple[Tuple[int, int, int, int], Dict[str, Any]]] = {}
+
+
+def _file_signature(path: str) -> Tuple[int, int, int, int]:
+    """Return (inode, mtime_ns, ctime_ns, size) identifying a file's version.
+
+    Saves replace the file with a renamed temp file, so the inode changes
+    even when a same-size rewrite lands within the mtime granularity.
+    """
+    stat = os.stat(path)
+    return stat.st_ino, stat.st_mtime_ns, stat.st_ctime_ns, stat.st_size
+
+
+def clear_state_cache() -> None:
+    """Forget all cached state (e.g. after editing state files out of band)."""
+    _state_cache.clear()
+
+
+class StateConflictError(RuntimeError):
+    """Raised when update_atomic keeps losing races with other writers."""
+
+
+def _write_json_atomic(path: str, data: Dict[str, Any]) -> None:
+    """Write JSON via a temp file, fsync and rename so readers never see a partial file."""
+    directory = os.path.dirname(path)
+    fd, tmp_path = tempfile.mkstemp(
+        dir=directory, prefix=f".{os.path.basename(path)}.", suffix=".tmp"
+    )
+    try:
+        with os.fdopen(fd, "w") as f:
+            json.dump(data, f, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+    # Persist the rename itself
+    if hasattr(os, "O_DIRECTORY"):
+        dir_fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
 
 
 class ADWState:
@@ -67,18 +138,33 @@ class ADWState:
 
     def get_state_path(self) -> str:
         """Get path to state file."""
-        project_root = os.path.dirname(
-            os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-        )
-        return os.path.join(project_root, "agents", self.adw_id, self.STATE_FILENAME)
+        return os.path.join(AGENTS_DIR, self.adw_id, self.STATE_FILENAME)
 
-    def save(self, workflow_step: Optional[str] = None) -> None:
-        """Save state to file in agents/{adw_id}/adw_state.json."""
+    @contextmanager
+    def _lock(self) -> Iterator[None]:
+        """Hold the per-adw_id advisory lock on agents/{adw_id}/adw_state.json.lock."""
         state_path = self.get_state_path()
         os.makedirs(os.path.dirname(state_path), exist_ok=True)
+        with open(f"{state_path}.lock", "a") as lock_file:
+            if fcntl:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
 
-        # Create ADWStateData for validation
-        state_data = ADWStateData(
+    def _read_version(self) -> int:
+        """Read the version currently on disk (0 if there is no state yet)."""
+        try:
+            with open(self.get_state_path(), "r") as f:
+                return int(json.load(f).get("version", 0))
+        except (OSError, ValueError):
+            return 0
+
+    def _to_state_data(self, version: int = 0) -> ADWStateData:
+        """Validate the core fields as ADWStateData."""
+        return ADWStateData(
             adw_id=self.data.get("adw_id"),
             issue_number=self.data.get("issue_number"),
             branch_name=self.data.get("branch_name"),
@@ -89,43 +175,142 @@ class ADWState:
             frontend_port=self.data.get("frontend_port"),
             model_set=self.data.get("model_set", "base"),
             all_adws=self.data.get("all_adws", []),
+            version=version,
+        )
+
+    def _write_file(self, state_data: ADWStateData) -> None:
+        """Atomically write state to the JSON file and refresh the cache."""
+        state_path = self.get_state_path()
+        _write_json_atomic(state_path, state_data.model_dump())
+        _state_cache[self.adw_id] = (
+            _file_signature(state_path),
+            copy.deepcopy(state_data.model_dump()),
         )
 
-        # Save as JSON
-        with open(state_path, "w") as f:
-            json.dump(state_data.model_dump(), f, indent=2)
+    def _store(self, expected_version: Optional[int] = None) -> bool:
+        """Persist state with a bumped version.
+
+        With expected_version, only writes if the stored version still
+        matches it. Returns False if that check failed.
+        """
+        if STATE_BACKEND == "sqlite":
+            version = get_state_store().put(self._to_state_data(), expected_version)
+            if version is None:
+                return False
+        else:
+            with self._lock():
+                current_version = self._read_version()
+                if expected_version is not None and current_version != expected_version:
+                    return False
+                version = current_version + 1
+                self._write_file(self._to_state_data(version))
+
+        self.data["version"] = version
+        return True
+
+    def _log_saved(self, workflow_step: Optional[str]) -> None:
+        """Log a save and append it to the run's phase event log."""
+        # Imported here: phase_log imports this module
+        from adw_modules.phase_log import append_event
 
-        self.logger.info(f"Saved state to {state_path}")
+        if STATE_BACKEND == "sqlite":
+            location = f"{get_state_store().db_path} ({self.adw_id})"
+        else:
+            location = self.get_state_path()
+        self.logger.info(f"Saved state to {location}")
         if workflow_step:
             self.logger.info(f"State updated by: {workflow_step}")
 
+        try:
+            append_event(
+                self.adw_id,
+                "state_saved",
+                step=workflow_step,
+                version=self.data.get("version"),
+            )
+        except OSError as e:
+            self.logger.warning(f"Failed to record state event: {e}")
+
+    def save(self, workflow_step: Optional[str] = None) -> None:
+        """Save state to agents/{adw_id}/adw_state.json (or the SQLite store).
+
+        The write is atomic and serialized with other writers of the same
+        adw_id, but last writer wins; use update_atomic for read-modify-write.
+        """
+        self._store()
+        self._log_saved(workflow_step)
+
+    def update_atomic(
+        self,
+        fn: Callable[["ADWState"], None],
+        workflow_step: Optional[str] = None,
+        max_attempts: int = 5,
+    ) -> "ADWState":
+        """Apply fn to the latest saved state and save it with compare-and-swap.
+
+        fn receives a freshly loaded ADWState and mutates it (e.g. via update).
+        If another writer saved in the meantime, fn is re-applied to the newer
+        state. On success this instance holds the saved data.
+
+        Raises:
+            StateConflictError: If every attempt lost a race with another writer
+        """
+        for attempt in range(max_attempts):
+            current = ADWState.load(self.adw_id) or ADWState(self.adw_id)
+            base_version = current.data.get("version", 0)
+            fn(current)
+
+            if current._store(expected_version=base_version):
+                self.data = current.data
+                self._log_saved(workflow_step)
+                return self
+
+            # Lost the race: back off briefly and retry against the new version
+            time.sleep(random.uniform(0, 0.05 * (attempt + 1)))
+
+        raise StateConflictError(
+            f"Could not update state for {self.adw_id} after {max_attempts} attempts"
+        )
+
     @classmethod
     def load(
         cls, adw_id: str, logger: Optional[logging.Logger] = None
     ) -> Optional["ADWState"]:
-        """Load state from file if it exists."""
-        project_root = os.path.dirname(
-            os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-        )
-        state_path = os.path.join(project_root, "agents", adw_id, cls.STATE_FILENAME)
+        """Load state from file (or the SQLite store) if it exists.
+
+        Parsed file state is cached in-process until the file's
+        (inode, mtime_ns, ctime_ns, size) signature changes.
+        """
+        if STATE_BACKEND == "sqlite":
+            return cls._load_from_store(adw_id, logger)
 
-        if not os.path.exists(state_path):
+        state_path = os.path.join(AGENTS_DIR, adw_id, cls.STATE_FILENAME)
+
+        try:
+            signature = _file_signature(state_path)
+        except OSError:
+            _state_cache.pop(adw_id, None)
             return None
 
         try:
-            with open(state_path, "r") as f:
-                data = json.load(f)
+            cached = _state_cache.get(adw_id)
+            if cached and cached[0] == signature:
+                data = cached[1]
+            else:
+                with open(state_path, "r") as f:
+                    raw_data = json.load(f)
 
-            # Validate with ADWStateData
-            state_data = ADWStateData(**data)
+                # Validate with ADWStateData
+                data = ADWStateData(**raw_data).model_dump()
+                _state_cache[adw_id] = (signature, data)
 
-            # Create ADWState instance
-            state = cls(state_data.adw_id)
-            state.data = state_data.model_dump()
+            # Create ADWState instance with its own copy of the cached data
+            state = cls(data["adw_id"])
+            state.data = copy.deepcopy(data)
 
             if logger:
                 logger.info(f"🔍 Found existing state from {state_path}")
-                logger.info(f"State: {json.dumps(state_data.model_dump(), indent=2)}")
+                logger.info(f"State: {json.dumps(data, indent=2)}")
 
             return state
         except Exception as e:
@@ -133,6 +318,73 @@ class ADWState:
                 logger.error(f"Failed to load state from {state_path}: {e}")
             return None
 
+    @classmethod
+    def _load_from_store(
+        cls, adw_id: str, logger: Optional[logging.Logger] = None
+    ) -> Optional["ADWState"]:
+        """Load state from the SQLite store."""
+        store = get_state_store()
+        try:
+            raw_data = store.get(adw_id)
+            if raw_data is None:
+                return None
+            data = ADWStateData(**raw_data).model_dump()
+
+            state = cls(data["adw_id"])
+            state.data = data
+
+            if logger:
+                logger.info(f"🔍 Found existing state for {adw_id} in {store.db_path}")
+                logger.info(f"State: {json.dumps(data, indent=2)}")
+
+            return state
+        except Exception as e:
+            if logger:
+                logger.error(f"Failed to load state for {adw_id} from {store.db_path}: {e}")
+            return None
+
+    @classmethod
+    def _find(cls, field: str, value: Any) -> List["ADWState"]:
+        """Return saved states whose field equals value, most recent first."""
+        if STATE_BACKEND == "sqlite":
+            store = get_state_store()
+            finders = {
+                "issue_number": store.find_by_issue,
+                "branch_name": store.find_by_branch,
+                "worktree_path": store.find_by_worktree,
+            }
+            states = []
+            for data in finders[field](value):
+                state = cls(data["adw_id"])
+                state.data = ADWStateData(**data).model_dump()
+                states.append(state)
+            return states
+
+        # JSON backend: scan every run directory
+        pattern = os.path.join(AGENTS_DIR, "*", cls.STATE_FILENAME)
+        paths = sorted(glob.glob(pattern), key=os.path.getmtime, reverse=True)
+        states = []
+        for path in paths:
+            state = cls.load(os.path.basename(os.path.dirname(path)))
+            if state and state.get(field) == value:
+                states.append(state)
+        return states
+
+    @classmethod
+    def find_by_issue(cls, issue_number: str) -> List["ADWState"]:
+        """Return all saved runs for an issue, most recently saved first."""
+        return cls._find("issue_number", str(issue_number))
+
+    @classmethod
+    def find_by_branch(cls, branch_name: str) -> List["ADWState"]:
+        """Return all saved runs on a branch, most recently saved first."""
+        return cls._find("branch_name", branch_name)
+
+    @classmethod
+    def find_by_worktree(cls, worktree_path: str) -> List["ADWState"]:
+        """Return all saved runs using a worktree, most recently saved first."""
+        return cls._find("worktree_path", worktree_path)
+
     @classmethod
     def from_stdin(cls) -> Optional["ADWState"]:
         """Read state from stdin if available (for piped input).
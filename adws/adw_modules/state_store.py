@@ -0,0 +1,208 @@
+"""SQLite backend for ADW state.
+
+With ADW_STATE_BACKEND=sqlite, ADWState keeps every run's state as one row
+of a single WAL-mode database (agents/adw_state.db) instead of one JSON
+file per run. Lookups by issue number, branch name and worktree path are
+indexed, so they stay fast with thousands of historical runs.
+
+Existing JSON state can be imported once with:
+    uv run adw_migrate_state.py
+"""
+
+import glob
+import json
+import os
+import sqlite3
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+from pydantic import ValidationError
+
+from .data_types import ADWStateData
+
+# __file__ is in adws/adw_modules/, so we need to go up 3 levels to get to project root
+PROJECT_ROOT = os.path.dirname(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+)
+STATE_DB_PATH = os.path.join(PROJECT_ROOT, "agents", "adw_state.db")
+
+# Columns stored as-is; all_adws is stored as a JSON array
+_SCALAR_FIELDS = [
+    "issue_number",
+    "branch_name",
+    "plan_file",
+    "issue_class",
+    "worktree_path",
+    "backend_port",
+    "frontend_port",
+    "model_set",
+]
+
+
+class StateStore:
+    """ADW state rows in a WAL-mode SQLite database shared by all processes."""
+
+    def __init__(self, db_path: str = STATE_DB_PATH):
+        self.db_path = db_path
+        os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS adw_state (
+                    adw_id TEXT PRIMARY KEY,
+                    issue_number TEXT,
+                    branch_name TEXT,
+                    plan_file TEXT,
+                    issue_class TEXT,
+                    worktree_path TEXT,
+                    backend_port INTEGER,
+                    frontend_port INTEGER,
+                    model_set TEXT,
+                    all_adws TEXT NOT NULL DEFAULT '[]',
+                    version INTEGER NOT NULL DEFAULT 0,
+                    updated_at REAL NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS idx_adw_state_issue
+                    ON adw_state (issue_number);
+                CREATE INDEX IF NOT EXISTS idx_adw_state_branch
+                    ON adw_state (branch_name);
+                CREATE INDEX IF NOT EXISTS idx_adw_state_worktree
+                    ON adw_state (worktree_path);
+                """
+            )
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Open a connection in autocommit mode; transactions are explicit."""
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _row_to_data(row: sqlite3.Row) -> Dict[str, Any]:
+        data = {"adw_id": row["adw_id"], "version": row["version"]}
+        for field in _SCALAR_FIELDS:
+            data[field] = row[field]
+        data["all_adws"] = json.loads(row["all_adws"])
+        return data
+
+    def get(self, adw_id: str) -> Optional[Dict[str, Any]]:
+        """Return the stored state for adw_id, or None."""
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT * FROM adw_state WHERE adw_id = ?", (adw_id,)
+            ).fetchone()
+        return self._row_to_data(row) if row else None
+
+    def put(
+        self, state_data: ADWStateData, expected_version: Optional[int] = None
+    ) -> Optional[int]:
+        """Write state, bumping its version.
+
+        Args:
+            state_data: Validated state to store (its version is ignored)
+            expected_version: If given, only write when the stored version
+                (0 for a new run) still equals it
+
+        Returns:
+            The new version, or None if expected_version did not match
+        """
+        data = state_data.model_dump()
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = conn.execute(
+                    "SELECT version FROM adw_state WHERE adw_id = ?",
+                    (state_data.adw_id,),
+                ).fetchone()
+                current_version = row["version"] if row else 0
+                if expected_version is not None and current_version != expected_version:
+                    conn.execute("ROLLBACK")
+                    return None
+
+                version = current_version + 1
+                conn.execute(
+                    f"INSERT OR REPLACE INTO adw_state "
+                    f"(adw_id, {', '.join(_SCALAR_FIELDS)}, all_adws, version, updated_at) "
+                    f"VALUES ({', '.join('?' * (len(_SCALAR_FIELDS) + 4))})",
+                    (
+                        state_data.adw_id,
+                        *(data[field] for field in _SCALAR_FIELDS),
+                        json.dumps(data["all_adws"]),
+                        version,
+                        time.time(),
+                    ),
+                )
+                conn.execute("COMMIT")
+                return version
+            except Exception:
+                if conn.in_transaction:
+                    conn.execute("ROLLBACK")
+                raise
+
+    def _find(self, where: str, params: tuple) -> List[Dict[str, Any]]:
+        with self._connect() as conn:
+            rows = conn.execute(
+                f"SELECT * FROM adw_state WHERE {where} ORDER BY updated_at DESC, rowid DESC",
+                params,
+            ).fetchall()
+        return [self._row_to_data(row) for row in rows]
+
+    def find_by_issue(self, issue_number: str) -> List[Dict[str, Any]]:
+        """Return all runs for an issue, most recently updated first."""
+        return self._find("issue_number = ?", (str(issue_number),))
+
+    def find_by_branch(self, branch_name: str) -> List[Dict[str, Any]]:
+        """Return all runs on a branch, most recently updated first."""
+        return self._find("branch_name = ?", (branch_name,))
+
+    def find_by_worktree(self, worktree_path: str) -> List[Dict[str, Any]]:
+        """Return all runs using a worktree, most recently updated first."""
+        return self._find("worktree_path = ?", (worktree_path,))
+
+
+def migrate_json_states(
+    agents_dir: Optional[str] = None, store: Optional[StateStore] = None
+) -> Dict[str, int]:
+    """Import every agents/*/adw_state.json into the SQLite store.
+
+    Runs already in the store are left untouched, so the migration can be
+    re-run safely.
+
+    Returns:
+        Counts of {"migrated", "skipped", "invalid"} state files
+    """
+    agents_dir = agents_dir or os.path.join(PROJECT_ROOT, "agents")
+    store = store or StateStore()
+    counts = {"migrated": 0, "skipped": 0, "invalid": 0}
+
+    for path in sorted(glob.glob(os.path.join(agents_dir, "*", "adw_state.json"))):
+        try:
+            with open(path, "r") as f:
+                state_data = ADWStateData(**json.load(f))
+        except (OSError, ValueError, ValidationError):
+            counts["invalid"] += 1
+            continue
+
+        if store.put(state_data, expected_version=0) is None:
+            counts["skipped"] += 1
+        else:
+            counts["migrated"] += 1
+
+    return counts
+
+
+_store: Optional[StateStore] = None
+
+
+def get_state_store() -> StateStore:
+    """Return the process-wide store for STATE_DB_PATH."""
+    global _store
+    if _store is None or _store.db_path != STATE_DB_PATH:
+        _store = StateStore(STATE_DB_PATH)
+    return _store
@@ -0,0 +1,178 @@
+"""Shared dedupe store for the cron and webhook triggers.
+
+Both triggers claim an issue here before launching a workflow for it, so a
+webhook delivery and a cron tick (or a restarted poller) cannot launch the
+same issue twice. Per issue, agents/trigger_dedupe.db keeps:
+
+- the last handled trigger: the ID of the comment that triggered a run, or
+  NEW_ISSUE_KEY for a run started by the issue itself
+- an in-flight marker while a launched workflow is running, which expires
+  after ADW_TRIGGER_IN_FLIGHT_TTL seconds in case the trigger died
+
+Issues not touched for ADW_TRIGGER_DEDUPE_TTL seconds are evicted.
+"""
+
+import os
+import sqlite3
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional
+
+# __file__ is in adws/adw_modules/, so we need to go up 3 levels to get to project root
+PROJECT_ROOT = os.path.dirname(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+)
+DEDUPE_DB_PATH = os.path.join(PROJECT_ROOT, "agents", "trigger_dedupe.db")
+
+DEDUPE_TTL_SECONDS = float(os.getenv("ADW_TRIGGER_DEDUPE_TTL", str(30 * 86400)))
+IN_FLIGHT_TTL_SECONDS = float(os.getenv("ADW_TRIGGER_IN_FLIGHT_TTL", str(6 * 3600)))
+
+# Trigger key for a run started by the issue itself rather than a comment
+NEW_ISSUE_KEY = "issue"
+
+
+class TriggerDedupeStore:
+    """Per-issue trigger claims in a WAL-mode SQLite database."""
+
+    def __init__(
+        self,
+        db_path: str = DEDUPE_DB_PATH,
+        ttl_seconds: float = DEDUPE_TTL_SECONDS,
+        in_flight_ttl_seconds: float = IN_FLIGHT_TTL_SECONDS,
+    ):
+        self.db_path = db_path
+        self.ttl_seconds = ttl_seconds
+        self.in_flight_ttl_seconds = in_flight_ttl_seconds
+        os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS issues (
+                    repo_path TEXT NOT NULL,
+                    issue_number TEXT NOT NULL,
+                    last_trigger TEXT,
+                    source TEXT,
+                    adw_id TEXT,
+                    in_flight_until REAL NOT NULL DEFAULT 0,
+                    updated_at REAL NOT NULL,
+                    PRIMARY KEY (repo_path, issue_number)
+                )
+                """
+            )
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Open a connection in autocommit mode; transactions are explicit."""
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    def get(self, repo_path: str, issue_number: Any) -> Optional[Dict[str, Any]]:
+        """Return the stored record for an issue, or None."""
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT * FROM issues WHERE repo_path = ? AND issue_number = ?",
+                (repo_path, str(issue_number)),
+            ).fetchone()
+        return dict(row) if row else None
+
+    def claim(
+        self,
+        repo_path: str,
+        issue_number: Any,
+        trigger_key: str,
+        source: str,
+        adw_id: Optional[str] = None,
+    ) -> bool:
+        """Claim an issue for launching a workflow.
+
+        Fails if a workflow for the issue is still in flight or trigger_key
+        was already handled. On success the issue is marked in flight.
+
+        Args:
+            repo_path: owner/repo
+            issue_number: The issue number
+            trigger_key: ID of the triggering comment, or NEW_ISSUE_KEY
+            source: Who is claiming ("cron", "webhook")
+            adw_id: The ADW ID that will run, if already known
+
+        Returns:
+            True if the caller should launch the workflow
+        """
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.execute(
+                    "DELETE FROM issues WHERE updated_at < ? AND in_flight_until < ?",
+                    (now - self.ttl_seconds, now),
+                )
+                row = conn.execute(
+                    "SELECT last_trigger, in_flight_until FROM issues "
+                    "WHERE repo_path = ? AND issue_number = ?",
+                    (repo_path, str(issue_number)),
+                ).fetchone()
+                if row and (
+                    row["in_flight_until"] > now or row["last_trigger"] == trigger_key
+                ):
+                    conn.execute("ROLLBACK")
+                    return False
+
+                conn.execute(
+                    "INSERT OR REPLACE INTO issues VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        repo_path,
+                        str(issue_number),
+                        trigger_key,
+                        source,
+                        adw_id,
+                        now + self.in_flight_ttl_seconds,
+                        now,
+                    ),
+                )
+                conn.execute("COMMIT")
+                return True
+            except Exception:
+                if conn.in_transaction:
+                    conn.execute("ROLLBACK")
+                raise
+
+    def release(
+        self,
+        repo_path: str,
+        issue_number: Any,
+        handled: bool = True,
+        adw_id: Optional[str] = None,
+    ) -> None:
+        """Clear an issue's in-flight marker once its workflow has finished.
+
+        With handled=False (the launch failed) the trigger is forgotten too,
+        so the next poll or delivery retries it. With adw_id, only a claim
+        made for that ADW ID is released.
+        """
+        query = (
+            "UPDATE issues SET in_flight_until = 0, updated_at = ?"
+            + ("" if handled else ", last_trigger = NULL")
+            + " WHERE repo_path = ? AND issue_number = ?"
+        )
+        params = [time.time(), repo_path, str(issue_number)]
+        if adw_id is not None:
+            query += " AND adw_id = ?"
+            params.append(adw_id)
+        with self._connect() as conn:
+            conn.execute(query, params)
+
+
+_store: Optional[TriggerDedupeStore] = None
+
+
+def get_trigger_dedupe_store() -> TriggerDedupeStore:
+    """Return the process-wide store for DEDUPE_DB_PATH."""
+    global _store
+    if _store is None or _store.db_path != DEDUPE_DB_PATH:
+        _store = TriggerDedupeStore(DEDUPE_DB_PATH)
+    return _store
@@ -0,0 +1,347 @@
+"""Durable queue for GitHub webhook deliveries.
+
+trigger_webhook checks a delivery's signature, appends the raw body to
+agents/webhook_queue.db and answers 202 right away. Dispatcher threads then
+claim deliveries oldest first, and do the slow part (workflow
+classification, state creation and the workflow launch) outside the
+request path. A delivery stays queued until it is completed, so deliveries
+accepted just before a crash or restart are dispatched by the next process.
+Workflow launches wait in trigger_webhook's in-memory pool, so a delivery
+that launches one is held as 'launching' until the workflow has actually
+started; if the pool is shut down first, or the process holding it dies,
+the delivery goes back to 'pending' and is dispatched again.
+
+The table doubles as the delivery log: each X-GitHub-Delivery ID is stored
+once, under a unique index, with its outcome. GitHub redelivers on
+timeouts, and a redelivery of an ID already in the log is dropped instead
+of launching a second workflow. Deliveries whose dispatch failed can be
+replayed from the log without GitHub (`trigger_webhook.py replay`).
+
+Configure via:
+- GITHUB_WEBHOOK_SECRET: the webhook's secret; when set, deliveries without
+  a valid X-Hub-Signature-256 are rejected
+- ADW_WEBHOOK_DISPATCHERS: number of dispatcher threads (default: 2)
+"""
+
+import hashlib
+import hmac
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+from .agent_limiter import _pid_alive
+
+# __file__ is in adws/adw_modules/, so we need to go up 3 levels to get to project root
+PROJECT_ROOT = os.path.dirname(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+)
+WEBHOOK_QUEUE_DB_PATH = os.path.join(PROJECT_ROOT, "agents", "webhook_queue.db")
+
+DISPATCHER_THREADS = int(os.getenv("ADW_WEBHOOK_DISPATCHERS", "2"))
+MAX_ATTEMPTS = 5
+CLAIM_LEASE_SECONDS = 600.0  # Classification is a Claude call and can be slow
+DONE_MAX_AGE_SECONDS = 7 * 86400  # Forget logged deliveries after a week
+
+
+def verify_signature(secret: str, body: bytes, signature: Optional[str]) -> bool:
+    """Check a delivery's X-Hub-Signature-256 header against the webhook secret."""
+    if not signature or not signature.startswith("sha256="):
+        return False
+    expected = hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+    return hmac.compare_digest(signature[len("sha256=") :], expected)
+
+
+class WebhookQueue:
+    """Webhook deliveries waiting to be dispatched, in a WAL-mode SQLite database."""
+
+    def __init__(self, db_path: str = WEBHOOK_QUEUE_DB_PATH):
+        self.db_path = db_path
+        # Set whenever a delivery is queued, so idle dispatchers wake up at once
+        self.ready = threading.Event()
+        os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS deliveries (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    delivery_id TEXT,
+                    event TEXT NOT NULL,
+                    body BLOB NOT NULL,
+                    status TEXT NOT NULL DEFAULT 'pending',
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    next_attempt_at REAL NOT NULL DEFAULT 0,
+                    claimed_until REAL NOT NULL DEFAULT 0,
+                    held_by INTEGER,
+                    result TEXT,
+                    received_at REAL NOT NULL,
+                    updated_at REAL NOT NULL
+                );
+                CREATE UNIQUE INDEX IF NOT EXISTS deliveries_delivery_id
+                    ON deliveries (delivery_id) WHERE delivery_id IS NOT NULL;
+                """
+            )
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Open a connection in autocommit mode; transactions are explicit."""
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    def enqueue(
+        self, event: str, body: bytes, delivery_id: Optional[str] = None
+    ) -> Optional[int]:
+        """Persist a raw delivery and return its queue ID.
+
+        Returns:
+            None if delivery_id is already in the log (a redelivery)
+        """
+        now = time.time()
+        with self._connect() as conn:
+            cursor = conn.execute(
+                "INSERT OR IGNORE INTO deliveries "
+                "(delivery_id, event, body, received_at, updated_at) VALUES (?, ?, ?, ?, ?)",
+                (delivery_id, event, body, now, now),
+            )
+        if not cursor.rowcount:
+            return None
+        self.ready.set()
+        return cursor.lastrowid
+
+    def claim(self, queue_ids: Optional[Sequence[int]] = None) -> Optional[Dict[str, Any]]:
+        """Claim the oldest delivery that is due, or return None.
+
+        The claim is a lease: a delivery whose dispatcher died is handed out
+        again once CLAIM_LEASE_SECONDS have passed.
+
+        Args:
+            queue_ids: Only claim among these deliveries
+        """
+        now = time.time()
+        query = (
+            "SELECT * FROM deliveries WHERE status = 'pending' "
+            "AND next_attempt_at <= ? AND claimed_until <= ?"
+        )
+        params: List[Any] = [now, now]
+        if queue_ids is not None:
+            query += " AND id IN (%s)" % ",".join("?" * len(queue_ids))
+            params.extend(queue_ids)
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = conn.execute(query + " ORDER BY id LIMIT 1", params).fetchone()
+                if row:
+                    conn.execute(
+                        "UPDATE deliveries SET claimed_until = ? WHERE id = ?",
+                        (now + CLAIM_LEASE_SECONDS, row["id"]),
+                    )
+                conn.execute("COMMIT")
+                return dict(row) if row else None
+            except Exception:
+                if conn.in_transaction:
+                    conn.execute("ROLLBACK")
+                raise
+
+    def complete(self, queue_id: int, result: str) -> None:
+        """Record a delivery's outcome and forget old logged deliveries."""
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE deliveries SET status = 'done', result = ?, claimed_until = 0, "
+                "updated_at = ? WHERE id = ?",
+                (result, now, queue_id),
+            )
+            conn.execute(
+                "DELETE FROM deliveries WHERE status IN ('done', 'failed') "
+                "AND updated_at < ?",
+                (now - DONE_MAX_AGE_SECONDS,),
+            )
+
+    def hold(self, queue_id: int, result: str) -> None:
+        """Park a claimed delivery whose workflow is queued but not started.
+
+        Held deliveries are not claimed again; complete() them once the
+        workflow has started, or requeue() them if it never will. The hold
+        records this process's pid for recover(). A delivery that was
+        already completed is left alone.
+        """
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE deliveries SET status = 'launching', result = ?, claimed_until = 0, "
+                "held_by = ?, updated_at = ? WHERE id = ? AND status = 'pending'",
+                (result, os.getpid(), time.time(), queue_id),
+            )
+
+    def requeue(self, queue_id: int) -> None:
+        """Queue a delivery again at once, without using up a retry."""
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE deliveries SET status = 'pending', next_attempt_at = 0, "
+                "claimed_until = 0, updated_at = ? WHERE id = ? AND status != 'done'",
+                (time.time(), queue_id),
+            )
+        self.ready.set()
+
+    def recover(self) -> List[Dict[str, Any]]:
+        """Requeue the deliveries held by a process that is gone.
+
+        Call once at startup, before dispatching: the in-memory pool the
+        held workflows were waiting in died with its process. Deliveries
+        held by another live process (e.g. a replay still waiting for its
+        workflows to start) are left alone. A hold recorded under this
+        process's own pid is stale, since the pid was reused.
+
+        Returns:
+            The deliveries that were queued again, as they were held
+        """
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                rows = [
+                    row
+                    for row in conn.execute(
+                        "SELECT * FROM deliveries WHERE status = 'launching' ORDER BY id"
+                    ).fetchall()
+                    if row["held_by"] is None
+                    or row["held_by"] == os.getpid()
+                    or not _pid_alive(row["held_by"])
+                ]
+                conn.executemany(
+                    "UPDATE deliveries SET status = 'pending', next_attempt_at = 0, "
+                    "claimed_until = 0, held_by = NULL, updated_at = ? "
+                    "WHERE id = ? AND status = 'launching'",
+                    [(time.time(), row["id"]) for row in rows],
+                )
+                conn.execute("COMMIT")
+            except Exception:
+                if conn.in_transaction:
+                    conn.execute("ROLLBACK")
+                raise
+        if rows:
+            self.ready.set()
+        return [dict(row) for row in rows]
+
+    def fail(self, queue_id: int, error: str) -> bool:
+        """Record a failed dispatch; retried with backoff up to MAX_ATTEMPTS.
+
+        Returns:
+            True if the delivery will be retried
+        """
+        with self._connect() as conn:
+            attempts = (
+                conn.execute(
+                    "SELECT attempts FROM deliveries WHERE id = ?", (queue_id,)
+                ).fetchone()[0]
+                + 1
+            )
+            retry = attempts < MAX_ATTEMPTS
+            conn.execute(
+                "UPDATE deliveries SET attempts = ?, status = ?, result = ?, "
+                "next_attempt_at = ?, claimed_until = 0, updated_at = ? WHERE id = ?",
+                (
+                    attempts,
+                    "pending" if retry else "failed",
+                    error,
+                    time.time() + min(2**attempts, 300),
+                    time.time(),
+                    queue_id,
+                ),
+            )
+        return retry
+
+    def replay(self, delivery_ids: Sequence[str] = ()) -> List[int]:
+        """Queue failed deliveries again, with a fresh retry budget.
+
+        Args:
+            delivery_ids: X-GitHub-Delivery IDs to replay, failed or already
+                dispatched; if empty, every delivery whose dispatch failed
+
+        Returns:
+            The queue IDs that were queued again
+        """
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                if delivery_ids:
+                    rows = conn.execute(
+                        "SELECT id FROM deliveries WHERE status IN ('done', 'failed') "
+                        "AND delivery_id IN (%s)" % ",".join("?" * len(delivery_ids)),
+                        list(delivery_ids),
+                    ).fetchall()
+                else:
+                    rows = conn.execute(
+                        "SELECT id FROM deliveries WHERE status = 'failed'"
+                    ).fetchall()
+                queue_ids = [row["id"] for row in rows]
+                conn.executemany(
+                    "UPDATE deliveries SET status = 'pending', attempts = 0, "
+                    "next_attempt_at = 0, claimed_until = 0, updated_at = ? WHERE id = ?",
+                    [(time.time(), queue_id) for queue_id in queue_ids],
+                )
+                conn.execute("COMMIT")
+            except Exception:
+                if conn.in_transaction:
+                    conn.execute("ROLLBACK")
+                raise
+        if queue_ids:
+            self.ready.set()
+        return sorted(queue_ids)
+
+    def list_deliveries(
+        self, status: Optional[str] = None, limit: int = 50
+    ) -> List[Dict[str, Any]]:
+        """Return the most recent log entries (without bodies), newest first."""
+        query = (
+            "SELECT id, delivery_id, event, status, attempts, result, received_at, "
+            "updated_at FROM deliveries"
+        )
+        params: List[Any] = []
+        if status:
+            query += " WHERE status = ?"
+            params.append(status)
+        with self._connect() as conn:
+            rows = conn.execute(
+                query + " ORDER BY id DESC LIMIT ?", params + [limit]
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def get(self, queue_id: int) -> Optional[Dict[str, Any]]:
+        """Return a queued delivery by ID, or None."""
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT * FROM deliveries WHERE id = ?", (queue_id,)
+            ).fetchone()
+        return dict(row) if row else None
+
+    def get_by_delivery_id(self, delivery_id: str) -> Optional[Dict[str, Any]]:
+        """Return a logged delivery by its X-GitHub-Delivery ID, or None."""
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT * FROM deliveries WHERE delivery_id = ?", (delivery_id,)
+            ).fetchone()
+        return dict(row) if row else None
+
+    def pending_count(self) -> int:
+        """Return the number of deliveries not yet dispatched."""
+        with self._connect() as conn:
+            return conn.execute(
+                "SELECT COUNT(*) FROM deliveries WHERE status = 'pending'"
+            ).fetchone()[0]
+
+
+_queue: Optional[WebhookQueue] = None
+
+
+def get_webhook_queue() -> WebhookQueue:
+    """Return the process-wide queue for WEBHOOK_QUEUE_DB_PATH."""
+    global _queue
+    if _queue is None or _queue.db_path != WEBHOOK_QUEUE_DB_PATH:
+        _queue = WebhookQueue(WEBHOOK_QUEUE_DB_PATH)
+    return _queue
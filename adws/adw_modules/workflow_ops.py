@@ -16,7 +16,7 @@ from adw_modules.data_types import (
 )
 from adw_modules.agent import execute_template
 from adw_modules.github import get_repo_url, extract_repo_path, ADW_BOT_IDENTIFIER
-from adw_modules.state import ADWState
+from adw_modules.state import ADWState, STATE_BACKEND
 from adw_modules.utils import parse_json
 
 
@@ -46,6 +46,16 @@ AVAILABLE_ADW_WORKFLOWS = [
     "adw_sdlc_iso",
 ]
 
+# Lowercase workflow name -> canonical name in AVAILABLE_ADW_WORKFLOWS
+_WORKFLOWS_BY_LOWER = {name.lower(): name for name in AVAILABLE_ADW_WORKFLOWS}
+
+# Tokens of a well-formed ADW command, e.g. "adw_plan_build_iso adw-1234abcd heavy"
+_COMMAND_TOKEN_PATTERN = re.compile(r"[^\s,;`'\"()\[\]]+")
+_PREFIXED_ADW_ID_PATTERN = re.compile(r"^adw[-_]?(?:id)?[-_:=]([a-z0-9]{8})$")
+_BARE_ADW_ID_PATTERN = re.compile(r"^[0-9a-f]{8}$")
+_MODEL_SET_PATTERN = re.compile(r"^(?:model[-_]?set[:=])?(base|heavy)$")
+_LABEL_TOKENS = {"adw_id", "adw_id:", "adw-id:", "model_set", "model_set:", "workflow", "workflow:", ":", "="}
+
 
 def format_issue_message(
     adw_id: str, agent_name: str, message: str, session_id: Optional[str] = None
@@ -57,10 +67,65 @@ def format_issue_message(
     return f"{ADW_BOT_IDENTIFIER} {adw_id}_{agent_name}: {message}"
 
 
+def parse_adw_command(text: str) -> Optional[ADWExtractionResult]:
+    """Deterministically parse a well-formed ADW command.
+
+    Handles text made up only of a workflow name, an optional 8-character
+    ADW ID (bare, "adw-<id>" or "adw_id: <id>") and an optional model set,
+    e.g. "adw_plan_build_iso adw-1234abcd heavy".
+
+    Returns None when the text is anything else (prose, several workflows,
+    conflicting IDs), so the caller can fall back to the LLM classifier.
+    """
+    workflows = set()
+    adw_ids = set()
+    model_sets = set()
+
+    for raw_token in _COMMAND_TOKEN_PATTERN.findall(text):
+        token = raw_token.lower().strip(".!?")
+        if not token or token in _LABEL_TOKENS:
+            continue
+        # Labels may be glued to their value, e.g. "adw_id:1234abcd"
+        for label in ("adw_id:", "adw_id=", "workflow:", "workflow="):
+            if token.startswith(label) and len(token) > len(label):
+                token = token[len(label):]
+                break
+
+        workflow = _WORKFLOWS_BY_LOWER.get(token.lstrip("/"))
+        prefixed_id = _PREFIXED_ADW_ID_PATTERN.match(token)
+        model_set = _MODEL_SET_PATTERN.match(token)
+        if workflow:
+            workflows.add(workflow)
+        elif prefixed_id:
+            adw_ids.add(prefixed_id.group(1))
+        elif _BARE_ADW_ID_PATTERN.match(token):
+            adw_ids.add(token)
+        elif model_set:
+            model_sets.add(model_set.group(1))
+        else:
+            return None  # Free text: let the classifier interpret it
+
+    if len(workflows) != 1 or len(adw_ids) > 1 or len(model_sets) > 1:
+        return None
+
+    return ADWExtractionResult(
+        workflow_command=workflows.pop(),
+        adw_id=adw_ids.pop() if adw_ids else None,
+        model_set=model_sets.pop() if model_sets else "base",
+    )
+
+
 def extract_adw_info(text: str, temp_adw_id: str) -> ADWExtractionResult:
-    """Extract ADW workflow, ID, and model_set from text using classify_adw agent.
+    """Extract ADW workflow, ID, and model_set from text.
+
+    Well-formed commands are parsed directly by parse_adw_command; anything
+    else is interpreted by the classify_adw agent.
     Returns ADWExtractionResult with workflow_command, adw_id, and model_set."""
 
+    parsed = parse_adw_command(text)
+    if parsed:
+        return parsed
+
     # Use classify_adw to extract structured info
     request = AgentTemplateRequest(
         agent_name="adw_classifier",
@@ -472,6 +537,14 @@ def find_plan_for_issue(
         if os.path.exists(plan_path):
             return plan_path
 
+    # Then runs recorded in state for this issue. Only indexed with the
+    # SQLite backend: with JSON state it would parse every state file
+    if STATE_BACKEND == "sqlite":
+        for state in ADWState.find_by_issue(issue_number):
+            plan_path = os.path.join(agents_dir, state.adw_id, AGENT_PLANNER, "plan.md")
+            if os.path.exists(plan_path):
+                return plan_path
+
     # Otherwise, search all agent directories
     for agent_id in os.listdir(agents_dir):
         agent_path = os.path.join(agents_dir, agent_id)
@@ -0,0 +1,270 @@
+"""Bounded background pool for workflow launches.
+
+Triggers submit workflow commands and return at once; at most max_workers
+workflows run at a time and the rest wait in a priority queue, ordered by
+the issue's labels and then by submission time. Worker threads reap each
+child as it exits. Every job's status, PID, exit code and timings are
+tracked, and its output goes to agents/workflow_jobs/<job_id>.log. Jobs
+with an ADW ID also persist their record, exit status included, to
+agents/<adw_id>/workflow_job.json whenever it changes.
+
+Configure via:
+- ADW_MAX_WORKFLOWS: workflows each trigger runs concurrently (default: 2)
+- ADW_LABEL_PRIORITY: comma-separated label:priority pairs, lower runs
+  first (default: "urgent:0,bug:1"; unlisted labels get 5)
+"""
+
+import itertools
+import json
+import os
+import queue
+import subprocess
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Set
+
+from .data_types import WorkflowJob
+from .utils import make_adw_id
+
+# __file__ is in adws/adw_modules/, so we need to go up 3 levels to get to project root
+PROJECT_ROOT = os.path.dirname(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+)
+AGENTS_DIR = os.path.join(PROJECT_ROOT, "agents")
+JOB_LOG_DIR = os.path.join(AGENTS_DIR, "workflow_jobs")
+JOB_RECORD_FILE = "workflow_job.json"
+
+MAX_WORKFLOWS = int(os.getenv("ADW_MAX_WORKFLOWS", "2"))
+LABEL_PRIORITY = os.getenv("ADW_LABEL_PRIORITY", "urgent:0,bug:1")
+DEFAULT_PRIORITY = 5
+MAX_FINISHED_JOBS = 200  # Finished jobs kept for status reporting
+FINISHED_STATUSES = ("succeeded", "failed", "cancelled")
+
+
+def parse_label_priorities(spec: str = LABEL_PRIORITY) -> Dict[str, int]:
+    """Parse "label:priority,..." into a mapping, skipping malformed pairs."""
+    priorities = {}
+    for pair in spec.split(","):
+        label, _, priority = pair.strip().rpartition(":")
+        if label and priority.strip().lstrip("-").isdigit():
+            priorities[label.strip().lower()] = int(priority)
+    return priorities
+
+
+def get_label_priority(labels: Iterable[str], spec: str = LABEL_PRIORITY) -> int:
+    """Return the most urgent priority among an issue's labels."""
+    priorities = parse_label_priorities(spec)
+    return min(
+        (priorities[label.lower()] for label in labels if label.lower() in priorities),
+        default=DEFAULT_PRIORITY,
+    )
+
+
+def save_job_record(job: WorkflowJob, agents_dir: str = AGENTS_DIR) -> None:
+    """Write a job's record to agents/<adw_id>/workflow_job.json atomically."""
+    path = os.path.join(agents_dir, job.adw_id, JOB_RECORD_FILE)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(job.model_dump(), f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def load_job_record(adw_id: str, agents_dir: str = AGENTS_DIR) -> Optional[WorkflowJob]:
+    """Return the last recorded job for an ADW ID, or None."""
+    path = os.path.join(agents_dir, adw_id, JOB_RECORD_FILE)
+    try:
+        with open(path) as f:
+            return WorkflowJob(**json.load(f))
+    except (OSError, ValueError):
+        return None
+
+
+class WorkflowPool:
+    """Runs submitted workflow commands on a fixed number of worker threads."""
+
+    def __init__(
+        self,
+        max_workers: int = MAX_WORKFLOWS,
+        on_finish: Optional[Callable[[WorkflowJob], None]] = None,
+        on_start: Optional[Callable[[WorkflowJob], None]] = None,
+        log_dir: str = JOB_LOG_DIR,
+        agents_dir: str = AGENTS_DIR,
+    ):
+        self.max_workers = max(1, max_workers)
+        self.on_finish = on_finish
+        self.on_start = on_start
+        self.log_dir = log_dir
+        self.agents_dir = agents_dir
+        self.jobs: Dict[str, WorkflowJob] = {}
+        self._queue: "queue.PriorityQueue" = queue.PriorityQueue()
+        self._sequence = itertools.count()
+        self._lock = threading.Lock()
+        # Notified when a job has started (on_start has run) or finished
+        self._changed = threading.Condition(self._lock)
+        self._started: Set[str] = set()
+        self._closed = False
+        self._workers = [
+            threading.Thread(target=self._work, name=f"workflow-worker-{i}", daemon=True)
+            for i in range(self.max_workers)
+        ]
+        for worker in self._workers:
+            worker.start()
+
+    def submit(
+        self,
+        issue_number: int,
+        cmd: List[str],
+        priority: int = DEFAULT_PRIORITY,
+        cwd: Optional[str] = None,
+        env: Optional[Dict[str, str]] = None,
+        adw_id: Optional[str] = None,
+        workflow: Optional[str] = None,
+        repo_path: Optional[str] = None,
+        delivery_queue_id: Optional[int] = None,
+    ) -> WorkflowJob:
+        """Queue a workflow command and return its job without waiting."""
+        job_id = make_adw_id()
+        job = WorkflowJob(
+            job_id=job_id,
+            issue_number=issue_number,
+            cmd=cmd,
+            adw_id=adw_id,
+            workflow=workflow,
+            repo_path=repo_path,
+            delivery_queue_id=delivery_queue_id,
+            priority=priority,
+            submitted_at=time.time(),
+            log_file=os.path.join(self.log_dir, f"{job_id}.log"),
+        )
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Workflow pool is shut down")
+            self.jobs[job.job_id] = job
+            self._prune()
+        self._record(job)
+        self._queue.put((priority, next(self._sequence), job, cwd, env))
+        return job
+
+    def _record(self, job: WorkflowJob) -> None:
+        if not job.adw_id:
+            return
+        try:
+            save_job_record(job, self.agents_dir)
+        except OSError as e:
+            print(f"ERROR: Failed to record workflow job {job.job_id}: {e}")
+
+    def _prune(self) -> None:
+        finished = [
+            job
+            for job in self.jobs.values()
+            if job.status in FINISHED_STATUSES
+        ]
+        for job in sorted(finished, key=lambda j: j.finished_at or 0)[
+            : max(0, len(finished) - MAX_FINISHED_JOBS)
+        ]:
+            del self.jobs[job.job_id]
+
+    def _work(self) -> None:
+        while True:
+            _, _, job, cwd, env = self._queue.get()
+            if job is None:
+                return
+            with self._lock:
+                # Skip jobs cancelled by shutdown() while they were queued
+                if job.status != "queued":
+                    continue
+                job.status = "running"
+                job.started_at = time.time()
+            self._run(job, cwd, env)
+
+    def _run(self, job: WorkflowJob, cwd: Optional[str], env: Optional[Dict[str, str]]) -> None:
+        try:
+            os.makedirs(self.log_dir, exist_ok=True)
+            with open(job.log_file, "w") as log:
+                # Own session: workflows keep running if the trigger is stopped
+                process = subprocess.Popen(
+                    job.cmd,
+                    cwd=cwd,
+                    env=env,
+                    stdout=log,
+                    stderr=subprocess.STDOUT,
+                    start_new_session=True,
+                )
+                job.pid = process.pid
+                self._record(job)
+                self._notify(self.on_start, job)
+                with self._changed:
+                    self._started.add(job.job_id)
+                    self._changed.notify_all()
+                job.returncode = process.wait()
+            job.status = "succeeded" if job.returncode == 0 else "failed"
+        except OSError as e:
+            print(f"ERROR: Failed to launch workflow for issue #{job.issue_number}: {e}")
+            job.status = "failed"
+        job.finished_at = time.time()
+        self._finish(job)
+
+    def _finish(self, job: WorkflowJob) -> None:
+        self._record(job)
+        self._notify(self.on_finish, job)
+        with self._changed:
+            self._started.discard(job.job_id)
+            self._changed.notify_all()
+
+    def _notify(
+        self, callback: Optional[Callable[[WorkflowJob], None]], job: WorkflowJob
+    ) -> None:
+        if callback:
+            try:
+                callback(job)
+            except Exception as e:
+                print(f"ERROR: Workflow job callback failed for {job.job_id}: {e}")
+
+    def counts(self) -> Dict[str, int]:
+        """Return the number of tracked jobs per status."""
+        with self._lock:
+            counts: Dict[str, int] = {}
+            for job in self.jobs.values():
+                counts[job.status] = counts.get(job.status, 0) + 1
+        return counts
+
+    def snapshot(self) -> List[WorkflowJob]:
+        """Return copies of all tracked jobs, most recently submitted first."""
+        with self._lock:
+            jobs = [job.model_copy() for job in self.jobs.values()]
+        return sorted(jobs, key=lambda job: job.submitted_at, reverse=True)
+
+    def wait_started(self) -> None:
+        """Block until every submitted job has started its process or finished.
+
+        With more jobs than max_workers, this includes waiting for earlier
+        jobs to exit and free a worker.
+        """
+        with self._changed:
+            self._changed.wait_for(
+                lambda: all(
+                    job.job_id in self._started or job.status in FINISHED_STATUSES
+                    for job in self.jobs.values()
+                )
+            )
+
+    def shutdown(self) -> List[WorkflowJob]:
+        """Stop accepting jobs and cancel the queued ones.
+
+        Running workflows are left running in their own sessions.
+
+        Returns:
+            The jobs that were cancelled before they started
+        """
+        with self._lock:
+            self._closed = True
+            cancelled = [job for job in self.jobs.values() if job.status == "queued"]
+            for job in cancelled:
+                job.status = "cancelled"
+                job.finished_at = time.time()
+        for job in cancelled:
+            self._finish(job)
+        for _ in self._workers:
+            self._queue.put((float("inf"), next(self._sequence), None, None, None))
+        return cancelled
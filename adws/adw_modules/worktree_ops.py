@@ -1,15 +1,24 @@
 """Worktree and port management operations for isolated ADW workflows.
 
 Provides utilities for creating and managing git worktrees under trees/<adw_id>/
-and allocating unique ports for each isolated instance.
+and allocating unique ports for each isolated instance (leased through
+adw_modules/port_allocator.py).
 """
 
 import os
+import shutil
 import subprocess
 import logging
-import socket
 from typing import Tuple, Optional
 from adw_modules.state import ADWState
+from adw_modules.port_allocator import (
+    BACKEND_PORT_START,
+    FRONTEND_PORT_START,
+    PORT_SLOTS,
+    get_port_allocator,
+    is_port_available,
+    preferred_slot,
+)
 
 
 def create_worktree(adw_id: str, branch_name: str, logger: logging.Logger) -> Tuple[str, Optional[str]]:
@@ -101,6 +110,8 @@ def validate_worktree(adw_id: str, state: ADWState) -> Tuple[bool, Optional[str]
     if worktree_path not in result.stdout:
         return False, "Worktree not registered with git"
     
+    # Every phase validates its worktree, so this keeps the run's port lease alive
+    get_port_allocator().renew(adw_id)
     return True, None
 
 
@@ -144,6 +155,7 @@ def remove_worktree(adw_id: str, logger: logging.Logger) -> Tuple[bool, Optional
             except Exception as e:
                 return False, f"Failed to remove worktree: {result.stderr}, manual cleanup failed: {e}"
     
+    get_port_allocator().release(adw_id)
     logger.info(f"Removed worktree at {worktree_path}")
     return True, None
 
@@ -174,7 +186,7 @@ def setup_worktree_environment(worktree_path: str, backend_port: int, frontend_p
 # Port management functions
 
 def get_ports_for_adw(adw_id: str) -> Tuple[int, int]:
-    """Deterministically assign ports based on ADW ID.
+    """Return the ports an ADW ID prefers, before any leases are considered.
     
     Args:
         adw_id: The ADW ID
@@ -182,46 +194,18 @@ def get_ports_for_adw(adw_id: str) -> Tuple[int, int]:
     Returns:
         Tuple of (backend_port, frontend_port)
     """
-    # Convert first 8 chars of ADW ID to index (0-14)
-    # Using base 36 conversion and modulo to get consistent mapping
-    try:
-        # Take first 8 alphanumeric chars and convert from base 36
-        id_chars = ''.join(c for c in adw_id[:8] if c.isalnum())
-        index = int(id_chars, 36) % 15
-    except ValueError:
-        # Fallback to simple hash if conversion fails
-        index = hash(adw_id) % 15
-    
-    backend_port = 9100 + index
-    frontend_port = 9200 + index
-    
-    return backend_port, frontend_port
+    index = preferred_slot(adw_id, PORT_SLOTS)
+    return BACKEND_PORT_START + index, FRONTEND_PORT_START + index
 
 
-def is_port_available(port: int) -> bool:
-    """Check if a port is available for binding.
+def allocate_ports(adw_id: str) -> Tuple[int, int]:
+    """Lease a backend/frontend port pair for an ADW run.
     
-    Args:
-        port: Port number to check
-        
-    Returns:
-        True if port is available, False otherwise
-    """
-    try:
-        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-            s.settimeout(1)
-            s.bind(('localhost', port))
-            return True
-    except (socket.error, OSError):
-        return False
-
-
-def find_next_available_ports(adw_id: str, max_attempts: int = 15) -> Tuple[int, int]:
-    """Find available ports starting from deterministic assignment.
+    The lease is atomic across processes and tied to the ADW ID: calling
+    this again for the same run returns the same ports.
     
     Args:
         adw_id: The ADW ID
-        max_attempts: Maximum number of attempts (default 15)
         
     Returns:
         Tuple of (backend_port, frontend_port)
@@ -229,15 +213,4 @@ def find_next_available_ports(adw_id: str, max_attempts: int = 15) -> Tuple[int,
     Raises:
         RuntimeError: If no available ports found
     """
-    base_backend, base_frontend = get_ports_for_adw(adw_id)
-    base_index = base_backend - 9100
-    
-    for offset in range(max_attempts):
-        index = (base_index + offset) % 15
-        backend_port = 9100 + index
-        frontend_port = 9200 + index
-        
-        if is_port_available(backend_port) and is_port_available(frontend_port):
-            return backend_port, frontend_port
-    
-    raise RuntimeError("No available ports in the allocated range")
\ No newline at end of file
+    return get_port_allocator().allocate(adw_id)
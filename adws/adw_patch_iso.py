@@ -1,6 +1,6 @@
 #!/usr/bin/env -S uv run
 # /// script
-# dependencies = ["python-dotenv", "pydantic"]
+# dependencies = ["python-dotenv", "pydantic", "requests"]
 # ///
 
 """
@@ -11,7 +11,7 @@ Usage:
 
 Workflow:
 1. Create/validate isolated worktree
-2. Allocate dedicated ports (9100-9114 backend, 9200-9214 frontend)
+2. Lease dedicated ports (backend from 9100, frontend from 9200; see port_allocator)
 3. Fetch GitHub issue details
 4. Check for 'adw_patch' keyword in comments or issue body
 5. Create patch plan based on content containing 'adw_patch'
@@ -58,9 +58,7 @@ from adw_modules.workflow_ops import (
 from adw_modules.worktree_ops import (
     create_worktree,
     validate_worktree,
-    get_ports_for_adw,
-    is_port_available,
-    find_next_available_ports,
+    allocate_ports,
     setup_worktree_environment,
 )
 from adw_modules.utils import setup_logger, check_env_vars
@@ -270,15 +268,8 @@ def main():
             )
             sys.exit(1)
 
-        # Get deterministic ports for this ADW ID
-        backend_port, frontend_port = get_ports_for_adw(adw_id)
-
-        # Check if ports are available, find alternatives if not
-        if not is_port_available(backend_port) or not is_port_available(frontend_port):
-            logger.warning(
-                f"Preferred ports {backend_port}/{frontend_port} not available, finding alternatives"
-            )
-            backend_port, frontend_port = find_next_available_ports(adw_id)
+        # Lease ports for this ADW ID
+        backend_port, frontend_port = allocate_ports(adw_id)
 
         logger.info(
             f"Allocated ports - Backend: {backend_port}, Frontend: {frontend_port}"
@@ -1,12 +1,12 @@
 #!/usr/bin/env -S uv run
 # /// script
-# dependencies = ["python-dotenv", "pydantic"]
+# dependencies = ["python-dotenv", "pydantic", "requests"]
 # ///
 
 """
 ADW Plan Build Review Iso - Compositional workflow for isolated planning, building, and reviewing
 
-Usage: uv run adw_plan_build_review_iso.py <issue-number> [adw-id] [--skip-resolution]
+Usage: uv run adw_plan_build_review_iso.py <issue-number> [adw-id] [--skip-resolution] [--resume]
 
 This script runs:
 1. adw_plan_iso.py - Planning phase (isolated)
@@ -14,26 +14,34 @@ This script runs:
 3. adw_review_iso.py - Review phase (isolated)
 
 The scripts are chained together via persistent state (adw_state.json).
+
+With --resume, phases that already completed against the worktree's
+current commit (see agents/<adw-id>/phase_events.jsonl) are skipped.
 """
 
-import subprocess
 import sys
 import os
 
 # Add the parent directory to Python path to import modules
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 from adw_modules.workflow_ops import ensure_adw_id
+from adw_modules.phase_log import get_completed_phases, run_phase
 
 
 def main():
     """Main entry point."""
+    # Check for --resume (skip phases already completed at the current commit)
+    resume = "--resume" in sys.argv
+    if resume:
+        sys.argv.remove("--resume")
+
     # Check for --skip-resolution flag
     skip_resolution = "--skip-resolution" in sys.argv
     if skip_resolution:
         sys.argv.remove("--skip-resolution")
     
     if len(sys.argv) < 2:
-        print("Usage: uv run adw_plan_build_review_iso.py <issue-number> [adw-id] [--skip-resolution]")
+        print("Usage: uv run adw_plan_build_review_iso.py <issue-number> [adw-id] [--skip-resolution] [--resume]")
         print("\nThis runs the isolated plan, build, and review workflow:")
         print("  1. Plan (isolated)")
         print("  2. Build (isolated)")
@@ -47,6 +55,15 @@ def main():
     adw_id = ensure_adw_id(issue_number, adw_id)
     print(f"Using ADW ID: {adw_id}")
 
+    # Skip leading phases that already completed against the worktree's current commit
+    completed = (
+        get_completed_phases(adw_id, ["plan", "build", "review"])
+        if resume
+        else []
+    )
+    if completed:
+        print(f"Resuming: skipping completed phases: {', '.join(completed)}")
+
     # Get the directory where this script is located
     script_dir = os.path.dirname(os.path.abspath(__file__))
 
@@ -59,9 +76,8 @@ def main():
         adw_id,
     ]
     print(f"\n=== ISOLATED PLAN PHASE ===")
-    print(f"Running: {' '.join(plan_cmd)}")
-    plan = subprocess.run(plan_cmd)
-    if plan.returncode != 0:
+    plan = run_phase(adw_id, "plan", plan_cmd, completed)
+    if plan != 0:
         print("Isolated plan phase failed")
         sys.exit(1)
 
@@ -74,9 +90,8 @@ def main():
         adw_id,
     ]
     print(f"\n=== ISOLATED BUILD PHASE ===")
-    print(f"Running: {' '.join(build_cmd)}")
-    build = subprocess.run(build_cmd)
-    if build.returncode != 0:
+    build = run_phase(adw_id, "build", build_cmd, completed)
+    if build != 0:
         print("Isolated build phase failed")
         sys.exit(1)
 
@@ -92,9 +107,8 @@ def main():
         review_cmd.append("--skip-resolution")
     
     print(f"\n=== ISOLATED REVIEW PHASE ===")
-    print(f"Running: {' '.join(review_cmd)}")
-    review = subprocess.run(review_cmd)
-    if review.returncode != 0:
+    review = run_phase(adw_id, "review", review_cmd, completed)
+    if review != 0:
         print("Isolated review phase failed")
         sys.exit(1)
 
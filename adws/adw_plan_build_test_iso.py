@@ -1,12 +1,12 @@
 #!/usr/bin/env -S uv run
 # /// script
-# dependencies = ["python-dotenv", "pydantic"]
+# dependencies = ["python-dotenv", "pydantic", "requests"]
 # ///
 
 """
 ADW Plan Build Test Iso - Compositional workflow for isolated planning, building, and testing
 
-Usage: uv run adw_plan_build_test_iso.py <issue-number> [adw-id] [--skip-e2e]
+Usage: uv run adw_plan_build_test_iso.py <issue-number> [adw-id] [--skip-e2e] [--resume]
 
 This script runs:
 1. adw_plan_iso.py - Planning phase (isolated)
@@ -14,26 +14,34 @@ This script runs:
 3. adw_test_iso.py - Testing phase (isolated)
 
 The scripts are chained together via persistent state (adw_state.json).
+
+With --resume, phases that already completed against the worktree's
+current commit (see agents/<adw-id>/phase_events.jsonl) are skipped.
 """
 
-import subprocess
 import sys
 import os
 
 # Add the parent directory to Python path to import modules
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 from adw_modules.workflow_ops import ensure_adw_id
+from adw_modules.phase_log import get_completed_phases, run_phase
 
 
 def main():
     """Main entry point."""
+    # Check for --resume (skip phases already completed at the current commit)
+    resume = "--resume" in sys.argv
+    if resume:
+        sys.argv.remove("--resume")
+
     # Check for --skip-e2e flag
     skip_e2e = "--skip-e2e" in sys.argv
     if skip_e2e:
         sys.argv.remove("--skip-e2e")
     
     if len(sys.argv) < 2:
-        print("Usage: uv run adw_plan_build_test_iso.py <issue-number> [adw-id] [--skip-e2e]")
+        print("Usage: uv run adw_plan_build_test_iso.py <issue-number> [adw-id] [--skip-e2e] [--resume]")
         print("\nThis runs the isolated plan, build, and test workflow:")
         print("  1. Plan (isolated)")
         print("  2. Build (isolated)")
@@ -47,6 +55,15 @@ def main():
     adw_id = ensure_adw_id(issue_number, adw_id)
     print(f"Using ADW ID: {adw_id}")
 
+    # Skip leading phases that already completed against the worktree's current commit
+    completed = (
+        get_completed_phases(adw_id, ["plan", "build", "test"])
+        if resume
+        else []
+    )
+    if completed:
+        print(f"Resuming: skipping completed phases: {', '.join(completed)}")
+
     # Get the directory where this script is located
     script_dir = os.path.dirname(os.path.abspath(__file__))
 
@@ -59,9 +76,8 @@ def main():
         adw_id,
     ]
     print(f"\n=== ISOLATED PLAN PHASE ===")
-    print(f"Running: {' '.join(plan_cmd)}")
-    plan = subprocess.run(plan_cmd)
-    if plan.returncode != 0:
+    plan = run_phase(adw_id, "plan", plan_cmd, completed)
+    if plan != 0:
         print("Isolated plan phase failed")
         sys.exit(1)
 
@@ -74,9 +90,8 @@ def main():
         adw_id,
     ]
     print(f"\n=== ISOLATED BUILD PHASE ===")
-    print(f"Running: {' '.join(build_cmd)}")
-    build = subprocess.run(build_cmd)
-    if build.returncode != 0:
+    build = run_phase(adw_id, "build", build_cmd, completed)
+    if build != 0:
         print("Isolated build phase failed")
         sys.exit(1)
 
@@ -92,9 +107,8 @@ def main():
         test_cmd.append("--skip-e2e")
     
     print(f"\n=== ISOLATED TEST PHASE ===")
-    print(f"Running: {' '.join(test_cmd)}")
-    test = subprocess.run(test_cmd)
-    if test.returncode != 0:
+    test = run_phase(adw_id, "test", test_cmd, completed)
+    if test != 0:
         print("Isolated test phase failed")
         sys.exit(1)
 
@@ -1,12 +1,12 @@
 #!/usr/bin/env -S uv run
 # /// script
-# dependencies = ["python-dotenv", "pydantic"]
+# dependencies = ["python-dotenv", "pydantic", "requests"]
 # ///
 
 """
 ADW Plan Build Test Review Iso - Compositional workflow for isolated planning, building, testing, and reviewing
 
-Usage: uv run adw_plan_build_test_review_iso.py <issue-number> [adw-id] [--skip-e2e] [--skip-resolution]
+Usage: uv run adw_plan_build_test_review_iso.py <issue-number> [adw-id] [--skip-e2e] [--skip-resolution] [--resume]
 
 This script runs:
 1. adw_plan_iso.py - Planning phase (isolated)
@@ -15,19 +15,27 @@ This script runs:
 4. adw_review_iso.py - Review phase (isolated)
 
 The scripts are chained together via persistent state (adw_state.json).
+
+With --resume, phases that already completed against the worktree's
+current commit (see agents/<adw-id>/phase_events.jsonl) are skipped.
 """
 
-import subprocess
 import sys
 import os
 
 # Add the parent directory to Python path to import modules
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 from adw_modules.workflow_ops import ensure_adw_id
+from adw_modules.phase_log import get_completed_phases, run_phase
 
 
 def main():
     """Main entry point."""
+    # Check for --resume (skip phases already completed at the current commit)
+    resume = "--resume" in sys.argv
+    if resume:
+        sys.argv.remove("--resume")
+
     # Check for flags
     skip_e2e = "--skip-e2e" in sys.argv
     skip_resolution = "--skip-resolution" in sys.argv
@@ -39,7 +47,7 @@ def main():
         sys.argv.remove("--skip-resolution")
     
     if len(sys.argv) < 2:
-        print("Usage: uv run adw_plan_build_test_review_iso.py <issue-number> [adw-id] [--skip-e2e] [--skip-resolution]")
+        print("Usage: uv run adw_plan_build_test_review_iso.py <issue-number> [adw-id] [--skip-e2e] [--skip-resolution] [--resume]")
         print("\nThis runs the isolated plan, build, test, and review workflow:")
         print("  1. Plan (isolated)")
         print("  2. Build (isolated)")
@@ -54,6 +62,15 @@ def main():
     adw_id = ensure_adw_id(issue_number, adw_id)
     print(f"Using ADW ID: {adw_id}")
 
+    # Skip leading phases that already completed against the worktree's current commit
+    completed = (
+        get_completed_phases(adw_id, ["plan", "build", "test", "review"])
+        if resume
+        else []
+    )
+    if completed:
+        print(f"Resuming: skipping completed phases: {', '.join(completed)}")
+
     # Get the directory where this script is located
     script_dir = os.path.dirname(os.path.abspath(__file__))
 
@@ -66,9 +83,8 @@ def main():
         adw_id,
     ]
     print(f"\n=== ISOLATED PLAN PHASE ===")
-    print(f"Running: {' '.join(plan_cmd)}")
-    plan = subprocess.run(plan_cmd)
-    if plan.returncode != 0:
+    plan = run_phase(adw_id, "plan", plan_cmd, completed)
+    if plan != 0:
         print("Isolated plan phase failed")
         sys.exit(1)
 
@@ -81,9 +97,8 @@ def main():
         adw_id,
     ]
     print(f"\n=== ISOLATED BUILD PHASE ===")
-    print(f"Running: {' '.join(build_cmd)}")
-    build = subprocess.run(build_cmd)
-    if build.returncode != 0:
+    build = run_phase(adw_id, "build", build_cmd, completed)
+    if build != 0:
         print("Isolated build phase failed")
         sys.exit(1)
 
@@ -99,9 +114,8 @@ def main():
         test_cmd.append("--skip-e2e")
     
     print(f"\n=== ISOLATED TEST PHASE ===")
-    print(f"Running: {' '.join(test_cmd)}")
-    test = subprocess.run(test_cmd)
-    if test.returncode != 0:
+    test = run_phase(adw_id, "test", test_cmd, completed)
+    if test != 0:
         print("Isolated test phase failed")
         sys.exit(1)
 
@@ -117,9 +131,8 @@ def main():
         review_cmd.append("--skip-resolution")
     
     print(f"\n=== ISOLATED REVIEW PHASE ===")
-    print(f"Running: {' '.join(review_cmd)}")
-    review = subprocess.run(review_cmd)
-    if review.returncode != 0:
+    review = run_phase(adw_id, "review", review_cmd, completed)
+    if review != 0:
         print("Isolated review phase failed")
         sys.exit(1)
 
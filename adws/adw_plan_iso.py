@@ -1,6 +1,6 @@
 #!/usr/bin/env -S uv run
 # /// script
-# dependencies = ["python-dotenv", "pydantic"]
+# dependencies = ["python-dotenv", "pydantic", "requests"]
 # ///
 
 """
@@ -54,9 +54,7 @@ from adw_modules.agent import execute_template
 from adw_modules.worktree_ops import (
     create_worktree,
     validate_worktree,
-    get_ports_for_adw,
-    is_port_available,
-    find_next_available_ports,
+    allocate_ports,
     setup_worktree_environment,
 )
 
@@ -113,13 +111,8 @@ def main():
         backend_port = state.get("backend_port")
         frontend_port = state.get("frontend_port")
     else:
-        # Allocate ports for this instance
-        backend_port, frontend_port = get_ports_for_adw(adw_id)
-        
-        # Check port availability
-        if not (is_port_available(backend_port) and is_port_available(frontend_port)):
-            logger.warning(f"Deterministic ports {backend_port}/{frontend_port} are in use, finding alternatives")
-            backend_port, frontend_port = find_next_available_ports(adw_id)
+        # Lease ports for this instance
+        backend_port, frontend_port = allocate_ports(adw_id)
         
         logger.info(f"Allocated ports - Backend: {backend_port}, Frontend: {frontend_port}")
         state.update(backend_port=backend_port, frontend_port=frontend_port)
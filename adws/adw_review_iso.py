@@ -1,6 +1,6 @@
 #!/usr/bin/env -S uv run
 # /// script
-# dependencies = ["python-dotenv", "pydantic", "boto3>=1.26.0"]
+# dependencies = ["python-dotenv", "pydantic", "requests", "boto3>=1.26.0"]
 # ///
 
 """
@@ -25,6 +25,7 @@ This workflow REQUIRES that adw_plan_iso.py or adw_patch_iso.py has been run fir
 to create the worktree. It cannot create worktrees itself.
 """
 
+import asyncio
 import sys
 import os
 import logging
@@ -43,7 +44,6 @@ from adw_modules.github import (
 from adw_modules.workflow_ops import (
     create_commit,
     format_issue_message,
-    implement_plan,
     find_spec_file,
 )
 from adw_modules.utils import setup_logger, parse_json, check_env_vars
@@ -53,7 +53,7 @@ from adw_modules.data_types import (
     ReviewIssue,
     AgentPromptResponse,
 )
-from adw_modules.agent import execute_template
+from adw_modules.agent import execute_template, gather_templates
 from adw_modules.r2_uploader import R2Uploader
 from adw_modules.worktree_ops import validate_worktree
 
@@ -65,6 +65,9 @@ AGENT_REVIEW_PATCH_IMPLEMENTOR = "review_patch_implementor"
 # Maximum number of review retry attempts after resolution
 MAX_REVIEW_RETRY_ATTEMPTS = 3
 
+# Maximum number of blocker resolution agents running at once
+MAX_PARALLEL_RESOLUTIONS = int(os.getenv("ADW_MAX_PARALLEL_RESOLUTIONS", "4"))
+
 
 
 
@@ -115,14 +118,14 @@ def run_review(
         )
 
 
-def create_review_patch_plan(
+def build_review_patch_plan_request(
     issue: ReviewIssue,
     issue_num: int,
     adw_id: str,
-    logger: logging.Logger,
     working_dir: Optional[str] = None,
-) -> AgentPromptResponse:
-    """Create a patch plan for a review issue."""
+    agent_name: str = AGENT_REVIEW_PATCH_PLANNER,
+) -> AgentTemplateRequest:
+    """Build the /patch request for a review issue."""
     # Build patch command with issue details
     patch_args = [
         f"Issue #{issue_num}: {issue.issue_description}",
@@ -130,16 +133,14 @@ def create_review_patch_plan(
         f"Severity: {issue.issue_severity}",
     ]
 
-    request = AgentTemplateRequest(
-        agent_name=AGENT_REVIEW_PATCH_PLANNER,
+    return AgentTemplateRequest(
+        agent_name=agent_name,
         slash_command="/patch",
         args=patch_args,
         adw_id=adw_id,
         working_dir=working_dir,
     )
 
-    return execute_template(request)
-
 
 def upload_review_screenshots(
     review_result: ReviewResult,
@@ -225,28 +226,55 @@ def resolve_blocker_issues(
         )
     )
     
-    # Create and implement patches for each blocker
+    # Create patch plans for all blockers concurrently
+    # Each blocker gets its own planner/implementor agent so outputs do not collide
+    plan_requests = []
     for i, issue in enumerate(blocker_issues, 1):
         logger.info(f"Resolving blocker {i}/{len(blocker_issues)}: {issue.issue_description}")
-        
-        # Create patch plan
-        plan_response = create_review_patch_plan(issue, i, adw_id, logger, working_dir=worktree_path)
-        
+        plan_requests.append(
+            build_review_patch_plan_request(
+                issue,
+                i,
+                adw_id,
+                working_dir=worktree_path,
+                agent_name=f"{AGENT_REVIEW_PATCH_PLANNER}_{i}",
+            )
+        )
+    plan_responses = asyncio.run(
+        gather_templates(plan_requests, max_concurrency=MAX_PARALLEL_RESOLUTIONS)
+    )
+
+    # Implement every successfully planned patch concurrently
+    implement_requests = []
+    blocker_numbers = []
+    for i, plan_response in enumerate(plan_responses, 1):
         if not plan_response.success:
             logger.error(f"Failed to create patch plan: {plan_response.output}")
             continue
-        
+
         # Extract plan file path
         plan_file = plan_response.output.strip()
-        
-        # Implement the patch
         logger.info(f"Implementing patch from plan: {plan_file}")
-        impl_response = implement_plan(plan_file, adw_id, logger, working_dir=worktree_path)
-        
+        implement_requests.append(
+            AgentTemplateRequest(
+                agent_name=f"{AGENT_REVIEW_PATCH_IMPLEMENTOR}_{i}",
+                slash_command="/implement",
+                args=[plan_file],
+                adw_id=adw_id,
+                working_dir=worktree_path,
+            )
+        )
+        blocker_numbers.append(i)
+
+    impl_responses = asyncio.run(
+        gather_templates(implement_requests, max_concurrency=MAX_PARALLEL_RESOLUTIONS)
+    )
+
+    for i, impl_response in zip(blocker_numbers, impl_responses):
         if not impl_response.success:
             logger.error(f"Failed to implement patch: {impl_response.output}")
             continue
-        
+
         logger.info(f"Successfully resolved blocker {i}")
 
 
@@ -1,12 +1,12 @@
 #!/usr/bin/env -S uv run
 # /// script
-# dependencies = ["python-dotenv", "pydantic"]
+# dependencies = ["python-dotenv", "pydantic", "requests"]
 # ///
 
 """
 ADW SDLC Iso - Complete Software Development Life Cycle workflow with isolation
 
-Usage: uv run adw_sdlc_iso.py <issue-number> [adw-id] [--skip-e2e] [--skip-resolution]
+Usage: uv run adw_sdlc_iso.py <issue-number> [adw-id] [--skip-e2e] [--skip-resolution] [--resume]
 
 This script runs the complete ADW SDLC pipeline in isolation:
 1. adw_plan_iso.py - Planning phase (isolated)
@@ -17,19 +17,27 @@ This script runs the complete ADW SDLC pipeline in isolation:
 
 The scripts are chained together via persistent state (adw_state.json).
 Each phase runs in its own git worktree with dedicated ports.
+
+With --resume, phases that already completed against the worktree's
+current commit (see agents/<adw-id>/phase_events.jsonl) are skipped.
 """
 
-import subprocess
 import sys
 import os
 
 # Add the parent directory to Python path to import modules
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 from adw_modules.workflow_ops import ensure_adw_id
+from adw_modules.phase_log import get_completed_phases, run_phase
 
 
 def main():
     """Main entry point."""
+    # Check for --resume (skip phases already completed at the current commit)
+    resume = "--resume" in sys.argv
+    if resume:
+        sys.argv.remove("--resume")
+
     # Check for flags
     skip_e2e = "--skip-e2e" in sys.argv
     skip_resolution = "--skip-resolution" in sys.argv
@@ -41,7 +49,7 @@ def main():
         sys.argv.remove("--skip-resolution")
     
     if len(sys.argv) < 2:
-        print("Usage: uv run adw_sdlc_iso.py <issue-number> [adw-id] [--skip-e2e] [--skip-resolution]")
+        print("Usage: uv run adw_sdlc_iso.py <issue-number> [adw-id] [--skip-e2e] [--skip-resolution] [--resume]")
         print("\nThis runs the complete isolated Software Development Life Cycle:")
         print("  1. Plan (isolated)")
         print("  2. Build (isolated)")
@@ -57,6 +65,15 @@ def main():
     adw_id = ensure_adw_id(issue_number, adw_id)
     print(f"Using ADW ID: {adw_id}")
 
+    # Skip leading phases that already completed against the worktree's current commit
+    completed = (
+        get_completed_phases(adw_id, ["plan", "build", "test", "review", "document"])
+        if resume
+        else []
+    )
+    if completed:
+        print(f"Resuming: skipping completed phases: {', '.join(completed)}")
+
     # Get the directory where this script is located
     script_dir = os.path.dirname(os.path.abspath(__file__))
 
@@ -69,9 +86,8 @@ def main():
         adw_id,
     ]
     print(f"\n=== ISOLATED PLAN PHASE ===")
-    print(f"Running: {' '.join(plan_cmd)}")
-    plan = subprocess.run(plan_cmd)
-    if plan.returncode != 0:
+    plan = run_phase(adw_id, "plan", plan_cmd, completed)
+    if plan != 0:
         print("Isolated plan phase failed")
         sys.exit(1)
 
@@ -84,9 +100,8 @@ def main():
         adw_id,
     ]
     print(f"\n=== ISOLATED BUILD PHASE ===")
-    print(f"Running: {' '.join(build_cmd)}")
-    build = subprocess.run(build_cmd)
-    if build.returncode != 0:
+    build = run_phase(adw_id, "build", build_cmd, completed)
+    if build != 0:
         print("Isolated build phase failed")
         sys.exit(1)
 
@@ -101,9 +116,8 @@ def main():
     ]
     
     print(f"\n=== ISOLATED TEST PHASE ===")
-    print(f"Running: {' '.join(test_cmd)}")
-    test = subprocess.run(test_cmd)
-    if test.returncode != 0:
+    test = run_phase(adw_id, "test", test_cmd, completed)
+    if test != 0:
         print("Isolated test phase failed")
         # Note: Continue anyway as some tests might be flaky
         print("WARNING: Test phase failed but continuing with review")
@@ -120,9 +134,8 @@ def main():
         review_cmd.append("--skip-resolution")
     
     print(f"\n=== ISOLATED REVIEW PHASE ===")
-    print(f"Running: {' '.join(review_cmd)}")
-    review = subprocess.run(review_cmd)
-    if review.returncode != 0:
+    review = run_phase(adw_id, "review", review_cmd, completed)
+    if review != 0:
         print("Isolated review phase failed")
         sys.exit(1)
 
@@ -135,9 +148,8 @@ def main():
         adw_id,
     ]
     print(f"\n=== ISOLATED DOCUMENTATION PHASE ===")
-    print(f"Running: {' '.join(document_cmd)}")
-    document = subprocess.run(document_cmd)
-    if document.returncode != 0:
+    document = run_phase(adw_id, "document", document_cmd, completed)
+    if document != 0:
         print("Isolated documentation phase failed")
         sys.exit(1)
 
@@ -1,12 +1,12 @@
 #!/usr/bin/env -S uv run
 # /// script
-# dependencies = ["python-dotenv", "pydantic"]
+# dependencies = ["python-dotenv", "pydantic", "requests"]
 # ///
 
 """
 ADW SDLC ZTE Iso - Zero Touch Execution: Complete SDLC with automatic shipping
 
-Usage: uv run adw_sdlc_zte_iso.py <issue-number> [adw-id] [--skip-e2e] [--skip-resolution]
+Usage: uv run adw_sdlc_zte_iso.py <issue-number> [adw-id] [--skip-e2e] [--skip-resolution] [--resume]
 
 This script runs the complete ADW SDLC pipeline with automatic shipping:
 1. adw_plan_iso.py - Planning phase (isolated)
@@ -21,20 +21,28 @@ human intervention, automatically shipping code to production if all phases pass
 
 The scripts are chained together via persistent state (adw_state.json).
 Each phase runs on the same git worktree with dedicated ports.
+
+With --resume, phases that already completed against the worktree's
+current commit (see agents/<adw-id>/phase_events.jsonl) are skipped.
 """
 
-import subprocess
 import sys
 import os
 
 # Add the parent directory to Python path to import modules
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 from adw_modules.workflow_ops import ensure_adw_id
+from adw_modules.phase_log import get_completed_phases, run_phase
 from adw_modules.github import make_issue_comment
 
 
 def main():
     """Main entry point."""
+    # Check for --resume (skip phases already completed at the current commit)
+    resume = "--resume" in sys.argv
+    if resume:
+        sys.argv.remove("--resume")
+
     # Check for flags
     skip_e2e = "--skip-e2e" in sys.argv
     skip_resolution = "--skip-resolution" in sys.argv
@@ -47,7 +55,7 @@ def main():
 
     if len(sys.argv) < 2:
         print(
-            "Usage: uv run adw_sdlc_zte_iso.py <issue-number> [adw-id] [--skip-e2e] [--skip-resolution]"
+            "Usage: uv run adw_sdlc_zte_iso.py <issue-number> [adw-id] [--skip-e2e] [--skip-resolution] [--resume]"
         )
         print("\n🚀 Zero Touch Execution: Complete SDLC with automatic shipping")
         print("\nThis runs the complete isolated Software Development Life Cycle:")
@@ -67,6 +75,15 @@ def main():
     adw_id = ensure_adw_id(issue_number, adw_id)
     print(f"Using ADW ID: {adw_id}")
 
+    # Skip leading phases that already completed against the worktree's current commit
+    completed = (
+        get_completed_phases(adw_id, ["plan", "build", "test", "review", "document", "ship"])
+        if resume
+        else []
+    )
+    if completed:
+        print(f"Resuming: skipping completed phases: {', '.join(completed)}")
+
     # Post initial ZTE message
     try:
         make_issue_comment(
@@ -96,9 +113,8 @@ def main():
         adw_id,
     ]
     print(f"\n=== ISOLATED PLAN PHASE ===")
-    print(f"Running: {' '.join(plan_cmd)}")
-    plan = subprocess.run(plan_cmd)
-    if plan.returncode != 0:
+    plan = run_phase(adw_id, "plan", plan_cmd, completed)
+    if plan != 0:
         print("Isolated plan phase failed")
         sys.exit(1)
 
@@ -111,9 +127,8 @@ def main():
         adw_id,
     ]
     print(f"\n=== ISOLATED BUILD PHASE ===")
-    print(f"Running: {' '.join(build_cmd)}")
-    build = subprocess.run(build_cmd)
-    if build.returncode != 0:
+    build = run_phase(adw_id, "build", build_cmd, completed)
+    if build != 0:
         print("Isolated build phase failed")
         sys.exit(1)
 
@@ -128,9 +143,8 @@ def main():
     ]
 
     print(f"\n=== ISOLATED TEST PHASE ===")
-    print(f"Running: {' '.join(test_cmd)}")
-    test = subprocess.run(test_cmd)
-    if test.returncode != 0:
+    test = run_phase(adw_id, "test", test_cmd, completed)
+    if test != 0:
         print("Isolated test phase failed")
         # For ZTE, we should stop if tests fail
         try:
@@ -156,9 +170,8 @@ def main():
         review_cmd.append("--skip-resolution")
 
     print(f"\n=== ISOLATED REVIEW PHASE ===")
-    print(f"Running: {' '.join(review_cmd)}")
-    review = subprocess.run(review_cmd)
-    if review.returncode != 0:
+    review = run_phase(adw_id, "review", review_cmd, completed)
+    if review != 0:
         print("Isolated review phase failed")
         try:
             make_issue_comment(
@@ -180,9 +193,8 @@ def main():
         adw_id,
     ]
     print(f"\n=== ISOLATED DOCUMENTATION PHASE ===")
-    print(f"Running: {' '.join(document_cmd)}")
-    document = subprocess.run(document_cmd)
-    if document.returncode != 0:
+    document = run_phase(adw_id, "document", document_cmd, completed)
+    if document != 0:
         print("Isolated documentation phase failed")
         # Documentation failure shouldn't block shipping
         print("WARNING: Documentation phase failed but continuing with shipping")
@@ -196,9 +208,8 @@ def main():
         adw_id,
     ]
     print(f"\n=== ISOLATED SHIP PHASE (APPROVE & MERGE) ===")
-    print(f"Running: {' '.join(ship_cmd)}")
-    ship = subprocess.run(ship_cmd)
-    if ship.returncode != 0:
+    ship = run_phase(adw_id, "ship", ship_cmd, completed)
+    if ship != 0:
         print("Isolated ship phase failed")
         try:
             make_issue_comment(
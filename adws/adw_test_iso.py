@@ -1,6 +1,6 @@
 #!/usr/bin/env -S uv run
 # /// script
-# dependencies = ["python-dotenv", "pydantic"]
+# dependencies = ["python-dotenv", "pydantic", "requests"]
 # ///
 
 """
@@ -20,6 +20,7 @@ This workflow REQUIRES that adw_plan_iso.py or adw_patch_iso.py has been run fir
 to create the worktree. It cannot create worktrees itself.
 """
 
+import asyncio
 import json
 import subprocess
 import sys
@@ -35,7 +36,7 @@ from adw_modules.data_types import (
     E2ETestResult,
     IssueClassSlashCommand,
 )
-from adw_modules.agent import execute_template
+from adw_modules.agent import execute_template, gather_templates
 from adw_modules.github import (
     extract_repo_path,
     fetch_issue,
@@ -62,6 +63,9 @@ AGENT_BRANCH_GENERATOR = "branch_generator"
 MAX_TEST_RETRY_ATTEMPTS = 4
 MAX_E2E_TEST_RETRY_ATTEMPTS = 2  # E2E ui tests
 
+# Maximum number of failed-test resolver agents running at once
+MAX_PARALLEL_RESOLUTIONS = int(os.getenv("ADW_MAX_PARALLEL_RESOLUTIONS", "4"))
+
 
 
 
@@ -279,11 +283,14 @@ def resolve_failed_tests(
 ) -> Tuple[int, int]:
     """
     Attempt to resolve failed tests using the resolve_failed_test command.
+    Each failed test gets its own resolver agent; up to MAX_PARALLEL_RESOLUTIONS
+    run concurrently.
     Returns (resolved_count, unresolved_count).
     """
     resolved_count = 0
     unresolved_count = 0
 
+    resolve_requests = []
     for idx, test in enumerate(failed_tests):
         logger.info(
             f"\n=== Resolving failed test {idx + 1}/{len(failed_tests)}: {test.test_name} ==="
@@ -296,12 +303,14 @@ def resolve_failed_tests(
         agent_name = f"test_resolver_iter{iteration}_{idx}"
 
         # Create template request with worktree_path
-        resolve_request = AgentTemplateRequest(
-            agent_name=agent_name,
-            slash_command="/resolve_failed_test",
-            args=[test_payload],
-            adw_id=adw_id,
-            working_dir=worktree_path,
+        resolve_requests.append(
+            AgentTemplateRequest(
+                agent_name=agent_name,
+                slash_command="/resolve_failed_test",
+                args=[test_payload],
+                adw_id=adw_id,
+                working_dir=worktree_path,
+            )
         )
 
         # Post to issue
@@ -314,9 +323,15 @@ def resolve_failed_tests(
             ),
         )
 
-        # Execute resolution
-        response = execute_template(resolve_request)
+    # Execute resolutions concurrently
+    responses = asyncio.run(
+        gather_templates(resolve_requests, max_concurrency=MAX_PARALLEL_RESOLUTIONS)
+    )
 
+    for test, resolve_request, response in zip(
+        failed_tests, resolve_requests, responses
+    ):
+        agent_name = resolve_request.agent_name
         if response.success:
             resolved_count += 1
             make_issue_comment(
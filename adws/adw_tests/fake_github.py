@@ -0,0 +1,340 @@
+"""In-process fake of the GitHub REST API for tests.
+
+Serves the subset of endpoints used by adw_modules.github_api from an
+in-memory repository on 127.0.0.1, over HTTP/1.1 keep-alive, and records
+every request and every accepted connection so tests can assert on both.
+GET responses carry an ETag and honour If-None-Match with 304s.
+
+    with FakeGitHub() as fake:
+        fake.add_issue(1, "Bug", body="adw_plan_iso")
+        github_api.GITHUB_API_URL = fake.url
+        ...
+        assert fake.connections == 1
+"""
+
+import hashlib
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+TIMESTAMP = "2025-01-01T00:00:00Z"
+
+
+def now() -> str:
+    """Return the current time as a GitHub timestamp."""
+    return time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+
+
+def _user(login: str) -> Dict[str, Any]:
+    return {"login": login, "node_id": f"U_{login}", "type": "User"}
+
+
+class FakeGitHub:
+    """A fake GitHub holding issues, comments and pull requests of one repo."""
+
+    def __init__(self):
+        self.issues: Dict[int, Dict[str, Any]] = {}
+        self.comments: Dict[int, List[Dict[str, Any]]] = {}
+        self.pulls: Dict[int, Dict[str, Any]] = {}
+        self.reviews: List[Tuple[int, Dict[str, Any]]] = []
+        self.merges: List[Tuple[int, Dict[str, Any]]] = []
+        self.requests: List[Tuple[str, str]] = []
+        self.raw_paths: List[str] = []  # Request paths including the query string
+        self.connections = 0
+        self.not_modified = 0  # GETs answered 304 from If-None-Match
+        # Maps "METHOD /path" to a status code returned instead of handling it
+        self.failures: Dict[str, int] = {}
+        self._next_id = 1000
+        self._lock = threading.Lock()
+        self._server: Optional[ThreadingHTTPServer] = None
+
+    # Repository contents
+
+    def add_issue(
+        self,
+        number: int,
+        title: str,
+        body: str = "",
+        labels: Tuple[str, ...] = (),
+        user: str = "alice",
+        pull_request: bool = False,
+    ) -> Dict[str, Any]:
+        issue = {
+            "number": number,
+            "node_id": f"I_{number}",
+            "title": title,
+            "body": body,
+            "state": "open",
+            "user": _user(user),
+            "assignees": [],
+            "labels": [
+                {"node_id": f"L_{name}", "name": name, "color": "ededed"}
+                for name in labels
+            ],
+            "milestone": None,
+            "comments": 0,
+            "created_at": TIMESTAMP,
+            "updated_at": TIMESTAMP,
+            "closed_at": None,
+            "html_url": f"https://github.com/owner/repo/issues/{number}",
+        }
+        if pull_request:
+            issue["pull_request"] = {"url": f"https://github.com/owner/repo/pull/{number}"}
+        self.issues[number] = issue
+        self.comments.setdefault(number, [])
+        return issue
+
+    def add_comment(
+        self, number: int, body: str, user: str = "alice", created_at: str = TIMESTAMP
+    ) -> Dict[str, Any]:
+        with self._lock:
+            self._next_id += 1
+            comment = {
+                "id": self._next_id,
+                "node_id": f"IC_{self._next_id}",
+                "user": _user(user),
+                "body": body,
+                "created_at": created_at,
+                "updated_at": created_at,
+            }
+            self.comments.setdefault(number, []).append(comment)
+            if number in self.issues:
+                self.issues[number]["comments"] = len(self.comments[number])
+        return comment
+
+    def add_pull(self, number: int, head: str, mergeable: Optional[bool] = True) -> None:
+        self.pulls[number] = {
+            "number": number,
+            "head": head,
+            "html_url": f"https://github.com/owner/repo/pull/{number}",
+            "mergeable": mergeable,
+            "mergeable_state": "clean" if mergeable else "dirty",
+        }
+
+    # Server lifecycle
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "FakeGitHub":
+        fake = self
+
+        class Handler(_Handler):
+            github = fake
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self) -> None:
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+
+    def __enter__(self) -> "FakeGitHub":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    # Request handling
+
+    def handle(
+        self, method: str, path: str, query: Dict[str, List[str]], body: Any
+    ) -> Tuple[int, Any, Dict[str, str]]:
+        """Return (status, payload, extra headers) for one request."""
+        key = f"{method} {path}"
+        if key in self.failures:
+            return self.failures[key], {"message": "Injected failure"}, {}
+
+        if key == "GET /user":
+            return 200, _user("adw-bot"), {}
+
+        if key == "POST /graphql":
+            return 200, self._open_issues_query(body["variables"]), {}
+
+        match = re.fullmatch(r"/repos/[^/]+/[^/]+/(.+)", path)
+        if not match:
+            return 404, {"message": "Not Found"}, {}
+        route = match.group(1)
+
+        if route == "issues" and method == "GET":
+            issues = [i for i in self.issues.values() if i["state"] == "open"]
+            return self._page(path, query, sorted(issues, key=lambda i: -i["number"]))
+
+        match = re.fullmatch(r"issues/comments/(\d+)", route)
+        if match and method == "PATCH":
+            for comments in self.comments.values():
+                for comment in comments:
+                    if comment["id"] == int(match.group(1)):
+                        comment["body"] = body["body"]
+                        comment["updated_at"] = now()
+                        return 200, comment, {}
+            return 404, {"message": "Not Found"}, {}
+
+        match = re.fullmatch(r"issues/(\d+)(?:/(\w+))?", route)
+        if match:
+            number, sub = int(match.group(1)), match.group(2)
+            if number not in self.issues:
+                return 404, {"message": "Not Found"}, {}
+            issue = self.issues[number]
+            if sub is None and method == "GET":
+                return 200, issue, {}
+            if sub == "comments" and method == "GET":
+                since = query.get("since", [""])[0]
+                comments = [c for c in self.comments[number] if c["updated_at"] >= since]
+                return self._page(path, query, comments)
+            if sub == "comments" and method == "POST":
+                return 201, self.add_comment(number, body["body"], user="adw-bot"), {}
+            if sub == "labels" and method == "POST":
+                issue["labels"].extend(
+                    {"node_id": f"L_{name}", "name": name, "color": "ededed"}
+                    for name in body["labels"]
+                )
+                return 200, issue["labels"], {}
+            if sub == "assignees" and method == "POST":
+                issue["assignees"].extend(_user(login) for login in body["assignees"])
+                return 201, issue, {}
+
+        if route == "pulls" and method == "GET":
+            head = query.get("head", [""])[0].split(":")[-1]
+            pulls = [p for p in self.pulls.values() if not head or p["head"] == head]
+            return 200, pulls, {}
+
+        match = re.fullmatch(r"pulls/(\d+)(?:/(\w+))?", route)
+        if match and int(match.group(1)) in self.pulls:
+            number, sub = int(match.group(1)), match.group(2)
+            if sub is None and method == "GET":
+                return 200, self.pulls[number], {}
+            if sub == "reviews" and method == "POST":
+                self.reviews.append((number, body))
+                return 200, {"state": "APPROVED"}, {}
+            if sub == "merge" and method == "PUT":
+                if not self.pulls[number]["mergeable"]:
+                    return 405, {"message": "Pull Request is not mergeable"}, {}
+                self.merges.append((number, body))
+                return 200, {"merged": True}, {}
+
+        return 404, {"message": "Not Found"}, {}
+
+    def _open_issues_query(self, variables: Dict[str, Any]) -> Dict[str, Any]:
+        """Answer OPEN_ISSUES_QUERY: 100 open issues per page, newest first."""
+        issues = sorted(
+            (
+                i
+                for i in self.issues.values()
+                if i["state"] == "open" and "pull_request" not in i
+            ),
+            key=lambda i: -i["number"],
+        )
+        offset = int(variables.get("cursor") or 0)
+        nodes = []
+        for issue in issues[offset : offset + 100]:
+            comments = self.comments.get(issue["number"], [])
+            last = comments[-1] if comments else None
+            nodes.append(
+                {
+                    "number": issue["number"],
+                    "title": issue["title"],
+                    "body": issue["body"],
+                    "createdAt": issue["created_at"],
+                    "updatedAt": issue["updated_at"],
+                    "labels": {
+                        "nodes": [
+                            {"id": l["node_id"], "name": l["name"], "color": l["color"]}
+                            for l in issue["labels"]
+                        ]
+                    },
+                    "comments": {
+                        "totalCount": len(comments),
+                        "nodes": [
+                            {
+                                "id": last["node_id"],
+                                "body": last["body"],
+                                "createdAt": last["created_at"],
+                                "author": {"login": last["user"]["login"]},
+                            }
+                        ]
+                        if last
+                        else [],
+                    },
+                }
+            )
+        has_next = offset + 100 < len(issues)
+        return {
+            "data": {
+                "repository": {
+                    "issues": {
+                        "pageInfo": {
+                            "hasNextPage": has_next,
+                            "endCursor": str(offset + 100) if has_next else None,
+                        },
+                        "nodes": nodes,
+                    }
+                }
+            }
+        }
+
+    def _page(
+        self, path: str, query: Dict[str, List[str]], items: List[Any]
+    ) -> Tuple[int, Any, Dict[str, str]]:
+        per_page = int(query.get("per_page", ["30"])[0])
+        page = int(query.get("page", ["1"])[0])
+        headers = {}
+        if page * per_page < len(items):
+            extra = "".join(
+                f"&{name}={values[0]}"
+                for name, values in query.items()
+                if name not in ("per_page", "page")
+            )
+            headers["Link"] = (
+                f'<{self.url}{path}?per_page={per_page}&page={page + 1}{extra}>; rel="next"'
+            )
+        return 200, items[(page - 1) * per_page : page * per_page], headers
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # Keep connections alive between requests
+    github: FakeGitHub
+
+    def setup(self):
+        super().setup()
+        with self.github._lock:
+            self.github.connections += 1
+
+    def log_message(self, format, *args):
+        pass
+
+    def _dispatch(self):
+        parsed = urlparse(self.path)
+        length = int(self.headers.get("Content-Length") or 0)
+        body = json.loads(self.rfile.read(length)) if length else None
+        with self.github._lock:
+            self.github.requests.append((self.command, parsed.path))
+            self.github.raw_paths.append(self.path)
+        status, payload, headers = self.github.handle(
+            self.command, parsed.path, parse_qs(parsed.query), body
+        )
+        data = json.dumps(payload).encode("utf-8")
+        if self.command == "GET" and status == 200:
+            headers["ETag"] = f'"{hashlib.sha1(data).hexdigest()}"'
+            if self.headers.get("If-None-Match") == headers["ETag"]:
+                status, data = 304, b""
+                with self.github._lock:
+                    self.github.not_modified += 1
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    do_GET = do_POST = do_PUT = do_PATCH = do_DELETE = _dispatch
@@ -0,0 +1,136 @@
+"""Tests for the asyncio agent execution API."""
+
+import sys
+import os
+import json
+import stat
+import asyncio
+import tempfile
+import time
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from adw_modules import agent, agent_limiter, agent_metrics
+from adw_modules.agent import gather_templates, prompt_claude_code_async
+from adw_modules.data_types import AgentPromptRequest, AgentTemplateRequest
+
+TEST_ADW_ID = "asynctst"
+
+RESULT_LINE = json.dumps(
+    {
+        "type": "result",
+        "subtype": "success",
+        "is_error": False,
+        "result": "resolved",
+        "session_id": "sess-async",
+    }
+)
+
+
+def write_sleeping_claude(directory: str, delay: float) -> str:
+    """Write a fake CLI that sleeps, then prints a large line and a result."""
+    path = os.path.join(directory, "fake_claude")
+    with open(path, "w") as f:
+        f.write(f"#!{sys.executable}\n")
+        f.write("import sys, time, json\n")
+        f.write("if '--version' in sys.argv:\n    print('1.0.0')\n    sys.exit(0)\n")
+        f.write(f"time.sleep({delay})\n")
+        # A line longer than asyncio's default 64 KiB StreamReader limit
+        f.write("print(json.dumps({'type': 'user', 'blob': 'x' * 200000}))\n")
+        f.write(f"print({RESULT_LINE!r})\n")
+    os.chmod(path, os.stat(path).st_mode | stat.S_IEXEC)
+    return path
+
+
+def test_prompt_claude_code_async():
+    """The async prompt parses the stream, including very long lines."""
+    tmp_dir = tempfile.mkdtemp()
+    original = (agent.CLAUDE_PATH, agent_limiter.LIMITER_DB_PATH)
+    agent.CLAUDE_PATH = write_sleeping_claude(tmp_dir, 0)
+    agent_limiter.LIMITER_DB_PATH = os.path.join(tmp_dir, "agent_limiter.db")
+    try:
+        output_file = os.path.join(tmp_dir, "raw_output.jsonl")
+        request = AgentPromptRequest(
+            prompt="hello", adw_id=TEST_ADW_ID, output_file=output_file
+        )
+        response = asyncio.run(prompt_claude_code_async(request))
+    finally:
+        agent.CLAUDE_PATH, agent_limiter.LIMITER_DB_PATH = original
+
+    assert response.success
+    assert response.output == "resolved"
+    assert response.session_id == "sess-async"
+    with open(output_file) as f:
+        assert len(f.readlines()) == 2
+
+
+def test_gather_templates_runs_concurrently():
+    """Independent templates overlap instead of running back to back."""
+    tmp_dir = tempfile.mkdtemp()
+    original = (
+        agent.CLAUDE_PATH,
+        agent.AGENTS_DIR,
+        agent_limiter.LIMITER_DB_PATH,
+        agent_metrics.AGENTS_DIR,
+    )
+    agent.CLAUDE_PATH = write_sleeping_claude(tmp_dir, 1.0)
+    agent.AGENTS_DIR = agent_metrics.AGENTS_DIR = os.path.join(tmp_dir, "agents")
+    agent_limiter.LIMITER_DB_PATH = os.path.join(tmp_dir, "agent_limiter.db")
+    requests = [
+        AgentTemplateRequest(
+            agent_name=f"resolver_{i}",
+            slash_command="/resolve_failed_test",
+            args=[f"test {i}"],
+            adw_id=TEST_ADW_ID,
+        )
+        for i in range(3)
+    ]
+    try:
+        start = time.monotonic()
+        responses = asyncio.run(gather_templates(requests, max_concurrency=3))
+        elapsed = time.monotonic() - start
+    finally:
+        (
+            agent.CLAUDE_PATH,
+            agent.AGENTS_DIR,
+            agent_limiter.LIMITER_DB_PATH,
+            agent_metrics.AGENTS_DIR,
+        ) = original
+
+    assert [r.output for r in responses] == ["resolved"] * 3
+    assert elapsed < 2.5, f"expected concurrent execution, took {elapsed:.2f}s"
+
+
+def run_all_tests():
+    """Run all tests."""
+    print("\n" + "=" * 60)
+    print("Running Async Agent Tests")
+    print("=" * 60 + "\n")
+
+    tests = [
+        test_prompt_claude_code_async,
+        test_gather_templates_runs_concurrently,
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except Exception as e:
+            print(f"❌ {test.__name__} failed with exception: {e}")
+            failed += 1
+
+    print("\n" + "=" * 60)
+    print(f"Results: {passed} passed, {failed} failed")
+    print("=" * 60 + "\n")
+
+    return failed == 0
+
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,145 @@
+"""Tests for the cross-process agent concurrency limiter."""
+
+import sys
+import os
+import sqlite3
+import subprocess
+import tempfile
+import threading
+import time
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from adw_modules import agent_limiter
+from adw_modules.agent_limiter import AgentLimiter, agent_slot
+
+
+def make_limiter(**kwargs) -> AgentLimiter:
+    """Create a limiter backed by a fresh temporary database."""
+    db_path = os.path.join(tempfile.mkdtemp(), "agent_limiter.db")
+    kwargs.setdefault("model_limits", {"opus": 1, "sonnet": 2})
+    kwargs.setdefault("global_limit", 3)
+    return AgentLimiter(db_path, **kwargs)
+
+
+def test_per_model_and_global_limits():
+    """Slots are capped per model and in total."""
+    limiter = make_limiter()
+    opus = [limiter.enqueue("opus") for _ in range(2)]
+    sonnet = [limiter.enqueue("sonnet") for _ in range(3)]
+
+    assert limiter.try_acquire(opus[0])
+    assert not limiter.try_acquire(opus[1])  # opus limit is 1
+    assert limiter.try_acquire(sonnet[0])
+    assert limiter.try_acquire(sonnet[1])
+    assert not limiter.try_acquire(sonnet[2])  # global limit is 3
+
+    limiter.release(sonnet[0])
+    assert limiter.try_acquire(sonnet[2])
+
+    stats = limiter.get_queue_stats()
+    assert stats["opus"]["running"] == 1
+    assert stats["opus"]["waiting"] == 1
+    assert stats["sonnet"]["running"] == 2
+    assert stats["sonnet"]["samples"] == 3
+
+
+def test_fifo_ordering():
+    """A newer ticket cannot jump ahead of an older one for the same model."""
+    limiter = make_limiter()
+    first = limiter.enqueue("opus")
+    second = limiter.enqueue("opus")
+    third = limiter.enqueue("opus")
+
+    assert limiter.try_acquire(first)
+    limiter.release(first)
+    assert not limiter.try_acquire(third)
+    assert limiter.try_acquire(second)
+
+
+def test_dead_process_slots_are_reclaimed():
+    """Tickets owned by exited processes are removed."""
+    limiter = make_limiter()
+    proc = subprocess.Popen([sys.executable, "-c", "pass"])
+    proc.wait()
+    with sqlite3.connect(limiter.db_path) as conn:
+        conn.execute(
+            "INSERT INTO tickets (model, pid, enqueued_at, acquired_at) VALUES (?, ?, ?, ?)",
+            ("opus", proc.pid, time.time(), time.time()),
+        )
+
+    ticket = limiter.enqueue("opus")
+    assert limiter.try_acquire(ticket)
+
+
+def test_agent_slot_blocks_until_released():
+    """agent_slot waits for a held slot and reports the queue wait."""
+    db_path = os.path.join(tempfile.mkdtemp(), "agent_limiter.db")
+    original = (
+        agent_limiter.LIMITER_DB_PATH,
+        agent_limiter.LIMITER_ENABLED,
+        agent_limiter.POLL_INTERVAL_SECONDS,
+        agent_limiter._limiter,
+    )
+    agent_limiter.LIMITER_DB_PATH = db_path
+    agent_limiter.LIMITER_ENABLED = True
+    agent_limiter.POLL_INTERVAL_SECONDS = 0.05
+    agent_limiter._limiter = AgentLimiter(
+        db_path, model_limits={"opus": 1}, global_limit=4
+    )
+    waits = []
+    try:
+        with agent_slot("opus"):
+            thread = threading.Thread(
+                target=lambda: waits.append(agent_slot("opus").__enter__())
+            )
+            thread.start()
+            time.sleep(0.3)
+            assert not waits
+        thread.join(timeout=5)
+    finally:
+        (
+            agent_limiter.LIMITER_DB_PATH,
+            agent_limiter.LIMITER_ENABLED,
+            agent_limiter.POLL_INTERVAL_SECONDS,
+            agent_limiter._limiter,
+        ) = original
+
+    assert waits and waits[0] >= 0.25
+
+
+def run_all_tests():
+    """Run all tests."""
+    print("\n" + "=" * 60)
+    print("Running Agent Limiter Tests")
+    print("=" * 60 + "\n")
+
+    tests = [
+        test_per_model_and_global_limits,
+        test_fifo_ordering,
+        test_dead_process_slots_are_reclaimed,
+        test_agent_slot_blocks_until_released,
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except Exception as e:
+            print(f"❌ {test.__name__} failed with exception: {e}")
+            failed += 1
+
+    print("\n" + "=" * 60)
+    print(f"Results: {passed} passed, {failed} failed")
+    print("=" * 60 + "\n")
+
+    return failed == 0
+
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
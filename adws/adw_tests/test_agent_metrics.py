@@ -0,0 +1,147 @@
+"""Tests for agent token, cost and latency accounting."""
+
+import sys
+import os
+import json
+import stat
+import tempfile
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from adw_modules import agent, agent_limiter, agent_metrics
+from adw_modules.agent import prompt_claude_code_with_retry
+from adw_modules.agent_metrics import iter_metrics, percentile, summarize_metrics
+from adw_modules.data_types import AgentPromptRequest
+
+RESULT_LINE = json.dumps(
+    {
+        "type": "result",
+        "subtype": "success",
+        "is_error": False,
+        "result": "done",
+        "session_id": "sess-metrics",
+        "total_cost_usd": 0.25,
+        "duration_ms": 1200,
+        "duration_api_ms": 900,
+        "num_turns": 3,
+        "usage": {
+            "input_tokens": 100,
+            "output_tokens": 40,
+            "cache_read_input_tokens": 500,
+        },
+    }
+)
+
+
+def test_call_records_usage_and_metrics():
+    """A finished call exposes usage and appends a record to the run's metrics."""
+    tmp_dir = tempfile.mkdtemp()
+    fake = os.path.join(tmp_dir, "fake_claude")
+    with open(fake, "w") as f:
+        f.write(f"#!{sys.executable}\n")
+        f.write("import sys\n")
+        f.write("if '--version' in sys.argv:\n    sys.exit(0)\n")
+        f.write(f"print({RESULT_LINE!r})\n")
+    os.chmod(fake, os.stat(fake).st_mode | stat.S_IEXEC)
+
+    original = (
+        agent.CLAUDE_PATH,
+        agent.AGENTS_DIR,
+        agent_limiter.LIMITER_DB_PATH,
+        agent_metrics.AGENTS_DIR,
+    )
+    agent.CLAUDE_PATH = fake
+    agent.AGENTS_DIR = agent_metrics.AGENTS_DIR = os.path.join(tmp_dir, "agents")
+    agent_limiter.LIMITER_DB_PATH = os.path.join(tmp_dir, "agent_limiter.db")
+    try:
+        request = AgentPromptRequest(
+            prompt="/classify_issue {}",
+            adw_id="metrtest",
+            agent_name="issue_classifier",
+            output_file=os.path.join(tmp_dir, "raw_output.jsonl"),
+        )
+        response = prompt_claude_code_with_retry(request)
+        records = list(iter_metrics())
+    finally:
+        (
+            agent.CLAUDE_PATH,
+            agent.AGENTS_DIR,
+            agent_limiter.LIMITER_DB_PATH,
+            agent_metrics.AGENTS_DIR,
+        ) = original
+
+    assert response.success
+    assert response.usage.input_tokens == 100
+    assert response.usage.cache_read_input_tokens == 500
+    assert response.usage.total_cost_usd == 0.25
+    assert response.wall_time_seconds > 0
+
+    assert len(records) == 1
+    record = records[0]
+    assert record["adw_id"] == "metrtest"
+    assert record["agent_name"] == "issue_classifier"
+    assert record["slash_command"] == "/classify_issue"
+    assert record["model"] == "sonnet"
+    assert record["retries"] == 0
+    assert record["output_tokens"] == 40
+    assert record["cost_usd"] == 0.25
+
+
+def test_summarize_metrics():
+    """Summaries report latency percentiles and cost per slash command."""
+    records = [
+        {"slash_command": "/implement", "wall_time_seconds": t, "cost_usd": 1.0,
+         "success": True, "retries": 0, "input_tokens": 10, "output_tokens": 5}
+        for t in range(1, 101)
+    ]
+    records.append(
+        {"slash_command": "/commit", "wall_time_seconds": 4.0, "cost_usd": 0.1,
+         "success": False, "retries": 2}
+    )
+    summary = summarize_metrics(iter(records))
+
+    assert list(summary) == ["/commit", "/implement"]
+    implement = summary["/implement"]
+    assert implement["calls"] == 100
+    assert implement["p50_seconds"] == 50.5
+    assert abs(implement["p95_seconds"] - 95.05) < 1e-9
+    assert implement["total_cost_usd"] == 100.0
+    assert implement["input_tokens"] == 1000
+    assert summary["/commit"]["failures"] == 1
+    assert summary["/commit"]["retries"] == 2
+    assert percentile([], 95) == 0.0
+
+
+def run_all_tests():
+    """Run all tests."""
+    print("\n" + "=" * 60)
+    print("Running Agent Metrics Tests")
+    print("=" * 60 + "\n")
+
+    tests = [
+        test_call_records_usage_and_metrics,
+        test_summarize_metrics,
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except Exception as e:
+            print(f"❌ {test.__name__} failed with exception: {e}")
+            failed += 1
+
+    print("\n" + "=" * 60)
+    print(f"Results: {passed} passed, {failed} failed")
+    print("=" * 60 + "\n")
+
+    return failed == 0
+
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
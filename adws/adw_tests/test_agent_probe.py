@@ -0,0 +1,113 @@
+"""Tests for the cached Claude Code CLI install probe."""
+
+import sys
+import os
+import stat
+import tempfile
+import time
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from adw_modules import agent
+from adw_modules.agent import check_claude_installed, clear_claude_probe_cache
+
+
+def write_counting_claude(directory: str) -> str:
+    """Write a fake CLI that appends a line to a counter file on every call."""
+    path = os.path.join(directory, "fake_claude")
+    counter = os.path.join(directory, "calls.txt")
+    with open(path, "w") as f:
+        f.write(f"#!{sys.executable}\n")
+        f.write(f"open({counter!r}, 'a').write('x\\n')\n")
+        f.write("print('1.0.0')\n")
+    os.chmod(path, os.stat(path).st_mode | stat.S_IEXEC)
+    return path
+
+
+def count_calls(directory: str) -> int:
+    """Return how many times the fake CLI was invoked."""
+    counter = os.path.join(directory, "calls.txt")
+    if not os.path.exists(counter):
+        return 0
+    with open(counter) as f:
+        return len(f.readlines())
+
+
+def test_probe_is_cached():
+    """Repeated checks only fork the CLI once."""
+    clear_claude_probe_cache()
+    tmp_dir = tempfile.mkdtemp()
+    claude = write_counting_claude(tmp_dir)
+
+    for _ in range(5):
+        assert check_claude_installed(claude) is None
+    assert count_calls(tmp_dir) == 1
+
+    assert check_claude_installed(claude, use_cache=False) is None
+    assert count_calls(tmp_dir) == 2
+
+
+def test_probe_invalidated_by_mtime_and_ttl():
+    """A changed binary or an expired TTL triggers a fresh probe."""
+    clear_claude_probe_cache()
+    tmp_dir = tempfile.mkdtemp()
+    claude = write_counting_claude(tmp_dir)
+
+    check_claude_installed(claude)
+    future = time.time() + 10
+    os.utime(claude, (future, future))
+    check_claude_installed(claude)
+    assert count_calls(tmp_dir) == 2
+
+    original_ttl = agent.CLAUDE_PROBE_TTL_SECONDS
+    agent.CLAUDE_PROBE_TTL_SECONDS = 0
+    try:
+        check_claude_installed(claude)
+    finally:
+        agent.CLAUDE_PROBE_TTL_SECONDS = original_ttl
+    assert count_calls(tmp_dir) == 3
+
+
+def test_missing_cli_reports_error():
+    """A missing CLI returns an error message."""
+    clear_claude_probe_cache()
+    missing = os.path.join(tempfile.mkdtemp(), "no_such_claude")
+    error = check_claude_installed(missing)
+    assert error is not None
+    assert missing in error
+
+
+def run_all_tests():
+    """Run all tests."""
+    print("\n" + "=" * 60)
+    print("Running Claude Probe Cache Tests")
+    print("=" * 60 + "\n")
+
+    tests = [
+        test_probe_is_cached,
+        test_probe_invalidated_by_mtime_and_ttl,
+        test_missing_cli_reports_error,
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except Exception as e:
+            print(f"❌ {test.__name__} failed with exception: {e}")
+            failed += 1
+
+    print("\n" + "=" * 60)
+    print(f"Results: {passed} passed, {failed} failed")
+    print("=" * 60 + "\n")
+
+    return failed == 0
+
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
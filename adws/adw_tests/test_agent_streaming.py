@@ -0,0 +1,185 @@
+"""Tests for streaming stream-json consumption in agent.py."""
+
+import sys
+import os
+import json
+import stat
+import tempfile
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from adw_modules import agent, agent_limiter
+from adw_modules.agent import (
+    StreamJsonConsumer,
+    convert_jsonl_to_json,
+    parse_jsonl_output,
+    prompt_claude_code,
+)
+from adw_modules.data_types import AgentPromptRequest, RetryCode
+
+
+SAMPLE_MESSAGES = [
+    {"type": "system", "subtype": "init", "session_id": "sess-1"},
+    {
+        "type": "assistant",
+        "message": {"content": [{"type": "text", "text": "Working on it"}]},
+        "session_id": "sess-1",
+    },
+    {
+        "type": "result",
+        "subtype": "success",
+        "is_error": False,
+        "result": "All done",
+        "session_id": "sess-1",
+    },
+]
+
+
+def write_fake_claude(directory: str, lines, exit_code: int = 0) -> str:
+    """Write an executable fake Claude CLI that prints the given lines."""
+    path = os.path.join(directory, "fake_claude")
+    body = "\n".join(lines)
+    with open(path, "w") as f:
+        f.write(f"#!{sys.executable}\n")
+        f.write("import sys\n")
+        f.write("if '--version' in sys.argv:\n    print('1.0.0')\n    sys.exit(0)\n")
+        f.write(f"sys.stdout.write({body!r} + '\\n')\n")
+        f.write("sys.stderr.write('some warning\\n')\n")
+        f.write(f"sys.exit({exit_code})\n")
+    os.chmod(path, os.stat(path).st_mode | stat.S_IEXEC)
+    return path
+
+
+def run_with_fake_claude(lines, exit_code: int = 0):
+    """Run prompt_claude_code against a fake CLI and return (response, output_file)."""
+    tmp_dir = tempfile.mkdtemp()
+    original = (agent.CLAUDE_PATH, agent_limiter.LIMITER_DB_PATH)
+    agent.CLAUDE_PATH = write_fake_claude(tmp_dir, lines, exit_code)
+    agent_limiter.LIMITER_DB_PATH = os.path.join(tmp_dir, "agent_limiter.db")
+    try:
+        output_file = os.path.join(tmp_dir, "ops", "raw_output.jsonl")
+        request = AgentPromptRequest(
+            prompt="hello",
+            adw_id="test1234",
+            output_file=output_file,
+        )
+        return prompt_claude_code(request), output_file
+    finally:
+        agent.CLAUDE_PATH, agent_limiter.LIMITER_DB_PATH = original
+
+
+def test_consumer_tracks_result_and_session():
+    """Consumer keeps result, session and a bounded tail."""
+    lines = [json.dumps(m) + "\n" for m in SAMPLE_MESSAGES]
+    lines.insert(1, "\n")
+    lines.insert(2, "not json\n")
+    consumer = StreamJsonConsumer().consume(lines)
+
+    assert consumer.message_count == 3
+    assert consumer.session_id == "sess-1"
+    assert consumer.result_message["result"] == "All done"
+    assert consumer.last_assistant_text() == "Working on it"
+    assert consumer.last_assistant_text(keywords=["error"]) is None
+
+    many = [json.dumps({"type": "user", "n": i}) for i in range(20)]
+    consumer = StreamJsonConsumer().consume(many)
+    assert len(consumer.tail) == StreamJsonConsumer.TAIL_SIZE
+
+
+def test_consumer_tees_to_sink():
+    """Every line fed is written to the sink unchanged."""
+    lines = [json.dumps(m) + "\n" for m in SAMPLE_MESSAGES]
+    with tempfile.NamedTemporaryFile("w+", suffix=".jsonl", delete=False) as f:
+        StreamJsonConsumer(sink=f).consume(lines)
+        f.seek(0)
+        assert f.read() == "".join(lines)
+    os.remove(f.name)
+
+
+def test_convert_jsonl_to_json_matches_array_dump():
+    """Streaming export produces the same document as json.dump(indent=2)."""
+    tmp_dir = tempfile.mkdtemp()
+    jsonl_file = os.path.join(tmp_dir, "raw_output.jsonl")
+    with open(jsonl_file, "w") as f:
+        for message in SAMPLE_MESSAGES:
+            f.write(json.dumps(message) + "\n")
+
+    json_file = convert_jsonl_to_json(jsonl_file)
+    with open(json_file) as f:
+        assert f.read() == json.dumps(SAMPLE_MESSAGES, indent=2)
+
+    empty_file = os.path.join(tmp_dir, "empty.jsonl")
+    open(empty_file, "w").close()
+    with open(convert_jsonl_to_json(empty_file)) as f:
+        assert json.load(f) == []
+
+
+def test_prompt_claude_code_success():
+    """Result is extracted and raw output is teed to disk."""
+    lines = [json.dumps(m) for m in SAMPLE_MESSAGES]
+    response, output_file = run_with_fake_claude(lines)
+
+    assert response.success
+    assert response.output == "All done"
+    assert response.session_id == "sess-1"
+    messages, result_message = parse_jsonl_output(output_file)
+    assert len(messages) == 3
+    assert result_message["result"] == "All done"
+    # JSON export is opt-in
+    assert not os.path.exists(output_file.replace(".jsonl", ".json"))
+
+
+def test_prompt_claude_code_failure_uses_stream_context():
+    """Non-zero exits surface the last error-like assistant message."""
+    lines = [
+        json.dumps(SAMPLE_MESSAGES[0]),
+        json.dumps(
+            {
+                "type": "assistant",
+                "message": {"content": [{"type": "text", "text": "Build failed badly"}]},
+            }
+        ),
+    ]
+    response, _ = run_with_fake_claude(lines, exit_code=1)
+
+    assert not response.success
+    assert response.retry_code == RetryCode.CLAUDE_CODE_ERROR
+    assert "Build failed badly" in response.output
+
+
+def run_all_tests():
+    """Run all tests."""
+    print("\n" + "=" * 60)
+    print("Running Agent Streaming Tests")
+    print("=" * 60 + "\n")
+
+    tests = [
+        test_consumer_tracks_result_and_session,
+        test_consumer_tees_to_sink,
+        test_convert_jsonl_to_json_matches_array_dump,
+        test_prompt_claude_code_success,
+        test_prompt_claude_code_failure_uses_stream_context,
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except Exception as e:
+            print(f"❌ {test.__name__} failed with exception: {e}")
+            failed += 1
+
+    print("\n" + "=" * 60)
+    print(f"Results: {passed} passed, {failed} failed")
+    print("=" * 60 + "\n")
+
+    return failed == 0
+
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
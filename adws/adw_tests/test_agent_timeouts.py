@@ -0,0 +1,167 @@
+"""Tests for agent timeout budgets and the idle-output watchdog."""
+
+import sys
+import os
+import json
+import stat
+import asyncio
+import tempfile
+import time
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from adw_modules import agent, agent_limiter
+from adw_modules.agent import (
+    AgentWatchdog,
+    get_timeout_for_prompt,
+    prompt_claude_code,
+    prompt_claude_code_async,
+)
+from adw_modules.data_types import AgentPromptRequest, RetryCode
+
+PARTIAL_LINES = [
+    json.dumps({"type": "system", "subtype": "init", "session_id": "sess-hang"}),
+    json.dumps(
+        {
+            "type": "assistant",
+            "session_id": "sess-hang",
+            "message": {"content": [{"type": "text", "text": "Reading files"}]},
+        }
+    ),
+]
+
+
+def write_hanging_claude(directory: str) -> str:
+    """Write a fake CLI that prints partial output, then hangs forever."""
+    path = os.path.join(directory, "fake_claude")
+    with open(path, "w") as f:
+        f.write(f"#!{sys.executable}\n")
+        f.write("import sys, time\n")
+        f.write("if '--version' in sys.argv:\n    sys.exit(0)\n")
+        for line in PARTIAL_LINES:
+            f.write(f"print({line!r}, flush=True)\n")
+        f.write("time.sleep(60)\n")
+    os.chmod(path, os.stat(path).st_mode | stat.S_IEXEC)
+    return path
+
+
+def run_hanging_prompt(runner, **request_kwargs):
+    """Run a prompt against the hanging CLI with a fast watchdog."""
+    tmp_dir = tempfile.mkdtemp()
+    original = (
+        agent.CLAUDE_PATH,
+        agent.AGENTS_DIR,
+        agent.WATCHDOG_POLL_SECONDS,
+        agent.WATCHDOG_KILL_GRACE_SECONDS,
+        agent_limiter.LIMITER_DB_PATH,
+    )
+    agent.CLAUDE_PATH = write_hanging_claude(tmp_dir)
+    agent.AGENTS_DIR = os.path.join(tmp_dir, "agents")
+    agent.WATCHDOG_POLL_SECONDS = 0.1
+    agent.WATCHDOG_KILL_GRACE_SECONDS = 0.5
+    agent_limiter.LIMITER_DB_PATH = os.path.join(tmp_dir, "agent_limiter.db")
+    try:
+        request = AgentPromptRequest(
+            prompt="/implement plan.md",
+            adw_id="timeotst",
+            output_file=os.path.join(tmp_dir, "raw_output.jsonl"),
+            **request_kwargs,
+        )
+        start = time.monotonic()
+        response = runner(request)
+        return response, time.monotonic() - start
+    finally:
+        (
+            agent.CLAUDE_PATH,
+            agent.AGENTS_DIR,
+            agent.WATCHDOG_POLL_SECONDS,
+            agent.WATCHDOG_KILL_GRACE_SECONDS,
+            agent_limiter.LIMITER_DB_PATH,
+        ) = original
+
+
+def test_timeout_budgets():
+    """Budgets come from the request, then the slash command, then the default."""
+    request = AgentPromptRequest(
+        prompt="/classify_issue {}", adw_id="x", output_file="out.jsonl"
+    )
+    assert get_timeout_for_prompt(request) == 300
+
+    request.timeout_seconds = 42
+    assert get_timeout_for_prompt(request) == 42
+
+    request = AgentPromptRequest(prompt="free form", adw_id="x", output_file="o")
+    assert get_timeout_for_prompt(request) == agent.DEFAULT_AGENT_TIMEOUT_SECONDS
+
+
+def test_watchdog_detects_idle_output():
+    """The watchdog trips when the output file stops growing."""
+    output_file = os.path.join(tempfile.mkdtemp(), "raw_output.jsonl")
+    watchdog = AgentWatchdog(output_file, timeout_seconds=60, idle_timeout_seconds=0.2)
+    assert watchdog.check() is None
+    with open(output_file, "w") as f:
+        f.write("{}\n")
+    time.sleep(0.15)
+    assert watchdog.check() is None  # Growth resets the idle timer
+    time.sleep(0.3)
+    assert "no output" in watchdog.check()
+
+
+def test_hard_timeout_kills_agent():
+    """A hung agent is killed and its partial output becomes a TIMEOUT_ERROR."""
+    response, elapsed = run_hanging_prompt(
+        prompt_claude_code, timeout_seconds=1, idle_timeout_seconds=0
+    )
+    assert not response.success
+    assert response.retry_code == RetryCode.TIMEOUT_ERROR
+    assert response.session_id == "sess-hang"
+    assert "timed out after 1 seconds" in response.output
+    assert "Reading files" in response.output
+    assert elapsed < 5, f"agent was not killed promptly ({elapsed:.2f}s)"
+
+
+def test_idle_timeout_kills_agent_async():
+    """The async path kills an agent whose output went quiet."""
+    response, elapsed = run_hanging_prompt(
+        lambda r: asyncio.run(prompt_claude_code_async(r)), idle_timeout_seconds=1
+    )
+    assert response.retry_code == RetryCode.TIMEOUT_ERROR
+    assert "no output for 1 seconds" in response.output
+    assert elapsed < 5, f"agent was not killed promptly ({elapsed:.2f}s)"
+
+
+def run_all_tests():
+    """Run all tests."""
+    print("\n" + "=" * 60)
+    print("Running Agent Timeout Tests")
+    print("=" * 60 + "\n")
+
+    tests = [
+        test_timeout_budgets,
+        test_watchdog_detects_idle_output,
+        test_hard_timeout_kills_agent,
+        test_idle_timeout_kills_agent_async,
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except Exception as e:
+            print(f"❌ {test.__name__} failed with exception: {e}")
+            failed += 1
+
+    print("\n" + "=" * 60)
+    print(f"Results: {passed} passed, {failed} failed")
+    print("=" * 60 + "\n")
+
+    return failed == 0
+
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,176 @@
+"""Tests for the background issue-comment outbox."""
+
+import sys
+import os
+import tempfile
+import time
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from adw_modules import comment_outbox, github, github_api
+from adw_modules.comment_outbox import CommentOutbox, get_coalesce_key
+from adw_modules.workflow_ops import format_issue_message
+from adw_tests.test_github_api import http_backend
+
+REPO = "owner/repo"
+
+
+def make_outbox(**kwargs) -> CommentOutbox:
+    options = {"min_interval": 0, "background": False, **kwargs}
+    return CommentOutbox(os.path.join(tempfile.mkdtemp(), "comment_outbox.db"), **options)
+
+
+def bodies(fake, issue: int):
+    return [comment["body"] for comment in fake.comments[issue]]
+
+
+def test_coalesce_key():
+    """Comments are grouped by their "<adw_id>_<agent>" tag."""
+    assert get_coalesce_key(format_issue_message("abcd1234", "ops", "Starting")) == (
+        "abcd1234_ops"
+    )
+    assert get_coalesce_key(
+        format_issue_message("abcd1234", "sdlc_planner", "Done", session_id="s-1")
+    ) == "abcd1234_sdlc_planner_s-1"
+    assert get_coalesce_key("Plain comment") is None
+
+
+def test_bursts_are_coalesced():
+    """A burst becomes one comment; follow-ups edit it; other tags get their own."""
+    with http_backend() as fake:
+        fake.add_issue(1, "Bug")
+        outbox = make_outbox()
+        for message in ["Starting", "Using state", "Fetched issue"]:
+            outbox.enqueue(REPO, "1", format_issue_message("abcd1234", "ops", message))
+        outbox.enqueue(REPO, "1", format_issue_message("abcd1234", "planner", "Plan ready"))
+
+        assert outbox.drain(timeout=5)
+        assert bodies(fake, 1) == [
+            "[ADW-AGENTS] abcd1234_ops: Starting\n\n"
+            "[ADW-AGENTS] abcd1234_ops: Using state\n\n"
+            "[ADW-AGENTS] abcd1234_ops: Fetched issue",
+            "[ADW-AGENTS] abcd1234_planner: Plan ready",
+        ]
+
+        # Follows the last ADW comment with the same tag: edited in place
+        outbox.enqueue(REPO, "1", format_issue_message("abcd1234", "planner", "Committed"))
+        assert outbox.drain(timeout=5)
+        assert len(fake.comments[1]) == 2
+        assert bodies(fake, 1)[1].endswith("Plan ready\n\n[ADW-AGENTS] abcd1234_planner: Committed")
+        assert fake.requests.count(("POST", "/repos/owner/repo/issues/1/comments")) == 2
+
+        # A different tag in between starts a new comment
+        outbox.enqueue(REPO, "1", format_issue_message("abcd1234", "ops", "Shipping"))
+        assert outbox.drain(timeout=5)
+        assert len(fake.comments[1]) == 3
+
+
+def test_coalescing_window_expires():
+    """Comments after the coalescing window are posted separately."""
+    with http_backend() as fake:
+        fake.add_issue(2, "Bug")
+        outbox = make_outbox(coalesce_window=0)
+        outbox.enqueue(REPO, "2", format_issue_message("abcd1234", "ops", "One"))
+        assert outbox.drain(timeout=5)
+        time.sleep(0.01)
+        outbox.enqueue(REPO, "2", format_issue_message("abcd1234", "ops", "Two"))
+        assert outbox.drain(timeout=5)
+        assert bodies(fake, 2) == [
+            "[ADW-AGENTS] abcd1234_ops: One",
+            "[ADW-AGENTS] abcd1234_ops: Two",
+        ]
+
+
+def test_rate_limit_pauses_writes():
+    """A rate-limited write keeps the comment queued and pauses all writers."""
+    with http_backend() as fake:
+        fake.add_issue(3, "Bug")
+        outbox = make_outbox(rate_limit_backoff=0.3)
+        fake.failures["POST /repos/owner/repo/issues/3/comments"] = 429
+
+        outbox.enqueue(REPO, "3", "[ADW-AGENTS] first")
+        outbox.enqueue(REPO, "3", "[ADW-AGENTS] second")
+        assert outbox.flush_once() == 2
+        assert fake.comments[3] == []
+        assert len(outbox.pending_ids()) == 2
+
+        del fake.failures["POST /repos/owner/repo/issues/3/comments"]
+        start = time.monotonic()
+        assert outbox.drain(timeout=5)
+        assert time.monotonic() - start >= 0.2
+        assert bodies(fake, 3) == ["[ADW-AGENTS] first", "[ADW-AGENTS] second"]
+
+
+def test_failures_retry_in_order():
+    """A failed comment is retried before later comments of the same issue."""
+    with http_backend() as fake:
+        fake.add_issue(4, "Bug")
+        outbox = make_outbox()
+        fake.failures["POST /repos/owner/repo/issues/4/comments"] = 500
+
+        outbox.enqueue(REPO, "4", "[ADW-AGENTS] first")
+        outbox.flush_once()
+        outbox.enqueue(REPO, "4", "[ADW-AGENTS] second")
+        del fake.failures["POST /repos/owner/repo/issues/4/comments"]
+
+        # The first comment is backing off, so nothing of issue 4 is due yet
+        assert outbox.flush_once() == 0
+        with outbox._connect() as conn:
+            conn.execute("UPDATE outbox SET next_attempt_at = 0")
+        assert outbox.drain(timeout=5)
+        assert bodies(fake, 4) == ["[ADW-AGENTS] first", "[ADW-AGENTS] second"]
+
+
+def test_make_issue_comment_uses_outbox():
+    """With the outbox enabled, make_issue_comment returns before posting."""
+    original = (github.COMMENT_OUTBOX_ENABLED, comment_outbox.OUTBOX_DB_PATH)
+    github.COMMENT_OUTBOX_ENABLED = True
+    comment_outbox.OUTBOX_DB_PATH = os.path.join(tempfile.mkdtemp(), "comment_outbox.db")
+    try:
+        with http_backend() as fake:
+            fake.add_issue(5, "Bug")
+            github.make_issue_comment("5", format_issue_message("abcd1234", "ops", "Hi"))
+            outbox = comment_outbox.get_comment_outbox()
+            assert outbox.drain(timeout=5)
+            assert bodies(fake, 5) == ["[ADW-AGENTS] abcd1234_ops: Hi"]
+    finally:
+        github.COMMENT_OUTBOX_ENABLED, comment_outbox.OUTBOX_DB_PATH = original
+
+
+def run_all_tests():
+    """Run all tests."""
+    print("\n" + "=" * 60)
+    print("Running Comment Outbox Tests")
+    print("=" * 60 + "\n")
+
+    tests = [
+        test_coalesce_key,
+        test_bursts_are_coalesced,
+        test_coalescing_window_expires,
+        test_rate_limit_pauses_writes,
+        test_failures_retry_in_order,
+        test_make_issue_comment_uses_outbox,
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except Exception as e:
+            print(f"❌ {test.__name__} failed with exception: {e}")
+            failed += 1
+
+    print("\n" + "=" * 60)
+    print(f"Results: {passed} passed, {failed} failed")
+    print("=" * 60 + "\n")
+
+    return failed == 0
+
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
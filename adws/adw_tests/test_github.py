@@ -0,0 +1,118 @@
+"""Tests for repository identity resolution in the GitHub module."""
+
+import sys
+import os
+import subprocess
+import tempfile
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from adw_modules import github
+from adw_modules.github import extract_repo_path, find_git_config, get_repo_url
+
+
+def git(*args: str, cwd: str) -> None:
+    subprocess.run(["git", *args], cwd=cwd, check=True, capture_output=True)
+
+
+def test_extract_repo_path():
+    """HTTPS and SSH remotes all map to owner/repo."""
+    for url in [
+        "https://github.com/owner/repo",
+        "https://github.com/owner/repo.git",
+        "https://github.com/owner/repo/",
+        "git@github.com:owner/repo.git",
+        "git@github.com:owner/repo",
+        "ssh://git@github.com/owner/repo.git",
+        "ssh://git@github.example.com:2222/owner/repo.git",
+    ]:
+        assert extract_repo_path(url) == "owner/repo", url
+
+    # Only a trailing .git is stripped
+    assert extract_repo_path("git@github.com:owner/site.github.io.git") == (
+        "owner/site.github.io"
+    )
+
+
+def test_get_repo_url_is_cached_until_config_changes():
+    """The origin URL is read once and re-read after the remote changes."""
+    repo_dir = os.path.realpath(tempfile.mkdtemp())
+    git("init", "-q", cwd=repo_dir)
+    git("remote", "add", "origin", "git@github.com:owner/first.git", cwd=repo_dir)
+    worktree_dir = os.path.join(repo_dir, "trees", "wt")
+    git(
+        "-c", "user.email=adw@example.com", "-c", "user.name=adw",
+        "commit", "-q", "--allow-empty", "-m", "init",
+        cwd=repo_dir,
+    )
+    git("worktree", "add", "-q", worktree_dir, cwd=repo_dir)
+
+    calls = []
+    original_run = github.subprocess.run
+
+    def counting_run(*args, **kwargs):
+        calls.append(args[0])
+        return original_run(*args, **kwargs)
+
+    original_cwd = os.getcwd()
+    github.clear_repo_cache()
+    github.subprocess.run = counting_run
+    try:
+        os.chdir(repo_dir)
+        assert find_git_config() == os.path.join(repo_dir, ".git", "config")
+        assert get_repo_url() == "git@github.com:owner/first.git"
+        assert get_repo_url() == "git@github.com:owner/first.git"
+        assert len(calls) == 1
+
+        # A linked worktree shares the main repository's config
+        os.chdir(worktree_dir)
+        assert find_git_config() == os.path.join(repo_dir, ".git", "config")
+        assert get_repo_url() == "git@github.com:owner/first.git"
+        assert len(calls) == 1
+
+        os.chdir(repo_dir)
+        original_run(
+            ["git", "remote", "set-url", "origin", "https://github.com/owner/second-repo.git"],
+            check=True,
+        )
+        assert get_repo_url() == "https://github.com/owner/second-repo.git"
+        assert len(calls) == 2
+    finally:
+        github.subprocess.run = original_run
+        github.clear_repo_cache()
+        os.chdir(original_cwd)
+
+
+def run_all_tests():
+    """Run all tests."""
+    print("\n" + "=" * 60)
+    print("Running GitHub Module Tests")
+    print("=" * 60 + "\n")
+
+    tests = [
+        test_extract_repo_path,
+        test_get_repo_url_is_cached_until_config_changes,
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except Exception as e:
+            print(f"❌ {test.__name__} failed with exception: {e}")
+            failed += 1
+
+    print("\n" + "=" * 60)
+    print(f"Results: {passed} passed, {failed} failed")
+    print("=" * 60 + "\n")
+
+    return failed == 0
+
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,326 @@
+"""Tests for the HTTP GitHub backend against a local fake GitHub."""
+
+import sys
+import os
+import json
+import logging
+import stat
+import tempfile
+
+from requests.adapters import HTTPAdapter
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from adw_modules import git_ops, github, github_api, github_cache
+from adw_modules.data_types import GitHubIssue
+from adw_tests.fake_github import FakeGitHub
+
+REPO_URL = "https://github.com/owner/repo"
+
+
+class http_backend:
+    """Context manager pointing the HTTP backend at a fresh fake GitHub."""
+
+    def __enter__(self) -> FakeGitHub:
+        self.original = (
+            github_api.GITHUB_BACKEND,
+            github_api.GITHUB_API_URL,
+            github.get_repo_url,
+            git_ops.get_repo_url,
+            github_cache.GITHUB_CACHE_DB_PATH,
+        )
+        self.fake = FakeGitHub().start()
+        github_api.GITHUB_BACKEND = "http"
+        github_api.GITHUB_API_URL = self.fake.url
+        github_cache.GITHUB_CACHE_DB_PATH = os.path.join(
+            tempfile.mkdtemp(), "github_cache.db"
+        )
+        github.get_repo_url = git_ops.get_repo_url = lambda: REPO_URL
+        return self.fake
+
+    def __exit__(self, *exc):
+        (
+            github_api.GITHUB_BACKEND,
+            github_api.GITHUB_API_URL,
+            github.get_repo_url,
+            git_ops.get_repo_url,
+            github_cache.GITHUB_CACHE_DB_PATH,
+        ) = self.original
+        github_api.get_github_client().close()
+        self.fake.stop()
+
+
+def test_fetch_issue_reuses_connection():
+    """Issues are fetched in gh's shape over a single keep-alive connection."""
+    with http_backend() as fake:
+        fake.add_issue(1, "Add login", body="adw_plan_iso", labels=("feature",))
+        fake.add_comment(1, "second", created_at="2025-01-02T00:00:00Z")
+        fake.add_comment(1, "first")
+
+        for _ in range(3):
+            issue = github.fetch_issue("1", "owner/repo")
+        assert isinstance(issue, GitHubIssue)
+        assert issue.state == "OPEN"
+        assert issue.author.login == "alice"
+        assert issue.labels[0].name == "feature"
+        assert [c.body for c in issue.comments] == ["first", "second"]
+        assert issue.url == "https://github.com/owner/repo/issues/1"
+
+        comments = github.fetch_issue_comments("owner/repo", 1)
+        assert [c["body"] for c in comments] == ["first", "second"]
+
+        assert len(fake.requests) == 8
+        assert fake.connections == 1
+
+
+def test_fetch_open_issues_paginates():
+    """Open issues are read page by page and pull requests are skipped."""
+    with http_backend() as fake:
+        for number in range(1, 151):
+            fake.add_issue(number, f"Issue {number}")
+        fake.add_issue(151, "A pull request", pull_request=True)
+
+        issues = github.fetch_open_issues("owner/repo")
+        assert len(issues) == 150
+        assert {i.number for i in issues} == set(range(1, 151))
+        assert fake.requests.count(("GET", "/repos/owner/repo/issues")) == 2
+
+
+def test_issue_writes():
+    """Comments are posted with the bot identifier; issues get label and assignee."""
+    with http_backend() as fake:
+        fake.add_issue(5, "Fix bug")
+
+        github.make_issue_comment("5", "Planning done")
+        github.mark_issue_in_progress("5")
+
+        assert fake.comments[5][0]["body"] == f"{github.ADW_BOT_IDENTIFIER} Planning done"
+        assert [label["name"] for label in fake.issues[5]["labels"]] == ["in_progress"]
+        assert [user["login"] for user in fake.issues[5]["assignees"]] == ["adw-bot"]
+
+
+def test_pull_request_helpers():
+    """PR lookup, approval and merge go through the REST API."""
+    logger = logging.getLogger("test_github_api")
+    with http_backend() as fake:
+        fake.add_pull(12, "feat-issue-5-adw-abc12345")
+        fake.add_pull(13, "bug-issue-6-adw-def67890", mergeable=False)
+
+        assert git_ops.check_pr_exists("feat-issue-5-adw-abc12345") == (
+            "https://github.com/owner/repo/pull/12"
+        )
+        assert git_ops.get_pr_number("feat-issue-5-adw-abc12345") == "12"
+        assert git_ops.get_pr_number("no-such-branch") is None
+
+        assert git_ops.approve_pr("12", logger) == (True, None)
+        assert fake.reviews[0][1]["event"] == "APPROVE"
+
+        assert git_ops.merge_pr("12", logger) == (True, None)
+        assert fake.merges == [
+            (
+                12,
+                {
+                    "merge_method": "squash",
+                    "commit_message": "Merged by ADW Ship workflow after successful validation.",
+                },
+            )
+        ]
+
+        success, error = git_ops.merge_pr("13", logger)
+        assert not success
+        assert "not mergeable" in error
+
+
+def test_unchanged_responses_are_not_modified():
+    """Repeated polls are revalidated with ETags and served from the cache."""
+    with http_backend() as fake:
+        fake.add_issue(1, "First")
+
+        assert [i.number for i in github.fetch_open_issues("owner/repo")] == [1]
+        assert [i.number for i in github.fetch_open_issues("owner/repo")] == [1]
+        assert fake.not_modified == 1
+
+        fake.add_issue(2, "Second")
+        assert [i.number for i in github.fetch_open_issues("owner/repo")] == [2, 1]
+        assert fake.not_modified == 1
+
+
+def test_comments_are_fetched_incrementally():
+    """Comment refreshes use since= and resync when comments are deleted."""
+    with http_backend() as fake:
+        fake.add_issue(3, "Bug")
+        fake.add_comment(3, "one", created_at="2025-01-01T00:00:00Z")
+        fake.add_comment(3, "two", created_at="2025-01-02T00:00:00Z")
+        assert [c.body for c in github.fetch_issue("3", "owner/repo").comments] == [
+            "one",
+            "two",
+        ]
+
+        fake.add_comment(3, "three", created_at="2025-01-03T00:00:00Z")
+        issue = github.fetch_issue("3", "owner/repo")
+        assert [c.body for c in issue.comments] == ["one", "two", "three"]
+        assert fake.raw_paths[-1].endswith("since=2025-01-01T23%3A59%3A59Z")
+
+        # Deleting a comment changes the count, so the comments are refetched
+        del fake.comments[3][0]
+        fake.issues[3]["comments"] = 2
+        issue = github.fetch_issue("3", "owner/repo")
+        assert [c.body for c in issue.comments] == ["two", "three"]
+        assert "since" not in fake.raw_paths[-1]
+
+        # fetch_issue_comments checks the count as well
+        del fake.comments[3][0]
+        fake.issues[3]["comments"] = 1
+        comments = github.fetch_issue_comments("owner/repo", 3)
+        assert [c["body"] for c in comments] == ["three"]
+        assert "since" not in fake.raw_paths[-1]
+
+
+def test_open_issue_summaries_are_batched():
+    """Open issues and their latest comments come from 100-issue GraphQL pages."""
+    with http_backend() as fake:
+        for number in range(1, 251):
+            fake.add_issue(number, f"Issue {number}")
+        fake.add_issue(251, "A pull request", pull_request=True)
+        fake.add_comment(7, "looks good")
+        fake.add_comment(7, "adw")
+
+        issues = github.fetch_open_issue_summaries("owner/repo")
+        assert len(issues) == 250
+        assert fake.requests == [("POST", "/graphql")] * 3
+
+        by_number = {issue.number: issue for issue in issues}
+        assert by_number[7].comment_count == 2
+        assert by_number[7].last_comment.body == "adw"
+        assert by_number[7].last_comment.author.login == "alice"
+        assert by_number[8].last_comment is None
+
+
+def test_falls_back_to_gh():
+    """A failing API call is retried through the gh CLI."""
+    tmp_dir = tempfile.mkdtemp()
+    gh_path = os.path.join(tmp_dir, "gh")
+    issues = [
+        {
+            "number": 9,
+            "title": "From gh",
+            "body": "",
+            "labels": [],
+            "createdAt": "2025-01-01T00:00:00Z",
+            "updatedAt": "2025-01-01T00:00:00Z",
+        }
+    ]
+    with open(gh_path, "w") as f:
+        f.write(f"#!{sys.executable}\n")
+        f.write(f"print({json.dumps(issues)!r})\n")
+    os.chmod(gh_path, os.stat(gh_path).st_mode | stat.S_IEXEC)
+
+    original_path = os.environ["PATH"]
+    os.environ["PATH"] = tmp_dir + os.pathsep + original_path
+    try:
+        with http_backend() as fake:
+            fake.failures["GET /repos/owner/repo/issues"] = 500
+            result = github.fetch_open_issues("owner/repo")
+            assert [issue.number for issue in result] == [9]
+            assert fake.requests == [("GET", "/repos/owner/repo/issues")]
+    finally:
+        os.environ["PATH"] = original_path
+
+
+def test_writes_fall_back_only_when_not_applied():
+    """Writes are redone through gh only if GitHub certainly did not apply them."""
+    logger = logging.getLogger("test_github_api")
+    tmp_dir = tempfile.mkdtemp()
+    gh_path = os.path.join(tmp_dir, "gh")
+    calls_path = os.path.join(tmp_dir, "gh_calls")
+    with open(gh_path, "w") as f:
+        f.write(f"#!{sys.executable}\n")
+        f.write("import sys\n")
+        f.write(f"open({calls_path!r}, 'a').write(sys.argv[1] + '\\n')\n")
+        f.write("print('https://github.com/owner/repo/issues/5#issuecomment-77')\n")
+    os.chmod(gh_path, os.stat(gh_path).st_mode | stat.S_IEXEC)
+
+    def gh_calls():
+        if not os.path.exists(calls_path):
+            return []
+        with open(calls_path) as f:
+            return f.read().split()
+
+    original_path = os.environ["PATH"]
+    os.environ["PATH"] = tmp_dir + os.pathsep + original_path
+    try:
+        with http_backend() as fake:
+            fake.add_issue(5, "Fix bug")
+            fake.add_pull(12, "feat-issue-5-adw-abc12345")
+
+            # A server error may have been applied: surfaced, not redone
+            fake.failures["POST /repos/owner/repo/issues/5/comments"] = 502
+            try:
+                github.post_issue_comment("owner/repo", "5", "hello")
+                assert False, "a 502 should be raised"
+            except github_api.GitHubAPIError as e:
+                assert e.status == 502
+            fake.failures["POST /repos/owner/repo/pulls/12/reviews"] = 500
+            success, error = git_ops.approve_pr("12", logger)
+            assert not success and "500" in error
+            fake.failures["PUT /repos/owner/repo/pulls/12/merge"] = 504
+            success, error = git_ops.merge_pr("12", logger)
+            assert not success and "504" in error
+            assert gh_calls() == []
+
+            # Rejected credentials: nothing was applied, so gh redoes it
+            fake.failures["POST /repos/owner/repo/issues/5/comments"] = 401
+            assert github.post_issue_comment("owner/repo", "5", "hello") == "77"
+            assert gh_calls() == ["issue"]
+
+        # Nothing listening: the request never left
+        with http_backend():
+            github_api.GITHUB_API_URL = "http://127.0.0.1:9"
+            # Skip the connect retries' backoff
+            github_api.get_github_client().session.mount("http://", HTTPAdapter())
+            assert github.post_issue_comment("owner/repo", "5", "hello") == "77"
+            assert gh_calls() == ["issue", "issue"]
+    finally:
+        os.environ["PATH"] = original_path
+
+
+def run_all_tests():
+    """Run all tests."""
+    print("\n" + "=" * 60)
+    print("Running GitHub API Tests")
+    print("=" * 60 + "\n")
+
+    tests = [
+        test_fetch_issue_reuses_connection,
+        test_fetch_open_issues_paginates,
+        test_issue_writes,
+        test_pull_request_helpers,
+        test_unchanged_responses_are_not_modified,
+        test_comments_are_fetched_incrementally,
+        test_open_issue_summaries_are_batched,
+        test_falls_back_to_gh,
+        test_writes_fall_back_only_when_not_applied,
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except Exception as e:
+            print(f"❌ {test.__name__} failed with exception: {e}")
+            failed += 1
+
+    print("\n" + "=" * 60)
+    print(f"Results: {passed} passed, {failed} failed")
+    print("=" * 60 + "\n")
+
+    return failed == 0
+
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,142 @@
+"""Tests for the cached health monitor used by the webhook trigger."""
+
+import sys
+import os
+import threading
+import time
+from datetime import datetime
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from adw_modules import health
+from adw_modules.data_types import CheckResult, HealthCheckResult
+from adw_modules.health import HealthMonitor
+
+
+class slow_checks:
+    """Context manager replacing run_health_check with a counting, slow fake."""
+
+    def __init__(self, seconds: float = 0.2):
+        self.seconds = seconds
+        self.runs = 0
+
+    def run(self) -> HealthCheckResult:
+        self.runs += 1
+        time.sleep(self.seconds)
+        return HealthCheckResult(
+            success=True,
+            timestamp=datetime.now().isoformat(),
+            checks={"environment": CheckResult(success=True)},
+            warnings=[f"run {self.runs}"],
+        )
+
+    def __enter__(self):
+        self.original = health.run_health_check
+        health.run_health_check = self.run
+        return self
+
+    def __exit__(self, *exc):
+        health.run_health_check = self.original
+
+
+def test_get_serves_cache_without_running_checks():
+    """get() never runs checks; refresh() does and caches the result."""
+    with slow_checks() as checks:
+        monitor = HealthMonitor()
+        pending = monitor.get()
+        assert not pending.success
+        assert pending.errors == ["Health check has not completed yet"]
+
+        assert monitor.refresh().warnings == ["run 1"]
+        start = time.perf_counter()
+        for _ in range(100):
+            result = monitor.get()
+        assert time.perf_counter() - start < 0.01
+        assert result.warnings == ["run 1"]
+        assert checks.runs == 1
+
+
+def test_concurrent_refreshes_share_one_run():
+    """Deep checks arriving during a refresh wait for it instead of piling up."""
+    with slow_checks() as checks:
+        monitor = HealthMonitor()
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(monitor.refresh()))
+            for _ in range(5)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        # The first refresh runs alone; everyone queued behind it shares the next
+        assert checks.runs <= 2
+        assert len(results) == 5
+
+
+def test_background_refresh():
+    """The monitor refreshes on its interval once started."""
+    with slow_checks(seconds=0) as checks:
+        monitor = HealthMonitor(interval_seconds=0.05).start()
+        try:
+            deadline = time.time() + 5
+            while checks.runs < 3 and time.time() < deadline:
+                time.sleep(0.01)
+            assert checks.runs >= 3
+            assert monitor.get().success
+        finally:
+            monitor.stop()
+
+
+def test_failing_checks_are_reported():
+    """An exception in the checks is cached as an unhealthy result."""
+    original = health.run_health_check
+
+    def broken():
+        raise RuntimeError("boom")
+
+    health.run_health_check = broken
+    try:
+        result = HealthMonitor().refresh()
+        assert not result.success
+        assert result.errors == ["Health check failed: boom"]
+    finally:
+        health.run_health_check = original
+
+
+def run_all_tests():
+    """Run all tests."""
+    print("\n" + "=" * 60)
+    print("Running Health Monitor Tests")
+    print("=" * 60 + "\n")
+
+    tests = [
+        test_get_serves_cache_without_running_checks,
+        test_concurrent_refreshes_share_one_run,
+        test_background_refresh,
+        test_failing_checks_are_reported,
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except Exception as e:
+            print(f"❌ {test.__name__} failed with exception: {e}")
+            failed += 1
+
+    print("\n" + "=" * 60)
+    print(f"Results: {passed} passed, {failed} failed")
+    print("=" * 60 + "\n")
+
+    return failed == 0
+
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,134 @@
+"""Tests for the phase event log and composite workflow resume."""
+
+import sys
+import os
+import shutil
+import subprocess
+import tempfile
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from adw_modules import phase_log
+from adw_modules import state as state_module
+from adw_modules.phase_log import get_completed_phases, read_events, run_phase
+from adw_modules.state import ADWState
+
+TEST_ADW_ID = "phasetst"
+
+GIT = ["git", "-c", "user.name=ADW Test", "-c", "user.email=adw@example.com"]
+
+
+def make_worktree() -> str:
+    """Create a git repository with one commit to act as the run's worktree."""
+    worktree = tempfile.mkdtemp()
+    subprocess.run(["git", "init", "-q"], cwd=worktree, check=True)
+    commit_cmd = GIT + ["commit", "-q", "--allow-empty", "-m", "init"]
+    subprocess.run(commit_cmd, cwd=worktree, check=True)
+    return worktree
+
+
+def python_cmd(code: str):
+    return [sys.executable, "-c", code]
+
+
+class temp_agents_dir:
+    """Context manager pointing run state and phase logs at a temp dir."""
+
+    def __enter__(self) -> str:
+        self.original = (state_module.AGENTS_DIR, phase_log.AGENTS_DIR)
+        self.path = tempfile.mkdtemp()
+        state_module.AGENTS_DIR = phase_log.AGENTS_DIR = self.path
+        state_module.clear_state_cache()
+        return self.path
+
+    def __exit__(self, *exc):
+        state_module.AGENTS_DIR, phase_log.AGENTS_DIR = self.original
+        state_module.clear_state_cache()
+        shutil.rmtree(self.path, ignore_errors=True)
+
+
+def test_resume_skips_phases_completed_at_current_commit():
+    """Only the successful prefix ending at the current HEAD is skipped."""
+    worktree = make_worktree()
+    try:
+        with temp_agents_dir():
+            state = ADWState(TEST_ADW_ID)
+            state.update(worktree_path=worktree)
+            state.save("test")
+
+            commit_in_worktree = python_cmd(
+                "import subprocess; subprocess.run("
+                f"{GIT + ['commit', '-q', '--allow-empty', '-m', 'build']!r}, "
+                f"cwd={worktree!r}, check=True)"
+            )
+            assert run_phase(TEST_ADW_ID, "plan", python_cmd("pass")) == 0
+            assert run_phase(TEST_ADW_ID, "build", commit_in_worktree) == 0
+            assert run_phase(TEST_ADW_ID, "test", python_cmd("raise SystemExit(3)")) == 3
+
+            phases = ["plan", "build", "test", "review"]
+            assert get_completed_phases(TEST_ADW_ID, phases) == ["plan", "build"]
+
+            events = read_events(TEST_ADW_ID)
+            finishes = [e for e in events if e["event"] == "phase_finish"]
+            assert [(e["phase"], e["outcome"]) for e in finishes] == [
+                ("plan", "success"),
+                ("build", "success"),
+                ("test", "failure"),
+            ]
+            assert finishes[0]["commit"] != finishes[1]["commit"]
+            assert any(e["event"] == "state_saved" and e["step"] == "test" for e in events)
+
+            # A completed phase is not re-run
+            marker = os.path.join(worktree, "ran")
+            assert run_phase(
+                TEST_ADW_ID, "plan", python_cmd(f"open({marker!r}, 'w')"), ["plan", "build"]
+            ) == 0
+            assert not os.path.exists(marker)
+
+            # Once the worktree moves on, nothing can be resumed
+            subprocess.run(GIT + ["commit", "-q", "--allow-empty", "-m", "x"], cwd=worktree, check=True)
+            assert get_completed_phases(TEST_ADW_ID, phases) == []
+    finally:
+        shutil.rmtree(worktree, ignore_errors=True)
+
+
+def test_no_worktree_means_nothing_to_resume():
+    """Runs without a worktree have no commit to resume against."""
+    with temp_agents_dir():
+        assert run_phase(TEST_ADW_ID, "plan", python_cmd("pass")) == 0
+        assert get_completed_phases(TEST_ADW_ID, ["plan"]) == []
+
+
+def run_all_tests():
+    """Run all tests."""
+    print("\n" + "=" * 60)
+    print("Running Phase Log Tests")
+    print("=" * 60 + "\n")
+
+    tests = [
+        test_resume_skips_phases_completed_at_current_commit,
+        test_no_worktree_means_nothing_to_resume,
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except Exception as e:
+            print(f"❌ {test.__name__} failed with exception: {e}")
+            failed += 1
+
+    print("\n" + "=" * 60)
+    print(f"Results: {passed} passed, {failed} failed")
+    print("=" * 60 + "\n")
+
+    return failed == 0
+
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
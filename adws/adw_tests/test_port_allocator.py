@@ -0,0 +1,164 @@
+"""Tests for the lease-based port allocator used by isolated workflows."""
+
+import sys
+import os
+import tempfile
+import threading
+import time
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from adw_modules import port_allocator
+from adw_modules.port_allocator import PortAllocator
+
+
+def make_allocator(**kwargs) -> PortAllocator:
+    tmp_dir = tempfile.mkdtemp()
+    kwargs.setdefault("port_available", lambda port: True)
+    return PortAllocator(
+        os.path.join(tmp_dir, "port_leases.db"),
+        trees_dir=os.path.join(tmp_dir, "trees"),
+        **kwargs,
+    )
+
+
+def make_worktree(allocator: PortAllocator, adw_id: str) -> None:
+    os.makedirs(os.path.join(allocator.trees_dir, adw_id))
+
+
+def test_leases_are_stable_and_unique():
+    """A run keeps its ports across phases and no two runs share a slot."""
+    allocator = make_allocator(slots=300, backend_start=20000, frontend_start=30000)
+    ports = {}
+    for n in range(300):
+        adw_id = f"run{n:05d}"
+        ports[adw_id] = allocator.allocate(adw_id)
+
+    assert len(set(ports.values())) == 300
+    assert all(
+        20000 <= backend < 20300 and frontend == backend + 10000
+        for backend, frontend in ports.values()
+    )
+    assert allocator.allocate("run00042") == ports["run00042"]
+
+    try:
+        allocator.allocate("onemore1")
+        assert False, "allocating past the last slot should fail"
+    except RuntimeError as e:
+        assert "ADW_PORT_SLOTS" in str(e)
+
+    allocator.release("run00042")
+    assert allocator.allocate("onemore1") == ports["run00042"]
+
+
+def test_busy_ports_are_skipped():
+    """Slots whose ports another program holds are not leased."""
+    allocator = make_allocator(
+        slots=3, port_available=lambda port: port not in (9100, 9201)
+    )
+    assert allocator.allocate("a") == (9102, 9202)
+
+
+def test_dead_and_expired_leases_are_reclaimed():
+    """Leases of runs without a worktree or past their TTL are reused."""
+    allocator = make_allocator(slots=2, ttl_seconds=0.1)
+    make_worktree(allocator, "alive001")
+    make_worktree(allocator, "stale001")
+    alive = allocator.allocate("alive001")
+    stale = allocator.allocate("stale001")
+
+    # stale001 expires; alive001 keeps renewing (as validate_worktree does)
+    time.sleep(0.15)
+    assert allocator.renew("alive001")
+    allocator.ttl_seconds = 60
+    assert allocator.allocate("new00001") == stale
+    assert allocator.get("stale001") is None
+
+    # A run whose worktree was purged is reclaimed once past the grace period
+    make_worktree(allocator, "new00001")
+    os.rmdir(os.path.join(allocator.trees_dir, "alive001"))
+    try:
+        allocator.allocate("new00002")
+        assert False, "alive001 is within its grace period"
+    except RuntimeError:
+        pass
+
+    original = port_allocator.DEAD_RUN_GRACE_SECONDS
+    port_allocator.DEAD_RUN_GRACE_SECONDS = 0
+    try:
+        assert allocator.allocate("new00002") == alive
+    finally:
+        port_allocator.DEAD_RUN_GRACE_SECONDS = original
+    assert allocator.get("new00001") is not None
+    assert not allocator.renew("alive001")
+
+
+def test_concurrent_allocation():
+    """Processes racing for ports through the same database never collide."""
+    allocator = make_allocator(slots=50)
+    results = {}
+
+    def allocate(n):
+        other = PortAllocator(
+            allocator.db_path,
+            slots=50,
+            trees_dir=allocator.trees_dir,
+            port_available=lambda port: True,
+        )
+        results[n] = other.allocate(f"same{n % 5}id{n}")
+
+    threads = [threading.Thread(target=allocate, args=(n,)) for n in range(40)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(set(results.values())) == 40
+    assert len(allocator.list_leases()) == 40
+
+
+def test_overlapping_ranges_are_rejected():
+    """Backend and frontend ranges may not overlap."""
+    try:
+        make_allocator(slots=150)
+        assert False, "9100-9249 overlaps 9200-9349"
+    except ValueError as e:
+        assert "overlap" in str(e)
+
+
+def run_all_tests():
+    """Run all tests."""
+    print("\n" + "=" * 60)
+    print("Running Port Allocator Tests")
+    print("=" * 60 + "\n")
+
+    tests = [
+        test_leases_are_stable_and_unique,
+        test_busy_ports_are_skipped,
+        test_dead_and_expired_leases_are_reclaimed,
+        test_concurrent_allocation,
+        test_overlapping_ranges_are_rejected,
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except Exception as e:
+            print(f"❌ {test.__name__} failed with exception: {e}")
+            failed += 1
+
+    print("\n" + "=" * 60)
+    print(f"Results: {passed} passed, {failed} failed")
+    print("=" * 60 + "\n")
+
+    return failed == 0
+
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,153 @@
+"""Tests for the content-addressed template response cache."""
+
+import sys
+import os
+import json
+import stat
+import tempfile
+import time
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from adw_modules import agent, agent_limiter, agent_metrics, response_cache
+from adw_modules.agent import execute_template
+from adw_modules.data_types import AgentPromptResponse, AgentTemplateRequest
+from adw_modules.response_cache import ResponseCache, hash_template, make_cache_key
+
+TEST_ADW_ID = "cachetst"
+
+
+def make_cache(**kwargs) -> ResponseCache:
+    """Create a cache backed by a fresh temporary database."""
+    return ResponseCache(os.path.join(tempfile.mkdtemp(), "cache.db"), **kwargs)
+
+
+def test_lru_eviction_and_ttl():
+    """The cache keeps the most recently used entries and drops expired ones."""
+    cache = make_cache(ttl_seconds=60, max_entries=2)
+    for key in ("a", "b"):
+        cache.put(key, "/classify_issue", AgentPromptResponse(output=key, success=True))
+    time.sleep(0.01)
+    assert cache.get("a").output == "a"  # "a" is now most recently used
+    time.sleep(0.01)
+    cache.put("c", "/classify_issue", AgentPromptResponse(output="c", success=True))
+    assert cache.get("b") is None
+    assert cache.get("a") is not None and cache.get("c") is not None
+
+    expiring = make_cache(ttl_seconds=0.05)
+    expiring.put("k", "/classify_adw", AgentPromptResponse(output="x", success=True))
+    time.sleep(0.1)
+    assert expiring.get("k") is None
+
+
+def test_cache_key_tracks_template_content():
+    """Editing the command template changes the cache key."""
+    working_dir = tempfile.mkdtemp()
+    commands_dir = os.path.join(working_dir, ".claude", "commands")
+    os.makedirs(commands_dir)
+    template = os.path.join(commands_dir, "classify_issue.md")
+    with open(template, "w") as f:
+        f.write("v1")
+    first = make_cache_key("/classify_issue", ["{}"], "sonnet", hash_template("/classify_issue", working_dir))
+    with open(template, "w") as f:
+        f.write("v2")
+    second = make_cache_key("/classify_issue", ["{}"], "sonnet", hash_template("/classify_issue", working_dir))
+    assert first != second
+    assert make_cache_key("/classify_issue", ["{}"], "opus", "h") != make_cache_key(
+        "/classify_issue", ["{}"], "sonnet", "h"
+    )
+
+
+def test_execute_template_serves_cached_classification():
+    """A repeated classifier call is answered without spawning the CLI."""
+    tmp_dir = tempfile.mkdtemp()
+    counter = os.path.join(tmp_dir, "calls.txt")
+    fake = os.path.join(tmp_dir, "fake_claude")
+    result = json.dumps(
+        {"type": "result", "subtype": "success", "is_error": False,
+         "result": "/feature", "session_id": "s"}
+    )
+    with open(fake, "w") as f:
+        f.write(f"#!{sys.executable}\n")
+        f.write("import sys\n")
+        f.write("if '--version' in sys.argv:\n    sys.exit(0)\n")
+        f.write(f"open({counter!r}, 'a').write('x')\n")
+        f.write(f"print({result!r})\n")
+    os.chmod(fake, os.stat(fake).st_mode | stat.S_IEXEC)
+
+    original = (
+        agent.CLAUDE_PATH,
+        agent.AGENTS_DIR,
+        agent_limiter.LIMITER_DB_PATH,
+        agent_metrics.AGENTS_DIR,
+        response_cache.CACHE_ENABLED,
+        response_cache.CACHE_DB_PATH,
+    )
+    agent.CLAUDE_PATH = fake
+    agent.AGENTS_DIR = agent_metrics.AGENTS_DIR = os.path.join(tmp_dir, "agents")
+    agent_limiter.LIMITER_DB_PATH = os.path.join(tmp_dir, "agent_limiter.db")
+    response_cache.CACHE_ENABLED = True
+    response_cache.CACHE_DB_PATH = os.path.join(tmp_dir, "response_cache.db")
+    try:
+        def classify(slash_command="/classify_issue"):
+            return execute_template(
+                AgentTemplateRequest(
+                    agent_name="issue_classifier",
+                    slash_command=slash_command,
+                    args=['{"number": 1, "title": "Add login"}'],
+                    adw_id=TEST_ADW_ID,
+                )
+            )
+
+        responses = [classify() for _ in range(3)]
+        classify("/implement")  # Not a cacheable command
+        classify("/implement")
+    finally:
+        (
+            agent.CLAUDE_PATH,
+            agent.AGENTS_DIR,
+            agent_limiter.LIMITER_DB_PATH,
+            agent_metrics.AGENTS_DIR,
+            response_cache.CACHE_ENABLED,
+            response_cache.CACHE_DB_PATH,
+        ) = original
+
+    assert [r.output for r in responses] == ["/feature"] * 3
+    with open(counter) as f:
+        assert len(f.read()) == 3  # One classification, two /implement runs
+
+
+def run_all_tests():
+    """Run all tests."""
+    print("\n" + "=" * 60)
+    print("Running Response Cache Tests")
+    print("=" * 60 + "\n")
+
+    tests = [
+        test_lru_eviction_and_ttl,
+        test_cache_key_tracks_template_content,
+        test_execute_template_serves_cached_classification,
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except Exception as e:
+            print(f"❌ {test.__name__} failed with exception: {e}")
+            failed += 1
+
+    print("\n" + "=" * 60)
+    print(f"Results: {passed} passed, {failed} failed")
+    print("=" * 60 + "\n")
+
+    return failed == 0
+
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,176 @@
+"""Tests for agent retry policy, rate-limit detection and circuit breaker."""
+
+import sys
+import os
+import json
+import stat
+import tempfile
+import time
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from adw_modules import agent, agent_limiter, agent_metrics, retry_policy
+from adw_modules.agent import prompt_claude_code_with_retry
+from adw_modules.data_types import AgentPromptRequest, RetryCode
+from adw_modules.retry_policy import CircuitBreaker, RetryPolicy, detect_rate_limit
+
+
+def test_budget_per_retry_code():
+    """Each error type has its own budget inside the global cap."""
+    policy = RetryPolicy(max_retries=4)
+
+    assert policy.allows_retry(RetryCode.TIMEOUT_ERROR, {})
+    assert not policy.allows_retry(
+        RetryCode.TIMEOUT_ERROR, {RetryCode.TIMEOUT_ERROR: 1}
+    )
+    assert policy.allows_retry(
+        RetryCode.CLAUDE_CODE_ERROR, {RetryCode.TIMEOUT_ERROR: 1}
+    )
+    assert not policy.allows_retry(
+        RetryCode.RATE_LIMIT_ERROR, {RetryCode.RATE_LIMIT_ERROR: 4}
+    )
+    assert not policy.allows_retry(RetryCode.NONE, {})
+
+
+def test_full_jitter_backoff():
+    """Delays are drawn from an exponentially growing, capped window."""
+    policy = RetryPolicy(base_delay=1.0, max_delay=8.0)
+    for retry_number, ceiling in [(1, 1.0), (2, 2.0), (3, 4.0), (6, 8.0)]:
+        delays = [policy.get_delay(retry_number) for _ in range(200)]
+        assert all(0 <= d <= ceiling for d in delays)
+        assert max(delays) > ceiling / 2  # Jitter spans the window
+
+    assert policy.get_delay(1, retry_after=30) == 30
+
+
+def test_detect_rate_limit():
+    """Rate limits come from API errors, result fields or stderr only."""
+
+    def error_result(text, **fields):
+        return {"type": "result", "is_error": True, "result": text, **fields}
+
+    assert detect_rate_limit(error_result("API Error: 429 Too Many Requests")) == (True, None)
+    assert detect_rate_limit(
+        error_result('API Error: {"type":"overloaded_error"} retry-after: 12')
+    ) == (True, 12.0)
+    assert detect_rate_limit(error_result("error", retry_after="7")) == (True, 7.0)
+    assert detect_rate_limit(stderr="Error: 529 Overloaded") == (True, None)
+    assert detect_rate_limit(error_result("API Error: 500 Internal")) == (False, None)
+    assert detect_rate_limit(stderr="Build failed: missing import") == (False, None)
+
+    # Model text that merely mentions rate limits is not a rate limit
+    assert detect_rate_limit(error_result("Fixed #429: rate limit handling")) == (False, None)
+    assert detect_rate_limit(
+        {"type": "result", "is_error": False, "result": "API Error: 429 in the logs"}
+    ) == (False, None)
+
+
+def test_circuit_breaker_opens_and_closes():
+    """Breaker opens after repeated failures or a retry-after hint."""
+    db_path = os.path.join(tempfile.mkdtemp(), "agent_limiter.db")
+    breaker = CircuitBreaker(db_path, failure_threshold=2, cooldown_seconds=0.3)
+
+    breaker.record_failure()
+    assert breaker.remaining_pause() == 0
+    breaker.record_failure()
+    assert breaker.remaining_pause() > 0
+    paused = breaker.wait_until_closed()
+    assert 0 < paused <= 0.5
+    assert breaker.remaining_pause() == 0
+
+    breaker.record_success()
+    breaker.record_failure(retry_after=0.2)
+    assert breaker.remaining_pause() > 0
+
+    # Another process sees the same state
+    assert CircuitBreaker(db_path).remaining_pause() > 0
+
+
+def test_retry_wrapper_recovers_from_rate_limit():
+    """A rate-limited call is retried and the caller's delays are untouched."""
+    tmp_dir = tempfile.mkdtemp()
+    counter = os.path.join(tmp_dir, "calls.txt")
+    fake = os.path.join(tmp_dir, "fake_claude")
+    limited = json.dumps(
+        {"type": "result", "subtype": "success", "is_error": True,
+         "result": "API Error: 429 rate_limit_error", "session_id": "s"}
+    )
+    ok = json.dumps(
+        {"type": "result", "subtype": "success", "is_error": False,
+         "result": "done", "session_id": "s"}
+    )
+    with open(fake, "w") as f:
+        f.write(f"#!{sys.executable}\n")
+        f.write("import sys, os\n")
+        f.write("if '--version' in sys.argv:\n    sys.exit(0)\n")
+        f.write(f"open({counter!r}, 'a').write('x')\n")
+        f.write(f"calls = len(open({counter!r}).read())\n")
+        f.write(f"print({limited!r} if calls < 3 else {ok!r})\n")
+    os.chmod(fake, os.stat(fake).st_mode | stat.S_IEXEC)
+
+    original = (
+        agent.CLAUDE_PATH,
+        agent_limiter.LIMITER_DB_PATH,
+        agent_metrics.AGENTS_DIR,
+    )
+    agent.CLAUDE_PATH = fake
+    agent_limiter.LIMITER_DB_PATH = os.path.join(tmp_dir, "agent_limiter.db")
+    agent_metrics.AGENTS_DIR = os.path.join(tmp_dir, "agents")
+    delays = [0, 0]
+    try:
+        request = AgentPromptRequest(
+            prompt="hello",
+            adw_id="retrytst",
+            output_file=os.path.join(tmp_dir, "raw_output.jsonl"),
+        )
+        response = prompt_claude_code_with_retry(request, retry_delays=delays)
+    finally:
+        (
+            agent.CLAUDE_PATH,
+            agent_limiter.LIMITER_DB_PATH,
+            agent_metrics.AGENTS_DIR,
+        ) = original
+
+    assert response.success
+    assert response.output == "done"
+    assert delays == [0, 0]
+    with open(counter) as f:
+        assert len(f.read()) == 3
+
+
+def run_all_tests():
+    """Run all tests."""
+    print("\n" + "=" * 60)
+    print("Running Retry Policy Tests")
+    print("=" * 60 + "\n")
+
+    tests = [
+        test_budget_per_retry_code,
+        test_full_jitter_backoff,
+        test_detect_rate_limit,
+        test_circuit_breaker_opens_and_closes,
+        test_retry_wrapper_recovers_from_rate_limit,
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except Exception as e:
+            print(f"❌ {test.__name__} failed with exception: {e}")
+            failed += 1
+
+    print("\n" + "=" * 60)
+    print(f"Results: {passed} passed, {failed} failed")
+    print("=" * 60 + "\n")
+
+    return failed == 0
+
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,248 @@
+"""Tests for ADWState persistence and the in-process state cache."""
+
+import sys
+import os
+import json
+import shutil
+import tempfile
+import threading
+import time
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from adw_modules import phase_log, state as state_module
+from adw_modules.agent import get_model_for_slash_command
+from adw_modules.data_types import AgentTemplateRequest
+from adw_modules.state import ADWState, StateConflictError, _write_json_atomic
+
+TEST_ADW_ID = "statetst"
+
+
+REAL_AGENTS_DIR = state_module.AGENTS_DIR
+
+
+def setup():
+    """Point run state and phase logs at a fresh temp dir."""
+    state_module.AGENTS_DIR = phase_log.AGENTS_DIR = tempfile.mkdtemp()
+    state_module.clear_state_cache()
+
+
+def cleanup():
+    """Remove the temp state dir and restore the real one."""
+    if state_module.AGENTS_DIR != REAL_AGENTS_DIR:
+        shutil.rmtree(state_module.AGENTS_DIR, ignore_errors=True)
+    state_module.AGENTS_DIR = phase_log.AGENTS_DIR = REAL_AGENTS_DIR
+    state_module.clear_state_cache()
+
+
+def test_load_uses_cache_until_file_changes():
+    """Repeated loads skip parsing until the file signature changes."""
+    setup()
+    try:
+        state = ADWState(TEST_ADW_ID)
+        state.update(issue_number="1", model_set="heavy")
+        state.save("test")
+
+        parses = []
+        original_load = json.load
+        json.load = lambda f: parses.append(1) or original_load(f)
+        try:
+            for _ in range(5):
+                loaded = ADWState.load(TEST_ADW_ID)
+                assert loaded.get("model_set") == "heavy"
+            assert parses == []  # Warmed by save()
+
+            # An out-of-band write is picked up
+            time.sleep(0.01)
+            path = state.get_state_path()
+            with open(path) as f:
+                data = original_load(f)
+            data["model_set"] = "base"
+            with open(path, "w") as f:
+                json.dump(data, f)
+            assert ADWState.load(TEST_ADW_ID).get("model_set") == "base"
+            assert len(parses) == 1
+        finally:
+            json.load = original_load
+    finally:
+        cleanup()
+
+
+def test_same_size_replace_invalidates_cache():
+    """A same-size rewrite by rename is picked up even with an unchanged mtime."""
+    setup()
+    try:
+        state = ADWState(TEST_ADW_ID)
+        state.update(branch_name="feature-aaaa")
+        state.save("test")
+        path = state.get_state_path()
+        assert ADWState.load(TEST_ADW_ID).get("branch_name") == "feature-aaaa"
+
+        with open(path) as f:
+            content = f.read()
+        mtime_ns = os.stat(path).st_mtime_ns
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w") as f:
+            f.write(content.replace("feature-aaaa", "feature-bbbb"))
+        os.utime(tmp_path, ns=(mtime_ns, mtime_ns))
+        os.replace(tmp_path, path)
+
+        assert ADWState.load(TEST_ADW_ID).get("branch_name") == "feature-bbbb"
+    finally:
+        cleanup()
+
+
+def test_loaded_state_is_isolated_from_cache():
+    """Mutating a loaded state does not leak into later loads."""
+    setup()
+    try:
+        state = ADWState(TEST_ADW_ID)
+        state.append_adw_id(TEST_ADW_ID)
+        state.save("test")
+
+        first = ADWState.load(TEST_ADW_ID)
+        first.append_adw_id("other123")
+        first.update(branch_name="changed")
+
+        second = ADWState.load(TEST_ADW_ID)
+        assert second.get("all_adws") == [TEST_ADW_ID]
+        assert second.get("branch_name") is None
+
+        os.remove(state.get_state_path())
+        assert ADWState.load(TEST_ADW_ID) is None
+    finally:
+        cleanup()
+
+
+def test_model_selection_reads_cached_state():
+    """get_model_for_slash_command follows the cached model_set."""
+    setup()
+    try:
+        state = ADWState(TEST_ADW_ID)
+        state.update(model_set="heavy")
+        state.save("test")
+        request = AgentTemplateRequest(
+            agent_name="sdlc_implementor",
+            slash_command="/implement",
+            args=["plan.md"],
+            adw_id=TEST_ADW_ID,
+        )
+        assert get_model_for_slash_command(request) == "opus"
+        assert get_model_for_slash_command(request) == "opus"
+
+        state.update(model_set="base")
+        state.save("test")
+        assert get_model_for_slash_command(request) == "sonnet"
+    finally:
+        cleanup()
+
+
+def test_update_atomic_from_concurrent_writers():
+    """Concurrent read-modify-write updates are never lost."""
+    setup()
+    try:
+        ADWState(TEST_ADW_ID).save("test")
+        errors = []
+
+        def append_id(i):
+            try:
+                ADWState(TEST_ADW_ID).update_atomic(
+                    lambda s: s.append_adw_id(f"adw{i:05d}"), max_attempts=50
+                )
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=append_id, args=(i,)) for i in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        state_module.clear_state_cache()
+        final = ADWState.load(TEST_ADW_ID)
+        assert not errors, errors
+        assert sorted(final.get("all_adws")) == [f"adw{i:05d}" for i in range(8)]
+        assert final.get("version") == 9
+    finally:
+        cleanup()
+
+
+def test_update_atomic_gives_up_on_persistent_conflict():
+    """A writer that always loses the race raises StateConflictError."""
+    setup()
+    try:
+        ADWState(TEST_ADW_ID).save("test")
+
+        def interfere(state):
+            ADWState(TEST_ADW_ID).save("other writer")
+
+        try:
+            ADWState(TEST_ADW_ID).update_atomic(interfere, max_attempts=2)
+            assert False, "expected StateConflictError"
+        except StateConflictError:
+            pass
+    finally:
+        cleanup()
+
+
+def test_failed_write_keeps_previous_state():
+    """A write that fails midway leaves the old file intact and no temp files."""
+    setup()
+    try:
+        state = ADWState(TEST_ADW_ID)
+        state.update(branch_name="feature-1")
+        state.save("test")
+        path = state.get_state_path()
+
+        try:
+            _write_json_atomic(path, {"adw_id": TEST_ADW_ID, "bad": object()})
+            assert False, "expected TypeError"
+        except TypeError:
+            pass
+
+        with open(path) as f:
+            assert json.load(f)["branch_name"] == "feature-1"
+        leftovers = [n for n in os.listdir(os.path.dirname(path)) if n.endswith(".tmp")]
+        assert leftovers == []
+    finally:
+        cleanup()
+
+
+def run_all_tests():
+    """Run all tests."""
+    print("\n" + "=" * 60)
+    print("Running ADW State Tests")
+    print("=" * 60 + "\n")
+
+    tests = [
+        test_load_uses_cache_until_file_changes,
+        test_same_size_replace_invalidates_cache,
+        test_loaded_state_is_isolated_from_cache,
+        test_model_selection_reads_cached_state,
+        test_update_atomic_from_concurrent_writers,
+        test_update_atomic_gives_up_on_persistent_conflict,
+        test_failed_write_keeps_previous_state,
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except Exception as e:
+            print(f"❌ {test.__name__} failed with exception: {e}")
+            failed += 1
+
+    print("\n" + "=" * 60)
+    print(f"Results: {passed} passed, {failed} failed")
+    print("=" * 60 + "\n")
+
+    return failed == 0
+
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,154 @@
+"""Tests for the SQLite ADW state backend and JSON migration."""
+
+import sys
+import os
+import json
+import tempfile
+import threading
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from adw_modules import phase_log
+from adw_modules import state as state_module
+from adw_modules import state_store
+from adw_modules.data_types import ADWStateData
+from adw_modules.state import ADWState
+from adw_modules.state_store import StateStore, migrate_json_states
+
+
+class sqlite_backend:
+    """Context manager switching ADWState to a temporary SQLite store.
+
+    Run directories (phase event logs) go to the same temp dir.
+    """
+
+    def __enter__(self):
+        self.original = (
+            state_module.STATE_BACKEND,
+            state_store.STATE_DB_PATH,
+            state_module.AGENTS_DIR,
+            phase_log.AGENTS_DIR,
+        )
+        tmp_dir = tempfile.mkdtemp()
+        state_module.STATE_BACKEND = "sqlite"
+        state_store.STATE_DB_PATH = os.path.join(tmp_dir, "adw_state.db")
+        state_module.AGENTS_DIR = phase_log.AGENTS_DIR = tmp_dir
+        return state_store.get_state_store()
+
+    def __exit__(self, *exc):
+        (
+            state_module.STATE_BACKEND,
+            state_store.STATE_DB_PATH,
+            state_module.AGENTS_DIR,
+            phase_log.AGENTS_DIR,
+        ) = self.original
+
+
+def test_adw_state_round_trip():
+    """ADWState saves, loads and queries through the SQLite backend."""
+    with sqlite_backend() as store:
+        for adw_id, issue, branch in [
+            ("aaaa1111", "42", "feat-42"),
+            ("bbbb2222", "42", "feat-42-retry"),
+            ("cccc3333", "7", "bug-7"),
+        ]:
+            state = ADWState(adw_id)
+            state.update(issue_number=issue, branch_name=branch, backend_port=9100)
+            state.append_adw_id(adw_id)
+            state.save("test")
+
+        loaded = ADWState.load("aaaa1111")
+        assert loaded.get("branch_name") == "feat-42"
+        assert loaded.get("all_adws") == ["aaaa1111"]
+        assert loaded.get("version") == 1
+        assert ADWState.load("missing0") is None
+
+        assert [s.adw_id for s in ADWState.find_by_issue("42")] == ["bbbb2222", "aaaa1111"]
+        assert [s.adw_id for s in ADWState.find_by_branch("bug-7")] == ["cccc3333"]
+
+        # No JSON files are written in SQLite mode
+        assert not os.path.exists(ADWState("aaaa1111").get_state_path())
+
+        with store._connect() as conn:
+            plan = " ".join(
+                str(tuple(row))
+                for row in conn.execute(
+                    "EXPLAIN QUERY PLAN SELECT * FROM adw_state WHERE issue_number = '42'"
+                )
+            )
+        assert "idx_adw_state_issue" in plan
+
+
+def test_update_atomic_with_sqlite():
+    """Compare-and-swap updates do not lose concurrent writes."""
+    with sqlite_backend():
+        ADWState("dddd4444").save("test")
+
+        def append_id(i):
+            ADWState("dddd4444").update_atomic(
+                lambda s: s.append_adw_id(f"run{i:05d}"), max_attempts=50
+            )
+
+        threads = [threading.Thread(target=append_id, args=(i,)) for i in range(6)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        final = ADWState.load("dddd4444")
+        assert sorted(final.get("all_adws")) == [f"run{i:05d}" for i in range(6)]
+        assert final.get("version") == 7
+
+
+def test_migrate_json_states():
+    """JSON state files are imported once; invalid files are counted."""
+    agents_dir = tempfile.mkdtemp()
+    for adw_id, issue in [("eeee5555", "1"), ("ffff6666", "2")]:
+        os.makedirs(os.path.join(agents_dir, adw_id))
+        with open(os.path.join(agents_dir, adw_id, "adw_state.json"), "w") as f:
+            json.dump({"adw_id": adw_id, "issue_number": issue}, f)
+    os.makedirs(os.path.join(agents_dir, "broken00"))
+    with open(os.path.join(agents_dir, "broken00", "adw_state.json"), "w") as f:
+        f.write("{not json")
+
+    store = StateStore(os.path.join(tempfile.mkdtemp(), "adw_state.db"))
+    assert migrate_json_states(agents_dir, store) == {"migrated": 2, "skipped": 0, "invalid": 1}
+    assert migrate_json_states(agents_dir, store) == {"migrated": 0, "skipped": 2, "invalid": 1}
+    assert store.get("ffff6666")["issue_number"] == "2"
+    assert store.put(ADWStateData(adw_id="ffff6666"), expected_version=0) is None
+
+
+def run_all_tests():
+    """Run all tests."""
+    print("\n" + "=" * 60)
+    print("Running State Store Tests")
+    print("=" * 60 + "\n")
+
+    tests = [
+        test_adw_state_round_trip,
+        test_update_atomic_with_sqlite,
+        test_migrate_json_states,
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except Exception as e:
+            print(f"❌ {test.__name__} failed with exception: {e}")
+            failed += 1
+
+    print("\n" + "=" * 60)
+    print(f"Results: {passed} passed, {failed} failed")
+    print("=" * 60 + "\n")
+
+    return failed == 0
+
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
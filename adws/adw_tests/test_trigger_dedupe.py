@@ -0,0 +1,122 @@
+"""Tests for the trigger dedupe store shared by the cron and webhook triggers."""
+
+import sys
+import os
+import tempfile
+import threading
+import time
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from adw_modules.trigger_dedupe import NEW_ISSUE_KEY, TriggerDedupeStore
+
+REPO = "owner/repo"
+
+
+def make_store(**kwargs) -> TriggerDedupeStore:
+    return TriggerDedupeStore(
+        os.path.join(tempfile.mkdtemp(), "trigger_dedupe.db"), **kwargs
+    )
+
+
+def test_claims_dedupe_triggers():
+    """A trigger is launched once, and nothing launches while a run is in flight."""
+    store = make_store()
+    assert store.claim(REPO, 1, NEW_ISSUE_KEY, "webhook", "abcd1234")
+    # The cron tick sees the same new issue while the webhook's run is going
+    assert not store.claim(REPO, 1, NEW_ISSUE_KEY, "cron")
+    # A new 'adw' comment must wait for the running workflow
+    assert not store.claim(REPO, 1, "IC_2", "cron")
+
+    store.release(REPO, 1)
+    assert not store.claim(REPO, 1, NEW_ISSUE_KEY, "cron")
+    assert store.claim(REPO, 1, "IC_2", "cron")
+    assert store.get(REPO, 1)["source"] == "cron"
+
+    # Other issues are independent
+    assert store.claim(REPO, 2, NEW_ISSUE_KEY, "cron")
+
+    # Survives a restart: a fresh store over the same file still dedupes
+    store.release(REPO, 1)
+    assert not TriggerDedupeStore(store.db_path).claim(REPO, 1, "IC_2", "cron")
+
+
+def test_failed_launch_is_retried():
+    """Releasing an unhandled trigger lets the next poll claim it again."""
+    store = make_store()
+    assert store.claim(REPO, 3, "IC_9", "cron")
+    store.release(REPO, 3, handled=False)
+    assert store.claim(REPO, 3, "IC_9", "cron", "abcd1234")
+
+    # A release for another run's ADW ID leaves the claim alone
+    store.release(REPO, 3, handled=False, adw_id="ffff0000")
+    assert not store.claim(REPO, 3, "IC_9", "cron")
+    store.release(REPO, 3, handled=False, adw_id="abcd1234")
+    assert store.claim(REPO, 3, "IC_9", "cron")
+
+
+def test_expiry():
+    """Stale in-flight markers expire and idle issues are evicted."""
+    store = make_store(ttl_seconds=0.05, in_flight_ttl_seconds=0.05)
+    assert store.claim(REPO, 4, NEW_ISSUE_KEY, "webhook")
+    assert not store.claim(REPO, 4, "IC_1", "cron")
+    time.sleep(0.1)
+
+    # The trigger that launched died: its marker has expired
+    assert store.claim(REPO, 4, "IC_1", "cron")
+    time.sleep(0.1)
+    store.claim(REPO, 5, NEW_ISSUE_KEY, "cron")
+    assert store.get(REPO, 4) is None
+
+
+def test_concurrent_claims():
+    """Exactly one of many concurrent claimants wins."""
+    store = make_store()
+    results = []
+
+    def claim(source):
+        results.append(TriggerDedupeStore(store.db_path).claim(REPO, 6, "IC_7", source))
+
+    threads = [threading.Thread(target=claim, args=(f"t{i}",)) for i in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert results.count(True) == 1
+
+
+def run_all_tests():
+    """Run all tests."""
+    print("\n" + "=" * 60)
+    print("Running Trigger Dedupe Tests")
+    print("=" * 60 + "\n")
+
+    tests = [
+        test_claims_dedupe_triggers,
+        test_failed_launch_is_retried,
+        test_expiry,
+        test_concurrent_claims,
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except Exception as e:
+            print(f"❌ {test.__name__} failed with exception: {e}")
+            failed += 1
+
+    print("\n" + "=" * 60)
+    print(f"Results: {passed} passed, {failed} failed")
+    print("=" * 60 + "\n")
+
+    return failed == 0
+
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
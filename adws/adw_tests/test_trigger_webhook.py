@@ -0,0 +1,210 @@
+"""Tests for the webhook trigger's module setup and delivery dispatch."""
+
+import sys
+import os
+import importlib
+import io
+import json
+from contextlib import redirect_stdout
+import tempfile
+import time
+import types
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from adw_modules import trigger_dedupe, webhook_queue
+from adw_modules.data_types import WorkflowJob
+from adw_modules.trigger_dedupe import get_trigger_dedupe_store
+from adw_modules.webhook_queue import get_webhook_queue
+from adw_modules.workflow_pool import WorkflowPool
+
+REPO = "owner/repo"
+
+
+class _FakeApp:
+    """Stands in for FastAPI: route decorators return the function unchanged."""
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def _route(self, *args, **kwargs):
+        return lambda func: func
+
+    on_event = post = get = _route
+
+
+def import_trigger_webhook():
+    """Import trigger_webhook, stubbing the server packages if not installed."""
+    stubs = {
+        "fastapi": {"FastAPI": _FakeApp, "Request": object},
+        "fastapi.concurrency": {"run_in_threadpool": None},
+        "fastapi.responses": {"JSONResponse": dict},
+        "uvicorn": {"run": None},
+    }
+    try:
+        import fastapi.concurrency, fastapi.responses, uvicorn  # noqa: F401
+    except ImportError:
+        for name, attrs in stubs.items():
+            module = types.ModuleType(name)
+            module.__dict__.update(attrs)
+            sys.modules[name] = module
+    return importlib.import_module("adw_triggers.trigger_webhook")
+
+
+def test_module_imports():
+    """The module builds its app, health monitor and workflow pool on import."""
+    trigger_webhook = import_trigger_webhook()
+    assert trigger_webhook.workflow_pool.on_finish is trigger_webhook.on_workflow_finished
+    assert trigger_webhook.workflow_pool.counts() == {}
+
+
+class temp_stores:
+    """Context manager pointing the webhook queue and dedupe store at a temp dir."""
+
+    def __enter__(self):
+        tmp = tempfile.mkdtemp()
+        self.originals = (webhook_queue.WEBHOOK_QUEUE_DB_PATH, trigger_dedupe.DEDUPE_DB_PATH)
+        webhook_queue.WEBHOOK_QUEUE_DB_PATH = os.path.join(tmp, "webhook_queue.db")
+        trigger_dedupe.DEDUPE_DB_PATH = os.path.join(tmp, "trigger_dedupe.db")
+        return get_webhook_queue(), get_trigger_dedupe_store()
+
+    def __exit__(self, *exc):
+        webhook_queue.WEBHOOK_QUEUE_DB_PATH, trigger_dedupe.DEDUPE_DB_PATH = self.originals
+
+
+def held_delivery(queue, store) -> int:
+    """Queue a delivery that claimed issue 5 and is waiting for its workflow."""
+    queue_id = queue.enqueue("issue_comment", b"{}", "guid-1")
+    assert queue.claim()["id"] == queue_id
+    assert store.claim(REPO, 5, "IC_1", "webhook", "abcd1234")
+    held = {"status": "launching", "issue": 5, "adw_id": "abcd1234", "repo_path": REPO}
+    queue.hold(queue_id, json.dumps(held))
+    return queue_id
+
+
+def make_job(queue_id: int, **kwargs) -> WorkflowJob:
+    return WorkflowJob(
+        job_id="job00001",
+        issue_number=5,
+        cmd=["uv", "run", "adw_plan_iso.py"],
+        adw_id="abcd1234",
+        workflow="adw_plan_iso",
+        repo_path=REPO,
+        delivery_queue_id=queue_id,
+        priority=5,
+        submitted_at=time.time(),
+        **kwargs,
+    )
+
+
+def test_started_workflow_completes_delivery():
+    """A delivery is done once its workflow runs, and stays handled after it exits."""
+    trigger_webhook = import_trigger_webhook()
+    with temp_stores() as (queue, store):
+        queue_id = held_delivery(queue, store)
+        job = make_job(queue_id, status="running", pid=4242)
+
+        trigger_webhook.on_workflow_started(job)
+        delivery = queue.get(queue_id)
+        assert delivery["status"] == "done"
+        assert json.loads(delivery["result"])["job_id"] == "job00001"
+
+        job.status, job.returncode = "succeeded", 0
+        trigger_webhook.on_workflow_finished(job)
+        assert queue.get(queue_id)["status"] == "done"
+        assert not store.claim(REPO, 5, "IC_1", "webhook")
+
+
+def test_cancelled_workflow_requeues_delivery():
+    """A workflow cancelled before it started sends its delivery back to the queue."""
+    trigger_webhook = import_trigger_webhook()
+    with temp_stores() as (queue, store):
+        queue_id = held_delivery(queue, store)
+
+        trigger_webhook.on_workflow_finished(make_job(queue_id, status="cancelled"))
+        assert queue.claim()["id"] == queue_id
+        assert store.claim(REPO, 5, "IC_1", "webhook")
+
+
+def test_recover_deliveries_after_restart():
+    """Deliveries held by a dead process are requeued and their claims released."""
+    trigger_webhook = import_trigger_webhook()
+    with temp_stores() as (queue, store):
+        queue_id = held_delivery(queue, store)
+
+        trigger_webhook.recover_deliveries(queue)
+        assert queue.claim()["id"] == queue_id
+        assert store.claim(REPO, 5, "IC_1", "webhook")
+
+
+def test_replay_dispatches_only_replayed_deliveries():
+    """Replay dispatches the named deliveries and reports the ones it skipped."""
+    trigger_webhook = import_trigger_webhook()
+    dispatched = []
+    output = io.StringIO()
+
+    def fake_dispatch(event_type, payload, queue=None, queue_id=None):
+        dispatched.append(payload["n"])
+        return {"status": "ignored"}
+
+    originals = (trigger_webhook.dispatch_delivery, trigger_webhook.workflow_pool)
+    trigger_webhook.dispatch_delivery = fake_dispatch
+    trigger_webhook.workflow_pool = WorkflowPool(
+        max_workers=1, log_dir=tempfile.mkdtemp(), agents_dir=tempfile.mkdtemp()
+    )
+    try:
+        with temp_stores() as (queue, store):
+            done_id = queue.enqueue("issues", b'{"n": 1}', "guid-done")
+            queue.enqueue("issues", b'{"n": 2}', "guid-pending")
+            queue.claim([done_id])
+            queue.complete(done_id, '{"status": "ignored"}')
+
+            with redirect_stdout(output):
+                trigger_webhook.replay_deliveries(
+                    ["guid-done", "guid-pending", "guid-unknown"]
+                )
+            assert dispatched == [1]
+            assert queue.pending_count() == 1
+    finally:
+        trigger_webhook.dispatch_delivery, trigger_webhook.workflow_pool = originals
+
+    assert "guid-pending: skipped, still pending" in output.getvalue()
+    assert "guid-unknown: not in the delivery log" in output.getvalue()
+
+
+def run_all_tests():
+    """Run all tests."""
+    print("\n" + "=" * 60)
+    print("Running Webhook Trigger Tests")
+    print("=" * 60 + "\n")
+
+    tests = [
+        test_module_imports,
+        test_started_workflow_completes_delivery,
+        test_cancelled_workflow_requeues_delivery,
+        test_recover_deliveries_after_restart,
+        test_replay_dispatches_only_replayed_deliveries,
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except Exception as e:
+            print(f"❌ {test.__name__} failed with exception: {e}")
+            failed += 1
+
+    print("\n" + "=" * 60)
+    print(f"Results: {passed} passed, {failed} failed")
+    print("=" * 60 + "\n")
+
+    return failed == 0
+
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
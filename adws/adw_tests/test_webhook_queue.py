@@ -0,0 +1,232 @@
+"""Tests for the durable webhook delivery queue."""
+
+import sys
+import os
+import hashlib
+import hmac
+import subprocess
+import tempfile
+import time
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from adw_modules import webhook_queue
+from adw_modules.webhook_queue import WebhookQueue, verify_signature
+
+
+def make_queue() -> WebhookQueue:
+    return WebhookQueue(os.path.join(tempfile.mkdtemp(), "webhook_queue.db"))
+
+
+def test_verify_signature():
+    """Only the HMAC-SHA256 of the exact body with the secret is accepted."""
+    body = b'{"action": "opened"}'
+    signature = "sha256=" + hmac.new(b"s3cret", body, hashlib.sha256).hexdigest()
+
+    assert verify_signature("s3cret", body, signature)
+    assert not verify_signature("other", body, signature)
+    assert not verify_signature("s3cret", body + b" ", signature)
+    assert not verify_signature("s3cret", body, signature[len("sha256=") :])
+    assert not verify_signature("s3cret", body, None)
+
+
+def test_deliveries_dispatch_in_order():
+    """Deliveries are claimed oldest first, once each, and survive a restart."""
+    queue = make_queue()
+    first = queue.enqueue("issues", b'{"n": 1}', "guid-1")
+    second = queue.enqueue("issue_comment", b'{"n": 2}', "guid-2")
+    assert queue.ready.is_set()
+    assert queue.pending_count() == 2
+
+    # A restarted trigger still sees both deliveries
+    queue = WebhookQueue(queue.db_path)
+    claimed = queue.claim()
+    assert claimed["id"] == first
+    assert claimed["event"] == "issues"
+    assert claimed["body"] == b'{"n": 1}'
+    assert claimed["delivery_id"] == "guid-1"
+    assert queue.claim()["id"] == second
+    assert queue.claim() is None
+
+    # Claims can be restricted to given deliveries
+    third = queue.enqueue("issues", b'{"n": 3}', "guid-3")
+    assert queue.claim([first, second]) is None
+    assert queue.claim([third])["id"] == third
+    assert queue.get_by_delivery_id("guid-3")["id"] == third
+    assert queue.get_by_delivery_id("guid-unknown") is None
+
+    queue.complete(first, "accepted")
+    assert queue.get(first)["status"] == "done"
+    assert queue.get(first)["result"] == "accepted"
+    assert queue.pending_count() == 2
+
+
+def test_redeliveries_are_dropped():
+    """A delivery ID already in the log is not queued a second time."""
+    queue = make_queue()
+    queue_id = queue.enqueue("issues", b'{"n": 1}', "guid-1")
+    assert queue.enqueue("issues", b'{"n": 1}', "guid-1") is None
+
+    # Still a duplicate after it was dispatched, and after a restart
+    queue.claim()
+    queue.complete(queue_id, '{"status": "accepted"}')
+    assert WebhookQueue(queue.db_path).enqueue("issues", b"{}", "guid-1") is None
+
+    # Deliveries without an ID are never considered duplicates
+    assert queue.enqueue("ping", b"{}") is not None
+    assert queue.enqueue("ping", b"{}") is not None
+    assert [d["delivery_id"] for d in queue.list_deliveries()] == [None, None, "guid-1"]
+
+
+def test_replay():
+    """Failed deliveries are queued again from the log with a fresh retry budget."""
+    queue = make_queue()
+    failed_id = queue.enqueue("issues", b"{}", "guid-failed")
+    done_id = queue.enqueue("issues", b"{}", "guid-done")
+    pending_id = queue.enqueue("issues", b"{}", "guid-pending")
+
+    original = webhook_queue.MAX_ATTEMPTS
+    webhook_queue.MAX_ATTEMPTS = 1
+    try:
+        queue.claim()
+        assert not queue.fail(failed_id, "boom")
+    finally:
+        webhook_queue.MAX_ATTEMPTS = original
+    queue.claim()
+    queue.complete(done_id, '{"status": "ignored"}')
+    assert [d["id"] for d in queue.list_deliveries(status="failed")] == [failed_id]
+
+    # Without IDs only failed deliveries are replayed
+    assert queue.replay() == [failed_id]
+    replayed = queue.get(failed_id)
+    assert (replayed["status"], replayed["attempts"]) == ("pending", 0)
+
+    # Named deliveries are replayed unless they are still queued
+    assert queue.replay(["guid-done", "guid-pending", "guid-unknown"]) == [done_id]
+    assert queue.pending_count() == 3
+
+
+def test_failed_dispatch_is_retried():
+    """Failures back off and are retried until MAX_ATTEMPTS."""
+    queue = make_queue()
+    queue_id = queue.enqueue("issues", b"{}")
+
+    original = webhook_queue.MAX_ATTEMPTS
+    webhook_queue.MAX_ATTEMPTS = 2
+    try:
+        queue.claim()
+        assert queue.fail(queue_id, "boom")
+        # Backing off: not due yet
+        assert queue.claim() is None
+
+        with queue._connect() as conn:
+            conn.execute("UPDATE deliveries SET next_attempt_at = 0")
+        assert queue.claim()["attempts"] == 1
+        assert not queue.fail(queue_id, "boom again")
+        assert queue.get(queue_id)["status"] == "failed"
+        assert queue.pending_count() == 0
+    finally:
+        webhook_queue.MAX_ATTEMPTS = original
+
+
+def test_expired_claim_is_reclaimed():
+    """A delivery whose dispatcher died is handed out again after its lease."""
+    queue = make_queue()
+    queue_id = queue.enqueue("issues", b"{}")
+    assert queue.claim()["id"] == queue_id
+    assert queue.claim() is None
+
+    with queue._connect() as conn:
+        conn.execute("UPDATE deliveries SET claimed_until = ?", (time.time() - 1,))
+    assert queue.claim()["id"] == queue_id
+
+
+def test_held_delivery_until_workflow_starts():
+    """Held deliveries are not claimed again; unstarted ones are requeued."""
+    queue = make_queue()
+    started_id = queue.enqueue("issues", b"{}", "guid-started")
+    cancelled_id = queue.enqueue("issues", b"{}", "guid-cancelled")
+    orphan_id = queue.enqueue("issues", b"{}", "guid-orphan")
+    for queue_id in (started_id, cancelled_id, orphan_id):
+        assert queue.claim()["id"] == queue_id
+        queue.hold(queue_id, '{"status": "launching"}')
+    assert queue.claim() is None
+    assert queue.get(started_id)["status"] == "launching"
+
+    queue.complete(started_id, '{"status": "started"}')
+    # A workflow that started before its delivery was held stays done
+    queue.hold(started_id, '{"status": "launching"}')
+    assert queue.get(started_id)["status"] == "done"
+
+    # Cancelled before it started: dispatched again without using a retry
+    queue.requeue(cancelled_id)
+    assert queue.claim()["id"] == cancelled_id
+    assert queue.get(cancelled_id)["attempts"] == 0
+
+    # A restarted trigger requeues what the old process still held
+    queue = WebhookQueue(queue.db_path)
+    recovered = queue.recover()
+    assert [d["id"] for d in recovered] == [orphan_id]
+    assert recovered[0]["result"] == '{"status": "launching"}'
+    assert queue.get(orphan_id)["status"] == "pending"
+    assert queue.recover() == []
+
+
+def test_recover_leaves_deliveries_of_live_holders():
+    """Only deliveries whose holding process has exited are requeued."""
+    queue = make_queue()
+    live_id = queue.enqueue("issues", b"{}", "guid-live")
+    dead_id = queue.enqueue("issues", b"{}", "guid-dead")
+    for queue_id in (live_id, dead_id):
+        assert queue.claim()["id"] == queue_id
+        queue.hold(queue_id, '{"status": "launching"}')
+
+    exited = subprocess.Popen([sys.executable, "-c", "pass"])
+    exited.wait()
+    with queue._connect() as conn:
+        conn.execute("UPDATE deliveries SET held_by = ? WHERE id = ?", (os.getppid(), live_id))
+        conn.execute("UPDATE deliveries SET held_by = ? WHERE id = ?", (exited.pid, dead_id))
+
+    assert [d["id"] for d in queue.recover()] == [dead_id]
+    assert queue.get(live_id)["status"] == "launching"
+
+
+def run_all_tests():
+    """Run all tests."""
+    print("\n" + "=" * 60)
+    print("Running Webhook Queue Tests")
+    print("=" * 60 + "\n")
+
+    tests = [
+        test_verify_signature,
+        test_deliveries_dispatch_in_order,
+        test_redeliveries_are_dropped,
+        test_replay,
+        test_failed_dispatch_is_retried,
+        test_expired_claim_is_reclaimed,
+        test_held_delivery_until_workflow_starts,
+        test_recover_leaves_deliveries_of_live_holders,
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except Exception as e:
+            print(f"❌ {test.__name__} failed with exception: {e}")
+            failed += 1
+
+    print("\n" + "=" * 60)
+    print(f"Results: {passed} passed, {failed} failed")
+    print("=" * 60 + "\n")
+
+    return failed == 0
+
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,97 @@
+"""Tests for shared workflow operations."""
+
+import sys
+import os
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from adw_modules import workflow_ops
+from adw_modules.workflow_ops import extract_adw_info, parse_adw_command
+
+
+def test_parse_well_formed_commands():
+    """Common command forms are parsed without the classifier."""
+    cases = [
+        ("adw_plan_build_iso adw-1234abcd heavy", ("adw_plan_build_iso", "1234abcd", "heavy")),
+        ("adw_plan_iso", ("adw_plan_iso", None, "base")),
+        ("/adw_sdlc_zte_iso", ("adw_sdlc_ZTE_iso", None, "base")),
+        ("`adw_build_iso` adw_id: deadbeef", ("adw_build_iso", "deadbeef", "base")),
+        ("adw_review_iso\nadw_id=0a1b2c3d\nmodel_set: heavy", ("adw_review_iso", "0a1b2c3d", "heavy")),
+        ("ADW_SHIP_ISO 1234abcd.", ("adw_ship_iso", "1234abcd", "base")),
+    ]
+    for text, expected in cases:
+        result = parse_adw_command(text)
+        assert result is not None, text
+        assert (result.workflow_command, result.adw_id, result.model_set) == expected, text
+
+
+def test_ambiguous_text_is_not_parsed():
+    """Prose, unknown workflows and conflicting values are left to the classifier."""
+    for text in [
+        "Please run adw_plan_iso on this",
+        "adw_plan_iso adw_build_iso",
+        "adw_build_iso continue",
+        "adw_plan_iso heavy base",
+        "adw_build_iso 1234abcd 5678abcd",
+        "adw_unknown_iso",
+        "",
+    ]:
+        assert parse_adw_command(text) is None, text
+
+
+def test_extract_adw_info_skips_classifier_for_commands():
+    """extract_adw_info only calls the agent when the fast path declines."""
+    calls = []
+    original = workflow_ops.execute_template
+
+    def fake_execute_template(request):
+        calls.append(request)
+        raise RuntimeError("classifier unavailable")
+
+    workflow_ops.execute_template = fake_execute_template
+    try:
+        fast = extract_adw_info("adw_plan_build_iso adw-1234abcd heavy", "tempid01")
+        slow = extract_adw_info("could you plan this with adw_plan_iso?", "tempid02")
+    finally:
+        workflow_ops.execute_template = original
+
+    assert fast.workflow_command == "adw_plan_build_iso"
+    assert fast.adw_id == "1234abcd"
+    assert not slow.has_workflow
+    assert len(calls) == 1 and calls[0].slash_command == "/classify_adw"
+
+
+def run_all_tests():
+    """Run all tests."""
+    print("\n" + "=" * 60)
+    print("Running Workflow Ops Tests")
+    print("=" * 60 + "\n")
+
+    tests = [
+        test_parse_well_formed_commands,
+        test_ambiguous_text_is_not_parsed,
+        test_extract_adw_info_skips_classifier_for_commands,
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except Exception as e:
+            print(f"❌ {test.__name__} failed with exception: {e}")
+            failed += 1
+
+    print("\n" + "=" * 60)
+    print(f"Results: {passed} passed, {failed} failed")
+    print("=" * 60 + "\n")
+
+    return failed == 0
+
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
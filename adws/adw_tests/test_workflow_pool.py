@@ -0,0 +1,199 @@
+"""Tests for the bounded workflow pool used by the cron trigger."""
+
+import sys
+import os
+import tempfile
+import threading
+import time
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from adw_modules.workflow_pool import (
+    DEFAULT_PRIORITY,
+    WorkflowPool,
+    get_label_priority,
+    load_job_record,
+)
+
+
+def sleep_cmd(seconds: float, exit_code: int = 0):
+    return [
+        sys.executable,
+        "-c",
+        f"import sys, time; print('working'); time.sleep({seconds}); sys.exit({exit_code})",
+    ]
+
+
+def wait_for(condition, timeout: float = 10) -> bool:
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if condition():
+            return True
+        time.sleep(0.02)
+    return False
+
+
+def make_pool(max_workers: int, **kwargs) -> WorkflowPool:
+    return WorkflowPool(
+        max_workers=max_workers,
+        log_dir=tempfile.mkdtemp(),
+        agents_dir=tempfile.mkdtemp(),
+        **kwargs,
+    )
+
+
+def test_label_priority():
+    """The most urgent configured label wins; unlisted labels get the default."""
+    spec = "urgent:0, bug:1,bogus,chore:9"
+    assert get_label_priority(["feature", "Bug"], spec) == 1
+    assert get_label_priority(["bug", "urgent"], spec) == 0
+    assert get_label_priority(["feature"], spec) == DEFAULT_PRIORITY
+    assert get_label_priority([], spec) == DEFAULT_PRIORITY
+
+
+def test_submit_does_not_block_and_caps_parallelism():
+    """Submitting returns at once and at most max_workers jobs run together."""
+    pool = make_pool(2)
+    peak = []
+
+    start = time.time()
+    jobs = [pool.submit(n, sleep_cmd(0.3)) for n in range(5)]
+    # Running them one after another would take at least 1.5 s
+    assert time.time() - start < 1.0
+
+    def record_peak():
+        peak.append(pool.counts().get("running", 0))
+        return all(job.status == "succeeded" for job in jobs)
+
+    assert wait_for(record_peak)
+    assert max(peak) == 2
+    assert all(job.returncode == 0 and job.pid for job in jobs)
+    with open(jobs[0].log_file) as f:
+        assert f.read().strip() == "working"
+    pool.shutdown()
+
+
+def test_priority_order():
+    """Queued jobs start by priority, then in submission order."""
+    started = []
+    lock = threading.Lock()
+
+    def on_finish(job):
+        with lock:
+            started.append(job.issue_number)
+
+    pool = make_pool(1, on_finish=on_finish)
+    blocker = pool.submit(0, sleep_cmd(0.3))
+    assert wait_for(lambda: blocker.status == "running")
+    pool.submit(1, sleep_cmd(0), priority=5)
+    pool.submit(2, sleep_cmd(0), priority=1)
+    pool.submit(3, sleep_cmd(0), priority=5)
+    pool.submit(4, sleep_cmd(0), priority=0)
+
+    assert wait_for(lambda: len(started) == 5)
+    assert started == [0, 4, 2, 1, 3]
+    pool.shutdown()
+
+
+def test_status_and_shutdown():
+    """Failures are reported, and shutdown cancels jobs that never started."""
+    finished = []
+    pool = make_pool(1, on_finish=finished.append)
+    failing = pool.submit(1, sleep_cmd(0.2, exit_code=3))
+    assert wait_for(lambda: failing.status == "running")
+    queued = pool.submit(2, sleep_cmd(0))
+    assert queued.status == "queued"
+
+    cancelled = pool.shutdown()
+    assert [job.issue_number for job in cancelled] == [2]
+    assert queued.status == "cancelled"
+
+    assert wait_for(lambda: failing.status == "failed")
+    assert failing.returncode == 3
+    assert failing.finished_at >= failing.started_at >= failing.submitted_at
+    assert [job.issue_number for job in finished] == [2, 1]
+    assert [job.issue_number for job in pool.snapshot()] == [2, 1]
+
+    try:
+        pool.submit(3, sleep_cmd(0))
+        assert False, "submit after shutdown should fail"
+    except RuntimeError:
+        pass
+
+
+def test_wait_started_returns_before_jobs_exit():
+    """wait_started() returns once every job has started, not when it exits."""
+    started = []
+    pool = make_pool(2, on_start=started.append)
+    jobs = [pool.submit(n, sleep_cmd(2)) for n in range(2)]
+
+    start = time.time()
+    pool.wait_started()
+    assert time.time() - start < 1.5
+    assert [job.status for job in jobs] == ["running"] * 2
+    assert sorted(job.issue_number for job in started) == [0, 1]
+    assert pool.shutdown() == []
+    assert wait_for(lambda: all(job.status == "succeeded" for job in jobs))
+
+
+def test_job_records_are_persisted_per_adw_id():
+    """Jobs with an ADW ID record their status and exit code on disk."""
+    pool = make_pool(1)
+    job = pool.submit(
+        7,
+        sleep_cmd(0.2, exit_code=2),
+        adw_id="abcd1234",
+        workflow="adw_plan_iso",
+        repo_path="owner/repo",
+    )
+    assert wait_for(
+        lambda: (load_job_record("abcd1234", pool.agents_dir) or job).status == "running"
+    )
+    record = load_job_record("abcd1234", pool.agents_dir)
+    assert record.pid == job.pid
+
+    assert wait_for(lambda: job.status == "failed")
+    pool.shutdown()
+    record = load_job_record("abcd1234", pool.agents_dir)
+    assert (record.status, record.returncode) == ("failed", 2)
+    assert (record.workflow, record.repo_path) == ("adw_plan_iso", "owner/repo")
+    assert load_job_record("missing0", pool.agents_dir) is None
+
+
+def run_all_tests():
+    """Run all tests."""
+    print("\n" + "=" * 60)
+    print("Running Workflow Pool Tests")
+    print("=" * 60 + "\n")
+
+    tests = [
+        test_label_priority,
+        test_submit_does_not_block_and_caps_parallelism,
+        test_priority_order,
+        test_status_and_shutdown,
+        test_wait_started_returns_before_jobs_exit,
+        test_job_records_are_persisted_per_adw_id,
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except Exception as e:
+            print(f"❌ {test.__name__} failed with exception: {e}")
+            failed += 1
+
+    print("\n" + "=" * 60)
+    print(f"Results: {passed} passed, {failed} failed")
+    print("=" * 60 + "\n")
+
+    return failed == 0
+
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
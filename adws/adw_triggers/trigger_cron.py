@@ -5,6 +5,7 @@
 #     "schedule",
 #     "python-dotenv",
 #     "pydantic",
+#     "requests",
 # ]
 # ///
 
@@ -15,16 +16,17 @@ This script polls GitHub every 20 seconds to detect:
 1. New issues without comments
 2. Issues where the latest comment contains 'adw'
 
-When a qualifying issue is found, it triggers the existing manual workflow script.
+When a qualifying issue is found, it queues the existing manual workflow script
+on a bounded background worker pool (ADW_MAX_WORKFLOWS at a time, ordered by
+ADW_LABEL_PRIORITY), so polling keeps its cadence while workflows run.
 """
 
 import os
 import signal
-import subprocess
 import sys
 import time
 from pathlib import Path
-from typing import Dict, Set, Optional
+from typing import Set, Optional
 
 import schedule
 from dotenv import load_dotenv
@@ -33,7 +35,10 @@ from dotenv import load_dotenv
 sys.path.insert(0, str(Path(__file__).parent.parent))
 from adw_modules.utils import get_safe_subprocess_env
 
-from adw_modules.github import fetch_open_issues, fetch_issue_comments, get_repo_url, extract_repo_path
+from adw_modules.data_types import GitHubIssueSummary, WorkflowJob
+from adw_modules.github import fetch_open_issue_summaries, get_repo_url, extract_repo_path
+from adw_modules.trigger_dedupe import NEW_ISSUE_KEY, get_trigger_dedupe_store
+from adw_modules.workflow_pool import WorkflowPool, get_label_priority
 
 # Load environment variables from current or parent directories
 load_dotenv()
@@ -49,10 +54,9 @@ except ValueError as e:
     print(f"ERROR: {e}")
     sys.exit(1)
 
-# Track processed issues
+# Issues launched in this session (for reporting; dedupe state lives in
+# the trigger dedupe store shared with the webhook trigger)
 processed_issues: Set[int] = set()
-# Track issues with their last processed comment ID
-issue_last_comment: Dict[int, Optional[int]] = {}
 
 # Graceful shutdown flag
 shutdown_requested = False
@@ -65,66 +69,81 @@ def signal_handler(signum, frame):
     shutdown_requested = True
 
 
-def should_process_issue(issue_number: int) -> bool:
-    """Determine if an issue should be processed based on comments."""
-    comments = fetch_issue_comments(REPO_PATH, issue_number)
-    
+def get_trigger_key(issue: GitHubIssueSummary) -> Optional[str]:
+    """Return what would trigger a workflow for the issue, or None.
+
+    New issues without comments are triggered by the issue itself
+    (NEW_ISSUE_KEY); otherwise by a latest comment that is exactly 'adw'.
+    """
     # If no comments, it's a new issue - process it
-    if not comments:
-        print(f"INFO: Issue #{issue_number} has no comments - marking for processing")
-        return True
-    
-    # Get the latest comment
-    latest_comment = comments[-1]
-    comment_body = latest_comment.get("body", "").lower()
-    comment_id = latest_comment.get("id")
-    
-    # Check if we've already processed this comment
-    last_processed_comment = issue_last_comment.get(issue_number)
-    if last_processed_comment == comment_id:
-        # DEBUG level - not printing
-        return False
+    if issue.last_comment is None:
+        return NEW_ISSUE_KEY
     
     # Check if latest comment is exactly 'adw' (after stripping whitespace)
-    if comment_body.strip() == "adw":
-        print(f"INFO: Issue #{issue_number} - latest comment is 'adw' - marking for processing")
-        issue_last_comment[issue_number] = comment_id
-        return True
+    if issue.last_comment.body.lower().strip() == "adw":
+        return issue.last_comment.id
     
     # DEBUG level - not printing
-    return False
+    return None
+
+
+def should_process_issue(issue: GitHubIssueSummary) -> bool:
+    """Claim the issue if it has an unhandled trigger and nothing in flight."""
+    trigger_key = get_trigger_key(issue)
+    if trigger_key is None:
+        return False
+
+    # Already handled (possibly before a restart, or by the webhook trigger)
+    if not get_trigger_dedupe_store().claim(REPO_PATH, issue.number, trigger_key, "cron"):
+        return False
+
+    if trigger_key == NEW_ISSUE_KEY:
+        print(f"INFO: Issue #{issue.number} has no comments - marking for processing")
+    else:
+        print(f"INFO: Issue #{issue.number} - latest comment is 'adw' - marking for processing")
+    return True
 
 
-def trigger_adw_workflow(issue_number: int) -> bool:
-    """Trigger the ADW plan and build workflow for a specific issue."""
+def on_workflow_finished(job: WorkflowJob) -> None:
+    """Release the issue's dedupe claim once its workflow has finished."""
+    if job.status == "succeeded":
+        print(f"INFO: Workflow for issue #{job.issue_number} finished successfully")
+    elif job.status == "cancelled":
+        print(f"INFO: Workflow for issue #{job.issue_number} cancelled before it started")
+    else:
+        print(f"ERROR: Workflow for issue #{job.issue_number} failed (exit code {job.returncode}), see {job.log_file}")
+    # Failed and cancelled runs are retried by a later cycle
+    get_trigger_dedupe_store().release(
+        REPO_PATH, job.issue_number, handled=job.status == "succeeded"
+    )
+
+
+# Workflows run here in the background so a long run never delays the next poll
+workflow_pool = WorkflowPool(on_finish=on_workflow_finished)
+
+
+def trigger_adw_workflow(issue: GitHubIssueSummary) -> Optional[WorkflowJob]:
+    """Queue the ADW plan and build workflow for a specific issue."""
     try:
         script_path = Path(__file__).parent.parent / "adw_plan_build_iso.py"
         
-        print(f"INFO: Triggering ADW workflow for issue #{issue_number}")
-        
-        cmd = [sys.executable, str(script_path), str(issue_number)]
+        cmd = [sys.executable, str(script_path), str(issue.number)]
+        priority = get_label_priority(label.name for label in issue.labels)
         
         # Run the manual trigger script with filtered environment
-        result = subprocess.run(
+        job = workflow_pool.submit(
+            issue.number,
             cmd,
-            capture_output=True,
-            text=True,
-            cwd=script_path.parent,
-            env=get_safe_subprocess_env()
+            priority=priority,
+            cwd=str(script_path.parent),
+            env=get_safe_subprocess_env(),
         )
-        
-        if result.returncode == 0:
-            print(f"INFO: Successfully triggered workflow for issue #{issue_number}")
-            # DEBUG level - not printing output
-            return True
-        else:
-            print(f"ERROR: Failed to trigger workflow for issue #{issue_number}")
-            print(f"ERROR: {result.stderr}")
-            return False
+        print(f"INFO: Queued ADW workflow for issue #{issue.number} (job {job.job_id}, priority {priority})")
+        return job
             
     except Exception as e:
-        print(f"ERROR: Exception while triggering workflow for issue #{issue_number}: {e}")
-        return False
+        print(f"ERROR: Exception while triggering workflow for issue #{issue.number}: {e}")
+        return None
 
 
 def check_and_process_issues():
@@ -137,8 +156,8 @@ def check_and_process_issues():
     print(f"INFO: Starting issue check cycle")
     
     try:
-        # Fetch all open issues
-        issues = fetch_open_issues(REPO_PATH)
+        # Fetch all open issues with their latest comment in a few batched requests
+        issues = fetch_open_issue_summaries(REPO_PATH)
         
         if not issues:
             print(f"INFO: No open issues found")
@@ -153,28 +172,26 @@ def check_and_process_issues():
             if not issue_number:
                 continue
             
-            # Skip if already processed in this session
-            if issue_number in processed_issues:
-                continue
-            
-            # Check if issue should be processed
-            if should_process_issue(issue_number):
-                new_qualifying_issues.append(issue_number)
+            # Check (and claim) if issue should be processed
+            if should_process_issue(issue):
+                new_qualifying_issues.append(issue)
         
         # Process qualifying issues
         if new_qualifying_issues:
-            print(f"INFO: Found {len(new_qualifying_issues)} new qualifying issues: {new_qualifying_issues}")
+            print(f"INFO: Found {len(new_qualifying_issues)} new qualifying issues: {[i.number for i in new_qualifying_issues]}")
             
-            for issue_number in new_qualifying_issues:
+            for issue in new_qualifying_issues:
                 if shutdown_requested:
                     print(f"INFO: Shutdown requested, stopping issue processing")
-                    break
+                    get_trigger_dedupe_store().release(REPO_PATH, issue.number, handled=False)
+                    continue
                 
-                # Trigger the workflow
-                if trigger_adw_workflow(issue_number):
-                    processed_issues.add(issue_number)
+                # Queue the workflow; the claim is released when it finishes
+                if trigger_adw_workflow(issue):
+                    processed_issues.add(issue.number)
                 else:
-                    print(f"WARNING: Failed to process issue #{issue_number}, will retry in next cycle")
+                    print(f"WARNING: Failed to process issue #{issue.number}, will retry in next cycle")
+                    get_trigger_dedupe_store().release(REPO_PATH, issue.number, handled=False)
         else:
             print(f"INFO: No new qualifying issues found")
         
@@ -182,6 +199,8 @@ def check_and_process_issues():
         cycle_time = time.time() - start_time
         print(f"INFO: Check cycle completed in {cycle_time:.2f} seconds")
         print(f"INFO: Total processed issues in session: {len(processed_issues)}")
+        counts = workflow_pool.counts()
+        print(f"INFO: Workflows running: {counts.get('running', 0)}, queued: {counts.get('queued', 0)}")
         
     except Exception as e:
         print(f"ERROR: Error during check cycle: {e}")
@@ -194,6 +213,7 @@ def main():
     print(f"INFO: Starting ADW cron trigger")
     print(f"INFO: Repository: {REPO_PATH}")
     print(f"INFO: Polling interval: 20 seconds")
+    print(f"INFO: Max concurrent workflows: {workflow_pool.max_workers}")
     
     # Set up signal handlers
     signal.signal(signal.SIGINT, signal_handler)
@@ -211,6 +231,10 @@ def main():
         schedule.run_pending()
         time.sleep(1)
     
+    # Queued workflows are cancelled (and retried after restart); running ones keep going
+    cancelled = workflow_pool.shutdown()
+    if cancelled:
+        print(f"INFO: Cancelled {len(cancelled)} queued workflows")
     print(f"INFO: Shutdown complete")
 
 
@@ -221,6 +245,8 @@ if __name__ == "__main__":
         print("\nUsage: ./trigger_cron.py")
         print("\nEnvironment variables:")
         print("  GITHUB_PAT - (Optional) GitHub Personal Access Token")
+        print("  ADW_MAX_WORKFLOWS - (Optional) Workflows run concurrently (default: 2)")
+        print("  ADW_LABEL_PRIORITY - (Optional) label:priority pairs, lower runs first")
         print("\nThe script will poll GitHub issues every 20 seconds and trigger")
         print("the ADW workflow for qualifying issues.")
         print("\nNote: Repository URL is automatically detected from git remote.")
@@ -1,27 +1,44 @@
 #!/usr/bin/env -S uv run
 # /// script
-# dependencies = ["fastapi", "uvicorn", "python-dotenv"]
+# dependencies = ["fastapi", "uvicorn", "python-dotenv", "requests"]
 # ///
 
 """
 GitHub Webhook Trigger - AI Developer Workflow (ADW)
 
 FastAPI webhook endpoint that receives GitHub issue events and triggers ADW workflows.
-Responds immediately to meet GitHub's 10-second timeout by launching workflows
-in the background. Supports both standard and isolated workflows.
+Responds immediately to meet GitHub's 10-second timeout: deliveries are checked
+against the webhook secret, persisted to a durable queue and answered with 202,
+and dispatcher threads classify them and launch workflows in the background.
+Supports both standard and isolated workflows.
 
-Usage: uv run trigger_webhook.py
+Usage:
+  uv run trigger_webhook.py
+  uv run trigger_webhook.py replay [delivery-id...]
+
+`replay` re-dispatches deliveries from the delivery log: the given
+X-GitHub-Delivery IDs, or every delivery whose dispatch failed. It exits
+once the replayed workflows have started; they keep running in the
+background. With more of them than ADW_MAX_WORKFLOWS, it waits for earlier
+ones to exit before starting the rest.
 
 Environment Requirements:
 - PORT: Server port (default: 8001)
+- GITHUB_WEBHOOK_SECRET: (Optional) Webhook secret used to verify signatures
+- ADW_WEBHOOK_DISPATCHERS: (Optional) Dispatcher threads (default: 2)
+- ADW_HEALTH_REFRESH_INTERVAL: (Optional) Seconds between health checks (default: 300)
+- ADW_MAX_WORKFLOWS: (Optional) Workflows run at once; the rest are queued (default: 2)
 - All workflow requirements (GITHUB_PAT, ANTHROPIC_API_KEY, etc.)
 """
 
+import json
 import os
-import subprocess
 import sys
-from typing import Optional
+import threading
+from typing import List, Optional
 from fastapi import FastAPI, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse
 from dotenv import load_dotenv
 import uvicorn
 
@@ -29,15 +46,32 @@ import uvicorn
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from adw_modules.utils import make_adw_id, setup_logger, get_safe_subprocess_env
-from adw_modules.github import make_issue_comment, ADW_BOT_IDENTIFIER
+from adw_modules.github import (
+    make_issue_comment,
+    ADW_BOT_IDENTIFIER,
+    get_repo_url,
+    extract_repo_path,
+)
+from adw_modules.trigger_dedupe import NEW_ISSUE_KEY, get_trigger_dedupe_store
+from adw_modules.webhook_queue import (
+    DISPATCHER_THREADS,
+    WebhookQueue,
+    get_webhook_queue,
+    verify_signature,
+)
 from adw_modules.workflow_ops import extract_adw_info, AVAILABLE_ADW_WORKFLOWS
 from adw_modules.state import ADWState
+from adw_modules.health import HealthMonitor
+from adw_modules.data_types import HealthCheckResult, WorkflowJob
+from adw_modules.workflow_pool import WorkflowPool, get_label_priority
 
 # Load environment variables
 load_dotenv()
 
 # Configuration
 PORT = int(os.getenv("PORT", "8001"))
+WEBHOOK_SECRET = os.getenv("GITHUB_WEBHOOK_SECRET")
+DISPATCH_POLL_SECONDS = 1.0
 
 # Dependent workflows that require existing worktrees
 # These cannot be triggered directly via webhook
@@ -56,115 +90,195 @@ app = FastAPI(
 
 print(f"Starting ADW Webhook Trigger on port {PORT}")
 
+# Health checks run in the background; /health only reads the cached result
+health_monitor = HealthMonitor()
+
+
+def on_workflow_started(job: WorkflowJob) -> None:
+    """Complete the job's delivery once its workflow is actually running."""
+    if job.delivery_queue_id is not None:
+        get_webhook_queue().complete(
+            job.delivery_queue_id,
+            json.dumps(
+                {
+                    "status": "started",
+                    "issue": job.issue_number,
+                    "adw_id": job.adw_id,
+                    "job_id": job.job_id,
+                    "workflow": job.workflow,
+                    "pid": job.pid,
+                }
+            ),
+        )
 
-@app.post("/gh-webhook")
-async def github_webhook(request: Request):
-    """Handle GitHub webhook events."""
-    try:
-        # Get event type from header
-        event_type = request.headers.get("X-GitHub-Event", "")
-
-        # Parse webhook payload
-        payload = await request.json()
-
-        # Extract event details
-        action = payload.get("action", "")
-        issue = payload.get("issue", {})
-        issue_number = issue.get("number")
 
+def on_workflow_finished(job: WorkflowJob) -> None:
+    """Clear the issue's in-flight marker once its workflow has exited."""
+    if job.status == "cancelled":
         print(
-            f"Received webhook: event={event_type}, action={action}, issue_number={issue_number}"
+            f"Workflow {job.workflow} for issue #{job.issue_number} (ADW ID {job.adw_id}) "
+            f"was cancelled before it started"
         )
+    else:
+        print(
+            f"Workflow {job.workflow} for issue #{job.issue_number} (ADW ID {job.adw_id}) "
+            f"exited with code {job.returncode}"
+        )
+    # A workflow that never started (cancelled, or failed to launch) lets
+    # the trigger be retried; release before its delivery is queued again
+    started = job.pid is not None
+    get_trigger_dedupe_store().release(job.repo_path, job.issue_number, handled=started)
+    if job.delivery_queue_id is not None and not started:
+        if job.status == "cancelled":
+            # Dispatched again by the next process
+            get_webhook_queue().requeue(job.delivery_queue_id)
+        else:
+            get_webhook_queue().fail(
+                job.delivery_queue_id, f"Failed to launch {job.workflow}"
+            )
 
-        workflow = None
-        provided_adw_id = None
-        model_set = None
-        trigger_reason = ""
-        content_to_check = ""
-
-        # Check if this is an issue opened event
-        if event_type == "issues" and action == "opened" and issue_number:
-            issue_body = issue.get("body", "")
-            content_to_check = issue_body
-
-            # Ignore issues from ADW bot to prevent loops
-            if ADW_BOT_IDENTIFIER in issue_body:
-                print(f"Ignoring ADW bot issue to prevent loop")
-                workflow = None
-            # Check if body contains "adw_"
-            elif "adw_" in issue_body.lower():
-                # Use temporary ID for classification
-                temp_id = make_adw_id()
-                extraction_result = extract_adw_info(issue_body, temp_id)
-                if extraction_result.has_workflow:
-                    workflow = extraction_result.workflow_command
-                    provided_adw_id = extraction_result.adw_id
-                    model_set = extraction_result.model_set
-                    trigger_reason = f"New issue with {workflow} workflow"
-
-        # Check if this is an issue comment
-        elif event_type == "issue_comment" and action == "created" and issue_number:
-            comment = payload.get("comment", {})
-            comment_body = comment.get("body", "")
-            content_to_check = comment_body
-
-            print(f"Comment body: '{comment_body}'")
-
-            # Ignore comments from ADW bot to prevent loops
-            if ADW_BOT_IDENTIFIER in comment_body:
-                print(f"Ignoring ADW bot comment to prevent loop")
-                workflow = None
-            # Check if comment contains "adw_"
-            elif "adw_" in comment_body.lower():
-                # Use temporary ID for classification
-                temp_id = make_adw_id()
-                extraction_result = extract_adw_info(comment_body, temp_id)
-                if extraction_result.has_workflow:
-                    workflow = extraction_result.workflow_command
-                    provided_adw_id = extraction_result.adw_id
-                    model_set = extraction_result.model_set
-                    trigger_reason = f"Comment with {workflow} workflow"
-
-        # Validate workflow constraints
-        if workflow in DEPENDENT_WORKFLOWS:
-            if not provided_adw_id:
-                print(
-                    f"{workflow} is a dependent workflow that requires an existing ADW ID"
+
+# Supervises launched workflows: at most ADW_MAX_WORKFLOWS run at once, the
+# rest wait in a queue, and exit codes are recorded per ADW ID
+workflow_pool = WorkflowPool(
+    on_finish=on_workflow_finished, on_start=on_workflow_started
+)
+
+
+def health_response(result: HealthCheckResult) -> dict:
+    """Wrap a health check result for the health endpoints."""
+    return {
+        "status": "healthy" if result.success else "unhealthy",
+        "service": "adw-webhook-trigger",
+        "health_check": result,
+    }
+
+
+def dispatch_delivery(
+    event_type: str,
+    payload: dict,
+    queue: Optional[WebhookQueue] = None,
+    queue_id: Optional[int] = None,
+) -> dict:
+    """Classify a queued delivery and launch its workflow, if any.
+
+    Runs on a dispatcher thread, outside the request path. Exceptions
+    propagate so the delivery is retried. A delivery that launches a
+    workflow is held in the queue until the workflow starts.
+    """
+    # Extract event details
+    action = payload.get("action", "")
+    issue = payload.get("issue", {})
+    issue_number = issue.get("number")
+
+    print(
+        f"Received webhook: event={event_type}, action={action}, issue_number={issue_number}"
+    )
+
+    workflow = None
+    provided_adw_id = None
+    model_set = None
+    trigger_reason = ""
+    content_to_check = ""
+    trigger_key = None
+
+    # Check if this is an issue opened event
+    if event_type == "issues" and action == "opened" and issue_number:
+        issue_body = issue.get("body", "")
+        content_to_check = issue_body
+        trigger_key = NEW_ISSUE_KEY
+
+        # Ignore issues from ADW bot to prevent loops
+        if ADW_BOT_IDENTIFIER in issue_body:
+            print(f"Ignoring ADW bot issue to prevent loop")
+            workflow = None
+        # Check if body contains "adw_"
+        elif "adw_" in issue_body.lower():
+            # Use temporary ID for classification
+            temp_id = make_adw_id()
+            extraction_result = extract_adw_info(issue_body, temp_id)
+            if extraction_result.has_workflow:
+                workflow = extraction_result.workflow_command
+                provided_adw_id = extraction_result.adw_id
+                model_set = extraction_result.model_set
+                trigger_reason = f"New issue with {workflow} workflow"
+
+    # Check if this is an issue comment
+    elif event_type == "issue_comment" and action == "created" and issue_number:
+        comment = payload.get("comment", {})
+        comment_body = comment.get("body", "")
+        content_to_check = comment_body
+        # Node IDs match the comment IDs seen by the cron trigger
+        trigger_key = comment.get("node_id") or str(comment.get("id"))
+
+        print(f"Comment body: '{comment_body}'")
+
+        # Ignore comments from ADW bot to prevent loops
+        if ADW_BOT_IDENTIFIER in comment_body:
+            print(f"Ignoring ADW bot comment to prevent loop")
+            workflow = None
+        # Check if comment contains "adw_"
+        elif "adw_" in comment_body.lower():
+            # Use temporary ID for classification
+            temp_id = make_adw_id()
+            extraction_result = extract_adw_info(comment_body, temp_id)
+            if extraction_result.has_workflow:
+                workflow = extraction_result.workflow_command
+                provided_adw_id = extraction_result.adw_id
+                model_set = extraction_result.model_set
+                trigger_reason = f"Comment with {workflow} workflow"
+
+    # Validate workflow constraints
+    if workflow in DEPENDENT_WORKFLOWS:
+        if not provided_adw_id:
+            print(
+                f"{workflow} is a dependent workflow that requires an existing ADW ID"
+            )
+            print(f"Cannot trigger {workflow} directly via webhook without ADW ID")
+            workflow = None
+            # Post error comment to issue
+            try:
+                make_issue_comment(
+                    str(issue_number),
+                    f"❌ Error: `{workflow}` is a dependent workflow that requires an existing ADW ID.\n\n"
+                    f"To run this workflow, you must provide the ADW ID in your comment, for example:\n"
+                    f"`{workflow} adw-12345678`\n\n"
+                    f"The ADW ID should come from a previous workflow run (like `adw_plan_iso` or `adw_patch_iso`).",
                 )
-                print(f"Cannot trigger {workflow} directly via webhook without ADW ID")
-                workflow = None
-                # Post error comment to issue
-                try:
-                    make_issue_comment(
-                        str(issue_number),
-                        f"❌ Error: `{workflow}` is a dependent workflow that requires an existing ADW ID.\n\n"
-                        f"To run this workflow, you must provide the ADW ID in your comment, for example:\n"
-                        f"`{workflow} adw-12345678`\n\n"
-                        f"The ADW ID should come from a previous workflow run (like `adw_plan_iso` or `adw_patch_iso`).",
-                    )
-                except Exception as e:
-                    print(f"Failed to post error comment: {e}")
-
-        if workflow:
-            # Use provided ADW ID or generate a new one
-            adw_id = provided_adw_id or make_adw_id()
+            except Exception as e:
+                print(f"Failed to post error comment: {e}")
+
+    if workflow:
+        # Use provided ADW ID or generate a new one
+        adw_id = provided_adw_id or make_adw_id()
+
+        # Claim the issue so the cron trigger (or a redelivery) cannot
+        # launch it a second time
+        repo_path = payload.get("repository", {}).get(
+            "full_name"
+        ) or extract_repo_path(get_repo_url())
+        if not get_trigger_dedupe_store().claim(
+            repo_path, issue_number, trigger_key, "webhook", adw_id
+        ):
+            print(f"Issue #{issue_number} is already being handled, ignoring")
+            return {
+                "status": "ignored",
+                "reason": f"Issue #{issue_number} already has a workflow in flight or this trigger was handled",
+            }
 
+        # Until the workflow is running, a failure must let the retried
+        # delivery claim the issue again
+        try:
             # If ADW ID was provided, update/create state file
             if provided_adw_id:
-                # Try to load existing state first
-                state = ADWState.load(provided_adw_id)
-                if state:
-                    # Update issue_number and model_set if state exists
-                    state.update(issue_number=str(issue_number), model_set=model_set)
-                else:
-                    # Only create new state if it doesn't exist
-                    state = ADWState(provided_adw_id)
-                    state.update(
-                        adw_id=provided_adw_id,
-                        issue_number=str(issue_number),
-                        model_set=model_set,
-                    )
-                state.save("webhook_trigger")
+                # Update issue_number and model_set (creating the state if it
+                # doesn't exist) without clobbering a phase saving the same run
+                ADWState(provided_adw_id).update_atomic(
+                    lambda s: s.update(
+                        issue_number=str(issue_number), model_set=model_set
+                    ),
+                    "webhook_trigger",
+                )
             else:
                 # Create new state for newly generated ADW ID
                 state = ADWState(adw_id)
@@ -207,127 +321,256 @@ async def github_webhook(request: Request):
             print(f"Command: {' '.join(cmd)} (reason: {trigger_reason})")
             print(f"Working directory: {repo_root}")
 
-            # Launch in background using Popen with filtered environment
-            process = subprocess.Popen(
+            if queue is not None:
+                # The pool only keeps queued launches in memory
+                queue.hold(
+                    queue_id,
+                    json.dumps(
+                        {
+                            "status": "launching",
+                            "issue": issue_number,
+                            "adw_id": adw_id,
+                            "workflow": workflow,
+                            "repo_path": repo_path,
+                        }
+                    ),
+                )
+
+            # Queue on the supervisor with filtered environment
+            job = workflow_pool.submit(
+                issue_number,
                 cmd,
+                priority=get_label_priority(
+                    label.get("name", "") for label in issue.get("labels", [])
+                ),
                 cwd=repo_root,  # Run from repository root where .claude/commands/ is located
                 env=get_safe_subprocess_env(),  # Pass only required environment variables
-                start_new_session=True,
+                adw_id=adw_id,
+                workflow=workflow,
+                repo_path=repo_path,
+                delivery_queue_id=queue_id,
             )
+        except Exception:
+            get_trigger_dedupe_store().release(repo_path, issue_number, handled=False)
+            raise
 
-            print(
-                f"Background process started for issue #{issue_number} with ADW ID: {adw_id}"
-            )
-            print(f"Logs will be written to: agents/{adw_id}/{workflow}/execution.log")
+        print(
+            f"Queued job {job.job_id} for issue #{issue_number} with ADW ID: {adw_id}"
+        )
+        print(f"Logs will be written to: agents/{adw_id}/{workflow}/execution.log")
 
-            # Return immediately
-            return {
-                "status": "accepted",
-                "issue": issue_number,
-                "adw_id": adw_id,
-                "workflow": workflow,
-                "message": f"ADW {workflow} triggered for issue #{issue_number}",
-                "reason": trigger_reason,
-                "logs": f"agents/{adw_id}/{workflow}/",
-            }
-        else:
-            print(
-                f"Ignoring webhook: event={event_type}, action={action}, issue_number={issue_number}"
-            )
-            return {
-                "status": "ignored",
-                "reason": f"Not a triggering event (event={event_type}, action={action})",
-            }
+        return {
+            "status": "accepted",
+            "issue": issue_number,
+            "adw_id": adw_id,
+            "job_id": job.job_id,
+            "workflow": workflow,
+            "message": f"ADW {workflow} triggered for issue #{issue_number}",
+            "reason": trigger_reason,
+            "logs": f"agents/{adw_id}/{workflow}/",
+        }
+    else:
+        print(
+            f"Ignoring webhook: event={event_type}, action={action}, issue_number={issue_number}"
+        )
+        return {
+            "status": "ignored",
+            "reason": f"Not a triggering event (event={event_type}, action={action})",
+        }
 
-    except Exception as e:
-        print(f"Error processing webhook: {e}")
-        # Always return 200 to GitHub to prevent retries
-        return {"status": "error", "message": "Internal error processing webhook"}
 
+def dispatch_next(queue: WebhookQueue, queue_ids: Optional[List[int]] = None) -> bool:
+    """Claim and dispatch the oldest due delivery, logging its outcome.
+
+    Args:
+        queue_ids: Only dispatch among these deliveries
+
+    Returns:
+        False if no delivery was due
+    """
+    delivery = queue.claim(queue_ids)
+    if delivery is None:
+        return False
 
-@app.get("/health")
-async def health():
-    """Health check endpoint - runs comprehensive system health check."""
     try:
-        # Run the health check script
-        script_dir = os.path.dirname(os.path.abspath(__file__))
-        # Health check is in adw_tests, not adw_triggers
-        health_check_script = os.path.join(
-            os.path.dirname(script_dir), "adw_tests", "health_check.py"
+        result = dispatch_delivery(
+            delivery["event"], json.loads(delivery["body"]), queue, delivery["id"]
+        )
+        # Launched deliveries are completed when their workflow starts
+        if "job_id" not in result:
+            queue.complete(delivery["id"], json.dumps(result))
+    except Exception as e:
+        retry = queue.fail(delivery["id"], str(e))
+        print(
+            f"Error dispatching queued delivery {delivery['id']}: {e}"
+            + (" (will retry)" if retry else " (giving up)")
+        )
+    return True
+
+
+def recover_deliveries(queue: WebhookQueue) -> None:
+    """Requeue deliveries whose workflows were queued by a process that is gone."""
+    recovered = queue.recover()
+    for delivery in recovered:
+        held = json.loads(delivery["result"] or "{}")
+        if held.get("repo_path"):
+            # The claim was made for the launch that never started
+            get_trigger_dedupe_store().release(
+                held["repo_path"], held["issue"], handled=False, adw_id=held["adw_id"]
+            )
+    if recovered:
+        print(f"Requeued {len(recovered)} deliveries whose workflows never started")
+
+
+def run_dispatcher() -> None:
+    """Dispatch queued deliveries, oldest first, until the process exits."""
+    queue = get_webhook_queue()
+    while True:
+        if not dispatch_next(queue):
+            queue.ready.wait(DISPATCH_POLL_SECONDS)
+            queue.ready.clear()
+
+
+def replay_deliveries(delivery_ids: List[str]) -> None:
+    """Re-dispatch logged deliveries without GitHub redelivering them."""
+    queue = get_webhook_queue()
+    queue_ids = queue.replay(delivery_ids)
+    replayed = {queue.get(queue_id)["delivery_id"] for queue_id in queue_ids}
+    for delivery_id in delivery_ids:
+        if delivery_id in replayed:
+            continue
+        delivery = queue.get_by_delivery_id(delivery_id)
+        if delivery is None:
+            print(f"{delivery_id}: not in the delivery log")
+        else:
+            print(f"{delivery_id}: skipped, still {delivery['status']}")
+    if not queue_ids:
+        print("No deliveries to replay")
+        return
+
+    print(f"Replaying {len(queue_ids)} deliveries")
+    # Only the replayed deliveries: others are left to the server. Lease-based
+    # claims keep a running server's dispatchers from dispatching the same
+    # delivery again
+    while dispatch_next(queue, queue_ids):
+        pass
+    # Pool workers are daemon threads: wait until each replayed workflow has
+    # started, or queued ones would die with this process. Started workflows
+    # run in their own sessions and outlive it; their in-flight markers
+    # expire after ADW_TRIGGER_IN_FLIGHT_TTL
+    if workflow_pool.counts():
+        print("Waiting for replayed workflows to start")
+    workflow_pool.wait_started()
+    workflow_pool.shutdown()
+    for queue_id in queue_ids:
+        delivery = queue.get(queue_id)
+        print(f"{delivery['delivery_id']}: {delivery['status']} {delivery['result']}")
+
+
+@app.on_event("startup")
+def start_dispatchers() -> None:
+    """Start the dispatcher threads and health monitor along with the server."""
+    if not WEBHOOK_SECRET:
+        print("WARNING: GITHUB_WEBHOOK_SECRET is not set, webhook signatures are not checked")
+    recover_deliveries(get_webhook_queue())
+    for i in range(max(1, DISPATCHER_THREADS)):
+        threading.Thread(
+            target=run_dispatcher, name=f"webhook-dispatcher-{i}", daemon=True
+        ).start()
+    health_monitor.start()
+
+
+@app.on_event("shutdown")
+def stop_workflow_pool() -> None:
+    """Cancel queued workflows; their deliveries are dispatched again on restart."""
+    cancelled = workflow_pool.shutdown()
+    if cancelled:
+        print(f"Cancelled {len(cancelled)} queued workflows")
+
+
+@app.post("/gh-webhook")
+async def github_webhook(request: Request):
+    """Queue a GitHub webhook delivery and answer 202 at once."""
+    body = await request.body()
+    if WEBHOOK_SECRET and not verify_signature(
+        WEBHOOK_SECRET, body, request.headers.get("X-Hub-Signature-256")
+    ):
+        print("Rejecting webhook with a missing or invalid signature")
+        return JSONResponse(
+            status_code=401, content={"status": "error", "message": "Invalid signature"}
         )
 
-        # Run health check with timeout
-        result = subprocess.run(
-            ["uv", "run", health_check_script],
-            capture_output=True,
-            text=True,
-            timeout=30,
-            cwd=os.path.dirname(script_dir),  # Run from adws directory
+    try:
+        json.loads(body)
+    except ValueError:
+        return JSONResponse(
+            status_code=400, content={"status": "error", "message": "Invalid JSON payload"}
         )
 
-        # Print the health check output for debugging
-        print("=== Health Check Output ===")
-        print(result.stdout)
-        if result.stderr:
-            print("=== Health Check Errors ===")
-            print(result.stderr)
-
-        # Parse the output - look for the overall status
-        output_lines = result.stdout.strip().split("\n")
-        is_healthy = result.returncode == 0
-
-        # Extract key information from output
-        warnings = []
-        errors = []
-
-        capturing_warnings = False
-        capturing_errors = False
-
-        for line in output_lines:
-            if "⚠️  Warnings:" in line:
-                capturing_warnings = True
-                capturing_errors = False
-                continue
-            elif "❌ Errors:" in line:
-                capturing_errors = True
-                capturing_warnings = False
-                continue
-            elif "📝 Next Steps:" in line:
-                break
-
-            if capturing_warnings and line.strip().startswith("-"):
-                warnings.append(line.strip()[2:])
-            elif capturing_errors and line.strip().startswith("-"):
-                errors.append(line.strip()[2:])
+    event_type = request.headers.get("X-GitHub-Event", "")
+    delivery_id = request.headers.get("X-GitHub-Delivery")
+    # The SQLite write is short, but keep it off the event loop anyway
+    queue_id = await run_in_threadpool(
+        get_webhook_queue().enqueue, event_type, body, delivery_id
+    )
+    if queue_id is None:
+        # GitHub redelivered a delivery it timed out on: it is already queued
+        print(f"Dropping duplicate webhook delivery {delivery_id}")
+        return {"status": "duplicate", "delivery": delivery_id}
+
+    print(f"Queued webhook delivery {queue_id}: event={event_type}")
+    return JSONResponse(
+        status_code=202,
+        content={
+            "status": "queued",
+            "queue_id": queue_id,
+            "message": "Delivery queued for dispatch",
+        },
+    )
+
+
+@app.get("/jobs")
+async def jobs(limit: int = 50):
+    """Live view of supervised workflows: queued, running and recently finished."""
+    snapshot = workflow_pool.snapshot()
+    queued = sorted(
+        (job for job in snapshot if job.status == "queued"),
+        key=lambda job: (job.priority, job.submitted_at),
+    )
+    running = [job for job in snapshot if job.status == "running"]
+    finished = sorted(
+        (job for job in snapshot if job.finished_at is not None),
+        key=lambda job: job.finished_at,
+        reverse=True,
+    )
+    return {
+        "max_running": workflow_pool.max_workers,
+        "queued": queued,
+        "running": running,
+        "finished": finished[:limit],
+    }
 
-        return {
-            "status": "healthy" if is_healthy else "unhealthy",
-            "service": "adw-webhook-trigger",
-            "health_check": {
-                "success": is_healthy,
-                "warnings": warnings,
-                "errors": errors,
-                "details": "Run health_check.py directly for full report",
-            },
-        }
 
-    except subprocess.TimeoutExpired:
-        return {
-            "status": "unhealthy",
-            "service": "adw-webhook-trigger",
-            "error": "Health check timed out",
-        }
-    except Exception as e:
-        return {
-            "status": "unhealthy",
-            "service": "adw-webhook-trigger",
-            "error": f"Health check failed: {str(e)}",
-        }
+@app.get("/health")
+async def health():
+    """Health check endpoint - serves the last cached system health check."""
+    return health_response(health_monitor.get())
+
+
+@app.get("/health/deep")
+async def health_deep():
+    """Health check endpoint - reruns the system health check now."""
+    return health_response(await run_in_threadpool(health_monitor.refresh))
 
 
 if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "replay":
+        replay_deliveries(sys.argv[2:])
+        sys.exit(0)
+
     print(f"Starting server on http://0.0.0.0:{PORT}")
     print(f"Webhook endpoint: POST /gh-webhook")
-    print(f"Health check: GET /health")
+    print(f"Health check: GET /health (cached), GET /health/deep (rerun now)")
+    print(f"Workflow jobs: GET /jobs")
 
     uvicorn.run(app, host="0.0.0.0", port=PORT)
@@ -7,6 +7,12 @@ RED='\033[0;31m'
 YELLOW='\033[0;33m'
 NC='\033[0m' # No Color
 
+# Isolated ADW port ranges (same settings as adws/adw_modules/port_allocator.py)
+BACKEND_PORT_START=${ADW_BACKEND_PORT_START:-9100}
+FRONTEND_PORT_START=${ADW_FRONTEND_PORT_START:-9200}
+BACKEND_PORT_END=$((BACKEND_PORT_START + ${ADW_PORT_SLOTS:-100} - 1))
+FRONTEND_PORT_END=$((FRONTEND_PORT_START + ${ADW_PORT_SLOTS:-100} - 1))
+
 echo -e "${BLUE}Checking ADW and Application Ports...${NC}"
 echo ""
 
@@ -25,9 +31,9 @@ done
 echo ""
 
 # Check isolated ADW backend ports
-echo -e "${GREEN}Isolated ADW Backend Ports (9100-9114):${NC}"
+echo -e "${GREEN}Isolated ADW Backend Ports ($BACKEND_PORT_START-$BACKEND_PORT_END):${NC}"
 in_use_count=0
-for port in {9100..9114}; do
+for port in $(seq $BACKEND_PORT_START $BACKEND_PORT_END); do
     pid=$(lsof -ti:$port 2>/dev/null)
     if [ ! -z "$pid" ]; then
         process=$(ps -p $pid -o comm= 2>/dev/null)
@@ -42,9 +48,9 @@ fi
 echo ""
 
 # Check isolated ADW frontend ports
-echo -e "${GREEN}Isolated ADW Frontend Ports (9200-9214):${NC}"
+echo -e "${GREEN}Isolated ADW Frontend Ports ($FRONTEND_PORT_START-$FRONTEND_PORT_END):${NC}"
 in_use_count=0
-for port in {9200..9214}; do
+for port in $(seq $FRONTEND_PORT_START $FRONTEND_PORT_END); do
     pid=$(lsof -ti:$port 2>/dev/null)
     if [ ! -z "$pid" ]; then
         process=$(ps -p $pid -o comm= 2>/dev/null)
@@ -7,6 +7,12 @@ RED='\033[0;31m'
 YELLOW='\033[0;33m'
 NC='\033[0m' # No Color
 
+# Isolated ADW port ranges (same settings as adws/adw_modules/port_allocator.py)
+BACKEND_PORT_START=${ADW_BACKEND_PORT_START:-9100}
+FRONTEND_PORT_START=${ADW_FRONTEND_PORT_START:-9200}
+BACKEND_PORT_END=$((BACKEND_PORT_START + ${ADW_PORT_SLOTS:-100} - 1))
+FRONTEND_PORT_END=$((FRONTEND_PORT_START + ${ADW_PORT_SLOTS:-100} - 1))
+
 echo -e "${BLUE}Stopping Natural Language SQL Interface and ADW Services...${NC}"
 
 # Kill any running start.sh processes
@@ -22,16 +28,16 @@ echo -e "${GREEN}Killing processes on main ports (5173, 8000, 8001)...${NC}"
 lsof -ti:5173,8000,8001 | xargs kill -9 2>/dev/null
 
 # Kill processes on isolated ADW ports
-echo -e "${GREEN}Killing processes on isolated ADW backend ports (9100-9114)...${NC}"
-for port in {9100..9114}; do
+echo -e "${GREEN}Killing processes on isolated ADW backend ports ($BACKEND_PORT_START-$BACKEND_PORT_END)...${NC}"
+for port in $(seq $BACKEND_PORT_START $BACKEND_PORT_END); do
     pid=$(lsof -ti:$port 2>/dev/null)
     if [ ! -z "$pid" ]; then
         kill -9 $pid 2>/dev/null && echo -e "${YELLOW}  Killed process on port $port${NC}"
     fi
 done
 
-echo -e "${GREEN}Killing processes on isolated ADW frontend ports (9200-9214)...${NC}"
-for port in {9200..9214}; do
+echo -e "${GREEN}Killing processes on isolated ADW frontend ports ($FRONTEND_PORT_START-$FRONTEND_PORT_END)...${NC}"
+for port in $(seq $FRONTEND_PORT_START $FRONTEND_PORT_END); do
     pid=$(lsof -ti:$port 2>/dev/null)
     if [ ! -z "$pid" ]; then
         kill -9 $pid 2>/dev/null && echo -e "${YELLOW}  Killed process on port $port${NC}"